@@ -37,6 +37,9 @@ def main():
     
     # 4. Start Voice Interaction Thread
     assistant.start_voice_thread()
+
+    # 5. Synthesize fixed replies ahead of time
+    assistant.prewarm_speech()
     
     print("✨ Core is active. Press Ctrl+C to shutdown.")
     
@@ -1,13 +1,177 @@
 import threading
 import time
+import uuid
+from collections import deque
+from core.errors import CoreErrorException
 from core.stt import listen
-from core.tts import speak, speak_interrupt
+from core.tts import speak, speak_stream, speak_interrupt, prewarm
 from core.brain import brain
+from core.brain_interface import CancellationToken
 from core.config import config
 from core.persistence import storage
 from core.skill_manager import skill_manager
 from core.workflow import workflow_manager, Workflow, WorkflowStatus
 
+class RequestContext:
+    """State of one command while it is queued or running."""
+
+    def __init__(self, command, request_id=None, stream=False, session_key="default"):
+        self.command = command
+        self.request_id = request_id or str(uuid.uuid4())
+        self.stream = stream
+        self.session_key = session_key
+        self.status = "queued"  # queued | running | done | cancelled
+        self.state = "idle"     # thinking | speaking | idle, while running
+        self.cancel_token = CancellationToken()  # also handed to the Brain's stream
+        self._done_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self.cancel_token.cancelled
+
+    def cancel(self):
+        self.cancel_token.cancel()
+
+    def wait(self, timeout=None):
+        """Block until the request has finished or was dropped from the queue."""
+        return self._done_event.wait(timeout)
+
+
+class RequestScheduler:
+    """
+    Runs commands on a bounded pool of worker threads.
+
+    Requests of one session run one at a time in submission order; different
+    sessions run concurrently, taking turns when workers are scarce. Once
+    `max_queued` requests are waiting, submit() refuses new work.
+    """
+
+    STATE_PRIORITY = {"speaking": 3, "thinking": 2, "listening": 1}
+
+    def __init__(self, handler, max_workers=2, max_queued=16):
+        self.handler = handler
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._cond = threading.Condition()
+        self._pending = {}          # session_key -> deque of queued contexts
+        self._ready = deque()       # sessions with queued work and nothing running
+        self._busy_sessions = set()
+        self._requests = {}         # request_id -> context, queued or running
+        self._queued = 0
+        self._workers = []
+
+    def submit(self, command, request_id=None, stream=False, session_key="default"):
+        """Queue a command; raises CoreErrorException when the queue is full."""
+        context = RequestContext(command, request_id, stream, session_key)
+        with self._cond:
+            if self._queued >= self.max_queued:
+                raise CoreErrorException(
+                    "ASSISTANT_BUSY",
+                    "Too many commands are waiting; try again shortly",
+                    severity="warning",
+                    retry_allowed=True,
+                    context={"queued": self._queued},
+                )
+            self._requests[context.request_id] = context
+            self._pending.setdefault(session_key, deque()).append(context)
+            self._queued += 1
+            if session_key not in self._busy_sessions and session_key not in self._ready:
+                self._ready.append(session_key)
+            if len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._worker_loop, daemon=True)
+                self._workers.append(worker)
+                worker.start()
+            self._cond.notify()
+        return context
+
+    def track(self, context):
+        """Register a context that runs outside the pool so it can be cancelled by id."""
+        context.status = "running"
+        with self._cond:
+            self._requests[context.request_id] = context
+
+    def finish(self, context, status="done"):
+        with self._cond:
+            if self._requests.get(context.request_id) is context:
+                del self._requests[context.request_id]
+        context.status = status
+        context._done_event.set()
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                while not self._ready:
+                    self._cond.wait()
+                session_key = self._ready.popleft()
+                context = self._pending[session_key].popleft()
+                self._queued -= 1
+                self._busy_sessions.add(session_key)
+                context.status = "running"
+
+            try:
+                self.handler(context)
+            except Exception as e:
+                print(f"Error in request {context.request_id}: {e}")
+            finally:
+                self.finish(context, "cancelled" if context.cancelled else "done")
+                with self._cond:
+                    self._busy_sessions.discard(session_key)
+                    if self._pending.get(session_key):
+                        self._ready.append(session_key)
+                        self._cond.notify()
+                    else:
+                        self._pending.pop(session_key, None)
+
+    def cancel(self, request_id):
+        """
+        Cancel one request.
+
+        Returns:
+            The cancelled context (queued ones are dropped immediately;
+            running ones stop at their next check), or None if unknown.
+        """
+        with self._cond:
+            context = self._requests.get(request_id)
+            if context is None:
+                return None
+            context.cancel()
+            if context.status != "queued":
+                return context
+            queue = self._pending[context.session_key]
+            queue.remove(context)
+            self._queued -= 1
+            if not queue:
+                del self._pending[context.session_key]
+                if context.session_key in self._ready:
+                    self._ready.remove(context.session_key)
+        self.finish(context, "cancelled")
+        return context
+
+    def cancel_all(self, session_key=None):
+        """Cancel every request, or those of one session; returns the cancelled contexts."""
+        with self._cond:
+            ids = [rid for rid, ctx in self._requests.items() if session_key is None or ctx.session_key == session_key]
+        return [ctx for ctx in map(self.cancel, ids) if ctx]
+
+    def running(self):
+        with self._cond:
+            return [ctx for ctx in self._requests.values() if ctx.status == "running"]
+
+    def overall_state(self):
+        """Most visible state among running requests ("idle" if none)."""
+        states = [ctx.state for ctx in self.running()]
+        return max(states, key=lambda s: self.STATE_PRIORITY.get(s, 0), default="idle")
+
+    def stats(self):
+        with self._cond:
+            return {
+                "workers": self.max_workers,
+                "running": sum(1 for ctx in self._requests.values() if ctx.status == "running"),
+                "queued": self._queued,
+                "max_queued": self.max_queued,
+            }
+
+
 class Assistant:
     """
     Headless Assistant class that manages the main interaction loop.
@@ -19,9 +183,9 @@ class Assistant:
         self.listening_enabled = True
         self.callbacks = []
         self.state = "idle"
-        self._interrupt_event = threading.Event()
-        self._current_request_id = None
-        self._current_thread = None
+        self.scheduler = RequestScheduler(self._run_request)
+        self._speeches = []  # (RequestContext, SpeechStream) of replies that may still be playing
+        self._speech_lock = threading.Lock()
         self._current_workflow_id = None
 
         # Connect workflow manager callbacks
@@ -41,30 +205,76 @@ class Assistant:
             except Exception as e:
                 print(f"Error in assistant callback: {e}")
 
-    def update_state(self, new_state):
-        self.state = new_state
-        self._emit("assistant.state", {"state": new_state})
+    def update_state(self, new_state, context=None):
+        """
+        Set the assistant state, or the state of one request.
 
-    def process_command(self, command, request_id=None, stream=False):
-        """Processes a string command (text or recognized speech)."""
+        With several requests in flight the reported state is the most
+        visible one among them (speaking > thinking > idle).
+        """
+        if context is None:
+            self.state = new_state
+            self._emit("assistant.state", {"state": new_state})
+            return
+        context.state = new_state
+        overall = self.scheduler.overall_state()
+        if overall == "idle":
+            overall = new_state
+        if overall != self.state or new_state != "idle":
+            self.state = overall
+            self._emit("assistant.state", {"state": overall, "request_id": context.request_id})
+
+    def submit_command(self, command, request_id=None, stream=False, session_key="default"):
+        """
+        Queue a command on the request scheduler and return its RequestContext.
+
+        Raises:
+            CoreErrorException: ASSISTANT_BUSY when too many commands are waiting.
+        """
+        return self.scheduler.submit(command, request_id, stream, session_key)
+
+    def _run_request(self, context):
+        self.process_command(context.command, context.request_id, context.stream, context=context)
+
+    def _speak(self, context, text):
+        return self._track_speech(context, speak(text))
+
+    def _track_speech(self, context, speech):
+        """Remember which request a reply's speech belongs to, so interrupt() can stop it."""
+        with self._speech_lock:
+            self._speeches = [(ctx, s) for ctx, s in self._speeches if not s.done]
+            self._speeches.append((context, speech))
+        return speech
+
+    def process_command(self, command, request_id=None, stream=False, context=None):
+        """
+        Processes a string command (text or recognized speech).
+
+        Runs on the calling thread; commands from the scheduler pass their
+        RequestContext, direct callers get one so they can still be cancelled.
+        """
         from core.memory import memory
 
-        self._interrupt_event.clear()
-        self._current_request_id = request_id
+        owns_context = context is None
+        if owns_context:
+            context = RequestContext(command, request_id, stream)
+            self.scheduler.track(context)
+        request_id = context.request_id
 
         self._emit("assistant.command", {"command": command, "request_id": request_id})
         memory.add_user_message(command)
-        self.update_state("thinking")
+        self.update_state("thinking", context)
 
         try:
             if stream:
                 has_streamed = False
                 streaming_complete = False
                 full_text = ""
+                speech = None
 
                 def on_chunk(chunk):
-                    nonlocal has_streamed, streaming_complete, full_text
-                    if self._interrupt_event.is_set():
+                    nonlocal has_streamed, streaming_complete, full_text, speech
+                    if context.cancelled:
                         streaming_complete = True
                         return
                     full_text += chunk
@@ -74,26 +284,35 @@ class Assistant:
                     )
                     if not has_streamed:
                         has_streamed = True
-                        self.update_state("speaking")
+                        self.update_state("speaking", context)
+                        # Start talking on the first sentence, not the last chunk
+                        speech = self._track_speech(context, speak_stream())
+                    speech.feed(chunk)
 
-                text, data = brain.process_stream(command, on_chunk)
+                try:
+                    text, data = brain.process_stream(command, on_chunk, cancel_token=context.cancel_token)
 
-                if streaming_complete:
-                    self.update_state("idle")
-                    return
+                    if streaming_complete or context.cancelled:
+                        return
 
-                self._emit(
-                    "assistant.stream",
-                    {"done": True, "request_id": request_id}
-                )
+                    self._emit(
+                        "assistant.stream",
+                        {"done": True, "request_id": request_id}
+                    )
 
-                if full_text:
-                    memory.add_assistant_message(full_text)
-                    self._emit("assistant.response", {"text": full_text, "data": data or {}, "request_id": request_id})
-                    self.update_state("speaking")
-                    speak(full_text)
-                else:
-                    self.update_state("idle")
+                    if full_text:
+                        memory.add_assistant_message(full_text)
+                        self._emit("assistant.response", {"text": full_text, "data": data or {}, "request_id": request_id})
+                        self.update_state("speaking", context)
+                        if speech:
+                            speech.close()
+                            speech = None  # finishes playing in the background
+                        else:
+                            self._speak(context, full_text)
+                finally:
+                    # Cancelled or failed mid-reply: stop the sentences already queued for speech
+                    if speech is not None:
+                        speech.cancel()
             else:
                 response = brain.process(command)
 
@@ -108,9 +327,9 @@ class Assistant:
                     if text:
                         memory.add_assistant_message(text)
                     self._emit("assistant.response", {"text": text, "data": data, "request_id": request_id})
-                    if not self._interrupt_event.is_set():
-                        self.update_state("speaking")
-                        speak(text)
+                    if not context.cancelled:
+                        self.update_state("speaking", context)
+                        self._speak(context, text)
         except Exception as e:
             import traceback
             traceback.print_exc()
@@ -126,14 +345,36 @@ class Assistant:
                 },
             )
         finally:
-            self._current_request_id = None
-            if self.state != "idle":
-                self.update_state("idle")
+            if owns_context:
+                self.scheduler.finish(context, "cancelled" if context.cancelled else "done")
+            self.update_state("idle", context)
 
-    def interrupt(self):
-        """Interrupt the current command processing."""
-        self._interrupt_event.set()
-        speak_interrupt()
+    def interrupt(self, request_id=None, session_key=None):
+        """
+        Cancel commands: one request, every request of a session, or everything.
+
+        Queued commands are dropped; running ones stop at their next check.
+        Speech is cut off when it belongs to the targeted request or session,
+        even if that request has already finished generating.
+        """
+        if request_id:
+            cancelled = [ctx for ctx in [self.scheduler.cancel(request_id)] if ctx]
+        else:
+            cancelled = self.scheduler.cancel_all(session_key)
+        for ctx in cancelled:
+            if ctx.status == "cancelled":  # dropped before it started
+                self._emit("assistant.cancelled", {"request_id": ctx.request_id})
+
+        if not request_id and not session_key:
+            speak_interrupt()
+        with self._speech_lock:
+            speeches = [
+                s for ctx, s in self._speeches
+                if (ctx.request_id == request_id if request_id else ctx.session_key == session_key)
+            ]
+        for speech in speeches:
+            speech.cancel()
+        return [ctx.request_id for ctx in cancelled]
 
     def voice_loop(self):
         """Standard background loop for voice interaction."""
@@ -151,13 +392,26 @@ class Assistant:
             else:
                 time.sleep(0.5)
 
-    def capture_voice_command(self, request_id=None):
+    def _on_partial_transcript(self, text, request_id=None):
+        """Forward a live transcript and any local intent it already matches."""
+        self._emit(
+            "assistant.transcript",
+            {
+                "text": text,
+                "final": False,
+                "intent": skill_manager.get_intent_match(text),
+                "request_id": request_id,
+            },
+        )
+
+    def capture_voice_command(self, request_id=None, session_key="voice"):
         """Capture a single voice command on demand."""
         try:
             self.update_state("listening")
-            command = listen()
+            command = listen(on_partial=lambda text: self._on_partial_transcript(text, request_id))
+            self._emit("assistant.transcript", {"text": command, "final": True, "request_id": request_id})
             if command:
-                self.process_command(command, request_id, True)
+                self.submit_command(command, request_id, True, session_key=session_key)
             else:
                 self.update_state("idle")
         except Exception as e:
@@ -179,6 +433,14 @@ class Assistant:
         thread.start()
         return thread
 
+    def prewarm_speech(self):
+        """Fill the speech cache with fixed replies so they play without synthesis."""
+        from core.brains.rules_brain import RulesBrain
+
+        phrases = list(RulesBrain.FALLBACK_RESPONSES.values())
+        phrases.append(skill_manager.NO_PERMISSIONS_REPLY)
+        return prewarm(phrases)
+
     def check_startup_permissions(self):
         """Headless version of permission checks."""
         allowed = storage.get_allowed_permissions()
@@ -230,11 +492,14 @@ class Assistant:
             })
             return
 
+        context = RequestContext(f"workflow:{workflow_id}", request_id)
+        self.scheduler.track(context)
+
         try:
-            self.update_state("thinking")
+            self.update_state("thinking", context)
 
             while True:
-                if self._interrupt_event.is_set():
+                if context.cancelled:
                     workflow_manager.cancel_workflow(workflow_id)
                     break
 
@@ -245,7 +510,7 @@ class Assistant:
 
                 # Start step execution
                 workflow_manager.start_step(workflow_id, next_step.id)
-                self.update_state("thinking")
+                self.update_state("thinking", context)
 
                 # Execute the step
                 try:
@@ -276,9 +541,9 @@ class Assistant:
                     )
 
                     # Speak result if not interrupted
-                    if not self._interrupt_event.is_set():
-                        self.update_state("speaking")
-                        speak(f"Step complete: {next_step.description}")
+                    if not context.cancelled:
+                        self.update_state("speaking", context)
+                        self._speak(context, f"Step complete: {next_step.description}")
 
                 except Exception as e:
                     import traceback
@@ -302,7 +567,8 @@ class Assistant:
 
         finally:
             self._current_workflow_id = None
-            self.update_state("idle")
+            self.scheduler.finish(context, "cancelled" if context.cancelled else "done")
+            self.update_state("idle", context)
 
     def plan_workflow(self, command: str, request_id: str = None) -> Workflow:
         """
@@ -0,0 +1,155 @@
+"""
+Audio Output - Persistent speaker stream for speech playback.
+
+Provides:
+- One sounddevice output stream kept open for the whole session
+- Playback from in-memory int16 buffers (PCM, WAV or decoded MP3)
+- Completion signalled by an event from the audio callback
+- stop() that silences the device within one audio block
+"""
+
+import atexit
+import os
+import threading
+import wave
+from math import gcd
+
+import numpy as np
+
+from core.piper_worker import PCMAudio
+
+OUTPUT_RATE = 24000  # gTTS/OpenAI MP3s are 24 kHz; Piper voices are resampled
+BLOCK_MS = 10
+POLL_INTERVAL = 0.02  # how often should_stop() is checked while waiting
+
+_decoder_lock = threading.Lock()
+
+
+def _decode_mp3(path, sample_rate):
+    """Decode an MP3 to int16 mono with SDL's decoder (no audio device used)."""
+    with _decoder_lock:
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+        from pygame import mixer, sndarray
+
+        if mixer.get_init() != (sample_rate, -16, 1):
+            mixer.quit()
+            mixer.init(frequency=sample_rate, size=-16, channels=1)
+        return sndarray.array(mixer.Sound(path)).astype(np.int16).reshape(-1)
+
+
+def _resample(samples, from_rate, to_rate):
+    if from_rate == to_rate or not len(samples):
+        return samples
+    from scipy.signal import resample_poly
+
+    common = gcd(from_rate, to_rate)
+    resampled = resample_poly(samples.astype(np.float32), to_rate // common, from_rate // common)
+    return np.clip(resampled, -32768, 32767).astype(np.int16)
+
+
+def load_samples(audio, sample_rate=OUTPUT_RATE):
+    """
+    Turn a file path or PCMAudio into int16 mono samples at sample_rate.
+    """
+    if isinstance(audio, PCMAudio):
+        samples, rate = np.frombuffer(audio.data, dtype=np.int16), audio.sample_rate
+    elif str(audio).lower().endswith(".wav"):
+        with wave.open(str(audio), "rb") as wav_file:
+            rate, channels = wav_file.getframerate(), wav_file.getnchannels()
+            samples = np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype=np.int16)
+        if channels > 1:
+            samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    else:
+        return _decode_mp3(str(audio), sample_rate)
+    return _resample(samples, rate, sample_rate)
+
+
+class _Clip:
+    def __init__(self, samples):
+        self.samples = samples
+        self.position = 0
+        self.done = threading.Event()
+        self.completed = False
+
+
+class AudioPlayer:
+    """
+    Plays one clip at a time on a persistent output stream.
+
+    The stream is opened on first use and stays open, so there is no
+    device setup per utterance. While idle the callback writes silence.
+    """
+
+    def __init__(self, sample_rate=OUTPUT_RATE, block_ms=BLOCK_MS, stream_factory=None):
+        self.sample_rate = sample_rate
+        self.blocksize = sample_rate * block_ms // 1000
+        self._stream_factory = stream_factory or self._open_device
+        self._stream = None
+        self._clip = None
+        self._lock = threading.Lock()
+
+    def _open_device(self, callback):
+        # Imported here so the module loads on machines without PortAudio
+        import sounddevice as sd
+
+        return sd.OutputStream(samplerate=self.sample_rate, channels=1, dtype='int16',
+                               blocksize=self.blocksize, latency='low', callback=callback)
+
+    def _ensure_stream(self):
+        with self._lock:
+            if self._stream is None:
+                self._stream = self._stream_factory(self._callback)
+                self._stream.start()
+
+    def _callback(self, outdata, frames, time_info, status):
+        with self._lock:
+            clip = self._clip
+            if clip is None:
+                outdata.fill(0)
+                return
+            chunk = clip.samples[clip.position:clip.position + frames]
+            outdata[:len(chunk), 0] = chunk
+            outdata[len(chunk):] = 0
+            clip.position += len(chunk)
+            if clip.position >= len(clip.samples):
+                clip.completed = True
+                clip.done.set()
+                self._clip = None
+
+    def play(self, audio, should_stop=None):
+        """
+        Play audio and block until it finishes.
+
+        Returns False if stop() or should_stop() cut playback short.
+        """
+        samples = load_samples(audio, self.sample_rate)
+        self._ensure_stream()
+        clip = _Clip(samples)
+        with self._lock:
+            if self._clip:
+                self._clip.done.set()
+            self._clip = clip
+        while not clip.done.wait(POLL_INTERVAL if should_stop else None):
+            if should_stop():
+                self.stop()
+                break
+        return clip.completed
+
+    def stop(self):
+        """Silence the current clip; the device goes quiet within one block."""
+        with self._lock:
+            clip, self._clip = self._clip, None
+        if clip:
+            clip.done.set()
+
+    def close(self):
+        self.stop()
+        with self._lock:
+            stream, self._stream = self._stream, None
+        if stream:
+            stream.stop()
+            stream.close()
+
+
+player = AudioPlayer()
+atexit.register(player.close)
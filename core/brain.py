@@ -5,8 +5,11 @@ This module maintains backward compatibility with the existing AVA codebase
 while delegating to the new Brain Manager architecture.
 """
 
+import asyncio
+import time
+
 from core.brain_manager import brain_manager
-from core.brain_interface import BrainConfig, BrainCapability
+from core.brain_interface import BrainConfig, BrainCapability, BrainResponse
 from core.brains.rules_brain import RulesBrain
 from core.brains.ollama_brain import OllamaBrain
 from core.brains.google_brain import GoogleBrain
@@ -14,6 +17,7 @@ from core.brains.openai_brain import OpenAIBrain
 from core.brains.claude_brain import ClaudeBrain
 from core.brains.lmstudio_brain import LMStudioBrain
 from core.context_filter import ContextFilter
+from core.response_cache import ResponseCache
 from core.config import config
 from core.persistence import storage
 from core.skill_manager import skill_manager
@@ -31,6 +35,12 @@ class Brain:
     def __init__(self):
         self.name = config.NAME
         self.manager = brain_manager
+        self.response_cache = ResponseCache(
+            storage,
+            max_entries=config.RESPONSE_CACHE_SIZE,
+            ttl_seconds=config.RESPONSE_CACHE_TTL,
+            enabled=config.RESPONSE_CACHE
+        )
         
         # Initialize Brains
         self._initialize_brains()
@@ -219,6 +229,8 @@ class Brain:
     def reload_config(self):
         """Reload configuration and re-initialize Brains."""
         print("🧠 Brain: Reloading configuration...")
+        self.response_cache.enabled = config.RESPONSE_CACHE
+        self.response_cache.invalidate()
         # Re-initialize the entire Brain system
         self._initialize_brains()
         self._load_active_brain()
@@ -247,14 +259,19 @@ class Brain:
         
         return response
 
-    def process_stream(self, command, on_chunk, chunk_size=32):
+    def process_stream(self, command, on_chunk, chunk_size=32, cancel_token=None):
         """
         Process a command and emit incremental chunks via callback.
 
+        Local intents and the AI permission check are answered first, with
+        no network call; only unmatched commands reach a Brain.
+
         Args:
             command: User input string.
             on_chunk: Callable that receives chunk strings.
             chunk_size: Character size per chunk (fallback for non-streaming brains).
+            cancel_token: CancellationToken; once cancelled, no more chunks are
+                emitted and the provider's stream is closed.
 
         Returns:
             Tuple of (full_text, data) or (None, None) on failure.
@@ -264,6 +281,10 @@ class Brain:
 
         storage.log_interaction("user", command)
 
+        handled, response = self._get_local_response(command)
+        if handled:
+            return self._finish_stream(response, on_chunk, chunk_size)
+
         context = self._build_context(command)
         brain = self.manager.select_brain(context)
 
@@ -273,68 +294,252 @@ class Brain:
         full_text = ""
         tool_call = None
         used_native_streaming = False
+        streams = brain.supports_capability(BrainCapability.STREAMING)
+        start = time.perf_counter()
+        first_chunk_ms = None
+        recorded = False  # outcome already reported to the circuit breaker
 
         try:
-            if brain.supports_capability(BrainCapability.STREAMING):
+            if streams:
                 filtered_context = ContextFilter.filter_for_privacy_level(
                     context,
                     brain.get_privacy_level(),
                     brain.config.context_filter_level
                 )
 
-                stream_result = brain.execute_stream(command, filtered_context, {})
+                cached = self.response_cache.get(brain, command, filtered_context, mode="stream")
+                if cached is not None:
+                    self.manager.release_request(brain.id)
+                    return self._finish_stream(self._resolve_response(cached), on_chunk, chunk_size)
+
+                stream_result = brain.execute_stream(command, filtered_context, {}, cancel_token=cancel_token)
                 if stream_result is not None:
-                    for chunk_data in stream_result:
+                    try:
+                        for chunk_data in stream_result:
+                            if self._cancelled(cancel_token):
+                                break
+                            if "error" in chunk_data:
+                                self.manager.record_result(brain.id, False, error=chunk_data["error"])
+                                recorded = True
+                                break
+                            if chunk_data.get("done"):
+                                full_text = chunk_data.get("full_content", full_text)
+                                self._log_stream_usage(brain, chunk_data)
+                                self._cache_stream(brain, command, filtered_context, chunk_data)
+                                self._record_stream(brain, start, first_chunk_ms)
+                                recorded = True
+                                break
+                            chunk = chunk_data.get("chunk", "")
+                            if chunk:
+                                if first_chunk_ms is None:
+                                    first_chunk_ms = (time.perf_counter() - start) * 1000
+                                full_text += chunk
+                                on_chunk(chunk)
+                                used_native_streaming = True
+                    finally:
+                        stream_result.close()
+        except Exception as e:
+            print(f"⚠️ Streaming failed for {brain.name}, falling back: {e}")
+            self.manager.record_result(brain.id, False, error=str(e))
+            recorded = True
+
+        if self._cancelled(cancel_token):
+            print(f"⏹️ Stream from {brain.name} cancelled")
+            if not recorded:
+                self._record_cancelled_stream(brain, start, first_chunk_ms)
+        elif not used_native_streaming:
+            # A Brain that cannot stream keeps its selection; a failed stream selects again
+            response = self._get_llm_response(command, None if streams else brain)
+            full_text, tool_call = self._emit_response(response, on_chunk, chunk_size, full_text)
+
+        storage.log_interaction("avva", full_text, tool_call)
+        return full_text, {"exec_str": tool_call} if tool_call else None
+
+    async def process_stream_async(self, command, on_chunk, chunk_size=32, cancel_token=None):
+        """
+        Async variant of process_stream() for callers on an event loop.
+
+        Native streams run on the loop via execute_stream_async(), so many
+        can be in flight without a thread each. Local skills and the
+        non-streaming fallback still run in a worker thread. The Assistant
+        does not use this yet: its commands run on request scheduler
+        workers through process_stream().
+
+        Returns:
+            Tuple of (full_text, data) or (None, None) on failure.
+        """
+        if not command:
+            return None, None
+
+        storage.log_interaction("user", command)
+
+        handled, response = await asyncio.to_thread(self._get_local_response, command)
+        if handled:
+            return self._finish_stream(response, on_chunk, chunk_size)
+
+        context = self._build_context(command)
+        brain = self.manager.select_brain(context)
+
+        if not brain:
+            return None, None
+
+        full_text = ""
+        tool_call = None
+        used_native_streaming = False
+        streams = brain.supports_capability(BrainCapability.STREAMING)
+        start = time.perf_counter()
+        first_chunk_ms = None
+        recorded = False  # outcome already reported to the circuit breaker
+
+        try:
+            if streams:
+                filtered_context = ContextFilter.filter_for_privacy_level(
+                    context,
+                    brain.get_privacy_level(),
+                    brain.config.context_filter_level
+                )
+
+                cached = self.response_cache.get(brain, command, filtered_context, mode="stream")
+                if cached is not None:
+                    self.manager.release_request(brain.id)
+                    response = await asyncio.to_thread(self._resolve_response, cached)
+                    return self._finish_stream(response, on_chunk, chunk_size)
+
+                stream = brain.execute_stream_async(command, filtered_context, {}, cancel_token=cancel_token)
+                try:
+                    async for chunk_data in stream:
+                        if self._cancelled(cancel_token):
+                            break
                         if "error" in chunk_data:
+                            self.manager.record_result(brain.id, False, error=chunk_data["error"])
+                            recorded = True
                             break
                         if chunk_data.get("done"):
                             full_text = chunk_data.get("full_content", full_text)
+                            self._log_stream_usage(brain, chunk_data)
+                            self._cache_stream(brain, command, filtered_context, chunk_data)
+                            self._record_stream(brain, start, first_chunk_ms)
+                            recorded = True
                             break
                         chunk = chunk_data.get("chunk", "")
                         if chunk:
+                            if first_chunk_ms is None:
+                                first_chunk_ms = (time.perf_counter() - start) * 1000
                             full_text += chunk
                             on_chunk(chunk)
                             used_native_streaming = True
+                finally:
+                    await stream.aclose()
         except Exception as e:
             print(f"⚠️ Streaming failed for {brain.name}, falling back: {e}")
+            self.manager.record_result(brain.id, False, error=str(e))
+            recorded = True
 
-        if not used_native_streaming:
-            response = self._get_response(command)
-
-            if response:
-                if isinstance(response, dict):
-                    text = response.get("text") or ""
-                    data = response
-                else:
-                    text = str(response)
-                    data = None
+        if self._cancelled(cancel_token):
+            print(f"⏹️ Stream from {brain.name} cancelled")
+            if not recorded:
+                self._record_cancelled_stream(brain, start, first_chunk_ms)
+        elif not used_native_streaming:
+            response = await asyncio.to_thread(self._get_llm_response, command, None if streams else brain)
+            full_text, tool_call = self._emit_response(response, on_chunk, chunk_size, full_text)
 
-                for chunk in self._chunk_text(text, chunk_size):
-                    on_chunk(chunk)
-                full_text = text
-                tool_call = data.get("exec_str") if isinstance(data, dict) else None
+        storage.log_interaction("avva", full_text, tool_call)
+        return full_text, {"exec_str": tool_call} if tool_call else None
 
+    def _finish_stream(self, response, on_chunk, chunk_size):
+        """Emit and log a response that was produced without a Brain stream."""
+        full_text, tool_call = self._emit_response(response, on_chunk, chunk_size, "")
         storage.log_interaction("avva", full_text, tool_call)
         return full_text, {"exec_str": tool_call} if tool_call else None
+
+    def _cache_stream(self, brain, command, filtered_context, done_frame):
+        """Cache a completed stream's text so a repeat is replayed without the Brain."""
+        full_content = done_frame.get("full_content")
+        if full_content:
+            self.response_cache.put(brain, command, filtered_context, BrainResponse(
+                success=True,
+                content=full_content,
+                natural_response=full_content,
+                tokens_used=done_frame.get("tokens_used"),
+                cost_usd=done_frame.get("cost_usd")
+            ), mode="stream")
+
+    def _record_stream(self, brain, start, first_chunk_ms):
+        """Report a completed stream to the circuit breaker, timed to its first chunk."""
+        latency_ms = first_chunk_ms if first_chunk_ms is not None else (time.perf_counter() - start) * 1000
+        self.manager.record_result(brain.id, True, latency_ms)
+
+    def _record_cancelled_stream(self, brain, start, first_chunk_ms):
+        """
+        Settle the circuit breaker for a stream cut short by cancel(): chunks
+        already arrived count as a success, otherwise the request (and any
+        half-open trial it held) is released without a verdict.
+        """
+        if first_chunk_ms is not None:
+            self._record_stream(brain, start, first_chunk_ms)
+        else:
+            self.manager.release_request(brain.id)
+
+    @staticmethod
+    def _cancelled(cancel_token):
+        return cancel_token is not None and cancel_token.cancelled
+
+    @staticmethod
+    def _log_stream_usage(brain, done_frame):
+        """Log usage reported in a stream's done frame, as _try_brain_execution does."""
+        tokens_used, cost_usd = done_frame.get("tokens_used"), done_frame.get("cost_usd")
+        if tokens_used and cost_usd:
+            storage.log_brain_usage(brain.id, tokens_used, cost_usd)
+
+    def _emit_response(self, response, on_chunk, chunk_size, full_text):
+        """Send a non-streamed response through on_chunk; returns (full_text, tool_call)."""
+        if not response:
+            return full_text, None
+        if isinstance(response, dict):
+            text = response.get("text") or ""
+            data = response
+        else:
+            text = str(response)
+            data = None
+
+        for chunk in self._chunk_text(text, chunk_size):
+            on_chunk(chunk)
+        return text, data.get("exec_str") if isinstance(data, dict) else None
     
     def _get_response(self, command):
         """Internal helper to get response from tiers."""
+        handled, response = self._get_local_response(command)
+        if handled:
+            return response
+        return self._get_llm_response(command)
+
+    def _get_local_response(self, command):
+        """
+        Tiers that need no network: local intents and the AI permission gate.
+
+        Returns:
+            (True, response) if the command was answered locally, otherwise
+            (False, None) and the command should go to a Brain.
+        """
         # --- TIER 1/2: Local Intent Matching (Static + Parametric) ---
         exec_str = skill_manager.get_intent_match(command)
         if exec_str:
             print(f"System: Intent Match found for '{exec_str}'")
-            return skill_manager.execute(exec_str)
+            return True, skill_manager.execute(exec_str)
         
-        # --- TIER 3: LLM Brain Reasoning ---
-        # Check for AI permission
+        # Check for AI permission before any Brain is asked
         allowed = storage.get_allowed_permissions()
         if "ai.generate" not in allowed:
             print("🔒 LLM skipped: 'ai.generate' permission not granted.")
-            return "I can't process that because AI access is currently disabled in Security Settings."
+            return True, "I can't process that because AI access is currently disabled in Security Settings."
         
-        # Select appropriate Brain
+        return False, None
+
+    def _get_llm_response(self, command, brain=None):
+        """TIER 3: LLM Brain reasoning, with the fallback chain."""
+        # Select appropriate Brain, unless the caller already has
         context = self._build_context(command)
-        brain = self.manager.select_brain(context)
+        brain = brain or self.manager.select_brain(context)
         
         if not brain:
             print("⚠️ No Brain available, cannot process command.")
@@ -342,15 +547,24 @@ class Brain:
         
         print(f"DEBUG: Active Brain Selected: {brain.name} ({brain.provider})")
         
-        # Try to execute with selected Brain
-        brain_response = self._try_brain_execution(brain, command, context)
+        # In hedged mode the fallback Brain races a slow primary instead of waiting for it to fail
+        chain = self.manager.get_hedge_chain(brain) if config.BRAIN_HEDGING else [brain]
+        if len(chain) > 1:
+            _, brain_response = self.manager.hedger.execute(
+                chain,
+                lambda candidate: self._try_brain_execution_async(candidate, command, context),
+                admit=self.manager._is_usable
+            )
+        else:
+            brain_response = self._try_brain_execution(brain, command, context)
         
         # If brain execution failed, try fallback chain
         if not brain_response or not brain_response.success:
             print(f"⚠️ Primary Brain failed: {brain_response.error if brain_response else 'No response'}")
+            self.manager.health_monitor.refresh(brain.id)
             
-            # Try fallback brain
-            fallback_brain = self.manager._try_fallback(f"Primary Brain '{brain.name}' failed")
+            # Try fallback brain, unless it already ran in the hedged race
+            fallback_brain = None if len(chain) > 1 else self.manager._try_fallback(f"Primary Brain '{brain.name}' failed")
             if fallback_brain and fallback_brain.id != brain.id:
                 print(f"🔄 Attempting fallback to: {fallback_brain.name}")
                 brain_response = self._try_brain_execution(fallback_brain, command, context)
@@ -368,6 +582,10 @@ class Brain:
             print(f"❌ All brains failed: {error_msg}")
             return f"I'm having trouble processing that command. {error_msg}"
         
+        return self._resolve_response(brain_response)
+
+    def _resolve_response(self, brain_response):
+        """Turn a successful BrainResponse into a reply, running its intent if confident."""
         # If Brain extracted an intent, execute it
         if brain_response.intent and brain_response.confidence > 0.7:
             # Construct execution string
@@ -399,25 +617,63 @@ class Brain:
                 brain.get_privacy_level(),
                 brain.config.context_filter_level
             )
+
+            cached = self.response_cache.get(brain, command, filtered_context)
+            if cached is not None:
+                self.manager.release_request(brain.id)
+                return cached
             
             # Execute with Brain
             print(f"DEBUG: Executing with {brain.name}...")
+            start = time.perf_counter()
             brain_response = brain.execute(command, filtered_context, {})
-            print(f"DEBUG: Brain Response Success: {brain_response.success}")
-            
-            # Log usage if applicable
-            if brain_response.tokens_used and brain_response.cost_usd:
-                storage.log_brain_usage(brain.id, brain_response.tokens_used, brain_response.cost_usd)
-            
+            self._record_execution(brain, command, filtered_context, brain_response, start)
             return brain_response
         except Exception as e:
-            print(f"❌ Exception during brain execution: {e}")
-            from core.brain_interface import BrainResponse
-            return BrainResponse(
-                success=False,
-                content="",
-                error=str(e)
+            return self._execution_error(brain, e)
+
+    async def _try_brain_execution_async(self, brain, command, context):
+        """_try_brain_execution() over the Brain's execute_async(), so a hedged loser can be cancelled."""
+        try:
+            filtered_context = ContextFilter.filter_for_privacy_level(
+                context,
+                brain.get_privacy_level(),
+                brain.config.context_filter_level
             )
+
+            cached = self.response_cache.get(brain, command, filtered_context)
+            if cached is not None:
+                self.manager.release_request(brain.id)
+                return cached
+            
+            start = time.perf_counter()
+            brain_response = await brain.execute_async(command, filtered_context, {})
+            self._record_execution(brain, command, filtered_context, brain_response, start)
+            return brain_response
+        except Exception as e:
+            return self._execution_error(brain, e)
+
+    def _record_execution(self, brain, command, filtered_context, brain_response, start):
+        """Cache the response, and record latency, outcome and usage of a finished execution."""
+        print(f"DEBUG: Brain Response Success: {brain_response.success}")
+        self.response_cache.put(brain, command, filtered_context, brain_response)
+        latency_ms = (time.perf_counter() - start) * 1000
+        if brain_response.success:
+            self.manager.hedger.record_latency(brain.id, latency_ms)
+        self.manager.record_result(brain.id, brain_response.success, latency_ms, brain_response.error)
+        
+        # Log usage if applicable
+        if brain_response.tokens_used and brain_response.cost_usd:
+            storage.log_brain_usage(brain.id, brain_response.tokens_used, brain_response.cost_usd)
+
+    def _execution_error(self, brain, e):
+        print(f"❌ Exception during brain execution: {e}")
+        self.manager.record_result(brain.id, False, error=str(e))
+        return BrainResponse(
+            success=False,
+            content="",
+            error=str(e)
+        )
     
     def _build_context(self, command):
         """Build context dictionary for Brain execution."""
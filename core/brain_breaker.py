@@ -0,0 +1,177 @@
+"""
+Brain Circuit Breaker - Stop sending requests to a Brain that keeps failing.
+
+Provides:
+- A per-Brain breaker over a sliding window of recent request outcomes
+- Tripping on error rate or on the share of slow requests
+- Exponential cool-down while open
+- Half-open trial requests that close the breaker again on success
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+CLOSED = "closed"        # requests flow normally
+OPEN = "open"            # requests are refused until the cool-down ends
+HALF_OPEN = "half_open"  # one trial request decides whether to close again
+
+WINDOW = 10        # outcomes remembered per Brain
+MIN_REQUESTS = 3   # outcomes needed before rates can trip the breaker
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one Brain.
+
+    Trips open when, over the last `window` requests (at least
+    `min_requests`), the share of failures reaches `error_rate` or the
+    share of requests slower than `slow_ms` reaches `slow_rate`. While open,
+    allow_request() refuses until the cool-down ends; the breaker then goes
+    half-open and lets one trial request through. A successful trial closes
+    it; a failed one re-opens it with the cool-down doubled, up to
+    `max_cooldown`.
+    """
+
+    def __init__(self, error_rate: float = 0.5, slow_ms: float = 30000.0, slow_rate: float = 0.5,
+                 cooldown: float = 5.0, max_cooldown: float = 300.0,
+                 window: int = WINDOW, min_requests: int = MIN_REQUESTS, clock=time.monotonic):
+        self.error_rate = error_rate
+        self.slow_ms = slow_ms
+        self.slow_rate = slow_rate
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.min_requests = min_requests
+        self._clock = clock
+        self._outcomes = deque(maxlen=window)  # (failed, slow)
+        self._state = CLOSED
+        self._cooldown = cooldown
+        self._opened_at = None
+        self._trial_started = None
+        self._trips = 0
+        self._reason = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._advance()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Whether a request may go to the Brain now.
+
+        In the half-open state this claims the trial slot, so callers should
+        only ask when they are about to send a request. A trial that never
+        reports back frees the slot after one cool-down.
+        """
+        with self._lock:
+            self._advance()
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                return False
+            now = self._clock()
+            if self._trial_started is None or now - self._trial_started >= self._cooldown:
+                self._trial_started = now
+                return True
+            return False
+
+    def can_request(self) -> bool:
+        """Whether allow_request() would let a request through, without claiming the trial slot."""
+        with self._lock:
+            self._advance()
+            if self._state == HALF_OPEN:
+                return self._trial_started is None or self._clock() - self._trial_started >= self._cooldown
+            return self._state == CLOSED
+
+    def release(self):
+        """Give back a claimed trial slot whose request ended with no verdict (e.g. cancelled)."""
+        with self._lock:
+            self._advance()
+            if self._state == HALF_OPEN:
+                self._trial_started = None
+
+    def record_success(self, latency_ms: Optional[float] = None):
+        slow = latency_ms is not None and latency_ms >= self.slow_ms
+        with self._lock:
+            self._advance()
+            if self._state == HALF_OPEN:
+                if slow:
+                    self._trip(f"trial request took {latency_ms:.0f} ms")
+                else:
+                    self._close()
+                return
+            self._outcomes.append((False, slow))
+            self._check()
+
+    def record_failure(self, error: Optional[str] = None):
+        with self._lock:
+            self._advance()
+            if self._state == HALF_OPEN:
+                self._trip(f"trial request failed: {error}" if error else "trial request failed")
+                return
+            self._outcomes.append((True, False))
+            self._check(error)
+
+    def reset(self):
+        with self._lock:
+            self._close()
+
+    def _advance(self):
+        """Move from open to half-open once the cool-down has passed."""
+        if self._state == OPEN and self._clock() - self._opened_at >= self._cooldown:
+            self._state = HALF_OPEN
+            self._trial_started = None
+
+    def _check(self, error: Optional[str] = None):
+        if self._state != CLOSED or len(self._outcomes) < self.min_requests:
+            return
+        total = len(self._outcomes)
+        failures = sum(1 for failed, _ in self._outcomes if failed)
+        slow = sum(1 for _, is_slow in self._outcomes if is_slow)
+        if failures / total >= self.error_rate:
+            reason = f"{failures}/{total} recent requests failed"
+            self._trip(f"{reason}: {error}" if error else reason)
+        elif slow / total >= self.slow_rate:
+            self._trip(f"{slow}/{total} recent requests took over {self.slow_ms:.0f} ms")
+
+    def _trip(self, reason: str):
+        # Re-opening from half-open doubles the cool-down
+        if self._state == HALF_OPEN:
+            self._cooldown = min(self._cooldown * 2, self.max_cooldown)
+        else:
+            self._cooldown = self.base_cooldown
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._trial_started = None
+        self._trips += 1
+        self._reason = reason
+
+    def _close(self):
+        self._state = CLOSED
+        self._cooldown = self.base_cooldown
+        self._opened_at = None
+        self._trial_started = None
+        self._reason = None
+        self._outcomes.clear()
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            self._advance()
+            total = len(self._outcomes)
+            failures = sum(1 for failed, _ in self._outcomes if failed)
+            retry_in = None
+            if self._state == OPEN:
+                retry_in = round(max(0.0, self._cooldown - (self._clock() - self._opened_at)), 1)
+            return {
+                "state": self._state,
+                "reason": self._reason,
+                "error_rate": round(failures / total, 2) if total else 0.0,
+                "recent_requests": total,
+                "trips": self._trips,
+                "cooldown_s": self._cooldown,
+                "retry_in_s": retry_in,
+            }
@@ -0,0 +1,255 @@
+"""
+Brain Health Monitor - Background health probing for registered Brains.
+
+Provides:
+- Periodic ping() of every registered Brain off the request path
+- Full health_check() only when a refresh is explicitly requested
+- Jittered schedules so probes of different Brains do not line up
+- A latest-result snapshot that Brain selection reads without blocking
+- Per-Brain latency histograms
+- Results persisted through storage.update_brain_health
+"""
+
+import math
+import random
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from core.brain_interface import BrainHealth, BrainStatus
+
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+MIN_WAIT = 0.05  # seconds; floor for the scheduler's sleep
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of latencies in milliseconds."""
+
+    def __init__(self, bounds=LATENCY_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last bucket is above the top bound
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms: float):
+        with self._lock:
+            self.counts[bisect_left(self.bounds, latency_ms)] += 1
+            self.count += 1
+            self.total_ms += latency_ms
+            self.max_ms = max(self.max_ms, latency_ms)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Upper bound of the bucket holding the q-th percentile (0-100).
+
+        Returns None when nothing has been recorded; values above the top
+        bucket report the largest latency seen.
+        """
+        with self._lock:
+            if not self.count:
+                return None
+            rank = max(1, math.ceil(q / 100 * self.count))
+            seen = 0
+            for i, n in enumerate(self.counts):
+                seen += n
+                if seen >= rank:
+                    return float(self.bounds[i]) if i < len(self.bounds) else self.max_ms
+            return self.max_ms
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            labels = [f"<={b}" for b in self.bounds] + [f">{self.bounds[-1]}"]
+            data = {
+                "count": self.count,
+                "mean_ms": round(self.total_ms / self.count, 1) if self.count else None,
+                "max_ms": round(self.max_ms, 1),
+                "buckets": dict(zip(labels, self.counts)),
+            }
+        data["p50_ms"] = self.percentile(50)
+        data["p95_ms"] = self.percentile(95)
+        return data
+
+
+class HealthMonitor:
+    """
+    Probes every Brain in a BrainManager's registry on a background thread.
+
+    Each Brain is checked about every `interval` seconds, randomized by
+    +/- `jitter` (a fraction of the interval). Scheduled probes use the
+    Brain's cheap ping(), as do refreshes for new or reconfigured Brains;
+    the full health_check(), which may run a paid completion, only runs
+    for refresh(full=True). Probes run on a small
+    worker pool so one slow provider does not hold up the others. Readers
+    only ever see the last completed result.
+    """
+
+    def __init__(self, manager, interval: float = 60.0, jitter: float = 0.2, workers: int = 4, store=None):
+        self.manager = manager
+        self.interval = interval
+        self.jitter = jitter
+        self.workers = workers
+        self.store = store
+        self._snapshot: Dict[str, BrainHealth] = {}
+        self._latency: Dict[str, LatencyHistogram] = {}
+        self._counts: Dict[str, list] = {}  # brain_id -> [probes, failures]
+        self._due: Dict[str, float] = {}  # brain_id -> monotonic time of next probe
+        self._probing = set()
+        self._stale = set()  # refreshed while a probe was in flight
+        self._full = set()  # next probe runs the full health_check()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+        self._pool = None
+
+    def next_delay(self) -> float:
+        """Seconds until a Brain's next probe."""
+        return self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self):
+        """Start probing; does nothing if already running."""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="brain-health")
+            self._thread = threading.Thread(target=self._run, name="brain-health", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            self._running = False
+            thread, pool = self._thread, self._pool
+        self._wake.set()
+        if thread:
+            thread.join(timeout=1)
+        if pool:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def refresh(self, brain_id: Optional[str] = None, full: bool = False):
+        """
+        Probe one Brain (or all of them) as soon as possible.
+
+        With `full` the probe runs health_check() rather than ping().
+        """
+        with self._lock:
+            now = time.monotonic()
+            for target in [brain_id] if brain_id else list(self.manager.registry):
+                self._due[target] = now
+                if full:
+                    self._full.add(target)
+                if target in self._probing:
+                    self._stale.add(target)
+        self._wake.set()
+
+    def forget(self, brain_id: str):
+        """Drop everything known about an unregistered Brain."""
+        with self._lock:
+            for table in (self._snapshot, self._latency, self._counts, self._due):
+                table.pop(brain_id, None)
+            self._stale.discard(brain_id)
+            self._full.discard(brain_id)
+
+    def get_health(self, brain_id: str) -> Optional[BrainHealth]:
+        """Latest probe result, or None if the Brain has not been probed yet."""
+        with self._lock:
+            return self._snapshot.get(brain_id)
+
+    def is_available(self, brain) -> bool:
+        """
+        Whether the latest snapshot says the Brain is available.
+
+        Brains not probed yet count as available, so selection never waits;
+        a failed request is still caught by the fallback chain.
+        """
+        health = self.get_health(brain.id)
+        return health is None or health.status == BrainStatus.AVAILABLE
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            with self._lock:
+                if not self._running:
+                    return
+                now = time.monotonic()
+                for brain_id in list(self.manager.registry):
+                    # First probe soon after start, spread over a fraction of the interval
+                    self._due.setdefault(brain_id, now + random.uniform(0, self.jitter * self.interval))
+                due = [b for b, at in self._due.items() if at <= now and b not in self._probing]
+                self._probing.update(due)
+                upcoming = [at for b, at in self._due.items() if b not in self._probing]
+                wait = (min(upcoming) - now) if upcoming else self.interval
+            for brain_id in due:
+                self._pool.submit(self._probe, brain_id)
+            self._wake.wait(max(wait, MIN_WAIT))
+
+    def _probe(self, brain_id: str):
+        brain = self.manager.get_brain(brain_id)
+        try:
+            if brain is None:
+                return
+            with self._lock:
+                full = brain_id in self._full
+                self._full.discard(brain_id)
+            start = time.perf_counter()
+            try:
+                health = brain.health_check() if full else brain.ping()
+            except Exception as e:
+                health = BrainHealth(status=BrainStatus.UNREACHABLE, message=f"Health check failed: {e}")
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            with self._lock:
+                if self.manager.get_brain(brain_id) is not brain:
+                    return  # replaced or unregistered while probing
+                previous = self._snapshot.get(brain_id)
+                self._snapshot[brain_id] = health
+                counts = self._counts.setdefault(brain_id, [0, 0])
+                counts[0] += 1
+                if health.status == BrainStatus.AVAILABLE:
+                    self._latency.setdefault(brain_id, LatencyHistogram()).record(elapsed_ms)
+                else:
+                    counts[1] += 1
+
+            if previous and previous.status != health.status:
+                print(f"🩺 Brain '{brain.name}' is now {health.status.value}: {health.message}")
+            if hasattr(brain, "record_health"):
+                brain.record_health(health)
+            if self.store is not None:
+                self.store.update_brain_health(brain_id, health.status.value, health.message)
+        finally:
+            with self._lock:
+                self._probing.discard(brain_id)
+                if brain_id not in self.manager.registry:
+                    self._due.pop(brain_id, None)
+                elif brain_id in self._stale:
+                    self._stale.discard(brain_id)
+                    self._due[brain_id] = time.monotonic()
+                else:
+                    self._due[brain_id] = time.monotonic() + self.next_delay()
+            self._wake.set()
+
+    def stats(self) -> dict:
+        """Latest status, probe counts and latency histogram per Brain."""
+        with self._lock:
+            snapshot = dict(self._snapshot)
+            latency = dict(self._latency)
+            counts = {b: list(c) for b, c in self._counts.items()}
+        return {
+            brain_id: {
+                "status": health.status.value,
+                "message": health.message,
+                "last_checked": health.last_checked.isoformat() if health.last_checked else None,
+                "probes": counts.get(brain_id, [0, 0])[0],
+                "failures": counts.get(brain_id, [0, 0])[1],
+                "latency": latency[brain_id].to_dict() if brain_id in latency else LatencyHistogram().to_dict(),
+            }
+            for brain_id, health in snapshot.items()
+        }
@@ -0,0 +1,166 @@
+"""
+Brain Hedging - Race fallback Brains against a slow primary.
+
+Provides:
+- Per-Brain request latency histograms, fed by every Brain execution
+- A hedge delay taken from a percentile of each Brain's observed latency
+- Hedged execution: the next Brain starts once the previous one has run
+  past its hedge delay (or failed), the first successful response wins
+  and the requests still in flight are cancelled
+- Win counts per primary Brain, for tuning the percentile and fallback
+"""
+
+import asyncio
+import threading
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from core.brain_health import LatencyHistogram
+from core.brain_interface import Brain, BrainResponse
+
+
+class HedgedExecutor:
+    """
+    Runs a Brain request against an ordered list of Brains, hedging on latency.
+
+    Races run on one long-lived event loop thread through the Brains'
+    execute_async(), so cancelling the loser closes its HTTP request and
+    async clients keep their pooled connections between requests. Brains
+    without a native async client run in a worker thread whose result is
+    discarded if they lose.
+    """
+
+    def __init__(self, percentile: float = 95.0, default_delay: float = 2.0,
+                 min_samples: int = 20, min_delay: float = 0.05):
+        self.percentile = percentile
+        self.default_delay = default_delay
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._latency: Dict[str, LatencyHistogram] = {}
+        self._wins: Dict[str, Dict[str, int]] = {}  # primary id -> {winner id | "none": count}
+        self._counts = {"requests": 0, "hedged": 0}
+        self._lock = threading.Lock()
+        self._loop = None
+
+    def record_latency(self, brain_id: str, latency_ms: float):
+        """Record how long a successful Brain execution took."""
+        with self._lock:
+            histogram = self._latency.setdefault(brain_id, LatencyHistogram())
+        histogram.record(latency_ms)
+
+    def forget(self, brain_id: str):
+        with self._lock:
+            self._latency.pop(brain_id, None)
+            self._wins.pop(brain_id, None)
+
+    def hedge_delay(self, brain_id: str) -> float:
+        """
+        Seconds to wait on a Brain before starting the next one.
+
+        The configured percentile of the Brain's latency once `min_samples`
+        requests have been seen, `default_delay` before that.
+        """
+        with self._lock:
+            histogram = self._latency.get(brain_id)
+        if histogram is None or histogram.count < self.min_samples:
+            return self.default_delay
+        return max(self.min_delay, histogram.percentile(self.percentile) / 1000)
+
+    def execute(
+        self,
+        brains: List[Brain],
+        attempt: Callable[[Brain], Awaitable[BrainResponse]],
+        admit: Optional[Callable[[Brain], bool]] = None
+    ) -> Tuple[Optional[Brain], Optional[BrainResponse]]:
+        """
+        Run attempt(brain) for brains in order, hedging on latency.
+
+        attempt is an async callable returning a BrainResponse; it should not
+        raise. admit(brain), if given, is asked right before each Brain after
+        the first is started, and a Brain it refuses is skipped. Blocks the
+        calling thread until a Brain succeeds or all fail.
+
+        Returns:
+            (winning Brain, its response), or (None, last failed response)
+        """
+        future = asyncio.run_coroutine_threadsafe(self.race(brains, attempt, admit), self._get_loop())
+        return future.result()
+
+    async def race(self, brains: List[Brain], attempt, admit=None) -> Tuple[Optional[Brain], Optional[BrainResponse]]:
+        """Coroutine behind execute(), for callers already on an event loop."""
+        pending = {}  # task -> Brain
+        remaining = list(brains)
+        hedged = False
+        last_failure = None
+
+        def launch(check=True):
+            while remaining:
+                brain = remaining.pop(0)
+                if not check or admit is None or admit(brain):
+                    pending[asyncio.ensure_future(attempt(brain))] = brain
+                    return brain
+            return None
+
+        latest = launch(check=False)  # the caller already chose the first Brain
+        try:
+            while pending:
+                timeout = self.hedge_delay(latest.id) if remaining else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedge = launch()
+                    if hedge is not None:
+                        print(f"⏱️ No answer from '{latest.name}' after {timeout:.2f}s; "
+                              f"hedging with '{hedge.name}'")
+                        hedged = True
+                        latest = hedge
+                    continue
+                for task in done:
+                    brain = pending.pop(task)
+                    response = task.result()
+                    if response and response.success:
+                        self._record_result(brains[0], brain, hedged)
+                        return brain, response
+                    last_failure = response
+                if remaining and not pending:
+                    latest = launch()
+            self._record_result(brains[0], None, hedged)
+            return None, last_failure
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _record_result(self, primary: Brain, winner: Optional[Brain], hedged: bool):
+        with self._lock:
+            self._counts["requests"] += 1
+            self._counts["hedged"] += int(hedged)
+            wins = self._wins.setdefault(primary.id, {})
+            key = winner.id if winner else "none"
+            wins[key] = wins.get(key, 0) + 1
+        if hedged and winner is not None:
+            print(f"🏁 Hedged request won by '{winner.name}'")
+
+    def _get_loop(self):
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="brain-hedging", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def stats(self) -> dict:
+        """Hedge delay and latency histogram per Brain, and wins per primary."""
+        with self._lock:
+            latency = dict(self._latency)
+            wins = {b: dict(w) for b, w in self._wins.items()}
+            counts = dict(self._counts)
+        return {
+            **counts,
+            "percentile": self.percentile,
+            "brains": {
+                brain_id: {
+                    "hedge_delay_ms": round(self.hedge_delay(brain_id) * 1000, 1),
+                    "latency": histogram.to_dict(),
+                }
+                for brain_id, histogram in latency.items()
+            },
+            "wins": wins,
+        }
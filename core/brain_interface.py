@@ -5,10 +5,12 @@ This module defines the abstract interface that all Brain providers must impleme
 along with supporting enums and data classes for capabilities, privacy levels, and responses.
 """
 
+import asyncio
+import threading
 from abc import ABC, abstractmethod
 from enum import Enum
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any, Generator, Union
+from typing import List, Optional, Dict, Any, AsyncIterator, Callable, Generator, Union
 from datetime import datetime
 
 
@@ -79,6 +81,56 @@ class BrainConfig:
     context_filter_level: str = "auto"  # auto, minimal, moderate, aggressive, none
 
 
+class CancellationToken:
+    """
+    Signals that the caller no longer wants a result.
+
+    Passed to execute_stream() so a provider stops reading and closes its
+    HTTP stream as soon as the request is interrupted. Callbacks added with
+    on_cancel() run once, on the thread that calls cancel(); providers use
+    them to interrupt a read that is blocked waiting for the next chunk.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"⚠️ Cancellation callback failed: {e}")
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Run callback on cancel(), or right away if already cancelled.
+
+        Returns a function that unregisters the callback.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove(callback)
+        callback()
+        return lambda: None
+
+    def _remove(self, callback: Callable[[], None]):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+
 class Brain(ABC):
     """
     Abstract base class for all Brain providers.
@@ -133,6 +185,19 @@ class Brain(ABC):
         """
         pass
     
+    def ping(self) -> BrainHealth:
+        """
+        Cheap availability check used by background health probing.
+        
+        Unlike health_check(), this should not run inference or spend
+        tokens; providers override it with a model lookup or similar
+        request. Defaults to health_check().
+        
+        Returns:
+            BrainHealth object with status and details
+        """
+        return self.health_check()
+    
     @abstractmethod
     def execute(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any]) -> BrainResponse:
         """
@@ -152,7 +217,8 @@ class Brain(ABC):
         self,
         prompt: str,
         context: Dict[str, Any],
-        constraints: Dict[str, Any]
+        constraints: Dict[str, Any],
+        cancel_token: Optional[CancellationToken] = None
     ) -> Generator[Dict[str, Any], None, None]:
         """
         Execute a reasoning task with streaming output.
@@ -161,6 +227,7 @@ class Brain(ABC):
             prompt: User's input/query
             context: Additional context (filtered based on privacy level)
             constraints: Execution constraints (JSON schema, tools, etc.)
+            cancel_token: When cancelled, stop reading and close the stream
 
         Yields:
             Dict with 'chunk' key for partial responses, 'done' key when complete.
@@ -169,6 +236,38 @@ class Brain(ABC):
         # Default implementation - subclasses should override this
         yield {'error': 'Streaming not implemented', 'done': True}
         return
+
+    async def execute_async(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any]) -> BrainResponse:
+        """
+        Async variant of execute() for use on an event loop.
+
+        The default runs execute() in a worker thread; providers with an
+        async HTTP client override this so no thread is held while waiting.
+        """
+        return await asyncio.to_thread(self.execute, prompt, context, constraints)
+
+    async def execute_stream_async(
+        self,
+        prompt: str,
+        context: Dict[str, Any],
+        constraints: Dict[str, Any],
+        cancel_token: Optional[CancellationToken] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Async variant of execute_stream(), yielding the same frames.
+
+        The default pulls frames from execute_stream() in a worker thread.
+        """
+        stream = self.execute_stream(prompt, context, constraints, cancel_token)
+        sentinel = object()
+        try:
+            while True:
+                frame = await asyncio.to_thread(next, stream, sentinel)
+                if frame is sentinel:
+                    break
+                yield frame
+        finally:
+            stream.close()
     
     def update_config(self, config_data: Dict[str, Any]) -> bool:
         """
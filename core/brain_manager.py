@@ -6,6 +6,10 @@ This module manages Brain registration, selection, and fallback logic.
 
 from typing import Dict, List, Optional, Any
 from core.brain_interface import Brain, BrainCapability, BrainConfig, BrainHealth, BrainResponse, PrivacyLevel
+from core.brain_breaker import CircuitBreaker, CLOSED
+from core.brain_health import HealthMonitor
+from core.brain_hedging import HedgedExecutor
+from core.config import config
 from core.persistence import storage
 from core.errors import BrainManagerError
 import json
@@ -22,6 +26,9 @@ class BrainManager:
         self.fallback_brain_id: Optional[str] = None
         self.rules_only_mode: bool = False
         self.auto_selection_enabled: bool = True
+        self.health_monitor = HealthMonitor(self, interval=config.BRAIN_HEALTH_INTERVAL, store=storage)
+        self.hedger = HedgedExecutor(percentile=config.BRAIN_HEDGE_PERCENTILE, default_delay=config.BRAIN_HEDGE_DELAY)
+        self.breakers: Dict[str, CircuitBreaker] = {}  # brain_id -> circuit breaker
         
     def register_brain(self, brain: Brain) -> None:
         """
@@ -31,6 +38,8 @@ class BrainManager:
             brain: Brain instance to register
         """
         self.registry[brain.id] = brain
+        self.breakers[brain.id] = self._new_breaker()
+        self.health_monitor.refresh(brain.id)
         print(f"🧠 Registered Brain: {brain.name} ({brain.provider})")
         
         # Set as active if marked in config
@@ -53,6 +62,9 @@ class BrainManager:
         """
         if brain_id in self.registry:
             del self.registry[brain_id]
+            self.health_monitor.forget(brain_id)
+            self.hedger.forget(brain_id)
+            self.breakers.pop(brain_id, None)
             
             # Clear active/fallback if this was the selected Brain
             if self.active_brain_id == brain_id:
@@ -185,12 +197,18 @@ class BrainManager:
         """
         Select appropriate Brain based on context and settings.
         
+        Health comes from the background monitor's latest snapshot, so this
+        never waits on a provider. Brains whose circuit breaker is open are
+        skipped; a half-open breaker lets one trial request through.
+        
         Args:
             context: Request context for intelligent selection
             
         Returns:
             Selected Brain instance or None
         """
+        self.health_monitor.start()
+        
         # Rules-only mode override
         if self.rules_only_mode:
             return self.get_brain("rules")
@@ -204,13 +222,11 @@ class BrainManager:
         # Default to active Brain
         active = self.get_active_brain()
         if active:
-            # Health check
-            health = active.get_cached_health() if hasattr(active, 'get_cached_health') else active.health_check()
-            if health.status.value == "available":
+            if self._is_usable(active):
                 return active
             
-            # Active Brain unhealthy, try fallback
-            print(f"⚠️ Active Brain '{active.name}' is {health.status.value}: {health.message}")
+            # Active Brain unhealthy or its circuit is open, try fallback
+            print(f"⚠️ Active Brain '{active.name}' {self._unavailable_reason(active)}")
             return self._try_fallback(f"Primary Brain unavailable")
         
         # No active Brain, try fallback
@@ -234,8 +250,7 @@ class BrainManager:
         if is_sensitive or requires_privacy:
             local_brains = self.get_brains_by_privacy_level(PrivacyLevel.LOCAL)
             for brain in local_brains:
-                health = brain.health_check()
-                if health.status.value == "available":
+                if self._is_usable(brain):
                     print(f"🔒 Auto-selected local Brain '{brain.name}' for sensitive request")
                     return brain
         
@@ -243,8 +258,9 @@ class BrainManager:
         required_capability = context.get("required_capability")
         if required_capability:
             capable_brains = self.get_brains_by_capability(BrainCapability(required_capability))
-            if capable_brains:
-                return capable_brains[0]  # Return first capable Brain
+            for brain in capable_brains:
+                if self._is_usable(brain):
+                    return brain  # Return first capable Brain
         
         return None
     
@@ -261,15 +277,94 @@ class BrainManager:
         if self.fallback_brain_id:
             fallback = self.registry.get(self.fallback_brain_id)
             if fallback:
-                health = fallback.health_check()
-                if health.status.value == "available":
+                if self._is_usable(fallback):
                     print(f"🔄 Falling back to '{fallback.name}': {reason}")
                     return fallback
                 else:
-                    print(f"❌ Fallback Brain '{fallback.name}' also unavailable: {health.message}")
+                    print(f"❌ Fallback Brain '{fallback.name}' also {self._unavailable_reason(fallback)}")
         
         return None
     
+    def get_hedge_chain(self, primary: Brain) -> List[Brain]:
+        """
+        Brains to race for a request, in order: the primary, then the
+        fallback Brain if it is registered, distinct and available.
+        
+        Args:
+            primary: Brain chosen by select_brain()
+            
+        Returns:
+            List starting with primary
+        """
+        chain = [primary]
+        fallback = self.registry.get(self.fallback_brain_id) if self.fallback_brain_id else None
+        # Only a peek: the hedger claims a half-open trial if it actually launches the fallback
+        if fallback and fallback.id != primary.id and self._is_usable(fallback, claim=False):
+            chain.append(fallback)
+        return chain
+    
+    def _new_breaker(self) -> CircuitBreaker:
+        return CircuitBreaker(
+            error_rate=config.BRAIN_BREAKER_ERROR_RATE,
+            slow_ms=config.BRAIN_BREAKER_SLOW_MS,
+            cooldown=config.BRAIN_BREAKER_COOLDOWN,
+            max_cooldown=config.BRAIN_BREAKER_MAX_COOLDOWN
+        )
+    
+    def _is_usable(self, brain: Brain, claim: bool = True) -> bool:
+        """
+        Whether a request may be sent to the Brain: its latest health is
+        available and its circuit breaker lets the request through.
+        
+        With `claim`, only call this right before sending: a half-open
+        breaker hands its trial request to the first caller. Without it
+        the breaker is only inspected.
+        """
+        if not self.health_monitor.is_available(brain):
+            return False
+        breaker = self.breakers.get(brain.id)
+        if breaker is None:
+            return True
+        return breaker.allow_request() if claim else breaker.can_request()
+    
+    def _unavailable_reason(self, brain: Brain) -> str:
+        breaker = self.breakers.get(brain.id)
+        if breaker is not None and breaker.state != CLOSED:
+            return f"has an open circuit: {breaker.to_dict()['reason']}"
+        health = self.health_monitor.get_health(brain.id)
+        return f"is {health.status.value}: {health.message}" if health else "is unavailable"
+    
+    def release_request(self, brain_id: str) -> None:
+        """Tell the Brain's circuit breaker a request ended without an outcome, e.g. was cancelled."""
+        breaker = self.breakers.get(brain_id)
+        if breaker is not None:
+            breaker.release()
+    
+    def record_result(self, brain_id: str, success: bool, latency_ms: Optional[float] = None,
+                      error: Optional[str] = None) -> None:
+        """
+        Feed the outcome of a request to the Brain's circuit breaker.
+        
+        Args:
+            brain_id: Brain that handled the request
+            success: Whether it returned a successful response
+            latency_ms: How long the request took
+            error: Error message of a failed request
+        """
+        breaker = self.breakers.get(brain_id)
+        if breaker is None:
+            return
+        before = breaker.state
+        if success:
+            breaker.record_success(latency_ms)
+        else:
+            breaker.record_failure(error)
+        after = breaker.state
+        if after != before:
+            name = self.registry[brain_id].name if brain_id in self.registry else brain_id
+            reason = breaker.to_dict()["reason"]
+            print(f"⚡ Brain '{name}' circuit {after}" + (f": {reason}" if after != CLOSED and reason else ""))
+    
     def get_brains_by_capability(self, capability: BrainCapability) -> List[Brain]:
         """
         Get all Brains that support a specific capability.
@@ -316,7 +411,13 @@ class BrainManager:
         Returns:
             List of Brain display info dictionaries
         """
-        return [brain.get_display_info() for brain in self.registry.values()]
+        info = []
+        for brain in self.registry.values():
+            data = brain.get_display_info()
+            breaker = self.breakers.get(brain.id)
+            data["circuit"] = breaker.to_dict() if breaker else None
+            info.append(data)
+        return info
     
     def update_brain_config(self, brain_id: str, config_data: Dict[str, Any]) -> bool:
         """
@@ -333,6 +434,8 @@ class BrainManager:
         if brain:
             success = brain.update_config(config_data)
             if success:
+                self.health_monitor.refresh(brain_id)
+                self.breakers[brain_id].reset()  # new settings get a clean slate
                 # Persist to database
                 storage.save_brain_config(
                     brain_id, 
@@ -12,8 +12,26 @@ from core.brain_interface import (
     PrivacyLevel
 )
 from typing import List, Dict, Any, Optional
+import asyncio
+import contextlib
 import json
+import socket
+import threading
 import time
+import weakref
+
+
+async def _close_at_loop_shutdown(client):
+    """
+    Parked async generator whose cleanup closes `client`.
+
+    asyncio.run() (via loop.shutdown_asyncgens()) closes every async
+    generator started on the loop before closing it, which runs the finally.
+    """
+    try:
+        yield
+    finally:
+        await client.close()
 
 
 class BaseBrain(Brain):
@@ -27,6 +45,32 @@ class BaseBrain(Brain):
         super().__init__(config)
         self._last_health_check = None
         self._health_cache_seconds = 30  # Cache health checks for 30 seconds
+        self._async_clients = weakref.WeakKeyDictionary()  # event loop -> (client, closer)
+        self._async_clients_lock = threading.Lock()
+    
+    def _get_loop_client(self, factory):
+        """
+        Get the async SDK client for the running event loop.
+        
+        Async clients keep connections bound to the loop that opened them,
+        so each loop gets its own from factory(). A client is closed when its
+        loop shuts down, and forgotten once the loop is garbage collected.
+        """
+        loop = asyncio.get_running_loop()
+        with self._async_clients_lock:
+            entry = self._async_clients.get(loop)
+            if entry is None:
+                client = factory()
+                closer = _close_at_loop_shutdown(client)
+                asyncio.ensure_future(closer.__anext__())  # registers it with the loop
+                entry = (client, closer)
+                self._async_clients[loop] = entry
+            return entry[0]
+    
+    def _reset_loop_clients(self):
+        """Drop the cached async clients, e.g. after the endpoint changed."""
+        with self._async_clients_lock:
+            self._async_clients = weakref.WeakKeyDictionary()
     
     def get_cached_health(self) -> BrainHealth:
         """
@@ -48,6 +92,10 @@ class BaseBrain(Brain):
         self._last_health_check = self.health_check()
         return self._last_health_check
     
+    def record_health(self, health: BrainHealth) -> None:
+        """Store a health result from a background probe as the cached check."""
+        self._last_health_check = health
+    
     def _build_error_response(self, error_message: str) -> BrainResponse:
         """
         Helper to build standardized error responses.
@@ -100,6 +148,89 @@ class BaseBrain(Brain):
             cost_usd=cost_usd
         )
 
+    def _build_done_frame(self, full_content: str, tokens_used: int = None, cost_usd: float = None) -> Dict[str, Any]:
+        """
+        Final frame of execute_stream(); usage keys are only set when the
+        provider reported them.
+        """
+        frame = {"done": True, "full_content": full_content}
+        if tokens_used is not None:
+            frame["tokens_used"] = tokens_used
+        if cost_usd is not None:
+            frame["cost_usd"] = cost_usd
+        return frame
+
+    @staticmethod
+    def _until_cancelled(items, cancel_token=None):
+        """
+        Iterate a provider stream, stopping at the first item that arrives
+        after cancel_token is cancelled.
+
+        Callers iterate this inside the provider's `with stream:` block, so
+        stopping early closes the HTTP response instead of reading the rest
+        of the generation.
+        """
+        try:
+            for item in items:
+                if cancel_token is not None and cancel_token.cancelled:
+                    return
+                yield item
+        except Exception:
+            if cancel_token is not None and cancel_token.cancelled:
+                return  # the read was cut off by _interrupt_on_cancel()
+            raise
+
+    @staticmethod
+    async def _until_cancelled_async(items, cancel_token=None):
+        """Async variant of _until_cancelled()."""
+        try:
+            async for item in items:
+                if cancel_token is not None and cancel_token.cancelled:
+                    return
+                yield item
+        except Exception:
+            if cancel_token is not None and cancel_token.cancelled:
+                return
+            raise
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _interrupt_on_cancel(cancel_token, response):
+        """
+        While the block runs, cancel() shuts down the socket under the httpx
+        `response`, so a read blocked waiting on the provider returns at once
+        instead of when the next chunk arrives.
+
+        HTTP/2 connections are shared by other requests and are left alone;
+        those streams still stop at the next chunk.
+        """
+        sock = None
+        if cancel_token is not None and response is not None and response.http_version != "HTTP/2":
+            network_stream = response.extensions.get("network_stream")
+            sock = network_stream.get_extra_info("socket") if network_stream is not None else None
+        if sock is None:
+            yield
+            return
+
+        lock = threading.Lock()
+        live = [True]  # the connection is still ours; it goes back to the pool after the block
+
+        def interrupt():
+            with lock:
+                if live[0]:
+                    try:
+                        sock.shutdown(socket.SHUT_RDWR)
+                    except OSError:
+                        pass
+
+        remove = cancel_token.on_cancel(interrupt)
+        try:
+            yield
+        finally:
+            remove()
+            with lock:
+                live[0] = False
+
     def _build_workflow_prompt(self, request: str, context: Dict[str, Any]) -> str:
         """Build the workflow planning prompt shared across all providers."""
         available_skills = context.get("available_skills", {})
@@ -3,6 +3,7 @@ Claude Brain - Cloud LLM provider using Anthropic's Claude API.
 """
 
 from core.brains.base import BaseBrain
+from core.brains.transport import ANTHROPIC_API_URL, http_pool
 from core.brain_interface import (
     BrainCapability,
     BrainConfig,
@@ -36,7 +37,7 @@ class ClaudeBrain(BaseBrain):
         """Initialize Anthropic client."""
         try:
             from anthropic import Anthropic
-            self.client = Anthropic(api_key=self.api_key)
+            self.client = Anthropic(api_key=self.api_key, http_client=http_pool.client(ANTHROPIC_API_URL))
         except ImportError:
             pass
         except Exception as e:
@@ -61,6 +62,27 @@ class ClaudeBrain(BaseBrain):
         """Claude/Anthropic is an external cloud provider."""
         return PrivacyLevel.EXTERNAL_CLOUD
     
+    def ping(self) -> BrainHealth:
+        """Check the API key and model with a model lookup instead of a completion."""
+        if not self.api_key:
+            return self.health_check()
+        if not self.client:
+            self._init_client()
+        if not self.client:
+            return self.health_check()  # reports the missing package
+        try:
+            import time
+            start = time.time()
+            self.client.models.retrieve(self.model)
+            latency = (time.time() - start) * 1000
+        except Exception as e:
+            return self._health_error(e)
+        return BrainHealth(
+            status=BrainStatus.AVAILABLE,
+            message=f"Claude ready with model '{self.model}'",
+            latency_ms=latency
+        )
+    
     def health_check(self) -> BrainHealth:
         """Check Claude API availability."""
         if not self.api_key:
@@ -98,16 +120,19 @@ class ClaudeBrain(BaseBrain):
                 message="Anthropic package not installed. Run: pip install anthropic"
             )
         except Exception as e:
-            error_msg = str(e)
-            if "authentication" in error_msg.lower() or "api key" in error_msg.lower():
-                return BrainHealth(
-                    status=BrainStatus.MISCONFIGURED,
-                    message=f"Invalid API key: {error_msg}"
-                )
+            return self._health_error(e)
+    
+    def _health_error(self, e: Exception) -> BrainHealth:
+        error_msg = str(e)
+        if "authentication" in error_msg.lower() or "api key" in error_msg.lower():
             return BrainHealth(
-                status=BrainStatus.UNREACHABLE,
-                message=f"Cannot connect to Claude: {error_msg}"
+                status=BrainStatus.MISCONFIGURED,
+                message=f"Invalid API key: {error_msg}"
             )
+        return BrainHealth(
+            status=BrainStatus.UNREACHABLE,
+            message=f"Cannot connect to Claude: {error_msg}"
+        )
     
     def execute(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any]) -> BrainResponse:
         """Execute reasoning with Claude."""
@@ -115,59 +140,78 @@ class ClaudeBrain(BaseBrain):
             if not self.client:
                 self._init_client()
             
-            # Build system prompt
-            system_prompt = self._build_system_prompt(context, constraints)
-            
-            # Execute
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                system=system_prompt,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            content = response.content[0].text
-            tokens_used = response.usage.input_tokens + response.usage.output_tokens
-            
-            # Parse JSON
-            try:
-                # Clean response
-                json_str = content.strip()
-                if "```json" in json_str:
-                    json_str = json_str.split("```json")[1].split("```")[0].strip()
-                elif "```" in json_str:
-                    json_str = json_str.split("```")[1].split("```")[0].strip()
-                
-                data = json.loads(json_str)
-                intent = data.get("intent")
-                arguments = data.get("arguments", {})
-                confidence = data.get("confidence", 0.0)
-                natural_response = data.get("natural_response")
-                
-                # Calculate cost
-                cost = self._calculate_cost(response.usage.input_tokens, response.usage.output_tokens)
-                
-                return self._build_success_response(
-                    content=content,
-                    confidence=confidence,
-                    intent=intent,
-                    arguments=arguments,
-                    natural_response=natural_response,
-                    tokens_used=tokens_used,
-                    cost_usd=cost
-                )
-            except json.JSONDecodeError:
-                return self._build_success_response(
-                    content=content,
-                    confidence=0.5,
-                    natural_response=content,
-                    tokens_used=tokens_used
-                )
+            response = self.client.messages.create(**self._message_kwargs(prompt, context, constraints))
+            return self._parse_message(response)
                 
         except Exception as e:
             return self._build_error_response(f"Claude error: {str(e)}")
 
+    async def execute_async(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any]) -> BrainResponse:
+        """Execute reasoning with Anthropic's async client."""
+        try:
+            response = await self._get_async_client().messages.create(
+                **self._message_kwargs(prompt, context, constraints)
+            )
+            return self._parse_message(response)
+        except Exception as e:
+            return self._build_error_response(f"Claude error: {str(e)}")
+
+    def _get_async_client(self):
+        from anthropic import AsyncAnthropic
+        return self._get_loop_client(lambda: AsyncAnthropic(
+            api_key=self.api_key, http_client=http_pool.async_client(ANTHROPIC_API_URL)
+        ))
+
+    def _message_kwargs(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any]) -> Dict[str, Any]:
+        """Messages API arguments shared by the sync and async paths."""
+        return {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "system": self._build_system_prompt(context, constraints),
+            "messages": [{"role": "user", "content": prompt}],
+        }
+
+    def _parse_message(self, response) -> BrainResponse:
+        """Turn a Messages API response into a BrainResponse."""
+        content = response.content[0].text
+        tokens_used = response.usage.input_tokens + response.usage.output_tokens
+        
+        # Parse JSON
+        try:
+            # Clean response
+            json_str = content.strip()
+            if "```json" in json_str:
+                json_str = json_str.split("```json")[1].split("```")[0].strip()
+            elif "```" in json_str:
+                json_str = json_str.split("```")[1].split("```")[0].strip()
+            
+            data = json.loads(json_str)
+            intent = data.get("intent")
+            arguments = data.get("arguments", {})
+            confidence = data.get("confidence", 0.0)
+            natural_response = data.get("natural_response")
+            
+            # Calculate cost
+            cost = self._calculate_cost(response.usage.input_tokens, response.usage.output_tokens)
+            
+            return self._build_success_response(
+                content=content,
+                confidence=confidence,
+                intent=intent,
+                arguments=arguments,
+                natural_response=natural_response,
+                tokens_used=tokens_used,
+                cost_usd=cost
+            )
+        except json.JSONDecodeError:
+            return self._build_success_response(
+                content=content,
+                confidence=0.5,
+                natural_response=content,
+                tokens_used=tokens_used
+            )
+
     def plan_workflow(self, request: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Plan a multi-step workflow using Claude."""
         try:
@@ -186,7 +230,7 @@ class ClaudeBrain(BaseBrain):
             print(f"ClaudeBrain workflow planning error: {e}")
             return None
 
-    def execute_stream(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any]):
+    def execute_stream(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any], cancel_token=None):
         """
         Execute streaming reasoning with Claude.
 
@@ -196,6 +240,7 @@ class ClaudeBrain(BaseBrain):
             prompt: User's input/query
             context: Additional context
             constraints: Execution constraints
+            cancel_token: Stops reading and closes the response when cancelled
 
         Yields:
             Dict with 'chunk' key containing the text chunk, or 'done' when complete
@@ -203,26 +248,55 @@ class ClaudeBrain(BaseBrain):
         if not self.client:
             self._init_client()
 
-        system_prompt = self._build_system_prompt(context, constraints)
+        try:
+            with self.client.messages.stream(**self._message_kwargs(prompt, context, constraints)) as stream:
+                full_content = ""
+                with self._interrupt_on_cancel(cancel_token, stream.response):
+                    for chunk in self._until_cancelled(stream.text_stream, cancel_token):
+                        full_content += chunk
+                        yield {"chunk": chunk}
+                # The final message is only known once the whole stream is read
+                usage = None if cancel_token and cancel_token.cancelled else stream.get_final_message().usage
+
+            yield self._stream_done_frame(full_content, usage)
+
+        except Exception as e:
+            yield {"error": str(e), "done": True}
 
+    async def execute_stream_async(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any], cancel_token=None):
+        """
+        Async variant of execute_stream() using Anthropic's async client.
+
+        Closing the generator early closes the HTTP response.
+        """
         try:
-            with self.client.messages.stream(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                system=system_prompt,
-                messages=[{"role": "user", "content": prompt}]
+            async with self._get_async_client().messages.stream(
+                **self._message_kwargs(prompt, context, constraints)
             ) as stream:
                 full_content = ""
-                for chunk in stream.text:
-                    full_content += chunk
-                    yield {"chunk": chunk}
+                with self._interrupt_on_cancel(cancel_token, stream.response):
+                    async for chunk in self._until_cancelled_async(stream.text_stream, cancel_token):
+                        full_content += chunk
+                        yield {"chunk": chunk}
+                usage = None
+                if not (cancel_token and cancel_token.cancelled):
+                    usage = (await stream.get_final_message()).usage
 
-            yield {"done": True, "full_content": full_content}
+            yield self._stream_done_frame(full_content, usage)
 
         except Exception as e:
             yield {"error": str(e), "done": True}
 
+    def _stream_done_frame(self, full_content: str, usage) -> Dict[str, Any]:
+        """Done frame with token counts from the final streamed message."""
+        if usage is None:
+            return self._build_done_frame(full_content)
+        return self._build_done_frame(
+            full_content,
+            tokens_used=usage.input_tokens + usage.output_tokens,
+            cost_usd=self._calculate_cost(usage.input_tokens, usage.output_tokens)
+        )
+
     def estimate_cost(self, prompt: str) -> float:
         """Estimate cost for Claude."""
         # Rough token estimation (4 chars ≈ 1 token)
@@ -49,6 +49,7 @@ class GoogleBrain(BaseBrain):
             BrainCapability.CHAT,
             BrainCapability.TOOL_CALLING,
             BrainCapability.JSON_MODE,
+            BrainCapability.STREAMING,
             BrainCapability.WORKFLOW_PLANNING,
         ]
 
@@ -62,6 +63,28 @@ class GoogleBrain(BaseBrain):
         """Google is a trusted first-party cloud provider."""
         return PrivacyLevel.TRUSTED_CLOUD
     
+    def ping(self) -> BrainHealth:
+        """Check the API key and model with a model lookup instead of a generation."""
+        if not self.api_key or not self.client:
+            return self.health_check()
+        try:
+            import google.generativeai as genai
+            import time
+            start = time.time()
+            name = self.model if self.model.startswith("models/") else f"models/{self.model}"
+            genai.get_model(name)
+            latency = (time.time() - start) * 1000
+        except Exception as e:
+            return BrainHealth(
+                status=BrainStatus.UNREACHABLE,
+                message=f"Cannot connect to Google Gemini: {str(e)}"
+            )
+        return BrainHealth(
+            status=BrainStatus.AVAILABLE,
+            message=f"Google Gemini ready with model '{self.model}'",
+            latency_ms=latency
+        )
+    
     def health_check(self) -> BrainHealth:
         """Check Google Gemini API availability."""
         if not self.api_key:
@@ -152,6 +175,44 @@ class GoogleBrain(BaseBrain):
         except Exception as e:
             return self._build_error_response(f"Google Gemini error: {str(e)}")
     
+    def execute_stream(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any], cancel_token=None):
+        """
+        Stream a reply from Google Gemini as it is generated.
+
+        Each stream is a single stateless request (system prompt and user
+        prompt together) rather than a turn on the shared chat session, so
+        a stream abandoned midway cannot leave that session inconsistent.
+
+        Yields:
+            Dict with 'chunk' key containing the text chunk, or 'done' when complete
+        """
+        try:
+            if not self.client:
+                self._init_client()
+
+            system_prompt = self._build_system_prompt(context, constraints)
+            response = self.client.generate_content([system_prompt, prompt], stream=True)
+
+            full_content = ""
+            usage = None
+            for chunk in self._until_cancelled(response, cancel_token):
+                usage = getattr(chunk, "usage_metadata", None) or usage
+                if chunk.parts and chunk.text:
+                    full_content += chunk.text
+                    yield {"chunk": chunk.text}
+
+            if usage is None:
+                yield self._build_done_frame(full_content)
+            else:
+                yield self._build_done_frame(
+                    full_content,
+                    tokens_used=usage.total_token_count,
+                    cost_usd=self._calculate_cost(usage.prompt_token_count, usage.candidates_token_count)
+                )
+
+        except Exception as e:
+            yield {"error": str(e), "done": True}
+
     def plan_workflow(self, request: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Plan a multi-step workflow using Google Gemini."""
         try:
@@ -170,12 +231,16 @@ class GoogleBrain(BaseBrain):
         # Rough token estimation (4 chars ≈ 1 token)
         estimated_tokens = len(prompt) // 4
         
+        # Assume 2:1 output:input ratio
+        return self._calculate_cost(estimated_tokens, estimated_tokens * 2)
+    
+    def _calculate_cost(self, input_tokens: int, output_tokens: int) -> float:
+        """Calculate cost from token counts."""
         # Gemini 1.5 Flash pricing (as of 2024)
         # Input: $0.075 per 1M tokens
         # Output: $0.30 per 1M tokens
-        # Assume 2:1 output:input ratio
-        input_cost = (estimated_tokens / 1_000_000) * 0.075
-        output_cost = ((estimated_tokens * 2) / 1_000_000) * 0.30
+        input_cost = (input_tokens / 1_000_000) * 0.075
+        output_cost = (output_tokens / 1_000_000) * 0.30
         
         return input_cost + output_cost
     
@@ -5,6 +5,7 @@ LM Studio provides a local OpenAI-compatible server for running models locally.
 """
 
 from core.brains.base import BaseBrain
+from core.brains.transport import http_pool
 from core.brain_interface import (
     BrainCapability,
     BrainConfig,
@@ -41,7 +42,8 @@ class LMStudioBrain(BaseBrain):
             from openai import OpenAI
             self.client = OpenAI(
                 base_url=self.endpoint,
-                api_key="lm-studio"  # LM Studio doesn't require real API key
+                api_key="lm-studio",  # LM Studio doesn't require real API key
+                http_client=http_pool.client(self.endpoint)
             )
         except ImportError:
             pass
@@ -133,53 +135,129 @@ class LMStudioBrain(BaseBrain):
             if not self.client:
                 self._init_client()
             
-            # Build system prompt
-            system_prompt = self._build_system_prompt(context, constraints)
-            
-            # Execute
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=self.temperature,
-                max_tokens=self.max_tokens
-            )
-            
-            content = response.choices[0].message.content
-            
-            # Parse JSON
-            try:
-                # Clean response
-                json_str = content.strip()
-                if "```json" in json_str:
-                    json_str = json_str.split("```json")[1].split("```")[0].strip()
-                elif "```" in json_str:
-                    json_str = json_str.split("```")[1].split("```")[0].strip()
-                
-                data = json.loads(json_str)
-                intent = data.get("intent")
-                arguments = data.get("arguments", {})
-                confidence = data.get("confidence", 0.0)
-                natural_response = data.get("natural_response")
-                
-                return self._build_success_response(
-                    content=content,
-                    confidence=confidence,
-                    intent=intent,
-                    arguments=arguments,
-                    natural_response=natural_response
-                )
-            except json.JSONDecodeError:
-                return self._build_success_response(
-                    content=content,
-                    confidence=0.5,
-                    natural_response=content
-                )
+            response = self.client.chat.completions.create(**self._completion_kwargs(prompt, context, constraints))
+            return self._parse_content(response.choices[0].message.content)
                 
         except Exception as e:
             return self._build_error_response(f"LM Studio error: {str(e)}")
+
+    def execute_stream(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any], cancel_token=None):
+        """
+        Stream a reply from LM Studio as the model generates it.
+
+        Yields:
+            Dict with 'chunk' key containing the text chunk, or 'done' when complete
+        """
+        try:
+            if not self.client:
+                self._init_client()
+
+            stream = self.client.chat.completions.create(
+                **self._completion_kwargs(prompt, context, constraints),
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            with stream, self._interrupt_on_cancel(cancel_token, stream.response):
+                full_content = ""
+                usage = None
+                for chunk in self._until_cancelled(stream, cancel_token):
+                    usage = chunk.usage or usage
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        content = chunk.choices[0].delta.content
+                        full_content += content
+                        yield {"chunk": content}
+
+            yield self._build_done_frame(full_content, tokens_used=usage.total_tokens if usage else None)
+
+        except Exception as e:
+            yield {"error": str(e), "done": True}
+
+    async def execute_async(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any]) -> BrainResponse:
+        """Execute reasoning with LM Studio over an async client."""
+        try:
+            response = await self._get_async_client().chat.completions.create(
+                **self._completion_kwargs(prompt, context, constraints)
+            )
+            return self._parse_content(response.choices[0].message.content)
+        except Exception as e:
+            return self._build_error_response(f"LM Studio error: {str(e)}")
+
+    async def execute_stream_async(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any], cancel_token=None):
+        """
+        Stream a reply from LM Studio over an async client.
+
+        Yields:
+            Dict with 'chunk' key containing the text chunk, or 'done' when complete
+        """
+        try:
+            stream = await self._get_async_client().chat.completions.create(
+                **self._completion_kwargs(prompt, context, constraints),
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            async with stream:
+                with self._interrupt_on_cancel(cancel_token, stream.response):
+                    full_content = ""
+                    usage = None
+                    async for chunk in self._until_cancelled_async(stream, cancel_token):
+                        usage = chunk.usage or usage
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            content = chunk.choices[0].delta.content
+                            full_content += content
+                            yield {"chunk": content}
+
+            yield self._build_done_frame(full_content, tokens_used=usage.total_tokens if usage else None)
+
+        except Exception as e:
+            yield {"error": str(e), "done": True}
+
+    def _get_async_client(self):
+        from openai import AsyncOpenAI
+        return self._get_loop_client(lambda: AsyncOpenAI(
+            base_url=self.endpoint, api_key="lm-studio", http_client=http_pool.async_client(self.endpoint)
+        ))
+
+    def _completion_kwargs(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any]) -> Dict[str, Any]:
+        """Chat completion arguments shared by the sync and async paths."""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self._build_system_prompt(context, constraints)},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+        }
+
+    def _parse_content(self, content: str) -> BrainResponse:
+        """Turn the model's reply text into a BrainResponse."""
+        try:
+            # Clean response
+            json_str = content.strip()
+            if "```json" in json_str:
+                json_str = json_str.split("```json")[1].split("```")[0].strip()
+            elif "```" in json_str:
+                json_str = json_str.split("```")[1].split("```")[0].strip()
+            
+            data = json.loads(json_str)
+            intent = data.get("intent")
+            arguments = data.get("arguments", {})
+            confidence = data.get("confidence", 0.0)
+            natural_response = data.get("natural_response")
+            
+            return self._build_success_response(
+                content=content,
+                confidence=confidence,
+                intent=intent,
+                arguments=arguments,
+                natural_response=natural_response
+            )
+        except json.JSONDecodeError:
+            return self._build_success_response(
+                content=content,
+                confidence=0.5,
+                natural_response=content
+            )
     
     def _build_system_prompt(self, context: Dict[str, Any], constraints: Dict[str, Any]) -> str:
         """Build system prompt for LM Studio."""
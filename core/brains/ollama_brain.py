@@ -5,6 +5,7 @@ Supports fully offline operation with local models.
 """
 
 from core.brains.base import BaseBrain
+from core.brains.transport import http_pool
 from core.brain_interface import (
     BrainCapability,
     BrainConfig,
@@ -28,6 +29,8 @@ class OllamaBrain(BaseBrain):
         self.model = config.config_data.get("model", "llama3")
         self.temperature = config.config_data.get("temperature", 0.2)
         self.max_tokens = config.config_data.get("max_tokens", 256)
+        self.context_window = config.config_data.get("context_window", 4096)
+        self._client = None
         
         # Detect capabilities based on model
         self._detect_capabilities()
@@ -38,6 +41,7 @@ class OllamaBrain(BaseBrain):
             BrainCapability.CHAT,
             BrainCapability.JSON_MODE,
             BrainCapability.OFFLINE,
+            BrainCapability.STREAMING,
             BrainCapability.WORKFLOW_PLANNING,
         ]
 
@@ -45,6 +49,13 @@ class OllamaBrain(BaseBrain):
         if "llava" in self.model.lower() or "vision" in self.model.lower():
             self.capabilities.append(BrainCapability.VISION)
     
+    def _get_client(self):
+        """Ollama client for self.host, sending through the shared connection pool."""
+        if self._client is None:
+            import ollama
+            self._client = ollama.Client(host=self.host, **http_pool.client_options(self.host))
+        return self._client
+    
     def get_capabilities(self) -> List[BrainCapability]:
         """Return Ollama capabilities."""
         return self.capabilities
@@ -53,19 +64,42 @@ class OllamaBrain(BaseBrain):
         """Ollama is fully local."""
         return PrivacyLevel.LOCAL
     
+    def _list_models(self) -> List[str]:
+        """Names of the models installed on the Ollama server."""
+        models_response = self._get_client().list()
+        # Handle different response formats (newer ollama-python versions return an object)
+        if hasattr(models_response, 'models'):
+            models = models_response.models
+            if not models:
+                return []
+            return [m.model for m in models] if hasattr(models[0], 'model') else [m.name for m in models]
+        return [model['name'] for model in models_response.get('models', [])]
+    
+    def ping(self) -> BrainHealth:
+        """Check the server lists the configured model, without running it."""
+        import time
+        start = time.time()
+        try:
+            available_models = self._list_models()
+        except Exception as e:
+            return BrainHealth(
+                status=BrainStatus.UNREACHABLE,
+                message=f"Cannot connect to Ollama at {self.host}: {str(e)}"
+            )
+        latency = (time.time() - start) * 1000
+        if self.model not in available_models:
+            return self.health_check()  # reports the missing model without inference
+        return BrainHealth(
+            status=BrainStatus.AVAILABLE,
+            message=f"Ollama ready with model '{self.model}'",
+            available_models=available_models,
+            latency_ms=latency
+        )
+    
     def health_check(self) -> BrainHealth:
         """Check Ollama server and model availability."""
         try:
-            import ollama
-            
-            # Try to list models
-            models_response = ollama.list()
-            # Handle different response formats (newer ollama-python versions return an object)
-            if hasattr(models_response, 'models'):
-                models = models_response.models
-                available_models = [m.model for m in models] if hasattr(models[0], 'model') else [m.name for m in models]
-            else:
-                available_models = [model['name'] for model in models_response.get('models', [])]
+            available_models = self._list_models()
             
             if not available_models:
                 return BrainHealth(
@@ -79,7 +113,7 @@ class OllamaBrain(BaseBrain):
                 import time
                 start = time.time()
                 try:
-                    ollama.chat(
+                    self._get_client().chat(
                         model=self.model,
                         messages=[{"role": "user", "content": "test"}],
                         options={"num_predict": 1}
@@ -133,6 +167,9 @@ class OllamaBrain(BaseBrain):
         self.model = config_data.get("model", self.model)
         self.temperature = config_data.get("temperature", self.temperature)
         self.max_tokens = config_data.get("max_tokens", self.max_tokens)
+        self.context_window = config_data.get("context_window", self.context_window)
+        self._client = None  # the host may have changed
+        self._reset_loop_clients()
         
         # Update underlying config object
         return super().update_config(config_data)
@@ -168,16 +205,22 @@ class OllamaBrain(BaseBrain):
                 "default": "4096",
                 "min": 256,
                 "max": 32768
+            },
+            {
+                "name": "context_window",
+                "type": "int",
+                "description": "Context window (num_ctx) in tokens",
+                "default": "4096",
+                "min": 2048,
+                "max": 131072
             }
         ]
 
     def plan_workflow(self, request: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Plan a multi-step workflow using Ollama."""
         try:
-            import ollama
-
             prompt = self._build_workflow_prompt(request, context)
-            response = ollama.chat(
+            response = self._get_client().chat(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 format="json",
@@ -191,55 +234,127 @@ class OllamaBrain(BaseBrain):
     def execute(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any]) -> BrainResponse:
         """Execute reasoning with Ollama."""
         try:
-            import ollama
-            
-            # Build system prompt
-            system_prompt = self._build_system_prompt(context, constraints)
-            
-            # Execute
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt}
-            ]
-            
-            response = ollama.chat(
-                model=self.model,
-                messages=messages,
-                format="json",
-                options={
-                    "temperature": self.temperature,
-                    "num_predict": self.max_tokens
-                }
-            )
-            
-            # Parse response
-            content = response['message']['content']
-            
-            # Try to parse JSON
-            try:
-                data = json.loads(content)
-                intent = data.get("intent")
-                arguments = data.get("arguments", {})
-                confidence = data.get("confidence", 0.0)
-                natural_response = data.get("natural_response")
-                
-                return self._build_success_response(
-                    content=content,
-                    confidence=confidence,
-                    intent=intent,
-                    arguments=arguments,
-                    natural_response=natural_response
-                )
-            except json.JSONDecodeError:
-                # Fallback if JSON parsing fails
-                return self._build_success_response(
-                    content=content,
-                    confidence=0.5,
-                    natural_response=content
-                )
+            response = self._get_client().chat(**self._chat_kwargs(prompt, context, constraints), format="json")
+            return self._parse_content(response['message']['content'])
                 
         except Exception as e:
             return self._build_error_response(f"Ollama execution error: {str(e)}")
+
+    def execute_stream(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any], cancel_token=None):
+        """
+        Stream a reply from Ollama as the model generates it.
+
+        Yields:
+            Dict with 'chunk' key containing the text chunk, or 'done' when complete
+        """
+        try:
+            stream = self._get_client().chat(**self._chat_kwargs(prompt, context, constraints), stream=True)
+            full_content = ""
+            tokens_used = None
+            try:
+                for part in self._until_cancelled(stream, cancel_token):
+                    content = part['message']['content']
+                    if content:
+                        full_content += content
+                        yield {"chunk": content}
+                    if part.get('done'):
+                        tokens_used = self._count_tokens(part)
+            finally:
+                stream.close()
+
+            yield self._build_done_frame(full_content, tokens_used=tokens_used)
+
+        except Exception as e:
+            yield {"error": str(e), "done": True}
+
+    @staticmethod
+    def _count_tokens(part) -> int:
+        """Prompt plus generated tokens from Ollama's final stream chunk."""
+        return (part.get('prompt_eval_count') or 0) + (part.get('eval_count') or 0)
+
+    async def execute_async(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any]) -> BrainResponse:
+        """Execute reasoning with Ollama's async client."""
+        try:
+            response = await self._get_async_client().chat(
+                **self._chat_kwargs(prompt, context, constraints), format="json"
+            )
+            return self._parse_content(response['message']['content'])
+        except Exception as e:
+            return self._build_error_response(f"Ollama execution error: {str(e)}")
+
+    async def execute_stream_async(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any], cancel_token=None):
+        """
+        Stream a reply from Ollama's async client.
+
+        Yields:
+            Dict with 'chunk' key containing the text chunk, or 'done' when complete
+        """
+        try:
+            stream = await self._get_async_client().chat(
+                **self._chat_kwargs(prompt, context, constraints), stream=True
+            )
+            full_content = ""
+            tokens_used = None
+            try:
+                async for part in self._until_cancelled_async(stream, cancel_token):
+                    content = part['message']['content']
+                    if content:
+                        full_content += content
+                        yield {"chunk": content}
+                    if part.get('done'):
+                        tokens_used = self._count_tokens(part)
+            finally:
+                await stream.aclose()
+
+            yield self._build_done_frame(full_content, tokens_used=tokens_used)
+
+        except Exception as e:
+            yield {"error": str(e), "done": True}
+
+    def _get_async_client(self):
+        import ollama
+        return self._get_loop_client(lambda: ollama.AsyncClient(
+            host=self.host, **http_pool.client_options(self.host, asynchronous=True)
+        ))
+
+    def _chat_kwargs(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any]) -> Dict[str, Any]:
+        """Chat arguments shared by the sync and async paths."""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self._build_system_prompt(context, constraints)},
+                {"role": "user", "content": prompt}
+            ],
+            "options": {
+                "temperature": self.temperature,
+                "num_predict": self.max_tokens,
+                "num_ctx": int(self.context_window)
+            },
+        }
+
+    def _parse_content(self, content: str) -> BrainResponse:
+        """Turn the model's reply text into a BrainResponse."""
+        try:
+            data = json.loads(content)
+            intent = data.get("intent")
+            arguments = data.get("arguments", {})
+            confidence = data.get("confidence", 0.0)
+            natural_response = data.get("natural_response")
+            
+            return self._build_success_response(
+                content=content,
+                confidence=confidence,
+                intent=intent,
+                arguments=arguments,
+                natural_response=natural_response
+            )
+        except json.JSONDecodeError:
+            # Fallback if JSON parsing fails
+            return self._build_success_response(
+                content=content,
+                confidence=0.5,
+                natural_response=content
+            )
     
     def _build_system_prompt(self, context: Dict[str, Any], constraints: Dict[str, Any]) -> str:
         """Build system prompt for Ollama."""
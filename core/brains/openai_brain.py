@@ -3,6 +3,7 @@ OpenAI Brain - Cloud LLM provider using OpenAI's API.
 """
 
 from core.brains.base import BaseBrain
+from core.brains.transport import OPENAI_API_URL, http_pool
 from core.brain_interface import (
     BrainCapability,
     BrainConfig,
@@ -35,7 +36,7 @@ class OpenAIBrain(BaseBrain):
         """Initialize OpenAI client."""
         try:
             from openai import OpenAI
-            self.client = OpenAI(api_key=self.api_key)
+            self.client = OpenAI(api_key=self.api_key, http_client=http_pool.client(OPENAI_API_URL))
         except ImportError:
             pass
         except Exception as e:
@@ -61,6 +62,27 @@ class OpenAIBrain(BaseBrain):
         """OpenAI is an external cloud provider."""
         return PrivacyLevel.EXTERNAL_CLOUD
     
+    def ping(self) -> BrainHealth:
+        """Check the API key and model with a model lookup instead of a completion."""
+        if not self.api_key:
+            return self.health_check()
+        if not self.client:
+            self._init_client()
+        if not self.client:
+            return self.health_check()  # reports the missing package
+        try:
+            import time
+            start = time.time()
+            self.client.models.retrieve(self.model)
+            latency = (time.time() - start) * 1000
+        except Exception as e:
+            return self._health_error(e)
+        return BrainHealth(
+            status=BrainStatus.AVAILABLE,
+            message=f"OpenAI ready with model '{self.model}'",
+            latency_ms=latency
+        )
+    
     def health_check(self) -> BrainHealth:
         """Check OpenAI API availability."""
         if not self.api_key:
@@ -98,16 +120,19 @@ class OpenAIBrain(BaseBrain):
                 message="OpenAI package not installed. Run: pip install openai"
             )
         except Exception as e:
-            error_msg = str(e)
-            if "authentication" in error_msg.lower() or "api key" in error_msg.lower():
-                return BrainHealth(
-                    status=BrainStatus.MISCONFIGURED,
-                    message=f"Invalid API key: {error_msg}"
-                )
+            return self._health_error(e)
+    
+    def _health_error(self, e: Exception) -> BrainHealth:
+        error_msg = str(e)
+        if "authentication" in error_msg.lower() or "api key" in error_msg.lower():
             return BrainHealth(
-                status=BrainStatus.UNREACHABLE,
-                message=f"Cannot connect to OpenAI: {error_msg}"
+                status=BrainStatus.MISCONFIGURED,
+                message=f"Invalid API key: {error_msg}"
             )
+        return BrainHealth(
+            status=BrainStatus.UNREACHABLE,
+            message=f"Cannot connect to OpenAI: {error_msg}"
+        )
     
     def execute(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any]) -> BrainResponse:
         """Execute reasoning with OpenAI."""
@@ -115,54 +140,76 @@ class OpenAIBrain(BaseBrain):
             if not self.client:
                 self._init_client()
             
-            # Build system prompt
-            system_prompt = self._build_system_prompt(context, constraints)
-            
-            # Execute
             response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=self.temperature,
+                **self._completion_kwargs(prompt, context, constraints),
                 response_format={"type": "json_object"}
             )
-            
-            content = response.choices[0].message.content
-            tokens_used = response.usage.total_tokens
-            
-            # Parse JSON
-            try:
-                data = json.loads(content)
-                intent = data.get("intent")
-                arguments = data.get("arguments", {})
-                confidence = data.get("confidence", 0.0)
-                natural_response = data.get("natural_response")
-                
-                # Estimate cost
-                cost = self._calculate_cost(response.usage.prompt_tokens, response.usage.completion_tokens)
-                
-                return self._build_success_response(
-                    content=content,
-                    confidence=confidence,
-                    intent=intent,
-                    arguments=arguments,
-                    natural_response=natural_response,
-                    tokens_used=tokens_used,
-                    cost_usd=cost
-                )
-            except json.JSONDecodeError:
-                return self._build_success_response(
-                    content=content,
-                    confidence=0.5,
-                    natural_response=content,
-                    tokens_used=tokens_used
-                )
+            return self._parse_completion(response)
                 
         except Exception as e:
             return self._build_error_response(f"OpenAI error: {str(e)}")
 
+    async def execute_async(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any]) -> BrainResponse:
+        """Execute reasoning with OpenAI's async client."""
+        try:
+            response = await self._get_async_client().chat.completions.create(
+                **self._completion_kwargs(prompt, context, constraints),
+                response_format={"type": "json_object"}
+            )
+            return self._parse_completion(response)
+        except Exception as e:
+            return self._build_error_response(f"OpenAI error: {str(e)}")
+
+    def _get_async_client(self):
+        from openai import AsyncOpenAI
+        return self._get_loop_client(lambda: AsyncOpenAI(
+            api_key=self.api_key, http_client=http_pool.async_client(OPENAI_API_URL)
+        ))
+
+    def _completion_kwargs(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any]) -> Dict[str, Any]:
+        """Chat completion arguments shared by the sync and async paths."""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self._build_system_prompt(context, constraints)},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": self.temperature,
+        }
+
+    def _parse_completion(self, response) -> BrainResponse:
+        """Turn a JSON-mode chat completion into a BrainResponse."""
+        content = response.choices[0].message.content
+        tokens_used = response.usage.total_tokens
+        
+        # Parse JSON
+        try:
+            data = json.loads(content)
+            intent = data.get("intent")
+            arguments = data.get("arguments", {})
+            confidence = data.get("confidence", 0.0)
+            natural_response = data.get("natural_response")
+            
+            # Estimate cost
+            cost = self._calculate_cost(response.usage.prompt_tokens, response.usage.completion_tokens)
+            
+            return self._build_success_response(
+                content=content,
+                confidence=confidence,
+                intent=intent,
+                arguments=arguments,
+                natural_response=natural_response,
+                tokens_used=tokens_used,
+                cost_usd=cost
+            )
+        except json.JSONDecodeError:
+            return self._build_success_response(
+                content=content,
+                confidence=0.5,
+                natural_response=content,
+                tokens_used=tokens_used
+            )
+
     def plan_workflow(self, request: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Plan a multi-step workflow using OpenAI."""
         try:
@@ -181,7 +228,7 @@ class OpenAIBrain(BaseBrain):
             print(f"OpenAIBrain workflow planning error: {e}")
             return None
 
-    def execute_stream(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any]):
+    def execute_stream(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any], cancel_token=None):
         """
         Execute streaming reasoning with OpenAI.
 
@@ -191,6 +238,7 @@ class OpenAIBrain(BaseBrain):
             prompt: User's input/query
             context: Additional context
             constraints: Execution constraints
+            cancel_token: Stops reading and closes the response when cancelled
 
         Yields:
             Dict with 'chunk' key containing the text chunk, or 'done' when complete
@@ -198,31 +246,65 @@ class OpenAIBrain(BaseBrain):
         if not self.client:
             self._init_client()
 
-        system_prompt = self._build_system_prompt(context, constraints)
-
         try:
             stream = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=self.temperature,
-                stream=True
+                **self._completion_kwargs(prompt, context, constraints),
+                stream=True,
+                stream_options={"include_usage": True}
             )
+            with stream, self._interrupt_on_cancel(cancel_token, stream.response):
+                full_content = ""
+                usage = None
+                for chunk in self._until_cancelled(stream, cancel_token):
+                    usage = chunk.usage or usage
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        content = chunk.choices[0].delta.content
+                        full_content += content
+                        yield {"chunk": content}
+
+            yield self._stream_done_frame(full_content, usage)
+
+        except Exception as e:
+            yield {"error": str(e), "done": True}
+
+    async def execute_stream_async(self, prompt: str, context: Dict[str, Any], constraints: Dict[str, Any], cancel_token=None):
+        """
+        Async variant of execute_stream() using OpenAI's async client.
 
-            full_content = ""
-            for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    content = chunk.choices[0].delta.content
-                    full_content += content
-                    yield {"chunk": content}
+        Closing the generator early closes the HTTP response.
+        """
+        try:
+            stream = await self._get_async_client().chat.completions.create(
+                **self._completion_kwargs(prompt, context, constraints),
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            async with stream:
+                with self._interrupt_on_cancel(cancel_token, stream.response):
+                    full_content = ""
+                    usage = None
+                    async for chunk in self._until_cancelled_async(stream, cancel_token):
+                        usage = chunk.usage or usage
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            content = chunk.choices[0].delta.content
+                            full_content += content
+                            yield {"chunk": content}
 
-            yield {"done": True, "full_content": full_content}
+            yield self._stream_done_frame(full_content, usage)
 
         except Exception as e:
             yield {"error": str(e), "done": True}
 
+    def _stream_done_frame(self, full_content: str, usage) -> Dict[str, Any]:
+        """Done frame with the usage chunk OpenAI sends last when include_usage is set."""
+        if usage is None:
+            return self._build_done_frame(full_content)
+        return self._build_done_frame(
+            full_content,
+            tokens_used=usage.total_tokens,
+            cost_usd=self._calculate_cost(usage.prompt_tokens, usage.completion_tokens)
+        )
+
     def estimate_cost(self, prompt: str) -> float:
         """Estimate cost for OpenAI."""
         # Rough token estimation (4 chars ≈ 1 token)
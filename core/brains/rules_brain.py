@@ -22,6 +22,14 @@ class RulesBrain(BaseBrain):
     
     Uses existing skill_manager intent matching and simple keyword extraction.
     """
+
+    # Fixed replies for unmatched queries (also prewarmed into the speech cache)
+    FALLBACK_RESPONSES = {
+        "greeting": "Hello! I'm running in rules-only mode. I can help with basic tasks like telling time or launching apps.",
+        "help": "I'm in rules-only mode, so I can only handle specific commands. Try asking for the time, date, or to launch an application.",
+        "thanks": "You're welcome!",
+        "default": "I couldn't find a direct match for that. I'm running in rules-only mode without LLM reasoning. Try a more specific command, or enable an LLM Brain in Settings.",
+    }
     
     def __init__(self, config: BrainConfig = None):
         if config is None:
@@ -105,13 +113,13 @@ class RulesBrain(BaseBrain):
         
         # Simple keyword-based responses
         if any(word in prompt_lower for word in ["hello", "hi", "hey"]):
-            return "Hello! I'm running in rules-only mode. I can help with basic tasks like telling time or launching apps."
+            return self.FALLBACK_RESPONSES["greeting"]
         
         if any(word in prompt_lower for word in ["help", "what can you do"]):
-            return "I'm in rules-only mode, so I can only handle specific commands. Try asking for the time, date, or to launch an application."
+            return self.FALLBACK_RESPONSES["help"]
         
         if any(word in prompt_lower for word in ["thank", "thanks"]):
-            return "You're welcome!"
+            return self.FALLBACK_RESPONSES["thanks"]
         
         # Default fallback
-        return "I couldn't find a direct match for that. I'm running in rules-only mode without LLM reasoning. Try a more specific command, or enable an LLM Brain in Settings."
+        return self.FALLBACK_RESPONSES["default"]
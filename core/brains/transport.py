@@ -0,0 +1,207 @@
+"""
+Shared HTTP transport for Brain providers and cloud TTS engines.
+
+Provides:
+- One connection pool per host (scheme, host, port) with keep-alive
+- HTTP/2 when the `h2` package is installed
+- Pool size, keep-alive and timeouts from config
+- Counters for requests, new connections and TLS handshakes per host
+
+SDKs that accept an httpx client (OpenAI, Anthropic, ElevenLabs) get one
+from client()/async_client(); Ollama builds its own client around the
+shared pool via client_options().
+"""
+
+import asyncio
+import atexit
+import importlib.util
+import threading
+import weakref
+from urllib.parse import urlsplit
+
+import httpx
+
+from core.config import config
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+OPENAI_API_URL = "https://api.openai.com/v1"
+ANTHROPIC_API_URL = "https://api.anthropic.com"
+ELEVENLABS_API_URL = "https://api.elevenlabs.io"
+
+
+def host_key(url: str) -> str:
+    """'scheme://host:port' for a URL; the unit of connection sharing."""
+    parts = urlsplit(url if "://" in url else f"http://{url}")
+    scheme = parts.scheme or "http"
+    return f"{scheme}://{parts.hostname}:{parts.port or DEFAULT_PORTS.get(scheme, 80)}"
+
+
+class _HostPool:
+    """Connection pools and counters for one host."""
+
+    def __init__(self, key, transport_options):
+        self.key = key
+        self._options = transport_options
+        self._lock = threading.Lock()
+        self._sync = None
+        self._sync_client = None
+        self._async = weakref.WeakKeyDictionary()  # event loop -> (transport, client)
+        self.requests = 0
+        self.connections = 0
+        self.tls_handshakes = 0
+
+    def _count(self, event):
+        with self._lock:
+            if event == "connection.connect_tcp.complete":
+                self.connections += 1
+            elif event == "connection.start_tls.complete":
+                self.tls_handshakes += 1
+
+    def _on_request(self, request):
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = lambda event, info: self._count(event)
+
+    async def _on_request_async(self, request):
+        async def trace(event, info):
+            self._count(event)
+
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = trace
+
+    def transport(self):
+        with self._lock:
+            if self._sync is None:
+                self._sync = httpx.HTTPTransport(**self._options)
+            return self._sync
+
+    def async_transport(self, loop):
+        with self._lock:
+            entry = self._async.get(loop)
+            if entry is None:
+                entry = (httpx.AsyncHTTPTransport(**self._options), None)
+                self._async[loop] = entry
+            return entry[0]
+
+    def client(self, timeout):
+        transport = self.transport()
+        with self._lock:
+            if self._sync_client is None:
+                self._sync_client = httpx.Client(
+                    transport=transport,
+                    timeout=timeout,
+                    event_hooks={"request": [self._on_request]},
+                )
+            return self._sync_client
+
+    def async_client(self, loop, timeout):
+        transport = self.async_transport(loop)
+        with self._lock:
+            _, client = self._async[loop]
+            if client is None:
+                client = httpx.AsyncClient(
+                    transport=transport,
+                    timeout=timeout,
+                    event_hooks={"request": [self._on_request_async]},
+                )
+                self._async[loop] = (transport, client)
+            return client
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "connections_opened": self.connections,
+                "connections_reused": max(self.requests - self.connections, 0),
+                "tls_handshakes": self.tls_handshakes,
+            }
+
+    def close(self):
+        with self._lock:
+            transport, self._sync_client, self._sync = self._sync, None, None
+        if transport:
+            transport.close()
+
+
+class HTTPPool:
+    """
+    Registry of per-host connection pools.
+
+    Sync clients are shared by every caller for a host. Async clients are
+    per event loop, since their connections belong to the loop that opened
+    them.
+    """
+
+    def __init__(self, pool_size=100, keepalive=20, keepalive_expiry=60.0,
+                 timeout=600.0, connect_timeout=5.0, http2=None):
+        if http2 is None:
+            http2 = importlib.util.find_spec("h2") is not None
+        self.http2 = http2
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self._transport_options = {
+            "limits": httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=keepalive,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            "http2": http2,
+        }
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host(self, url) -> _HostPool:
+        key = host_key(url)
+        with self._lock:
+            pool = self._hosts.get(key)
+            if pool is None:
+                pool = _HostPool(key, self._transport_options)
+                self._hosts[key] = pool
+            return pool
+
+    def client(self, url: str) -> httpx.Client:
+        """Shared httpx.Client for the host of url."""
+        return self._host(url).client(self.timeout)
+
+    def async_client(self, url: str) -> httpx.AsyncClient:
+        """httpx.AsyncClient for the host of url on the running event loop."""
+        return self._host(url).async_client(asyncio.get_running_loop(), self.timeout)
+
+    def client_options(self, url: str, asynchronous: bool = False) -> dict:
+        """
+        Keyword arguments for SDKs that build their own httpx client, so
+        it still sends through the shared pool and is counted.
+        """
+        pool = self._host(url)
+        if asynchronous:
+            transport = pool.async_transport(asyncio.get_running_loop())
+            hook = pool._on_request_async
+        else:
+            transport, hook = pool.transport(), pool._on_request
+        return {"transport": transport, "timeout": self.timeout, "event_hooks": {"request": [hook]}}
+
+    def stats(self) -> dict:
+        """Per-host request and connection counters."""
+        with self._lock:
+            pools = list(self._hosts.values())
+        return {
+            "http2": self.http2,
+            "hosts": {pool.key: pool.stats() for pool in pools},
+        }
+
+    def close(self):
+        """Close the sync pools; async pools are dropped with their event loop."""
+        with self._lock:
+            pools = list(self._hosts.values())
+        for pool in pools:
+            pool.close()
+
+
+http_pool = HTTPPool(
+    pool_size=config.HTTP_POOL_SIZE,
+    keepalive=config.HTTP_KEEPALIVE,
+    timeout=config.HTTP_TIMEOUT,
+    connect_timeout=config.HTTP_CONNECT_TIMEOUT,
+)
+atexit.register(http_pool.close)
@@ -20,11 +20,30 @@ class Config:
             "MODEL_NAME": os.getenv("LLM_MODEL", "gemini-1.5-flash"),
             "OLLAMA_HOST": os.getenv("OLLAMA_HOST", "http://localhost:11434"),
             "TTS_ENGINE": os.getenv("TTS_ENGINE", "gtts"),
+            "STT_ENGINE": os.getenv("STT_ENGINE", "google"),
+            "VOSK_MODEL": os.getenv("VOSK_MODEL", ""),
             "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", ""),
             "LANGUAGE": os.getenv("AVVA_LANG", "en-uk"),
             "PIPER_VOICE": os.getenv("PIPER_VOICE", "en_US-lessac-medium.onnx"),
             "TEMPERATURE": 0.7,
-            "CONTEXT_WINDOW": 8192
+            "CONTEXT_WINDOW": 8192,
+            "RESPONSE_CACHE": os.getenv("AVVA_RESPONSE_CACHE", "0") == "1",
+            "RESPONSE_CACHE_TTL": 3600,
+            "RESPONSE_CACHE_SIZE": 256,
+            "TTS_CACHE": os.getenv("AVVA_TTS_CACHE", "1") == "1",
+            "TTS_CACHE_MB": 100,
+            "HTTP_POOL_SIZE": 100,
+            "HTTP_KEEPALIVE": 20,
+            "HTTP_TIMEOUT": 600.0,
+            "HTTP_CONNECT_TIMEOUT": 5.0,
+            "BRAIN_HEALTH_INTERVAL": 60.0,
+            "BRAIN_HEDGING": os.getenv("AVVA_BRAIN_HEDGING", "0") == "1",
+            "BRAIN_HEDGE_PERCENTILE": 95.0,
+            "BRAIN_HEDGE_DELAY": 2.0,
+            "BRAIN_BREAKER_ERROR_RATE": 0.5,
+            "BRAIN_BREAKER_SLOW_MS": 30000.0,
+            "BRAIN_BREAKER_COOLDOWN": 5.0,
+            "BRAIN_BREAKER_MAX_COOLDOWN": 300.0
         }
         
         # Override with User Config
@@ -53,11 +72,30 @@ class Config:
         self.MODEL_NAME = merged["MODEL_NAME"]
         self.OLLAMA_HOST = merged["OLLAMA_HOST"]
         self.TTS_ENGINE = merged["TTS_ENGINE"]
+        self.STT_ENGINE = merged["STT_ENGINE"]
+        self.VOSK_MODEL = merged["VOSK_MODEL"]
         self.OPENAI_API_KEY = merged["OPENAI_API_KEY"]
         self.LANGUAGE = merged["LANGUAGE"]
         self.PIPER_VOICE = merged["PIPER_VOICE"]
         self.TEMPERATURE = merged["TEMPERATURE"]
         self.CONTEXT_WINDOW = merged["CONTEXT_WINDOW"]
+        self.RESPONSE_CACHE = merged["RESPONSE_CACHE"]
+        self.RESPONSE_CACHE_TTL = merged["RESPONSE_CACHE_TTL"]
+        self.RESPONSE_CACHE_SIZE = merged["RESPONSE_CACHE_SIZE"]
+        self.TTS_CACHE = merged["TTS_CACHE"]
+        self.TTS_CACHE_MB = merged["TTS_CACHE_MB"]
+        self.HTTP_POOL_SIZE = merged["HTTP_POOL_SIZE"]
+        self.HTTP_KEEPALIVE = merged["HTTP_KEEPALIVE"]
+        self.HTTP_TIMEOUT = merged["HTTP_TIMEOUT"]
+        self.HTTP_CONNECT_TIMEOUT = merged["HTTP_CONNECT_TIMEOUT"]
+        self.BRAIN_HEALTH_INTERVAL = merged["BRAIN_HEALTH_INTERVAL"]
+        self.BRAIN_HEDGING = merged["BRAIN_HEDGING"]
+        self.BRAIN_HEDGE_PERCENTILE = merged["BRAIN_HEDGE_PERCENTILE"]
+        self.BRAIN_HEDGE_DELAY = merged["BRAIN_HEDGE_DELAY"]
+        self.BRAIN_BREAKER_ERROR_RATE = merged["BRAIN_BREAKER_ERROR_RATE"]
+        self.BRAIN_BREAKER_SLOW_MS = merged["BRAIN_BREAKER_SLOW_MS"]
+        self.BRAIN_BREAKER_COOLDOWN = merged["BRAIN_BREAKER_COOLDOWN"]
+        self.BRAIN_BREAKER_MAX_COOLDOWN = merged["BRAIN_BREAKER_MAX_COOLDOWN"]
 
     def save_config(self, key, value):
         """Updates a setting and saves to JSON."""
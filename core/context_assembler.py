@@ -0,0 +1,271 @@
+"""
+Context Assembler - Token-budgeted conversation context for Brain queries.
+
+Provides:
+- Fast approximate token counting tuned per provider
+- An in-memory ring buffer of the active session, updated as messages arrive
+- A short-lived cache of recent session headers
+- Packing of the most relevant history into a Brain's real context budget
+"""
+
+import math
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+
+# Average characters per token for each provider's tokenizer family.
+# Close enough for budgeting; exact counts would need the provider's tokenizer.
+CHARS_PER_TOKEN = {
+    "openai": 4.0,
+    "claude": 3.5,
+    "google": 4.0,
+    "ollama": 3.6,
+    "lmstudio": 3.6,
+    "local": 4.0,
+}
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+# Context windows by model-name fragment, checked in order (first match wins)
+MODEL_CONTEXT_WINDOWS = [
+    ("gpt-4o", 128000),
+    ("gpt-4-turbo", 128000),
+    ("gpt-4.1", 1000000),
+    ("gpt-4", 8192),
+    ("gpt-3.5", 16385),
+    ("claude", 200000),
+    ("gemini-1.5-pro", 2000000),
+    ("gemini-1.5", 1000000),
+    ("gemini-2", 1000000),
+    ("gemini", 32768),
+]
+# Fallback per provider when the model is not listed. Ollama serves the
+# window OllamaBrain requests with num_ctx; LM Studio's depends on how the
+# model was loaded, so it uses the global CONTEXT_WINDOW.
+PROVIDER_CONTEXT_WINDOWS = {
+    "openai": 128000,
+    "claude": 200000,
+    "google": 32768,
+    "ollama": 4096,
+}
+
+# Tokens held back for the system prompt / tool descriptions
+SYSTEM_PROMPT_RESERVE = 1024
+DEFAULT_RESPONSE_RESERVE = 1024
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def estimate_tokens(text: str, provider: Optional[str] = None) -> int:
+    """
+    Approximate the token count of `text` for a provider.
+
+    Uses the larger of a character-ratio estimate and a word-based estimate,
+    which keeps short, word-dense strings and long unbroken strings (URLs,
+    code) from being undercounted.
+    """
+    if not text:
+        return 0
+    ratio = CHARS_PER_TOKEN.get((provider or "").lower(), DEFAULT_CHARS_PER_TOKEN)
+    by_chars = len(text) / ratio
+    by_words = len(_WORD_RE.findall(text)) * 1.3
+    return int(math.ceil(max(by_chars, by_words)))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, provider: Optional[str] = None) -> str:
+    """Cut `text` so that estimate_tokens() fits within max_tokens."""
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text, provider) <= max_tokens:
+        return text
+    ratio = CHARS_PER_TOKEN.get((provider or "").lower(), DEFAULT_CHARS_PER_TOKEN)
+    cut = max(int(max_tokens * ratio) - 3, 0)
+    while cut > 0 and estimate_tokens(text[:cut] + "...", provider) > max_tokens:
+        cut = int(cut * 0.9)
+    return text[:cut].rstrip() + "..." if cut > 0 else ""
+
+
+def context_window_for(brain=None, default: int = 8192) -> int:
+    """
+    Context window of `brain` in tokens.
+
+    A "context_window" in the Brain's config wins; otherwise it is looked
+    up from the model name, then the provider, then `default`.
+    """
+    if brain is None:
+        return default
+    config_data = getattr(getattr(brain, "config", None), "config_data", None) or {}
+    if config_data.get("context_window"):
+        return int(config_data["context_window"])
+    model = str(config_data.get("model") or getattr(brain, "model", "") or "").lower()
+    for fragment, window in MODEL_CONTEXT_WINDOWS:
+        if fragment in model:
+            return window
+    return PROVIDER_CONTEXT_WINDOWS.get((getattr(brain, "provider", "") or "").lower(), default)
+
+
+def context_budget_for(brain=None, context_window: int = 8192) -> int:
+    """
+    Tokens available for conversation history when prompting `brain`.
+
+    The Brain's context window (see context_window_for(); the global
+    CONTEXT_WINDOW when unknown) minus the space its response may use and
+    a reserve for the system prompt.
+    """
+    config_data = getattr(getattr(brain, "config", None), "config_data", None) or {}
+    window = context_window_for(brain, context_window)
+    response_reserve = int(config_data.get("max_tokens") or getattr(brain, "max_tokens", None)
+                           or DEFAULT_RESPONSE_RESERVE)
+    return max(window - response_reserve - SYSTEM_PROMPT_RESERVE, 256)
+
+
+class ContextAssembler:
+    """
+    Builds conversation context without re-querying SQLite on every call.
+
+    The active session's messages live in a bounded deque that Memory appends
+    to as messages are added; session headers are cached for a few seconds
+    and dropped whenever Memory changes a session.
+    """
+
+    def __init__(self, storage, ring_size: int = 200, header_ttl: float = 30.0):
+        self.storage = storage
+        self.ring_size = ring_size
+        self.header_ttl = header_ttl
+        self._lock = threading.Lock()
+        self._session_id = None
+        self._ring = deque(maxlen=ring_size)
+        self._headers = None
+        self._headers_limit = 0
+        self._headers_loaded_at = 0.0
+
+    # ----- Incremental invalidation -----
+
+    def set_session(self, session_id, preload: bool = True):
+        """Point the ring buffer at a session, loading its tail from storage."""
+        with self._lock:
+            if session_id == self._session_id:
+                return
+            self._session_id = session_id
+            self._ring = deque(maxlen=self.ring_size)
+            if preload and session_id:
+                messages = self.storage.get_session_messages(session_id, limit=self.ring_size)
+                self._ring.extend({"role": m["role"], "content": m["content"] or ""} for m in messages)
+            self._headers = None
+
+    def on_message_added(self, session_id, role, content):
+        """Record a new message without touching the database."""
+        with self._lock:
+            if session_id != self._session_id:
+                return
+            self._ring.append({"role": role, "content": content or ""})
+
+    def invalidate_headers(self):
+        """Drop cached session headers (title change, delete, pin...)."""
+        with self._lock:
+            self._headers = None
+
+    def reset(self):
+        """Forget everything; the next build reloads from storage."""
+        with self._lock:
+            self._session_id = None
+            self._ring = deque(maxlen=self.ring_size)
+            self._headers = None
+
+    # ----- Assembly -----
+
+    def _recent_headers(self, limit: int) -> List[Dict]:
+        now = time.monotonic()
+        with self._lock:
+            fresh = self._headers is not None and now - self._headers_loaded_at < self.header_ttl
+            if fresh and self._headers_limit >= limit:
+                return self._headers[:limit]
+        headers = self.storage.list_sessions(limit=limit)
+        with self._lock:
+            self._headers = headers
+            self._headers_limit = limit
+            self._headers_loaded_at = now
+        return headers
+
+    @staticmethod
+    def _overlap(query_terms, content: str) -> int:
+        if not query_terms:
+            return 0
+        return len(query_terms & set(_WORD_RE.findall(content.lower())))
+
+    def build(
+        self,
+        session_id,
+        budget_tokens: int,
+        provider: Optional[str] = None,
+        query: Optional[str] = None,
+        max_messages: Optional[int] = None,
+        include_sessions: int = 3,
+        keep_recent: int = 4,
+    ) -> str:
+        """
+        Pack session history into at most `budget_tokens` tokens.
+
+        The newest `keep_recent` messages are placed first; older messages
+        are then ranked by word overlap with `query` (ties broken by recency)
+        and added while they fit. Earlier session titles fill whatever room
+        remains. Output is in chronological order.
+        """
+        self.set_session(session_id)
+        with self._lock:
+            messages = list(self._ring)
+        if max_messages is not None:
+            messages = messages[-max_messages:] if max_messages > 0 else []
+
+        header = "Recent conversation:"
+        remaining = budget_tokens - estimate_tokens(header, provider)
+        lines = {}
+
+        def line_for(msg):
+            role_emoji = "👤" if msg["role"] == "user" else "🤖"
+            return f"{role_emoji} {msg['content']}"
+
+        newest_first = list(range(len(messages) - 1, -1, -1))
+        recent = newest_first[:keep_recent]
+        query_terms = set(_WORD_RE.findall(query.lower())) if query else set()
+        older = sorted(
+            newest_first[keep_recent:],
+            key=lambda i: (self._overlap(query_terms, messages[i]["content"]), i),
+            reverse=True
+        )
+
+        for position, idx in enumerate(recent + older):
+            if remaining <= 0:
+                break
+            line = line_for(messages[idx])
+            cost = estimate_tokens(line, provider)
+            if cost <= remaining:
+                lines[idx] = line
+                remaining -= cost
+            elif position == 0:
+                # Always keep (a truncated copy of) the latest message
+                line = truncate_to_tokens(line, remaining, provider)
+                if line:
+                    lines[idx] = line
+                    remaining -= estimate_tokens(line, provider)
+
+        parts = []
+        if lines:
+            parts.append(header)
+            parts.extend(lines[i] for i in sorted(lines))
+
+        if include_sessions > 0 and remaining > 0:
+            for session in self._recent_headers(include_sessions + 1):
+                if session["id"] == session_id:
+                    continue
+                updated = session["updated_at"].strftime('%Y-%m-%d %H:%M') if session["updated_at"] else "unknown"
+                line = f"\nEarlier session ({updated}): {session['title']}"
+                cost = estimate_tokens(line, provider)
+                if cost > remaining:
+                    break
+                parts.append(line)
+                remaining -= cost
+
+        return "\n".join(parts)
@@ -0,0 +1,237 @@
+"""
+Intent Matcher - Precompiled Tier 1/2 intent matching for SkillManager.
+
+Provides:
+- An Aho-Corasick automaton over static intent phrases
+- A required-literal prefilter so only plausible regex intents are searched
+- The exact priority rules of the original linear scan
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+
+class AhoCorasick:
+    """
+    Multi-phrase substring matcher.
+
+    `find_first(text)` returns the phrase with the lowest priority number
+    that occurs anywhere in `text`, in one pass over the text regardless of
+    how many phrases are registered; `find_all(text)` returns every
+    phrase index that occurs.
+    """
+
+    def __init__(self, phrases: List[str]):
+        # Node 0 is the root. goto[n] maps a character to the next node.
+        self._goto = [{}]
+        self._fail = [0]
+        self._best = [None]  # lowest phrase index ending at or suffix-linked from node
+        self._out = [[]]     # every phrase index ending at or suffix-linked from node
+        self._phrases = list(phrases)
+
+        for priority, phrase in enumerate(self._phrases):
+            node = 0
+            for ch in phrase:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(None)
+                    self._out.append([])
+                    self._goto[node][ch] = nxt
+                node = nxt
+            if self._best[node] is None:
+                self._best[node] = priority
+            self._out[node].append(priority)
+
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(ch, 0)
+                self._fail[child] = link if link != child else 0
+                # Fold the suffix's best match into this node (BFS order
+                # guarantees the suffix node is already final)
+                inherited = self._best[self._fail[child]]
+                if inherited is not None and (self._best[child] is None or inherited < self._best[child]):
+                    self._best[child] = inherited
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find_first(self, text: str) -> Optional[str]:
+        """Return the highest-priority phrase contained in `text`, or None."""
+        goto, fail, best_at = self._goto, self._fail, self._best
+        best = best_at[0]  # the empty phrase matches everything
+        if best == 0:
+            return self._phrases[0]
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            candidate = best_at[node]
+            if candidate is not None and (best is None or candidate < best):
+                best = candidate
+                if best == 0:
+                    break
+        return self._phrases[best] if best is not None else None
+
+    def find_all(self, text: str) -> set:
+        """Return the indices of all phrases contained in `text`."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set(out[0])
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+    from re import _constants as sre_constants
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_parse
+    import sre_constants
+
+
+# ASCII characters whose case-insensitive match includes a non-ASCII
+# character that str.lower() does not map back to them (e.g. "ſ" ~ "s")
+_UNSAFE_FOLD = set("is")
+
+_REPEAT_OPS = tuple(
+    getattr(sre_constants, name)
+    for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+    if hasattr(sre_constants, name)
+)
+
+
+def required_literal(compiled: re.Pattern) -> Optional[str]:
+    """
+    Longest run of literal characters every match of `compiled` contains.
+
+    Used only as a prefilter, so it errs on the side of returning None.
+    """
+    try:
+        parsed = sre_parse.parse(compiled.pattern, compiled.flags)
+    except Exception:
+        return None
+
+    runs = []
+
+    def walk(items):
+        run = []
+        for op, arg in items:
+            if op is sre_constants.LITERAL:
+                ch = chr(arg)
+                if ch.isascii() and ch.lower() not in _UNSAFE_FOLD:
+                    run.append(ch.lower())
+                    continue
+            elif op is sre_constants.SUBPATTERN:
+                walk(arg[-1])
+            elif op in _REPEAT_OPS:
+                if arg[0] >= 1:
+                    walk(arg[2])
+            elif op is sre_constants.AT:
+                continue  # zero-width anchors do not break a literal run
+            if run:
+                runs.append("".join(run))
+                run = []
+        if run:
+            runs.append("".join(run))
+
+    walk(parsed)
+    return max(runs, key=len) if runs else None
+
+
+class RegexIntentSet:
+    """
+    Ordered parametric intents with a literal prefilter.
+
+    Each pattern's required literal (if it has one) goes into one
+    Aho-Corasick automaton. A command is scanned once to find which
+    literals occur; only patterns whose literal is present, plus those
+    without one, are searched, in registration order. A pattern whose
+    required literal is absent cannot match, so the first hit is the same
+    as searching every pattern in turn.
+    """
+
+    def __init__(self, regex_intents: List[Tuple[re.Pattern, str]]):
+        self._intents = list(regex_intents)
+        self._unfiltered = []  # pattern indices that must always be searched
+        literal_owners = {}    # literal -> pattern indices requiring it
+        for index, (compiled, _) in enumerate(self._intents):
+            literal = required_literal(compiled)
+            if literal:
+                literal_owners.setdefault(literal, []).append(index)
+            else:
+                self._unfiltered.append(index)
+        self._literals = list(literal_owners)
+        self._owners = [literal_owners[literal] for literal in self._literals]
+        self._automaton = AhoCorasick(self._literals)
+
+    def candidates(self, text: str) -> List[int]:
+        """Indices of patterns that might match `text`, in priority order."""
+        found = list(self._unfiltered)
+        for literal_index in self._automaton.find_all(text):
+            found.extend(self._owners[literal_index])
+        found.sort()
+        return found
+
+    def match(self, text: str) -> Optional[Tuple[str, tuple]]:
+        """Return (template, groups) for the first matching pattern, or None."""
+        for index in self.candidates(text):
+            compiled, template = self._intents[index]
+            m = compiled.search(text)
+            if m:
+                return template, m.groups()
+        return None
+
+
+class IntentMatcher:
+    """
+    Compiled form of SkillManager's static and regex intents.
+
+    Priority is identical to the original lookup: an exact phrase match,
+    then the earliest-registered phrase contained in the command, then the
+    earliest-registered regex that matches.
+    """
+
+    def __init__(self, static_intents: Dict[str, str], regex_intents: List[Tuple[re.Pattern, str]],
+                 version: int = 0):
+        self.version = version
+        self._phrases = AhoCorasick(list(static_intents.keys()))
+        self._regexes = RegexIntentSet(regex_intents)
+
+    def is_stale(self, version: int) -> bool:
+        """True if the intents changed since compilation, i.e. their version moved on."""
+        return self.version != version
+
+    def match(self, cmd_clean: str, static_intents: Dict[str, str]):
+        """
+        Match a lowercased, stripped command.
+
+        Returns:
+            ("static", exec_str), ("regex", (template, groups)) or None
+        """
+        if cmd_clean in static_intents:
+            return "static", static_intents[cmd_clean]
+        phrase = self._phrases.find_first(cmd_clean)
+        if phrase is not None:
+            return "static", static_intents[phrase]
+        found = self._regexes.match(cmd_clean)
+        if found:
+            return "regex", found
+        return None
@@ -3,13 +3,15 @@ Memory System - Conversation memory and semantic recall for AVA.
 
 Provides:
 - Conversation session management
-- Semantic search across history
+- Keyword (FTS5) and semantic (vector) search across history
 - Context building for Brain queries
 """
 
 import uuid
 from core.persistence import storage
 from core.config import config
+from core.context_assembler import ContextAssembler, context_budget_for
+from core.semantic_index import semantic_index
 
 
 class Memory:
@@ -18,6 +20,7 @@ class Memory:
     def __init__(self):
         self.current_session_id = None
         self.session_title = None
+        self.context = ContextAssembler(storage)
 
     def start_session(self, title=None, brain_id=None):
         """Start a new conversation session."""
@@ -27,6 +30,8 @@ class Memory:
             brain_id=brain_id
         )
         self.session_title = title or "New Conversation"
+        # A brand-new session has no history to load
+        self.context.set_session(self.current_session_id, preload=False)
         return self.current_session_id
 
     def get_current_session(self):
@@ -36,9 +41,9 @@ class Memory:
         return self.current_session_id
 
     def add_message(self, role, content, brain_id=None, intent=None, tool_call=None):
-        """Add a message to the current session."""
+        """Add a message to the current session (written behind the request path)."""
         session_id = self.get_current_session()
-        storage.add_message(
+        storage.queue_message(
             session_id=session_id,
             role=role,
             content=content,
@@ -46,6 +51,8 @@ class Memory:
             intent=intent,
             tool_call=tool_call
         )
+        self.context.on_message_added(session_id, role, content)
+        semantic_index.schedule_sync()
 
     def add_user_message(self, content):
         """Add a user message to memory."""
@@ -67,34 +74,34 @@ class Memory:
         if self.session_title == "New Conversation":
             self._generate_smart_title()
 
-    def get_recent_context(self, max_messages=10, include_sessions=3):
+    def get_recent_context(self, max_messages=10, include_sessions=3, budget_tokens=None, brain=None, query=None):
         """
         Build context string from recent conversation history.
 
         Args:
             max_messages: Maximum messages to include from current session
+                (None packs as many as the budget allows)
             include_sessions: Number of recent sessions to include
+            budget_tokens: Token budget for the context (default: derived
+                from the brain's context window, else CONTEXT_WINDOW)
+            brain: Brain the context is for; sets budget and tokenizer estimate
+            query: Current user request, used to prefer relevant older messages
 
         Returns:
             Formatted context string for Brain queries
         """
-        context_parts = []
-
-        current_session = self.get_current_session()
-        messages = storage.get_session_messages(current_session, limit=max_messages)
-
-        if messages:
-            context_parts.append("Recent conversation:")
-            for msg in messages:
-                role_emoji = "👤" if msg['role'] == "user" else "🤖"
-                context_parts.append(f"{role_emoji} {msg['content'][:500]}")
-
-        recent_sessions = storage.list_sessions(limit=include_sessions + 1, offset=1)
-        for session in recent_sessions:
-            if session['id'] != current_session:
-                context_parts.append(f"\nEarlier session ({session['updated_at'].strftime('%Y-%m-%d %H:%M')}): {session['title']}")
-
-        return "\n".join(context_parts)
+        if budget_tokens is None:
+            budget_tokens = context_budget_for(brain, config.CONTEXT_WINDOW)
+        provider = getattr(brain, "provider", None)
+
+        return self.context.build(
+            self.get_current_session(),
+            budget_tokens,
+            provider=provider,
+            query=query,
+            max_messages=max_messages,
+            include_sessions=include_sessions
+        )
 
     def recall(self, query, max_results=5):
         """
@@ -105,23 +112,55 @@ class Memory:
             max_results: Maximum results to return
 
         Returns:
-            List of matching conversation summaries
+            List of matching conversation summaries, best match first
         """
         results = storage.search_conversations(query, limit=max_results)
 
         recalls = []
         for result in results:
-            messages = storage.get_session_messages(result['session_id'], limit=5)
             summary = {
                 'session_id': result['session_id'],
                 'title': result['title'],
-                'date': result['updated_at'].strftime('%Y-%m-%d %H:%M'),
-                'messages': [m['content'][:200] for m in messages]
+                'date': result['updated_at'].strftime('%Y-%m-%d %H:%M') if result['updated_at'] else '',
+                'snippet': result.get('snippet', ''),
+                'score': result.get('score', 0.0),
+                'messages': [result['snippet']] if result.get('snippet') else []
             }
             recalls.append(summary)
 
         return recalls
 
+    def semantic_recall(self, query, max_results=5):
+        """
+        Find past conversations by meaning rather than exact words.
+
+        Uses the local vector index; returns the same summary shape as
+        recall(), one entry per session, best match first.
+        """
+        hits = semantic_index.search(query, k=max_results * 4)
+        messages = storage.get_messages_by_ids([message_id for message_id, _ in hits])
+
+        recalls = []
+        seen_sessions = set()
+        for message_id, score in hits:
+            msg = messages.get(message_id)
+            if not msg or msg['session_id'] in seen_sessions:
+                continue  # deleted message or session already represented
+            seen_sessions.add(msg['session_id'])
+            snippet = msg['content'][:200]
+            recalls.append({
+                'session_id': msg['session_id'],
+                'title': msg['title'],
+                'date': msg['updated_at'].strftime('%Y-%m-%d %H:%M') if msg['updated_at'] else '',
+                'snippet': snippet,
+                'score': score,
+                'messages': [snippet]
+            })
+            if len(recalls) >= max_results:
+                break
+
+        return recalls
+
     def summarize_session(self, session_id=None, brain=None):
         """
         Generate a summary for a session using the Brain.
@@ -168,10 +207,15 @@ class Memory:
             storage.delete_session(session_id)
             if session_id == self.current_session_id:
                 self.current_session_id = None
+                self.context.reset()
+            else:
+                self.context.invalidate_headers()
 
     def toggle_pin(self, session_id):
         """Toggle pin status for a session."""
-        return storage.toggle_session_pin(session_id)
+        pinned = storage.toggle_session_pin(session_id)
+        self.context.invalidate_headers()
+        return pinned
 
     def export_conversation(self, session_id=None, format='markdown'):
         """
@@ -256,7 +300,9 @@ class Memory:
 
     def clear_old_sessions(self, days=30):
         """Delete sessions older than specified days."""
-        return storage.delete_old_sessions(days=days)
+        deleted = storage.delete_old_sessions(days=days)
+        self.context.invalidate_headers()
+        return deleted
 
     def get_stats(self):
         """Get memory statistics."""
@@ -280,6 +326,7 @@ class Memory:
         self.session_title = title
         # Update in database
         storage.update_session_title(self.current_session_id, title)
+        self.context.invalidate_headers()
 
     def _generate_smart_title(self):
         """Generate an intelligent title using the Brain."""
@@ -328,6 +375,7 @@ Title:"""
                 if title and len(title) > 3:
                     self.session_title = title
                     storage.update_session_title(self.current_session_id, title)
+                    self.context.invalidate_headers()
                     print(f"✨ Generated smart title: {title}")
         except Exception as e:
             print(f"Could not generate smart title, using fallback: {e}")
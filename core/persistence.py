@@ -1,236 +1,693 @@
 # MIT License - Copyright (c) 2026 Asigri Shamsu-Deen Al-Heyr
 import sqlite3
 import os
+import re
+import atexit
+import queue
+import threading
+import time
 import datetime
+from contextlib import contextmanager
 from pathlib import Path
 
+
+class ConnectionPool:
+    """
+    Bounded pool of long-lived SQLite connections shared by all Persistence calls.
+
+    Connections are opened lazily (up to `max_connections`), tuned once with
+    WAL-friendly pragmas and handed out to one thread at a time, so callers
+    skip the connect/close round trip and reuse sqlite3's per-connection
+    prepared-statement cache.
+    """
+
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA cache_size=-8000",       # ~8 MB page cache per connection
+        "PRAGMA mmap_size=67108864",     # 64 MB memory-mapped I/O
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA busy_timeout=5000",
+    )
+
+    def __init__(self, db_path, max_connections=4, cached_statements=256, timeout=10.0):
+        self.db_path = db_path
+        self.max_connections = max_connections
+        self.cached_statements = cached_statements
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._all = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _open(self):
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=self.cached_statements
+        )
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self):
+        """Borrow a connection, opening a new one if the pool is not yet full."""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._all) < self.max_connections:
+                conn = self._open()
+                self._all.append(conn)
+                return conn
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Timed out waiting for a pooled SQLite connection")
+
+    def release(self, conn):
+        """Return a borrowed connection to the pool."""
+        if self._closed:
+            conn.close()
+            return
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a `with` block."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    @contextmanager
+    def cursor(self):
+        """
+        Run a block inside a single transaction.
+
+        Commits when the block exits normally and rolls back on error.
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                yield cursor
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def close(self):
+        """Close every connection opened by the pool."""
+        with self._lock:
+            self._closed = True
+            connections, self._all = self._all, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+class WriteBehindQueue:
+    """
+    Background writer that batches `history` and `conversation_messages` inserts.
+
+    Callers on the request path only enqueue rows; a single daemon thread
+    drains the bounded queue and commits each batch in one transaction.
+    `flush()` blocks until everything enqueued before it has been written,
+    which Persistence uses to give readers read-your-writes semantics.
+
+    A batch that hits a locked or busy database is retried with backoff and,
+    if still failing, kept pending and retried on the next cycle. Rows
+    rejected for any other reason are written one at a time, and the ones
+    that still fail are kept in `failed` instead of being silently dropped.
+    """
+
+    _STOP = object()
+    RETRY_DELAYS = (0.1, 0.5, 1.0)  # seconds between attempts, on top of the pool's busy_timeout
+    RETRY_INTERVAL = 2.0  # seconds before a batch kept pending is tried again
+
+    def __init__(self, pool, max_pending=1000, batch_size=200):
+        self.pool = pool
+        self.batch_size = batch_size
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._pending_total = 0
+        self._pending_sessions = {}  # session_id -> queued message count
+        self._retry = []  # rows from a batch that could not be committed yet
+        self.failed = []  # (kind, session_id, params, error) rows given up on
+        self._thread = None
+        self._closed = False
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(
+                        target=self._run, name="avva-db-writer", daemon=True
+                    )
+                    self._thread.start()
+
+    def submit_history(self, params):
+        """Queue a row for the history table."""
+        self._submit(("history", None, params))
+
+    def submit_message(self, session_id, params):
+        """Queue a row for the conversation_messages table."""
+        self._submit(("message", session_id, params))
+
+    def _submit(self, item):
+        with self._lock:
+            self._pending_total += 1
+            if item[1] is not None:
+                self._pending_sessions[item[1]] = self._pending_sessions.get(item[1], 0) + 1
+        if self._closed:
+            self._commit([item], requeue=False)
+            return
+        self._ensure_started()
+        # Blocks when the queue is full, applying backpressure to producers
+        self._queue.put(item)
+
+    def has_pending(self, session_id=None):
+        """True if rows (optionally for one session) are still waiting to be written."""
+        if session_id is None:
+            return self._pending_total > 0
+        return self._pending_sessions.get(session_id, 0) > 0
+
+    def flush(self, timeout=None):
+        """
+        Block until every row queued so far has been written or attempted.
+
+        Rows kept for a retry after a locked database still count in
+        has_pending().
+        """
+        if self._pending_total == 0 or self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Flush outstanding rows and stop the writer thread."""
+        if self._closed:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join(timeout)
+        self._closed = True
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.RETRY_INTERVAL if self._retry else None)
+            except queue.Empty:
+                item = None
+            batch, waiters, stop = self._retry, [], False
+            self._retry = []
+            while item is not None:
+                if item is self._STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            if batch:
+                self._retry = self._commit(batch, requeue=not stop)
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+
+    def _commit(self, batch, requeue=True):
+        """
+        Write a batch and mark its rows done; returns the rows to retry later.
+
+        OperationalError (locked or busy database) is retried with backoff;
+        if it persists, the batch is returned for the next cycle when
+        `requeue` is set. Any other error falls back to one row at a time.
+        """
+        for delay in self.RETRY_DELAYS + (None,):
+            try:
+                self._write_batch(batch)
+                self._mark_done(batch)
+                return []
+            except sqlite3.OperationalError as e:
+                error = e
+                if delay is None:
+                    break
+                time.sleep(delay)
+            except Exception as e:
+                error = e
+                break
+
+        if isinstance(error, sqlite3.OperationalError):
+            if requeue:
+                print(f"⚠️ Write-behind batch of {len(batch)} row(s) failed, will retry: {error}")
+                return batch
+            self._give_up(batch, error)
+            return []
+
+        print(f"⚠️ Write-behind batch of {len(batch)} row(s) failed, writing rows one by one: {error}")
+        for item in batch:
+            try:
+                self._write_batch([item])
+                self._mark_done([item])
+            except Exception as e:
+                self._give_up([item], e)
+        return []
+
+    def _give_up(self, items, error):
+        """Record rows that cannot be written and stop counting them as pending."""
+        print(f"❌ Write-behind could not write {len(items)} row(s): {error}")
+        with self._lock:
+            self.failed.extend((*item, str(error)) for item in items)
+        self._mark_done(items)
+
+    def _write_batch(self, batch):
+        history_rows = [params for kind, _, params in batch if kind == "history"]
+        message_rows = [params for kind, _, params in batch if kind == "message"]
+        touched = {}
+        for kind, session_id, params in batch:
+            if kind == "message":
+                touched[session_id] = params[3]  # latest timestamp per session
+
+        with self.pool.cursor() as cursor:
+            if history_rows:
+                cursor.executemany('''
+                    INSERT INTO history (timestamp, sender, message, tool_call)
+                    VALUES (?, ?, ?, ?)
+                ''', history_rows)
+            if message_rows:
+                cursor.executemany('''
+                    INSERT INTO conversation_messages (session_id, role, content, timestamp, brain_id, intent, tool_call)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', message_rows)
+                cursor.executemany('''
+                    UPDATE conversation_sessions SET updated_at = ? WHERE id = ?
+                ''', [(ts, session_id) for session_id, ts in touched.items()])
+
+    def _mark_done(self, batch):
+        with self._lock:
+            self._pending_total -= len(batch)
+            for _, session_id, _ in batch:
+                if session_id is None:
+                    continue
+                remaining = self._pending_sessions.get(session_id, 0) - 1
+                if remaining > 0:
+                    self._pending_sessions[session_id] = remaining
+                else:
+                    self._pending_sessions.pop(session_id, None)
+
+
 class Persistence:
-    def __init__(self):
-        self.config_dir = Path.home() / ".config" / "avva"
-        self.db_path = self.config_dir / "avva.db"
+    def __init__(self, db_path=None, max_connections=4):
+        if db_path:
+            self.db_path = Path(db_path)
+            self.config_dir = self.db_path.parent
+        else:
+            self.config_dir = Path.home() / ".config" / "avva"
+            self.db_path = self.config_dir / "avva.db"
+        os.makedirs(self.config_dir, exist_ok=True)
+        self.pool = ConnectionPool(self.db_path, max_connections=max_connections)
+        self.writer = WriteBehindQueue(self.pool)
+        self._closing = threading.Event()
+        self._fts_backfill_thread = None
+        self._fts_ready = False
         self._init_db()
+        self._init_fts()
+        atexit.register(self.close)
+
+    def flush(self, timeout=None):
+        """Wait for queued history/message writes to reach the database."""
+        return self.writer.flush(timeout)
+
+    def close(self):
+        """Flush queued writes and release all pooled database connections."""
+        self._closing.set()
+        if self._fts_backfill_thread is not None:
+            self._fts_backfill_thread.join(5.0)
+        self.writer.close()
+        self.pool.close()
 
     def _init_db(self):
         """Creates the database and tables if they don't exist."""
-        os.makedirs(self.config_dir, exist_ok=True)
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Table for global permissions
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS global_permissions (
-                permission TEXT PRIMARY KEY,
-                granted_at DATETIME
-            )
-        ''')
-        
-        # Table for interaction history
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME,
-                sender TEXT,
-                message TEXT,
-                tool_call TEXT
-            )
-        ''')
-        
-        # Table for Brain configurations
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS brains (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                provider TEXT NOT NULL,
-                privacy_level TEXT NOT NULL,
-                config_json TEXT NOT NULL,
-                is_active INTEGER DEFAULT 0,
-                is_fallback INTEGER DEFAULT 0,
-                created_at DATETIME,
-                last_health_check DATETIME,
-                health_status TEXT,
-                health_message TEXT
-            )
-        ''')
-        
-        # Table for Brain capabilities
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS brain_capabilities (
-                brain_id TEXT,
-                capability TEXT,
-                FOREIGN KEY (brain_id) REFERENCES brains(id) ON DELETE CASCADE
-            )
-        ''')
-        
-        # Table for Brain usage tracking
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS brain_usage (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                brain_id TEXT,
-                timestamp DATETIME,
-                tokens_used INTEGER,
-                cost_usd REAL,
-                FOREIGN KEY (brain_id) REFERENCES brains(id) ON DELETE CASCADE
-            )
-        ''')
-
-        # Table for conversation sessions
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS conversation_sessions (
-                id TEXT PRIMARY KEY,
-                created_at DATETIME,
-                updated_at DATETIME,
-                title TEXT,
-                brain_id TEXT,
-                pinned INTEGER DEFAULT 0
+        with self.pool.cursor() as cursor:
+            # Table for global permissions
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS global_permissions (
+                    permission TEXT PRIMARY KEY,
+                    granted_at DATETIME
+                )
+            ''')
+
+            # Table for interaction history
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp DATETIME,
+                    sender TEXT,
+                    message TEXT,
+                    tool_call TEXT
+                )
+            ''')
+
+            # Table for Brain configurations
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS brains (
+                    id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    provider TEXT NOT NULL,
+                    privacy_level TEXT NOT NULL,
+                    config_json TEXT NOT NULL,
+                    is_active INTEGER DEFAULT 0,
+                    is_fallback INTEGER DEFAULT 0,
+                    created_at DATETIME,
+                    last_health_check DATETIME,
+                    health_status TEXT,
+                    health_message TEXT
+                )
+            ''')
+
+            # Table for Brain capabilities
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS brain_capabilities (
+                    brain_id TEXT,
+                    capability TEXT,
+                    FOREIGN KEY (brain_id) REFERENCES brains(id) ON DELETE CASCADE
+                )
+            ''')
+
+            # Table for Brain usage tracking
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS brain_usage (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    brain_id TEXT,
+                    timestamp DATETIME,
+                    tokens_used INTEGER,
+                    cost_usd REAL,
+                    FOREIGN KEY (brain_id) REFERENCES brains(id) ON DELETE CASCADE
+                )
+            ''')
+
+            # Table for conversation sessions
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS conversation_sessions (
+                    id TEXT PRIMARY KEY,
+                    created_at DATETIME,
+                    updated_at DATETIME,
+                    title TEXT,
+                    brain_id TEXT,
+                    pinned INTEGER DEFAULT 0
+                )
+            ''')
+
+            # Migrate existing conversation_sessions table to add pinned column if it doesn't exist
+            cursor.execute("PRAGMA table_info(conversation_sessions)")
+            columns = [column[1] for column in cursor.fetchall()]
+            if 'pinned' not in columns:
+                cursor.execute("ALTER TABLE conversation_sessions ADD COLUMN pinned INTEGER DEFAULT 0")
+                print("✓ Added 'pinned' column to conversation_sessions table")
+
+            # Table for conversation messages (richer than history)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS conversation_messages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id TEXT,
+                    role TEXT,
+                    content TEXT,
+                    timestamp DATETIME,
+                    brain_id TEXT,
+                    intent TEXT,
+                    tool_call TEXT,
+                    embedding TEXT,
+                    FOREIGN KEY (session_id) REFERENCES conversation_sessions(id) ON DELETE CASCADE
+                )
+            ''')
+
+            # Table for memory/recalls (for semantic search)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS memory_entries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    key TEXT,
+                    value TEXT,
+                    source TEXT,
+                    created_at DATETIME,
+                    expires_at DATETIME,
+                    embedding TEXT
+                )
+            ''')
+
+            # Table for settings
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS settings (
+                    key TEXT PRIMARY KEY,
+                    value TEXT,
+                    updated_at DATETIME
+                )
+            ''')
+
+            # Persistent tier of the Brain response cache
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS response_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    brain_id TEXT,
+                    response_json TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_response_cache_created ON response_cache(created_at)')
+
+    # ===== Full-Text Search Index =====
+
+    FTS_BACKFILL_CURSOR_KEY = "fts_backfill_cursor"
+    FTS_BACKFILL_TARGET_KEY = "fts_backfill_target"
+    FTS_BACKFILL_BATCH = 2000
+
+    def _init_fts(self):
+        """
+        Create the FTS5 index over conversation_messages and its sync triggers.
+
+        Databases that already hold messages are migrated online: the triggers
+        index every new row immediately while a background thread backfills
+        the pre-existing rows in small batches, resuming where it left off
+        after a restart.
+        """
+        with self.pool.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'conversation_messages_fts'"
             )
-        ''')
-
-        # Migrate existing conversation_sessions table to add pinned column if it doesn't exist
-        cursor.execute("PRAGMA table_info(conversation_sessions)")
-        columns = [column[1] for column in cursor.fetchall()]
-        if 'pinned' not in columns:
-            cursor.execute("ALTER TABLE conversation_sessions ADD COLUMN pinned INTEGER DEFAULT 0")
-            print("✓ Added 'pinned' column to conversation_sessions table")
-
-        # Table for conversation messages (richer than history)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS conversation_messages (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id TEXT,
-                role TEXT,
-                content TEXT,
-                timestamp DATETIME,
-                brain_id TEXT,
-                intent TEXT,
-                tool_call TEXT,
-                embedding TEXT,
-                FOREIGN KEY (session_id) REFERENCES conversation_sessions(id) ON DELETE CASCADE
+            is_new = cursor.fetchone() is None
+
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS conversation_messages_fts USING fts5(
+                    content,
+                    session_id UNINDEXED,
+                    tokenize = 'unicode61 remove_diacritics 2'
+                )
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS conversation_messages_fts_insert
+                AFTER INSERT ON conversation_messages BEGIN
+                    INSERT INTO conversation_messages_fts (rowid, content, session_id)
+                    VALUES (new.id, new.content, new.session_id);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS conversation_messages_fts_delete
+                AFTER DELETE ON conversation_messages BEGIN
+                    DELETE FROM conversation_messages_fts WHERE rowid = old.id;
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS conversation_messages_fts_update
+                AFTER UPDATE OF content, session_id ON conversation_messages BEGIN
+                    DELETE FROM conversation_messages_fts WHERE rowid = old.id;
+                    INSERT INTO conversation_messages_fts (rowid, content, session_id)
+                    VALUES (new.id, new.content, new.session_id);
+                END
+            ''')
+
+            if is_new:
+                # Rows that existed before the triggers must be backfilled
+                cursor.execute('SELECT COALESCE(MAX(id), 0) FROM conversation_messages')
+                target = cursor.fetchone()[0]
+                if target:
+                    now = datetime.datetime.now()
+                    cursor.executemany('''
+                        INSERT OR REPLACE INTO settings (key, value, updated_at)
+                        VALUES (?, ?, ?)
+                    ''', [
+                        (self.FTS_BACKFILL_CURSOR_KEY, "0", now),
+                        (self.FTS_BACKFILL_TARGET_KEY, str(target), now),
+                    ])
+                    print(f"🔎 Indexing {target} existing message(s) for full-text search...")
+
+        if not self.fts_ready():
+            self._fts_backfill_thread = threading.Thread(
+                target=self._run_fts_backfill, name="avva-fts-backfill", daemon=True
             )
-        ''')
-
-        # Table for memory/recalls (for semantic search)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS memory_entries (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                key TEXT,
-                value TEXT,
-                source TEXT,
-                created_at DATETIME,
-                expires_at DATETIME,
-                embedding TEXT
+            self._fts_backfill_thread.start()
+
+    def fts_ready(self):
+        """True once every pre-existing message has been added to the FTS index."""
+        if not self._fts_ready:
+            self._fts_ready = self.get_setting(self.FTS_BACKFILL_TARGET_KEY) is None
+        return self._fts_ready
+
+    def _run_fts_backfill(self):
+        """Backfill the FTS index in short transactions so writers are never starved."""
+        try:
+            while not self._closing.is_set():
+                if self.backfill_fts_step():
+                    print("🔎 Full-text index is up to date")
+                    return
+                self._closing.wait(0.05)
+        except Exception as e:
+            print(f"⚠️ Full-text index backfill failed: {e}")
+
+    def backfill_fts_step(self, batch_size=None):
+        """
+        Index the next batch of pre-existing messages.
+
+        Returns:
+            True when the backfill has finished.
+        """
+        batch_size = batch_size or self.FTS_BACKFILL_BATCH
+        with self.pool.cursor() as cursor:
+            cursor.execute(
+                'SELECT key, value FROM settings WHERE key IN (?, ?)',
+                (self.FTS_BACKFILL_CURSOR_KEY, self.FTS_BACKFILL_TARGET_KEY)
             )
-        ''')
-
-        # Table for settings
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS settings (
-                key TEXT PRIMARY KEY,
-                value TEXT,
-                updated_at DATETIME
+            state = dict(cursor.fetchall())
+            if self.FTS_BACKFILL_TARGET_KEY not in state:
+                return True
+            start = int(state.get(self.FTS_BACKFILL_CURSOR_KEY) or 0)
+            target = int(state[self.FTS_BACKFILL_TARGET_KEY])
+
+            cursor.execute('''
+                SELECT MAX(id) FROM (
+                    SELECT id FROM conversation_messages
+                    WHERE id > ? AND id <= ?
+                    ORDER BY id
+                    LIMIT ?
+                )
+            ''', (start, target, batch_size))
+            end = cursor.fetchone()[0]
+
+            if end is None:
+                cursor.execute(
+                    'DELETE FROM settings WHERE key IN (?, ?)',
+                    (self.FTS_BACKFILL_CURSOR_KEY, self.FTS_BACKFILL_TARGET_KEY)
+                )
+                return True
+
+            cursor.execute('''
+                INSERT OR REPLACE INTO conversation_messages_fts (rowid, content, session_id)
+                SELECT id, content, session_id FROM conversation_messages
+                WHERE id > ? AND id <= ?
+            ''', (start, end))
+            cursor.execute(
+                'UPDATE settings SET value = ?, updated_at = ? WHERE key = ?',
+                (str(end), datetime.datetime.now(), self.FTS_BACKFILL_CURSOR_KEY)
             )
-        ''')
+        return False
 
-        conn.commit()
-        conn.close()
+    @staticmethod
+    def _build_fts_query(query):
+        """Turn free text into a safe FTS5 MATCH expression (all terms, last one as prefix)."""
+        terms = re.findall(r"\w+", query or "")
+        if not terms:
+            return None
+        quoted = [f'"{term}"' for term in terms]
+        quoted[-1] += "*"
+        return " ".join(quoted)
 
     def save_permission(self, permission):
         """Saves a globally granted permission to the database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        try:
+        with self.pool.cursor() as cursor:
             cursor.execute('''
                 INSERT OR IGNORE INTO global_permissions (permission, granted_at)
                 VALUES (?, ?)
             ''', (permission, datetime.datetime.now()))
-            conn.commit()
-        finally:
-            conn.close()
 
     def revoke_permission(self, permission):
         """Removes a globally granted permission from the database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        try:
+        with self.pool.cursor() as cursor:
             cursor.execute('''
                 DELETE FROM global_permissions WHERE permission = ?
             ''', (permission,))
-            conn.commit()
-        finally:
-            conn.close()
 
     def get_allowed_permissions(self):
         """Returns a list of all globally granted permissions."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT permission FROM global_permissions')
-        # Returns list of strings [perm1, perm2]
-        perms = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return perms
+        with self.pool.cursor() as cursor:
+            cursor.execute('SELECT permission FROM global_permissions')
+            # Returns list of strings [perm1, perm2]
+            return [row[0] for row in cursor.fetchall()]
 
     def log_interaction(self, sender, message, tool_call=None):
-        """Logs an interaction to the history table."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        try:
-            cursor.execute('''
-                INSERT INTO history (timestamp, sender, message, tool_call)
-                VALUES (?, ?, ?, ?)
-            ''', (datetime.datetime.now(), sender, message, tool_call))
-            conn.commit()
-        finally:
-            conn.close()
-    
+        """Queues an interaction for the history table (written in the background)."""
+        self.writer.submit_history((datetime.datetime.now(), sender, message, tool_call))
+
     # ===== Brain Configuration Methods =====
-    
+
     def save_brain_config(self, brain_id, name, provider, privacy_level, config_data, capabilities):
         """Save or update a Brain configuration."""
         import json
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
         try:
-            # Insert or replace Brain config
-            cursor.execute('''
-                INSERT OR REPLACE INTO brains 
-                (id, name, provider, privacy_level, config_json, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (brain_id, name, provider, privacy_level, json.dumps(config_data), datetime.datetime.now()))
-            
-            # Delete old capabilities
-            cursor.execute('DELETE FROM brain_capabilities WHERE brain_id = ?', (brain_id,))
-            
-            # Insert new capabilities
-            for capability in capabilities:
+            with self.pool.cursor() as cursor:
+                # Insert or replace Brain config
                 cursor.execute('''
+                    INSERT OR REPLACE INTO brains
+                    (id, name, provider, privacy_level, config_json, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (brain_id, name, provider, privacy_level, json.dumps(config_data), datetime.datetime.now()))
+
+                # Delete old capabilities
+                cursor.execute('DELETE FROM brain_capabilities WHERE brain_id = ?', (brain_id,))
+
+                # Insert new capabilities
+                cursor.executemany('''
                     INSERT INTO brain_capabilities (brain_id, capability)
                     VALUES (?, ?)
-                ''', (brain_id, capability))
-            
-            conn.commit()
+                ''', [(brain_id, capability) for capability in capabilities])
             return True
         except Exception as e:
             print(f"Error saving Brain config: {e}")
             return False
-        finally:
-            conn.close()
-    
+
     def load_brain_configs(self):
         """Load all Brain configurations."""
         import json
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM brains')
-        rows = cursor.fetchall()
-        
+        with self.pool.cursor() as cursor:
+            cursor.execute('SELECT * FROM brains')
+            rows = cursor.fetchall()
+
+            # Load all capabilities in one pass instead of one query per Brain
+            cursor.execute('SELECT brain_id, capability FROM brain_capabilities')
+            capabilities_by_brain = {}
+            for brain_id, capability in cursor.fetchall():
+                capabilities_by_brain.setdefault(brain_id, []).append(capability)
+
         brains = []
         for row in rows:
             brain_id, name, provider, privacy_level, config_json, is_active, is_fallback, created_at, last_health_check, health_status, health_message = row
-            
-            # Load capabilities
-            cursor.execute('SELECT capability FROM brain_capabilities WHERE brain_id = ?', (brain_id,))
-            capabilities = [cap[0] for cap in cursor.fetchall()]
-            
+
             brains.append({
                 'id': brain_id,
                 'name': name,
@@ -239,115 +696,90 @@ class Persistence:
                 'config_data': json.loads(config_json),
                 'is_active': bool(is_active),
                 'is_fallback': bool(is_fallback),
-                'capabilities': capabilities,
+                'capabilities': capabilities_by_brain.get(brain_id, []),
                 'health_status': health_status,
                 'health_message': health_message
             })
-        
-        conn.close()
+
         return brains
-    
+
     def delete_brain_config(self, brain_id):
         """Delete a Brain configuration."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
         try:
-            cursor.execute('DELETE FROM brains WHERE id = ?', (brain_id,))
-            conn.commit()
+            with self.pool.cursor() as cursor:
+                cursor.execute('DELETE FROM brains WHERE id = ?', (brain_id,))
             return True
         except Exception as e:
             print(f"Error deleting Brain config: {e}")
             return False
-        finally:
-            conn.close()
-    
+
     def set_active_brain(self, brain_id):
         """Set the active Brain."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
         try:
-            # Clear all active flags
-            cursor.execute('UPDATE brains SET is_active = 0')
-            # Set new active
-            cursor.execute('UPDATE brains SET is_active = 1 WHERE id = ?', (brain_id,))
-            conn.commit()
+            with self.pool.cursor() as cursor:
+                # Clear all active flags
+                cursor.execute('UPDATE brains SET is_active = 0')
+                # Set new active
+                cursor.execute('UPDATE brains SET is_active = 1 WHERE id = ?', (brain_id,))
             return True
         except Exception as e:
             print(f"Error setting active Brain: {e}")
             return False
-        finally:
-            conn.close()
-    
+
     def set_fallback_brain(self, brain_id):
         """Set the fallback Brain."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
         try:
-            # Clear all fallback flags
-            cursor.execute('UPDATE brains SET is_fallback = 0')
-            # Set new fallback
-            cursor.execute('UPDATE brains SET is_fallback = 1 WHERE id = ?', (brain_id,))
-            conn.commit()
+            with self.pool.cursor() as cursor:
+                # Clear all fallback flags
+                cursor.execute('UPDATE brains SET is_fallback = 0')
+                # Set new fallback
+                cursor.execute('UPDATE brains SET is_fallback = 1 WHERE id = ?', (brain_id,))
             return True
         except Exception as e:
             print(f"Error setting fallback Brain: {e}")
             return False
-        finally:
-            conn.close()
-    
+
     def update_brain_health(self, brain_id, status, message):
         """Update Brain health check status."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
         try:
-            cursor.execute('''
-                UPDATE brains 
-                SET last_health_check = ?, health_status = ?, health_message = ?
-                WHERE id = ?
-            ''', (datetime.datetime.now(), status, message, brain_id))
-            conn.commit()
+            with self.pool.cursor() as cursor:
+                cursor.execute('''
+                    UPDATE brains
+                    SET last_health_check = ?, health_status = ?, health_message = ?
+                    WHERE id = ?
+                ''', (datetime.datetime.now(), status, message, brain_id))
             return True
         except Exception as e:
             print(f"Error updating Brain health: {e}")
             return False
-        finally:
-            conn.close()
-    
+
     def log_brain_usage(self, brain_id, tokens_used, cost_usd):
         """Log Brain usage for tracking."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
         try:
-            cursor.execute('''
-                INSERT INTO brain_usage (brain_id, timestamp, tokens_used, cost_usd)
-                VALUES (?, ?, ?, ?)
-            ''', (brain_id, datetime.datetime.now(), tokens_used, cost_usd))
-            conn.commit()
+            with self.pool.cursor() as cursor:
+                cursor.execute('''
+                    INSERT INTO brain_usage (brain_id, timestamp, tokens_used, cost_usd)
+                    VALUES (?, ?, ?, ?)
+                ''', (brain_id, datetime.datetime.now(), tokens_used, cost_usd))
             return True
         except Exception as e:
             print(f"Error logging Brain usage: {e}")
             return False
-        finally:
-            conn.close()
-    
+
     def get_brain_stats(self, brain_id, days=30):
         """Get usage statistics for a Brain."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
         cutoff = datetime.datetime.now() - datetime.timedelta(days=days)
 
-        cursor.execute('''
-            SELECT
-                COUNT(*) as request_count,
-                SUM(tokens_used) as total_tokens,
-                SUM(cost_usd) as total_cost
-            FROM brain_usage
-            WHERE brain_id = ? AND timestamp > ?
-        ''', (brain_id, cutoff))
-
-        row = cursor.fetchone()
-        conn.close()
+        with self.pool.cursor() as cursor:
+            cursor.execute('''
+                SELECT
+                    COUNT(*) as request_count,
+                    SUM(tokens_used) as total_tokens,
+                    SUM(cost_usd) as total_cost
+                FROM brain_usage
+                WHERE brain_id = ? AND timestamp > ?
+            ''', (brain_id, cutoff))
+            row = cursor.fetchone()
 
         if row:
             return {
@@ -362,68 +794,71 @@ class Persistence:
     def create_session(self, session_id=None, title=None, brain_id=None):
         """Create a new conversation session."""
         import uuid
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        try:
-            session_id = session_id or str(uuid.uuid4())
-            now = datetime.datetime.now()
+        session_id = session_id or str(uuid.uuid4())
+        now = datetime.datetime.now()
+        with self.pool.cursor() as cursor:
             cursor.execute('''
                 INSERT INTO conversation_sessions (id, created_at, updated_at, title, brain_id)
                 VALUES (?, ?, ?, ?, ?)
             ''', (session_id, now, now, title or "New Conversation", brain_id))
-            conn.commit()
-            return session_id
-        finally:
-            conn.close()
+        return session_id
 
     def add_message(self, session_id, role, content, brain_id=None, intent=None, tool_call=None):
         """Add a message to a conversation session."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        try:
-            now = datetime.datetime.now()
+        now = datetime.datetime.now()
+        with self.pool.cursor() as cursor:
             cursor.execute('''
                 INSERT INTO conversation_messages (session_id, role, content, timestamp, brain_id, intent, tool_call)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
             ''', (session_id, role, content, now, brain_id, intent, tool_call))
+            message_id = cursor.lastrowid
             cursor.execute('''
                 UPDATE conversation_sessions SET updated_at = ? WHERE id = ?
             ''', (now, session_id))
-            conn.commit()
-            return cursor.lastrowid
-        finally:
-            conn.close()
+        return message_id
+
+    def queue_message(self, session_id, role, content, brain_id=None, intent=None, tool_call=None):
+        """
+        Add a message without waiting for the database write.
+
+        The row is batched by the write-behind queue; readers of this session
+        flush it first, so it is visible to the next get_session_messages().
+        """
+        now = datetime.datetime.now()
+        self.writer.submit_message(
+            session_id,
+            (session_id, role, content, now, brain_id, intent, tool_call)
+        )
+
+    def _sync_reads(self, session_id=None):
+        """Flush queued writes a read is about to depend on."""
+        if self.writer.has_pending(session_id):
+            self.writer.flush()
 
     def get_session(self, session_id):
         """Get a conversation session by ID."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        try:
+        with self.pool.cursor() as cursor:
             cursor.execute('''
                 SELECT id, created_at, updated_at, title, brain_id, pinned
                 FROM conversation_sessions WHERE id = ?
             ''', (session_id,))
             row = cursor.fetchone()
-            if row:
-                from datetime import datetime
-                return {
-                    'id': row[0],
-                    'created_at': datetime.fromisoformat(row[1]) if row[1] else None,
-                    'updated_at': datetime.fromisoformat(row[2]) if row[2] else None,
-                    'title': row[3],
-                    'brain_id': row[4],
-                    'pinned': bool(row[5]) if len(row) > 5 else False
-                }
-            return None
-        finally:
-            conn.close()
+        if row:
+            from datetime import datetime
+            return {
+                'id': row[0],
+                'created_at': datetime.fromisoformat(row[1]) if row[1] else None,
+                'updated_at': datetime.fromisoformat(row[2]) if row[2] else None,
+                'title': row[3],
+                'brain_id': row[4],
+                'pinned': bool(row[5]) if len(row) > 5 else False
+            }
+        return None
 
     def get_session_messages(self, session_id, limit=100):
         """Get all messages in a conversation session."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        try:
+        self._sync_reads(session_id)
+        with self.pool.cursor() as cursor:
             cursor.execute('''
                 SELECT id, role, content, timestamp, brain_id, intent, tool_call
                 FROM conversation_messages
@@ -432,24 +867,56 @@ class Persistence:
                 LIMIT ?
             ''', (session_id, limit))
             rows = cursor.fetchall()
-            from datetime import datetime
-            return [{
-                'id': row[0],
-                'role': row[1],
-                'content': row[2],
-                'timestamp': datetime.fromisoformat(row[3]) if row[3] else None,
-                'brain_id': row[4],
-                'intent': row[5],
-                'tool_call': row[6]
-            } for row in rows]
-        finally:
-            conn.close()
+        from datetime import datetime
+        return [{
+            'id': row[0],
+            'role': row[1],
+            'content': row[2],
+            'timestamp': datetime.fromisoformat(row[3]) if row[3] else None,
+            'brain_id': row[4],
+            'intent': row[5],
+            'tool_call': row[6]
+        } for row in rows]
+
+    def get_messages_after(self, message_id, limit=500):
+        """Return (id, content) pairs for messages newer than message_id, oldest first."""
+        self._sync_reads()
+        with self.pool.cursor() as cursor:
+            cursor.execute('''
+                SELECT id, content FROM conversation_messages
+                WHERE id > ?
+                ORDER BY id
+                LIMIT ?
+            ''', (message_id, limit))
+            return cursor.fetchall()
+
+    def get_messages_by_ids(self, message_ids):
+        """Fetch messages (with their session title) for a list of message ids."""
+        if not message_ids:
+            return {}
+        placeholders = ",".join("?" * len(message_ids))
+        with self.pool.cursor() as cursor:
+            cursor.execute(f'''
+                SELECT m.id, m.session_id, m.role, m.content, s.title, s.updated_at
+                FROM conversation_messages m
+                JOIN conversation_sessions s ON s.id = m.session_id
+                WHERE m.id IN ({placeholders})
+            ''', list(message_ids))
+            rows = cursor.fetchall()
+        from datetime import datetime
+        return {row[0]: {
+            'id': row[0],
+            'session_id': row[1],
+            'role': row[2],
+            'content': row[3],
+            'title': row[4],
+            'updated_at': datetime.fromisoformat(row[5]) if row[5] else None
+        } for row in rows}
 
     def list_sessions(self, limit=50, offset=0):
         """List recent conversation sessions, pinned first."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        try:
+        self._sync_reads()
+        with self.pool.cursor() as cursor:
             cursor.execute('''
                 SELECT id, created_at, updated_at, title, brain_id, COALESCE(pinned, 0) as pinned
                 FROM conversation_sessions
@@ -457,148 +924,208 @@ class Persistence:
                 LIMIT ? OFFSET ?
             ''', (limit, offset))
             rows = cursor.fetchall()
-            from datetime import datetime
-            return [{
-                'id': row[0],
-                'created_at': datetime.fromisoformat(row[1]) if row[1] else None,
-                'updated_at': datetime.fromisoformat(row[2]) if row[2] else None,
-                'title': row[3],
-                'brain_id': row[4],
-                'pinned': bool(row[5])
-            } for row in rows]
-        finally:
-            conn.close()
+        from datetime import datetime
+        return [{
+            'id': row[0],
+            'created_at': datetime.fromisoformat(row[1]) if row[1] else None,
+            'updated_at': datetime.fromisoformat(row[2]) if row[2] else None,
+            'title': row[3],
+            'brain_id': row[4],
+            'pinned': bool(row[5])
+        } for row in rows]
 
     def search_conversations(self, query, limit=10):
-        """Search conversations by content (simple LIKE search)."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        try:
-            search_term = f"%{query}%"
+        """
+        Search conversations by content.
+
+        Uses the FTS5 index: results are ranked by BM25, one row per session
+        (its best matching message), each with a highlighted snippet. Every
+        match takes part in the per-session ranking, so a session is not lost
+        behind another session's many hits; snippets are only built for the
+        sessions returned. Falls back to a LIKE scan while the index is still
+        being backfilled.
+        """
+        self._sync_reads()
+        match = self._build_fts_query(query)
+        if match is None or not self.fts_ready():
+            return self._search_conversations_like(query, limit)
+
+        with self.pool.cursor() as cursor:
+            cursor.execute('''
+                WITH hits AS (
+                    SELECT rowid AS message_id, session_id, rank AS score,
+                           ROW_NUMBER() OVER (PARTITION BY session_id ORDER BY rank) AS pos
+                    FROM conversation_messages_fts
+                    WHERE conversation_messages_fts MATCH ?
+                ),
+                best AS (
+                    SELECT * FROM hits
+                    WHERE pos = 1
+                    ORDER BY score
+                    LIMIT ?
+                )
+                SELECT b.session_id, s.title, s.updated_at,
+                       snippet(conversation_messages_fts, 0, '[', ']', '…', 12), b.score, b.message_id
+                FROM best b
+                JOIN conversation_messages_fts ON conversation_messages_fts.rowid = b.message_id
+                JOIN conversation_sessions s ON s.id = b.session_id
+                WHERE conversation_messages_fts MATCH ?
+                ORDER BY b.score
+            ''', (match, limit, match))
+            rows = cursor.fetchall()
+        from datetime import datetime
+        return [{
+            'session_id': row[0],
+            'title': row[1],
+            'updated_at': datetime.fromisoformat(row[2]) if row[2] else None,
+            'snippet': row[3],
+            'score': -row[4],  # bm25() is lower-is-better; expose higher-is-better
+            'message_id': row[5]
+        } for row in rows]
+
+    def _search_conversations_like(self, query, limit=10):
+        """Legacy substring search, used until the FTS index is ready."""
+        search_term = f"%{query}%"
+        with self.pool.cursor() as cursor:
             cursor.execute('''
-                SELECT DISTINCT m.session_id, s.title, s.updated_at
+                SELECT m.session_id, s.title, s.updated_at, MIN(m.content)
                 FROM conversation_messages m
                 JOIN conversation_sessions s ON m.session_id = s.id
                 WHERE m.content LIKE ?
+                GROUP BY m.session_id
                 ORDER BY s.updated_at DESC
                 LIMIT ?
             ''', (search_term, limit))
             rows = cursor.fetchall()
-            from datetime import datetime
-            return [{
-                'session_id': row[0],
-                'title': row[1],
-                'updated_at': datetime.fromisoformat(row[2]) if row[2] else None
-            } for row in rows]
-        finally:
-            conn.close()
+        from datetime import datetime
+        return [{
+            'session_id': row[0],
+            'title': row[1],
+            'updated_at': datetime.fromisoformat(row[2]) if row[2] else None,
+            'snippet': (row[3] or '')[:200],
+            'score': 0.0,
+            'message_id': None
+        } for row in rows]
 
     def update_session_title(self, session_id, title):
         """Update a session's title."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
         try:
             now = datetime.datetime.now()
-            cursor.execute('''
-                UPDATE conversation_sessions
-                SET title = ?, updated_at = ?
-                WHERE id = ?
-            ''', (title, now, session_id))
-            conn.commit()
+            with self.pool.cursor() as cursor:
+                cursor.execute('''
+                    UPDATE conversation_sessions
+                    SET title = ?, updated_at = ?
+                    WHERE id = ?
+                ''', (title, now, session_id))
             return True
         except Exception as e:
             print(f"Error updating session title: {e}")
             return False
-        finally:
-            conn.close()
 
     def toggle_session_pin(self, session_id):
         """Toggle pin status for a session."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
         try:
-            # Get current pin status
-            cursor.execute('SELECT COALESCE(pinned, 0) FROM conversation_sessions WHERE id = ?', (session_id,))
-            row = cursor.fetchone()
-            if row:
-                current_pinned = bool(row[0])
-                new_pinned = 0 if current_pinned else 1
-                cursor.execute('''
-                    UPDATE conversation_sessions
-                    SET pinned = ?
-                    WHERE id = ?
-                ''', (new_pinned, session_id))
-                conn.commit()
-                return bool(new_pinned)
+            with self.pool.cursor() as cursor:
+                # Get current pin status
+                cursor.execute('SELECT COALESCE(pinned, 0) FROM conversation_sessions WHERE id = ?', (session_id,))
+                row = cursor.fetchone()
+                if row:
+                    current_pinned = bool(row[0])
+                    new_pinned = 0 if current_pinned else 1
+                    cursor.execute('''
+                        UPDATE conversation_sessions
+                        SET pinned = ?
+                        WHERE id = ?
+                    ''', (new_pinned, session_id))
+                    return bool(new_pinned)
             return False
         except Exception as e:
             print(f"Error toggling session pin: {e}")
             return False
-        finally:
-            conn.close()
 
     def delete_session(self, session_id):
         """Delete a conversation session and all its messages."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self._sync_reads(session_id)
         try:
-            cursor.execute('DELETE FROM conversation_messages WHERE session_id = ?', (session_id,))
-            cursor.execute('DELETE FROM conversation_sessions WHERE id = ?', (session_id,))
-            conn.commit()
+            with self.pool.cursor() as cursor:
+                cursor.execute('DELETE FROM conversation_messages WHERE session_id = ?', (session_id,))
+                cursor.execute('DELETE FROM conversation_sessions WHERE id = ?', (session_id,))
             return True
         except Exception as e:
             print(f"Error deleting session: {e}")
             return False
-        finally:
-            conn.close()
 
     def delete_old_sessions(self, days=30):
         """Delete sessions older than specified days."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self._sync_reads()
         try:
             cutoff = datetime.datetime.now() - datetime.timedelta(days=days)
-            cursor.execute('''
-                DELETE FROM conversation_messages
-                WHERE session_id IN (
-                    SELECT id FROM conversation_sessions WHERE updated_at < ?
-                )
-            ''', (cutoff,))
-            cursor.execute('DELETE FROM conversation_sessions WHERE updated_at < ?', (cutoff,))
-            conn.commit()
+            with self.pool.cursor() as cursor:
+                cursor.execute('''
+                    DELETE FROM conversation_messages
+                    WHERE session_id IN (
+                        SELECT id FROM conversation_sessions WHERE updated_at < ?
+                    )
+                ''', (cutoff,))
+                cursor.execute('DELETE FROM conversation_sessions WHERE updated_at < ?', (cutoff,))
             return True
         except Exception as e:
             print(f"Error deleting old sessions: {e}")
             return False
-        finally:
-            conn.close()
+
+    # ===== Response Cache Methods =====
+
+    def get_cached_response(self, cache_key):
+        """Get (response_json, created_at) for a cache key, or None."""
+        with self.pool.cursor() as cursor:
+            cursor.execute('SELECT response_json, created_at FROM response_cache WHERE cache_key = ?', (cache_key,))
+            row = cursor.fetchone()
+        return (row[0], row[1]) if row else None
+
+    def put_cached_response(self, cache_key, brain_id, response_json, created_at):
+        """Insert or replace a cached Brain response."""
+        try:
+            with self.pool.cursor() as cursor:
+                cursor.execute('''
+                    INSERT OR REPLACE INTO response_cache (cache_key, brain_id, response_json, created_at)
+                    VALUES (?, ?, ?, ?)
+                ''', (cache_key, brain_id, response_json, created_at))
+            return True
+        except Exception as e:
+            print(f"Error caching response: {e}")
+            return False
+
+    def delete_cached_responses(self, brain_id=None, created_before=None):
+        """Drop cached responses for one Brain and/or older than a timestamp."""
+        clauses, params = [], []
+        if brain_id is not None:
+            clauses.append('brain_id = ?')
+            params.append(brain_id)
+        if created_before is not None:
+            clauses.append('created_at < ?')
+            params.append(created_before)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self.pool.cursor() as cursor:
+            cursor.execute(f'DELETE FROM response_cache{where}', params)
+            return cursor.rowcount
 
     # ===== Settings Methods =====
 
     def get_setting(self, key, default=None):
         """Get a setting value."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        try:
+        with self.pool.cursor() as cursor:
             cursor.execute('SELECT value FROM settings WHERE key = ?', (key,))
             row = cursor.fetchone()
-            return row[0] if row else default
-        finally:
-            conn.close()
+        return row[0] if row else default
 
     def set_setting(self, key, value):
         """Set a setting value."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        try:
-            now = datetime.datetime.now()
+        now = datetime.datetime.now()
+        with self.pool.cursor() as cursor:
             cursor.execute('''
                 INSERT OR REPLACE INTO settings (key, value, updated_at)
                 VALUES (?, ?, ?)
             ''', (key, value, now))
-            conn.commit()
-            return True
-        finally:
-            conn.close()
+        return True
 
 storage = Persistence()
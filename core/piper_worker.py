@@ -0,0 +1,177 @@
+"""
+Piper Worker - Long-lived local Piper TTS.
+
+Provides:
+- One loaded voice model per (binary, model), reused for every utterance
+- In-process synthesis with the `piper` Python package when installed
+- Otherwise a kept-alive `piper --json-input` process fed over stdin
+- Raw int16 PCM results, so callers can play audio from memory
+- Thread-safe synthesize() for concurrent requests
+"""
+
+import atexit
+import itertools
+import json
+import os
+import subprocess
+import tempfile
+import threading
+import wave
+from collections import namedtuple
+from concurrent.futures import Future
+from typing import Optional
+
+PCMAudio = namedtuple("PCMAudio", ["data", "sample_rate"])  # int16 mono
+
+SYNTHESIS_TIMEOUT = 60.0
+
+_workers = {}
+_workers_lock = threading.Lock()
+
+
+def read_sample_rate(model_path: str, default: int = 22050) -> int:
+    """Sample rate from the voice's <model>.onnx.json config."""
+    try:
+        with open(f"{model_path}.json", "r") as f:
+            return int(json.load(f)["audio"]["sample_rate"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return default
+
+
+class InProcessPiper:
+    """Synthesis with piper.PiperVoice; ONNX Runtime sessions allow concurrent runs."""
+
+    def __init__(self, model_path: str):
+        from piper import PiperVoice
+
+        self.voice = PiperVoice.load(model_path)
+        self.sample_rate = self.voice.config.sample_rate
+
+    def synthesize(self, text: str) -> PCMAudio:
+        if hasattr(self.voice, "synthesize_stream_raw"):  # piper-tts < 1.3
+            data = b"".join(self.voice.synthesize_stream_raw(text))
+        else:
+            data = b"".join(chunk.audio_int16_bytes for chunk in self.voice.synthesize(text))
+        return PCMAudio(data, self.sample_rate)
+
+    def close(self):
+        pass
+
+
+class PiperProcess:
+    """
+    A piper binary kept running with --json-input.
+
+    Each request is one JSON line naming a private output file; piper prints
+    that path when the utterance is done, which completes the matching
+    request. Requests from several threads are pipelined into the same
+    process, and a dead process is restarted on the next request.
+    """
+
+    def __init__(self, binary_path: str, model_path: str):
+        self.binary_path = binary_path
+        self.model_path = model_path
+        self.sample_rate = read_sample_rate(model_path)
+        shm = "/dev/shm"
+        self.work_dir = tempfile.mkdtemp(prefix="avva-piper-", dir=shm if os.access(shm, os.W_OK) else None)
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._process = None
+
+    def _start(self):
+        env = dict(os.environ)
+        bin_dir = os.path.dirname(self.binary_path)
+        env["LD_LIBRARY_PATH"] = f"{bin_dir}:{env['LD_LIBRARY_PATH']}" if env.get("LD_LIBRARY_PATH") else bin_dir
+        process = subprocess.Popen(
+            [self.binary_path, "--model", self.model_path, "--json-input", "--output_dir", self.work_dir],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=env,
+            text=True,
+            bufsize=1,
+        )
+        threading.Thread(target=self._read_results, args=(process,), daemon=True).start()
+        self._process = process
+
+    def _read_results(self, process):
+        for line in process.stdout:
+            path = line.strip()
+            with self._lock:
+                future, _ = self._pending.pop(path, (None, None))
+            if future:
+                future.set_result(path)
+        with self._lock:
+            failed = [path for path, (_, owner) in self._pending.items() if owner is process]
+            futures = [self._pending.pop(path)[0] for path in failed]
+        for future in futures:
+            future.set_exception(RuntimeError(f"Piper exited with code {process.wait()}"))
+
+    def synthesize(self, text: str) -> PCMAudio:
+        path = os.path.join(self.work_dir, f"utterance_{next(self._ids)}.wav")
+        future = Future()
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._start()
+            self._pending[path] = (future, self._process)
+            try:
+                self._process.stdin.write(json.dumps({"text": text, "output_file": path}) + "\n")
+                self._process.stdin.flush()
+            except OSError as e:
+                self._pending.pop(path, None)
+                raise RuntimeError(f"Piper is not accepting input: {e}")
+        try:
+            future.result(timeout=SYNTHESIS_TIMEOUT)
+            with wave.open(path, "rb") as wav_file:
+                return PCMAudio(wav_file.readframes(wav_file.getnframes()), wav_file.getframerate())
+        finally:
+            with self._lock:
+                self._pending.pop(path, None)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def close(self):
+        with self._lock:
+            process, self._process = self._process, None
+        if process and process.poll() is None:
+            process.stdin.close()
+            try:
+                process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        try:
+            os.rmdir(self.work_dir)
+        except OSError:
+            pass
+
+
+def get_piper_worker(model_path: str, binary_path: Optional[str] = None):
+    """
+    Shared worker for a voice, loading the model on first use.
+
+    The in-process backend is used when the `piper` package is importable;
+    otherwise binary_path must point at the piper executable.
+    """
+    key = (binary_path, model_path)
+    with _workers_lock:
+        worker = _workers.get(key)
+        if worker is None:
+            try:
+                worker = InProcessPiper(model_path)
+            except ImportError:
+                if not binary_path:
+                    raise RuntimeError("Piper is not installed")
+                worker = PiperProcess(binary_path, model_path)
+            _workers[key] = worker
+        return worker
+
+
+@atexit.register
+def close_workers():
+    """Stop every worker process."""
+    with _workers_lock:
+        workers = list(_workers.values())
+        _workers.clear()
+    for worker in workers:
+        worker.close()
@@ -0,0 +1,167 @@
+"""
+Response Cache - Reuse Brain responses for repeated questions.
+
+Provides:
+- Cache keys from the normalized prompt, Brain id and filtered context
+- An in-memory LRU tier with TTL expiry
+- A persistent tier in SQLite that survives restarts
+- Hit/miss counters for the UI
+"""
+
+import dataclasses
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from core.brain_interface import BrainResponse
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    return _WHITESPACE_RE.sub(" ", (prompt or "").lower()).strip().rstrip(".!?").strip()
+
+
+def make_cache_key(prompt: str, brain_id: str, context: Optional[dict] = None, model: Optional[str] = None,
+                   mode: str = "execute") -> str:
+    """
+    Hash of (normalized prompt, brain id + model, filtered context, mode).
+
+    The context's "query" entry repeats the raw prompt, so it is left out to
+    let prompts that only differ in case or punctuation share an entry.
+    `mode` keeps parsed execute() responses apart from raw streamed text.
+    """
+    context = {k: v for k, v in (context or {}).items() if k != "query"}
+    payload = json.dumps(
+        [normalize_prompt(prompt), brain_id, model, context, mode],
+        sort_keys=True,
+        default=str,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier cache of successful BrainResponses.
+
+    Lookups check the in-memory LRU first, then SQLite; disk hits are
+    promoted into memory. Entries older than the TTL count as misses.
+    Brains opt out with `"cache_responses": false` in their config_data
+    (for creative or otherwise non-deterministic use) and may set their
+    own `"cache_ttl"` in seconds.
+    """
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, storage=None, max_entries: int = 256, ttl_seconds: float = 3600, enabled: bool = False):
+        self.storage = storage
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (BrainResponse, created_at, brain_id)
+        self._puts_since_prune = 0
+        self._stats = {"hits": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def is_cacheable(self, brain) -> bool:
+        """Whether responses from `brain` may be cached."""
+        if not self.enabled or brain is None:
+            return False
+        return bool(brain.config.config_data.get("cache_responses", True))
+
+    @staticmethod
+    def _key(brain, prompt, context, mode):
+        return make_cache_key(prompt, brain.id, context, brain.config.config_data.get("model"), mode)
+
+    def _ttl_for(self, brain) -> float:
+        return float(brain.config.config_data.get("cache_ttl", self.ttl_seconds))
+
+    def get(self, brain, prompt: str, context: Optional[dict] = None, mode: str = "execute") -> Optional[BrainResponse]:
+        """Return a cached response or None (counted as a miss)."""
+        if not self.is_cacheable(brain):
+            return None
+        key = self._key(brain, prompt, context, mode)
+        ttl = self._ttl_for(brain)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[1] <= ttl:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                self._stats["memory_hits"] += 1
+                return entry[0]
+            if entry:
+                del self._entries[key]
+
+        if self.storage is not None:
+            row = self.storage.get_cached_response(key)
+            if row and now - row[1] <= ttl:
+                try:
+                    response = BrainResponse(**json.loads(row[0]))
+                except (TypeError, ValueError):
+                    response = None
+                if response is not None:
+                    with self._lock:
+                        self._remember(key, response, row[1], brain.id)
+                        self._stats["hits"] += 1
+                        self._stats["disk_hits"] += 1
+                    return response
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def put(self, brain, prompt: str, context: Optional[dict], response: BrainResponse, mode: str = "execute"):
+        """Store a successful response."""
+        if not self.is_cacheable(brain) or response is None or not response.success:
+            return
+        key = self._key(brain, prompt, context, mode)
+        now = time.time()
+
+        with self._lock:
+            self._remember(key, response, now, brain.id)
+            self._stats["stores"] += 1
+            self._puts_since_prune += 1
+            prune = self._puts_since_prune >= self.PRUNE_EVERY
+            if prune:
+                self._puts_since_prune = 0
+
+        if self.storage is not None:
+            self.storage.put_cached_response(key, brain.id, json.dumps(dataclasses.asdict(response)), now)
+            if prune:
+                self.storage.delete_cached_responses(created_before=now - self.ttl_seconds)
+
+    def _remember(self, key, response, created_at, brain_id):
+        self._entries[key] = (response, created_at, brain_id)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def invalidate(self, brain_id: Optional[str] = None):
+        """Forget cached responses for one Brain, or all of them."""
+        with self._lock:
+            if brain_id is None:
+                self._entries.clear()
+            else:
+                self._entries = OrderedDict((k, v) for k, v in self._entries.items() if v[2] != brain_id)
+        if self.storage is not None:
+            self.storage.delete_cached_responses(brain_id=brain_id)
+
+    def stats(self) -> dict:
+        """Hit/miss counters plus current size and hit rate."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["enabled"] = self.enabled
+        return stats
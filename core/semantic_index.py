@@ -0,0 +1,313 @@
+"""
+Semantic Index - Local embedding-backed recall for AVA's conversation memory.
+
+Provides:
+- A pluggable embedder interface with a network-free hashed n-gram default
+- A compact, append-only vector store kept next to avva.db and memory-mapped
+- Incremental indexing of conversation_messages in the background
+- Top-k cosine search over the stored vectors
+"""
+
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+from core.persistence import storage
+
+
+class Embedder(ABC):
+    """
+    Interface for text embedders used by the semantic index.
+
+    Implementations must return L2-normalized float32 vectors so that a dot
+    product equals cosine similarity. `name` and `dim` are persisted with the
+    index; changing either triggers a rebuild.
+    """
+
+    name = "base"
+    dim = 0
+
+    @abstractmethod
+    def embed(self, texts: Iterable[str]) -> np.ndarray:
+        """Return an (n, dim) float32 array, one unit-length row per text."""
+        pass
+
+
+class HashingEmbedder(Embedder):
+    """
+    Feature-hashed bag of words + character n-grams.
+
+    Needs no model download or network access. Word features capture exact
+    vocabulary overlap; character n-grams make it tolerant to inflections
+    and typos ("launching" ~ "launch").
+    """
+
+    _TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+    def __init__(self, dim: int = 128, ngram_sizes: Tuple[int, ...] = (3, 4), char_weight: float = 0.5):
+        self.dim = dim
+        self.ngram_sizes = ngram_sizes
+        self.char_weight = char_weight
+        self.name = f"hashing-v1-{dim}-{'.'.join(map(str, ngram_sizes))}"
+
+    def _features(self, text: str):
+        for word in self._TOKEN_RE.findall(text.lower()):
+            yield word, 1.0
+            padded = f"<{word}>"
+            for n in self.ngram_sizes:
+                for i in range(len(padded) - n + 1):
+                    yield padded[i:i + n], self.char_weight
+
+    def embed(self, texts: Iterable[str]) -> np.ndarray:
+        texts = list(texts)
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            buckets, weights = [], []
+            for feature, weight in self._features(text or ""):
+                h = zlib.crc32(feature.encode("utf-8"))
+                # Low bits pick the bucket, the top bit picks the sign
+                buckets.append(h % self.dim)
+                weights.append(weight if h & 0x80000000 else -weight)
+            if not buckets:
+                continue
+            vec = out[row]
+            np.add.at(vec, buckets, weights)
+            # Sub-linear term frequency, then unit length for cosine via dot
+            np.copyto(vec, np.sign(vec) * np.log1p(np.abs(vec)))
+            norm = np.linalg.norm(vec)
+            if norm > 0:
+                vec /= norm
+        return out
+
+
+class VectorStore:
+    """
+    Append-only float32 matrix on disk with a parallel int64 id column.
+
+    Files: <base>.f32 (rows), <base>.ids (message ids), <base>.json (metadata).
+    Reads go through np.memmap so the matrix is paged in by the OS rather
+    than loaded into Python memory.
+    """
+
+    def __init__(self, base_path, dim: int, embedder_name: str):
+        self.base_path = str(base_path)
+        self.vectors_path = self.base_path + ".f32"
+        self.ids_path = self.base_path + ".ids"
+        self.meta_path = self.base_path + ".json"
+        self.dim = dim
+        self.embedder_name = embedder_name
+        self._lock = threading.Lock()
+        self._vectors = None
+        self._ids = None
+        self._mapped_count = -1
+        self._validate()
+
+    def _validate(self):
+        """Discard the store if it was built with a different embedder."""
+        meta = {}
+        if os.path.exists(self.meta_path):
+            try:
+                with open(self.meta_path, "r") as f:
+                    meta = json.load(f)
+            except Exception:
+                meta = {}
+        if meta.get("dim") != self.dim or meta.get("embedder") != self.embedder_name:
+            self.reset()
+
+    def reset(self):
+        """Remove all stored vectors."""
+        with self._lock:
+            for path in (self.vectors_path, self.ids_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            with open(self.meta_path, "w") as f:
+                json.dump({"dim": self.dim, "embedder": self.embedder_name}, f)
+            self._vectors = None
+            self._ids = None
+            self._mapped_count = -1
+
+    def count(self) -> int:
+        """Number of complete (vector, id) pairs on disk."""
+        ids_rows = os.path.getsize(self.ids_path) // 8 if os.path.exists(self.ids_path) else 0
+        vec_rows = os.path.getsize(self.vectors_path) // (4 * self.dim) if os.path.exists(self.vectors_path) else 0
+        return min(ids_rows, vec_rows)
+
+    def last_id(self) -> int:
+        """Highest message id stored (ids are appended in ascending order)."""
+        n = self.count()
+        if n == 0:
+            return 0
+        with open(self.ids_path, "rb") as f:
+            f.seek((n - 1) * 8)
+            return int(np.frombuffer(f.read(8), dtype=np.int64)[0])
+
+    def append(self, ids: List[int], vectors: np.ndarray):
+        """Append rows; a torn write is ignored on read via count()."""
+        if not len(ids):
+            return
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self._lock:
+            # Trim any half-written tail so both files stay row-aligned
+            n = self.count()
+            for path, row_bytes in ((self.vectors_path, 4 * self.dim), (self.ids_path, 8)):
+                if os.path.exists(path) and os.path.getsize(path) != n * row_bytes:
+                    os.truncate(path, n * row_bytes)
+            with open(self.vectors_path, "ab") as f:
+                f.write(vectors.tobytes())
+            with open(self.ids_path, "ab") as f:
+                f.write(np.asarray(ids, dtype=np.int64).tobytes())
+
+    def snapshot(self):
+        """Return (vectors, ids) memory-mapped views of the current contents."""
+        n = self.count()
+        with self._lock:
+            if n != self._mapped_count:
+                if n == 0:
+                    self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+                    self._ids = np.zeros(0, dtype=np.int64)
+                else:
+                    self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(n, self.dim))
+                    self._ids = np.memmap(self.ids_path, dtype=np.int64, mode="r", shape=(n,))
+                self._mapped_count = n
+            return self._vectors, self._ids
+
+    def search(self, query_vector: np.ndarray, k: int = 10, chunk_rows: int = 262144):
+        """
+        Top-k cosine search.
+
+        Scans the matrix in chunks so a 1M-row store needs no full copy in RAM.
+
+        Returns:
+            List of (id, score) pairs, best first.
+        """
+        vectors, ids = self.snapshot()
+        n = len(ids)
+        if n == 0 or k <= 0:
+            return []
+        k = min(k, n)
+        query_vector = np.asarray(query_vector, dtype=np.float32)
+
+        best_scores = np.empty(0, dtype=np.float32)
+        best_rows = np.empty(0, dtype=np.int64)
+        for start in range(0, n, chunk_rows):
+            scores = vectors[start:start + chunk_rows] @ query_vector
+            if len(scores) > k:
+                top = np.argpartition(scores, -k)[-k:]
+            else:
+                top = np.arange(len(scores))
+            best_scores = np.concatenate([best_scores, scores[top]])
+            best_rows = np.concatenate([best_rows, top + start])
+            if len(best_scores) > k:
+                keep = np.argpartition(best_scores, -k)[-k:]
+                best_scores, best_rows = best_scores[keep], best_rows[keep]
+
+        order = np.argsort(-best_scores)
+        return [(int(ids[best_rows[i]]), float(best_scores[i])) for i in order]
+
+
+class SemanticIndex:
+    """
+    Keeps a VectorStore in step with conversation_messages.
+
+    Indexing is incremental and keyed on message id: each sync embeds rows
+    newer than the last stored id. `schedule_sync()` wakes a background
+    thread so the request path never pays for embedding; with `backfill`
+    existing history is indexed that way as soon as the index is created.
+    The thread waits `sync_delay` seconds after a wake-up, so a burst of
+    messages is indexed in one sync and their write-behind batch has
+    usually been committed before it reads (instead of being flushed once
+    per message).
+    """
+
+    def __init__(self, storage, embedder: Embedder = None, batch_size: int = 512, backfill: bool = False,
+                 sync_delay: float = 1.0):
+        self.storage = storage
+        self.embedder = embedder or HashingEmbedder()
+        self.batch_size = batch_size
+        self.sync_delay = sync_delay
+        self.store = VectorStore(storage.config_dir / "avva_vectors", self.embedder.dim, self.embedder.name)
+        self._sync_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        if backfill:
+            self.schedule_sync()
+
+    def set_embedder(self, embedder: Embedder):
+        """Swap the embedder; the index is rebuilt from scratch on next sync."""
+        with self._sync_lock:
+            self.embedder = embedder
+            self.store = VectorStore(self.storage.config_dir / "avva_vectors", embedder.dim, embedder.name)
+
+    def schedule_sync(self):
+        """Ask the background indexer to pick up newly added messages."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="avva-semantic-index", daemon=True)
+            self._thread.start()
+        self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            time.sleep(self.sync_delay)
+            self._wakeup.clear()
+            try:
+                self.sync()
+            except Exception as e:
+                print(f"⚠️ Semantic index sync failed: {e}")
+
+    def sync(self, max_batches: int = None, blocking: bool = True) -> int:
+        """
+        Embed and store messages added since the last sync.
+
+        Args:
+            max_batches: Stop after this many batches of `batch_size` messages.
+            blocking: If False, return 0 at once when another sync is running.
+
+        Returns:
+            Number of messages indexed.
+        """
+        indexed = 0
+        batches = 0
+        if not self._sync_lock.acquire(blocking=blocking):
+            return 0
+        try:
+            last_id = self.store.last_id()
+            while max_batches is None or batches < max_batches:
+                rows = self.storage.get_messages_after(last_id, limit=self.batch_size)
+                if not rows:
+                    break
+                ids = [row[0] for row in rows]
+                self.store.append(ids, self.embedder.embed(row[1] for row in rows))
+                last_id = ids[-1]
+                indexed += len(ids)
+                batches += 1
+        finally:
+            self._sync_lock.release()
+        return indexed
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[int, float]]:
+        """
+        Return (message_id, cosine score) pairs for the k nearest messages.
+
+        At most one batch of new messages is indexed inline, and none while
+        the background indexer is busy; anything further behind is left to
+        the background thread, so a large backlog never stalls a search.
+        """
+        if not query or not query.strip():
+            return []
+        if self.sync(max_batches=1, blocking=False) == self.batch_size:
+            self.schedule_sync()
+        query_vector = self.embedder.embed([query])[0]
+        if not np.any(query_vector):
+            return []
+        return self.store.search(query_vector, k=k)
+
+
+semantic_index = SemanticIndex(storage, backfill=True)
@@ -1,18 +1,51 @@
 # MIT License - Copyright (c) 2026 Asigri Shamsu-Deen Al-Heyr
 import os
+import ast
 import json
 import importlib.util
 import re
+import threading
+import time
 from core.persistence import storage
+from core.intent_matcher import IntentMatcher
+
+
+class LazyTool:
+    """
+    Registry placeholder for a tool whose plugin has not been imported yet.
+
+    The first call imports the plugin module, swaps the real functions into
+    the registry and forwards the call.
+    """
+
+    def __init__(self, manager, plugin_key, tool_id):
+        self.manager = manager
+        self.plugin_key = plugin_key
+        self.tool_id = tool_id
+
+    def __call__(self, *args, **kwargs):
+        module = self.manager._import_plugin(self.plugin_key)
+        return getattr(module, self.tool_id)(*args, **kwargs)
+
 
 class SkillManager:
-    def __init__(self, skills_dir="skills"):
+    INDEX_VERSION = 1
+    NO_PERMISSIONS_REPLY = "You haven't granted any special permissions yet."
+
+    def __init__(self, skills_dir="skills", index_path=None):
         self.skills_dir = skills_dir
-        self.registry = {}       # tool_name -> function
+        self.index_path = index_path or os.path.join(storage.config_dir, "skill_index.json")
+        self.registry = {}       # tool_name -> function (or LazyTool until first use)
         self.tool_metadata = {}  # tool_name -> description
         self.tool_permissions = {} # tool_name -> list of permissions
         self.static_intents = {} # phrase -> execution_string
         self.regex_intents = []  # list of (compiled_regex, execution_template)
+        self._matcher = None     # IntentMatcher compiled from the two above
+        self._intents_version = 0  # bumped on every intent change; a matcher of an older version is rebuilt
+        self.plugins = {}        # plugin key -> indexed plugin record
+        self.load_timings = {}   # plugin key -> {"ms": float, "source": "cache" | "scan" | "import"}
+        self._modules = {}       # plugin key -> imported module
+        self._import_lock = threading.RLock()
         
         # Load persistent permissions
         self.allowed_permissions = storage.get_allowed_permissions()
@@ -20,45 +53,185 @@ class SkillManager:
         self.load_all_skills()
 
     def load_all_skills(self):
-        """Scans for folder-based plugins and registers them."""
+        """
+        Scans for folder-based plugins and registers them.
+
+        Only manifests are read at startup: tool names and descriptions come
+        from a persisted index (refreshed when a plugin's files change), and
+        plugin modules are imported on first tool invocation.
+        """
         if not os.path.exists(self.skills_dir):
             os.makedirs(self.skills_dir)
             
         print(f"System: Discovering plugins in '{self.skills_dir}'...")
-        
-        for folder in os.listdir(self.skills_dir):
+
+        index = self._own_entries(self._read_index())
+        fresh_index = {}
+        for folder in sorted(os.listdir(self.skills_dir)):
             folder_path = os.path.join(self.skills_dir, folder)
             manifest_path = os.path.join(folder_path, "manifest.json")
             
             if os.path.isdir(folder_path) and os.path.exists(manifest_path):
-                self._load_plugin(folder, folder_path, manifest_path)
+                record = self._load_plugin(folder, folder_path, manifest_path, index)
+                if record:
+                    fresh_index[record["key"]] = record
+
+        if fresh_index != index:
+            self._write_index(fresh_index)
+
+        self.rebuild_intent_matcher()
+        self._print_load_report()
+
+    # ----- Plugin index -----
+
+    def _read_index(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") == self.INDEX_VERSION:
+                return data.get("plugins", {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _own_entries(self, plugins):
+        """Index entries for plugins in this manager's skills_dir."""
+        skills_root = os.path.abspath(self.skills_dir)
+        return {key: record for key, record in plugins.items() if os.path.dirname(key) == skills_root}
+
+    def _write_index(self, plugins):
+        """
+        Replace this skills_dir's entries in the index file.
+
+        The index is shared by every SkillManager, so entries for plugins
+        in other directories are kept.
+        """
+        index = self._read_index()
+        own = self._own_entries(index)
+        merged = {key: record for key, record in index.items() if key not in own}
+        merged.update(plugins)
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({"version": self.INDEX_VERSION, "plugins": merged}, f, indent=1)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"⚠️ Could not write plugin index: {e}")
+
+    @staticmethod
+    def _fingerprint(*paths):
+        """mtime + size of each file; any change invalidates the index entry."""
+        stamp = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+                stamp.append([st.st_mtime_ns, st.st_size])
+            except OSError:
+                stamp.append(None)
+        return stamp
+
+    @staticmethod
+    def _module_statements(body):
+        """
+        Statements that run at module level, including those nested in
+        if/try/with/for/while blocks (e.g. optional-import fallbacks), but
+        not the bodies of functions and classes.
+        """
+        for node in body:
+            yield node
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                continue
+            for field in ("body", "orelse", "finalbody"):
+                yield from SkillManager._module_statements(getattr(node, field, []))
+            for handler in getattr(node, "handlers", []):
+                yield from SkillManager._module_statements(handler.body)
+
+    @staticmethod
+    def _scan_tools(entry_path):
+        """
+        Read the module-level MANIFEST and module-level names without running the module.
+
+        Returns:
+            {tool_id: description} in MANIFEST order, or None if MANIFEST is
+            not a plain literal and the module must be imported to read it.
+        """
+        with open(entry_path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=entry_path)
+
+        defined = set()
+        manifest = {}
+        for node in SkillManager._module_statements(tree.body):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                defined.add(node.name)
+            elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                defined.update((alias.asname or alias.name).split(".")[0] for alias in node.names)
+            elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                names = [t.id for t in targets if isinstance(t, ast.Name)]
+                defined.update(names)
+                if "MANIFEST" in names:
+                    try:
+                        manifest = ast.literal_eval(node.value)
+                    except ValueError:
+                        return None
 
-    def _load_plugin(self, folder_name, folder_path, manifest_path):
+        return {
+            tool_id: info.get("description", "")
+            for tool_id, info in manifest.items()
+            if tool_id in defined
+        }
+
+    def _load_plugin(self, folder_name, folder_path, manifest_path, index=None):
         """Standardized plugin loader supporting direct and parametric intents."""
+        started = time.perf_counter()
+        key = os.path.abspath(folder_path)
+        source = "error"
         try:
             with open(manifest_path, 'r') as f:
                 manifest = json.load(f)
             
             entry_point = manifest.get("entry_point", "main.py")
             entry_path = os.path.join(folder_path, entry_point)
-            
-            # Use importlib to load the module
-            spec = importlib.util.spec_from_file_location(folder_name, entry_path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
+            fingerprint = self._fingerprint(manifest_path, entry_path)
+
+            cached = (index or {}).get(key)
+            if cached and cached.get("fingerprint") == fingerprint:
+                tools = cached["tools"]
+                source = "cache"
+            else:
+                tools = self._scan_tools(entry_path)
+                source = "scan"
+
+            record = {
+                "key": key,
+                "folder": folder_name,
+                "entry_path": entry_path,
+                "fingerprint": fingerprint,
+                "tools": tools,
+            }
+            self.plugins[key] = record
+
+            if tools is None:
+                # Dynamic MANIFEST: import now to learn the tool names
+                module = self._import_plugin(key)
+                tools = {
+                    tool_id: info.get("description", "")
+                    for tool_id, info in getattr(module, 'MANIFEST', {}).items()
+                    if hasattr(module, tool_id)
+                }
+                source = "import"
             
             # Extract permissions from manifest
             plugin_permissions = manifest.get("permissions", [])
             
             # 1. Register tools from the module MANIFEST
-            if hasattr(module, 'MANIFEST'):
-                module_manifest = getattr(module, 'MANIFEST')
-                for tool_id, info in module_manifest.items():
-                    if hasattr(module, tool_id):
-                        self.registry[tool_id] = getattr(module, tool_id)
-                        self.tool_metadata[tool_id] = info.get("description", "")
-                        self.tool_permissions[tool_id] = plugin_permissions
-                        print(f"  - Registered Tool: {tool_id} (Perms: {plugin_permissions})")
+            for tool_id, description in tools.items():
+                if key not in self._modules:
+                    self.registry[tool_id] = LazyTool(self, key, tool_id)
+                self.tool_metadata[tool_id] = description
+                self.tool_permissions[tool_id] = plugin_permissions
+                print(f"  - Registered Tool: {tool_id} (Perms: {plugin_permissions})")
 
             # 2. Register Intents (Direct + Parametric)
             intents = manifest.get("intents", {})
@@ -67,15 +240,67 @@ class SkillManager:
                     self._register_intent(pattern, exec_template, folder_name)
             elif isinstance(intents, list):
                 # Legacy list support: map all phrases to the first tool in MANIFEST
-                if hasattr(module, 'MANIFEST'):
-                    first_tool = list(getattr(module, 'MANIFEST').keys())[0]
+                if tools:
+                    first_tool = list(tools.keys())[0]
                     for phrase in intents:
                         self.static_intents[phrase.lower()] = f"{first_tool}()"
+                    self._intents_version += 1
 
             print(f"✨ Loaded Plugin: {manifest.get('name', folder_name)}")
+            return record
             
         except Exception as e:
             print(f"❌ Error loading plugin '{folder_name}': {e}")
+            return None
+        finally:
+            self.load_timings[key] = {
+                "plugin": folder_name,
+                "ms": (time.perf_counter() - started) * 1000,
+                "source": source,
+            }
+
+    def _import_plugin(self, key):
+        """Import a plugin module (once) and replace its LazyTool placeholders."""
+        with self._import_lock:
+            module = self._modules.get(key)
+            if module is not None:
+                return module
+
+            record = self.plugins[key]
+            started = time.perf_counter()
+            spec = importlib.util.spec_from_file_location(record["folder"], record["entry_path"])
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            self._modules[key] = module
+
+            for tool_id in (record["tools"] or getattr(module, 'MANIFEST', {})):
+                if hasattr(module, tool_id):
+                    self.registry[tool_id] = getattr(module, tool_id)
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.load_timings.setdefault(key, {"plugin": record["folder"]})["import_ms"] = elapsed_ms
+            print(f"📦 Imported plugin '{record['folder']}' on first use ({elapsed_ms:.1f} ms)")
+            return module
+
+    def _print_load_report(self):
+        """Per-plugin startup timing report."""
+        total = sum(t.get("ms", 0.0) for t in self.load_timings.values())
+        print(f"⏱️ Plugin discovery: {len(self.load_timings)} plugins in {total:.1f} ms")
+        for timing in sorted(self.load_timings.values(), key=lambda t: -t.get("ms", 0.0)):
+            print(f"    {timing['plugin']:<20} {timing.get('ms', 0.0):7.1f} ms ({timing.get('source', '?')})")
+
+    def get_load_report(self):
+        """Startup (and first-use import) timings per plugin."""
+        return sorted(self.load_timings.values(), key=lambda t: t["plugin"])
+
+    def rebuild_intent_matcher(self):
+        """
+        Compile static and regex intents into a single matcher.
+
+        Code that edits static_intents or regex_intents directly, rather
+        than through _register_intent(), should call this afterwards.
+        """
+        self._matcher = IntentMatcher(self.static_intents, self.regex_intents, self._intents_version)
 
     def _register_intent(self, pattern, exec_template, folder_name):
         """Helper to register a single intent pattern."""
@@ -88,8 +313,10 @@ class SkillManager:
                 print(f"  - Registered Parametric Intent: {regex_pattern}")
             except re.error as e:
                 print(f"  ❌ Invalid regex in {folder_name}: {e}")
+                return
         else:
             self.static_intents[pattern] = exec_template
+        self._intents_version += 1
 
     def get_intent_match(self, command):
         """
@@ -97,26 +324,23 @@ class SkillManager:
         Returns the resolved execution string or None.
         """
         cmd_clean = command.lower().strip()
-        
-        # 1. Check Static Intents (Priority 1)
-        if cmd_clean in self.static_intents:
-            return self.static_intents[cmd_clean]
-            
-        for phrase, exec_str in self.static_intents.items():
-            if phrase in cmd_clean:
-                return exec_str
-
-        # 2. Check Regex Intents (Priority 2)
-        for regex, template in self.regex_intents:
-            match = regex.search(cmd_clean)
-            if match:
-                # Replace $1, $2, etc with capture groups
-                resolved_exec = template
-                for i, group in enumerate(match.groups(), 1):
-                    resolved_exec = resolved_exec.replace(f"${i}", group)
-                return resolved_exec
-
-        return None
+
+        if self._matcher is None or self._matcher.is_stale(self._intents_version):
+            self.rebuild_intent_matcher()
+
+        # Static phrases (Priority 1), then regex intents (Priority 2)
+        found = self._matcher.match(cmd_clean, self.static_intents)
+        if not found:
+            return None
+        kind, value = found
+        if kind == "static":
+            return value
+
+        # Replace $1, $2, etc with capture groups
+        resolved_exec, groups = value
+        for i, group in enumerate(groups, 1):
+            resolved_exec = resolved_exec.replace(f"${i}", group)
+        return resolved_exec
 
     def get_tool_descriptions(self):
         """Prepare tool info for LLM (Tier 3 Intent)."""
@@ -230,7 +454,7 @@ class SkillManager:
         elif res.get("type") == "permissions":
             count = res.get("count", 0)
             if count == 0:
-                return "You haven't granted any special permissions yet."
+                return self.NO_PERMISSIONS_REPLY
             return f"I found {count} active permission mappings in your system memory."
         elif status == "not_found":
             return f"I'm sorry, I couldn't find an application related to '{res.get('query')}'."
@@ -1,33 +1,306 @@
-import sounddevice as sd
 import numpy as np
 import speech_recognition as sr
 import io
+import os
+import sys
+import json
+import queue
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
 import scipy.io.wavfile as wav
 from core.config import config
 
-def listen(duration=5):
-    """Listens for microphone input using sounddevice and returns recognized text."""
-    fs = 44100  # Sample rate
-    
-    try:
-        print(f"Listening for {duration} seconds...")
-        # Record audio using InputStream for better stability
-        with sd.InputStream(samplerate=fs, channels=1, dtype='int16') as stream:
-            recording, overflowed = stream.read(int(duration * fs))
-        
-        print("Processing...")
+SAMPLE_RATE = 16000  # 16 kHz mono is what speech recognizers expect
+FRAME_MS = 30
+
+
+class EnergyEndpointer:
+    """
+    Energy-based voice activity detector / endpointer.
+
+    Tracks an adaptive noise floor from non-speech frames; a frame counts as
+    speech when its RMS exceeds `threshold_ratio` times that floor (and at
+    least `min_rms`). Speech starts after `start_ms` of consecutive speech
+    frames and ends after `end_silence_ms` of consecutive silence.
+    """
+
+    def __init__(self, frame_ms=FRAME_MS, start_ms=90, end_silence_ms=700,
+                 threshold_ratio=3.0, min_rms=300.0, noise_adapt=0.05):
+        self.start_frames = max(1, start_ms // frame_ms)
+        self.end_frames = max(1, end_silence_ms // frame_ms)
+        self.threshold_ratio = threshold_ratio
+        self.min_rms = min_rms
+        self.noise_adapt = noise_adapt
+        self.noise_floor = None
+        self.in_speech = False
+        self._voiced_run = 0
+        self._silent_run = 0
+
+    def is_speech(self, frame):
+        rms = float(np.sqrt(np.mean(np.square(frame.astype(np.float32))))) if len(frame) else 0.0
+        if self.noise_floor is None:
+            # Capped so a user who starts talking immediately is still heard
+            self.noise_floor = min(rms, self.min_rms)
+        voiced = rms > max(self.min_rms, self.noise_floor * self.threshold_ratio)
+        if not voiced:
+            self.noise_floor += self.noise_adapt * (rms - self.noise_floor)
+        return voiced
+
+    def process(self, frame):
+        """
+        Feed one frame.
+
+        Returns:
+            "start" when speech begins, "end" when it finishes, else None.
+        """
+        voiced = self.is_speech(frame)
+        if not self.in_speech:
+            self._voiced_run = self._voiced_run + 1 if voiced else 0
+            if self._voiced_run >= self.start_frames:
+                self.in_speech = True
+                self._silent_run = 0
+                return "start"
+        else:
+            self._silent_run = 0 if voiced else self._silent_run + 1
+            if self._silent_run >= self.end_frames:
+                self.in_speech = False
+                self._voiced_run = 0
+                return "end"
+        return None
+
+
+def collect_utterance(frames, endpointer=None, frame_ms=FRAME_MS, timeout=5.0,
+                      phrase_limit=15.0, pre_roll_ms=300, on_frame=None):
+    """
+    Pull frames until one utterance has been captured.
+
+    A ring buffer keeps the last `pre_roll_ms` of audio before speech is
+    detected so the first syllable is not clipped. Returns as soon as the
+    endpointer reports end-of-speech (or `phrase_limit` is reached); returns
+    None if no speech starts within `timeout` seconds. `on_frame` receives
+    every frame of the utterance as it is captured (pre-roll first), which
+    lets streaming recognizers work while the user is still speaking.
+    """
+    endpointer = endpointer or EnergyEndpointer(frame_ms=frame_ms)
+    pre_roll = deque(maxlen=max(1, pre_roll_ms // frame_ms))
+    timeout_frames = int(timeout * 1000 / frame_ms)
+    limit_frames = int(phrase_limit * 1000 / frame_ms)
+    utterance = None
+
+    for count, frame in enumerate(frames, 1):
+        event = endpointer.process(frame)
+        if utterance is None:
+            pre_roll.append(frame)
+            if event == "start":
+                utterance = list(pre_roll)
+                if on_frame:
+                    for buffered in utterance:
+                        on_frame(buffered)
+            elif count >= timeout_frames:
+                return None
+            continue
+
+        utterance.append(frame)
+        if on_frame:
+            on_frame(frame)
+        if event == "end" or len(utterance) >= limit_frames:
+            break
+
+    if not utterance:
+        return None
+    return np.concatenate(utterance)
+
+
+def microphone_frames(sample_rate=SAMPLE_RATE, frame_ms=FRAME_MS, read_timeout=2.0):
+    """
+    Yield int16 mono frames from the default input device.
+
+    Audio is delivered by a sounddevice callback into a queue, so capture
+    keeps running while the consumer processes frames. The stream is closed
+    when the generator is closed.
+    """
+    # Imported here so the module loads on machines without PortAudio
+    import sounddevice as sd
+
+    blocksize = int(sample_rate * frame_ms / 1000)
+    frames = queue.Queue()
+
+    def callback(indata, frame_count, time_info, status):
+        if status:
+            print(f"Audio status: {status}")
+        frames.put(indata[:, 0].copy())
+
+    with sd.InputStream(samplerate=sample_rate, channels=1, dtype='int16',
+                        blocksize=blocksize, callback=callback):
+        while True:
+            yield frames.get(timeout=read_timeout)
+
+
+class STTEngine(ABC):
+    """
+    Speech-to-text backend.
+
+    Engines are fed the utterance frame by frame while it is captured
+    (`accept`) and produce the final transcript once it ends (`finish`).
+    Streaming engines call `on_partial` with the current hypothesis as
+    the user speaks; batch engines simply recognize in `finish`.
+    """
+
+    name = "base"
+
+    def start(self, on_partial=None, sample_rate=SAMPLE_RATE):
+        self.on_partial = on_partial
+        self.sample_rate = sample_rate
 
-        # Convert the NumPy array to a WAV file in memory
+    def accept(self, frame):
+        pass
+
+    @abstractmethod
+    def finish(self, audio):
+        """Return the transcript of the complete utterance."""
+        pass
+
+
+class GoogleSTTEngine(STTEngine):
+    """SpeechRecognition's Google Web Speech backend (online, no partials)."""
+
+    name = "google"
+
+    def finish(self, audio):
         byte_io = io.BytesIO()
-        wav.write(byte_io, fs, recording)
+        wav.write(byte_io, self.sample_rate, audio)
         byte_io.seek(0)
 
-        # Use SpeechRecognition to process the audio from the memory buffer
         r = sr.Recognizer()
         with sr.AudioFile(byte_io) as source:
-            audio = r.record(source)
+            audio_data = r.record(source)
+        return r.recognize_google(audio_data, language=config.LANGUAGE)
+
+
+class VoskSTTEngine(STTEngine):
+    """
+    Offline recognition with Vosk (Kaldi); emits partial hypotheses.
+
+    The model directory comes from config.VOSK_MODEL, falling back to
+    temp/models/<name> or models/<name> next to the executable, like Piper
+    voices. Models are loaded once and reused.
+    """
+
+    name = "vosk"
+    _models = {}
+    _models_lock = threading.Lock()
+
+    @staticmethod
+    def find_model_path():
+        model = config.VOSK_MODEL
+        if not model:
+            return None
+        if os.path.isdir(model):
+            return model
+        base_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
+        for candidate in (os.path.join(os.getcwd(), 'temp', 'models', model), os.path.join(base_dir, 'models', model)):
+            if os.path.isdir(candidate):
+                return candidate
+        return None
+
+    @classmethod
+    def available(cls):
+        try:
+            import vosk  # noqa: F401
+        except ImportError:
+            return False
+        return cls.find_model_path() is not None
+
+    def start(self, on_partial=None, sample_rate=SAMPLE_RATE):
+        super().start(on_partial, sample_rate)
+        import vosk
+
+        path = self.find_model_path()
+        with self._models_lock:
+            if path not in self._models:
+                vosk.SetLogLevel(-1)
+                self._models[path] = vosk.Model(path)
+        self._recognizer = vosk.KaldiRecognizer(self._models[path], sample_rate)
+        self._segments = []  # finalized text segments within this utterance
+        self._last_partial = ""
 
-        query = r.recognize_google(audio, language=config.LANGUAGE)
+    def accept(self, frame):
+        if self._recognizer.AcceptWaveform(frame.tobytes()):
+            text = json.loads(self._recognizer.Result()).get("text", "")
+            if text:
+                self._segments.append(text)
+            current = ""
+        else:
+            current = json.loads(self._recognizer.PartialResult()).get("partial", "")
+        partial = " ".join(self._segments + [current]).strip()
+        if partial and partial != self._last_partial:
+            self._last_partial = partial
+            if self.on_partial:
+                self.on_partial(partial)
+
+    def finish(self, audio):
+        text = json.loads(self._recognizer.FinalResult()).get("text", "")
+        if text:
+            self._segments.append(text)
+        result = " ".join(self._segments).strip()
+        if not result:
+            raise sr.UnknownValueError()
+        return result
+
+
+def get_stt_engine():
+    """Build the engine selected by STT_ENGINE (mirrors TTS_ENGINE dispatch)."""
+    engine = config.STT_ENGINE.lower()
+    if engine == "google":
+        return GoogleSTTEngine()
+    elif engine == "vosk":
+        if VoskSTTEngine.available():
+            return VoskSTTEngine()
+        print("Vosk package or model not found. Falling back to Google STT.")
+        return GoogleSTTEngine()
+    else:
+        print(f"Unknown STT engine: {engine}. Falling back to Google STT.")
+        return GoogleSTTEngine()
+
+
+def recognize(audio, sample_rate=SAMPLE_RATE):
+    """Recognize a complete int16 mono recording with the configured engine."""
+    engine = get_stt_engine()
+    engine.start(sample_rate=sample_rate)
+    engine.accept(audio)
+    return engine.finish(audio)
+
+
+def listen(timeout=5, phrase_limit=15, on_partial=None):
+    """
+    Listens for microphone input and returns recognized text.
+
+    Capture streams in 30 ms frames and stops at end of speech, so short
+    commands are handed to recognition immediately and long ones are not
+    cut off at a fixed duration. Streaming engines (STT_ENGINE=vosk)
+    decode while the user is speaking and report partial transcripts.
+
+    Args:
+        timeout: Seconds to wait for speech to start
+        phrase_limit: Maximum length of one utterance in seconds
+        on_partial: Optional callable receiving partial transcripts
+    """
+    try:
+        print("Listening...")
+        engine = get_stt_engine()
+        engine.start(on_partial=on_partial)
+        frames = microphone_frames()
+        try:
+            recording = collect_utterance(frames, timeout=timeout, phrase_limit=phrase_limit, on_frame=engine.accept)
+        finally:
+            frames.close()
+
+        if recording is None:
+            return ""
+
+        print("Processing...")
+        query = engine.finish(recording)
         print(f"User: {query}\n")
         return query.lower()
     except sr.UnknownValueError:
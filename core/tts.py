@@ -1,81 +1,335 @@
-from pygame import mixer
 import os
+import re
 import sys
-import requests
+import queue
+import itertools
 import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from core.config import config
+from core.audio_output import player
+from core.brains.transport import ELEVENLABS_API_URL, OPENAI_API_URL, http_pool
+from core.piper_worker import PCMAudio, get_piper_worker
+from core.tts_cache import TTSCache, make_speech_key
 
-_speaking = False
-_playback_thread = None
+MEDIA_DIR = os.path.join('temp', 'media')
+STREAM_WORKERS = 2  # sentences synthesized ahead of playback
+OPENAI_TTS_MODEL, OPENAI_TTS_VOICE = "tts-1", "alloy"
+ELEVENLABS_VOICE, ELEVENLABS_MODEL = "Rachel", "eleven_multilingual_v2"
 
-def speak(text, interrupt_callback=None):
-    """Orchestrates Text-to-Speech using the configured engine."""
-    global _speaking, _playback_thread
+speech_cache = TTSCache(
+    config.config_dir / "tts_cache",
+    max_bytes=config.TTS_CACHE_MB * 1024 * 1024,
+    enabled=config.TTS_CACHE,
+)
 
-    if _speaking:
-        print("🛑 Stopping previous speech...")
-        stop_speak()
+_stream_ids = itertools.count(1)
+_voice = threading.Condition()
+_voice_queue = deque()  # SpeechStreams in speaking order; the first one is heard
 
-    engine = config.TTS_ENGINE.lower()
-    print(f"{config.NAME}: {text}")
+def speak(text, interrupt_callback=None):
+    """
+    Speak a complete reply with the configured engine.
 
-    os.makedirs('temp/media', exist_ok=True)
-    filename = os.path.join('temp/media', 'response.mp3')
+    Replies share one voice: this one is queued behind any reply still
+    being spoken. Returns the SpeechStream, whose cancel() stops just this
+    reply.
+    """
+    stream = SpeechStream(interrupt_callback=interrupt_callback)
+    stream.say(text)
+    return stream
 
-    try:
-        if engine == "gtts":
-            _speak_gtts(text, filename)
-        elif engine == "openai":
-            _speak_openai(text, filename)
-        elif engine == "elevenlabs":
-            _speak_elevenlabs(text, filename)
-        elif engine == "piper":
-            filename = filename.replace('.mp3', '.wav')
-            _speak_piper(text, filename)
-        else:
-            print(f"Unknown TTS engine: {engine}. Falling back to gTTS.")
-            _speak_gtts(text, filename)
-
-        _speaking = True
-        _playback_thread = threading.Thread(target=_play_audio, args=(filename, interrupt_callback), daemon=True)
-        _playback_thread.start()
-    except Exception as e:
-        print(f"TTS Error ({engine}): {e}")
-        _speaking = False
+def speak_stream(interrupt_callback=None):
+    """
+    Start speaking a reply that is still being generated.
+
+    Feed text chunks to the returned SpeechStream as they arrive and call
+    close() once the reply is complete; each sentence is spoken as soon as
+    it has been synthesized instead of waiting for the whole text.
+    """
+    return SpeechStream(interrupt_callback=interrupt_callback)
 
 def speak_interrupt():
     """Simply stop any ongoing speech without generating new audio."""
     stop_speak()
 
 def stop_speak():
-    """Stop any ongoing speech."""
-    global _speaking
-    try:
-        if mixer.get_init():
-            mixer.music.stop()
-            mixer.quit()
-    except Exception:
-        pass
-    _speaking = False
-
-def _play_audio(filename, interrupt_callback=None):
-    """Plays the generated audio file with interrupt support."""
-    global _speaking
-    try:
-        mixer.init()
-        mixer.music.load(filename)
-        mixer.music.play()
-
-        while mixer.music.get_busy() and _speaking:
-            if interrupt_callback and interrupt_callback():
-                print("🛑 Speech interrupted by callback")
-                mixer.music.stop()
+    """Stop the reply being spoken and every reply queued behind it."""
+    with _voice:
+        streams = list(_voice_queue)
+    for stream in streams:
+        stream.cancel()
+    player.stop()
+
+def prewarm(phrases):
+    """
+    Synthesize fixed phrases into the speech cache in the background.
+
+    Each phrase is cached whole (for speak) and as the sentences a
+    SpeechStream would cut it into. Phrases already cached for the current
+    engine and voice are skipped.
+    """
+    if not speech_cache.enabled:
+        return None
+
+    texts = []
+    for phrase in phrases:
+        segmenter = SentenceSegmenter()
+        texts.append(phrase)
+        texts.extend(segmenter.feed(phrase) + segmenter.flush())
+
+    def run():
+        engine = config.TTS_ENGINE.lower()
+        missing = [t for t in dict.fromkeys(texts) if t and not speech_cache.contains(_speech_key(engine, t))]
+        for phrase in missing:
+            try:
+                _synthesize(phrase, os.path.join(MEDIA_DIR, 'prewarm.mp3'))
+            except Exception as e:
+                print(f"⚠️ TTS prewarm failed: {e}")
+                return
+        if missing:
+            print(f"🔊 Prewarmed {len(missing)} phrases into the speech cache")
+
+    os.makedirs(MEDIA_DIR, exist_ok=True)
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+def _voice_id(engine):
+    """Everything besides the text that changes how an engine sounds."""
+    if engine == "openai":
+        return f"{OPENAI_TTS_MODEL}/{OPENAI_TTS_VOICE}"
+    if engine == "elevenlabs":
+        return f"{ELEVENLABS_MODEL}/{ELEVENLABS_VOICE}"
+    if engine == "piper":
+        return config.PIPER_VOICE
+    return config.LANGUAGE
+
+def _speech_key(engine, text):
+    return make_speech_key(engine, _voice_id(engine), text)
+
+def _synthesize(text, filename):
+    """
+    Render text with the configured engine, reusing cached audio.
+
+    Returns:
+        Path of an audio file, or PCMAudio for engines that synthesize in
+        memory (Piper).
+    """
+    engine = config.TTS_ENGINE.lower()
+    if engine not in ("gtts", "openai", "elevenlabs", "piper"):
+        print(f"Unknown TTS engine: {engine}. Falling back to gTTS.")
+        engine = "gtts"
+
+    key = _speech_key(engine, text)
+    audio = speech_cache.get(key)
+    if audio is not None:
+        return audio
+
+    audio = _render(engine, text, filename)
+    if engine == "piper" and not isinstance(audio, PCMAudio):
+        return audio  # gTTS stood in for Piper; don't cache it as Piper audio
+    return speech_cache.put(key, audio)
+
+def _render(engine, text, filename):
+    """Run one engine; returns a file path or PCMAudio."""
+    if engine == "gtts":
+        _speak_gtts(text, filename)
+    elif engine == "openai":
+        _speak_openai(text, filename)
+    elif engine == "elevenlabs":
+        _speak_elevenlabs(text, filename)
+    elif engine == "piper":
+        audio = _speak_piper(text)
+        if audio is not None:
+            return audio
+        print("Falling back to gTTS.")
+        _speak_gtts(text, filename)
+    return filename
+
+class SentenceSegmenter:
+    """
+    Splits streamed text into speakable sentences.
+
+    A sentence ends at . ! ? followed by whitespace, or at a line break.
+    Common abbreviations, initials and list numbers do not end a sentence,
+    and pieces shorter than `min_chars` are joined with what follows so
+    the voice does not stutter over fragments.
+    """
+
+    BOUNDARY = re.compile(r'[.!?…]+["\')\]]*\s+|\n\s*')
+    ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "prof", "st", "vs", "etc", "e.g", "i.e", "approx", "no"}
+
+    def __init__(self, min_chars=12):
+        self.min_chars = min_chars
+        self.buffer = ""
+
+    def _is_abbreviation(self, text):
+        words = text.split()
+        if not words:
+            return False
+        word = words[-1].lower().lstrip('("\'')
+        return word in self.ABBREVIATIONS or word.isdigit() or (len(word) == 1 and word.isalpha())
+
+    def feed(self, chunk):
+        """Add a chunk; returns the sentences it completed."""
+        self.buffer += chunk
+        sentences = []
+        start = 0
+        for match in self.BOUNDARY.finditer(self.buffer):
+            if match.group().startswith('.') and self._is_abbreviation(self.buffer[start:match.start()]):
+                continue
+            sentence = self.buffer[start:match.end()].strip()
+            if len(sentence) < self.min_chars:
+                continue
+            sentences.append(sentence)
+            start = match.end()
+        self.buffer = self.buffer[start:]
+        return sentences
+
+    def flush(self):
+        """Return whatever is left once the text is complete."""
+        rest, self.buffer = self.buffer.strip(), ""
+        return [rest] if rest else []
+
+class SpeechStream:
+    """
+    Speaks text while it is still being generated.
+
+    Complete sentences are synthesized by a small worker pool and played
+    back-to-back, in order, by a playback thread, so the first sentence is
+    heard while later ones are still being generated or synthesized.
+    Streams take turns on the voice in creation order; a stream's sentences
+    are synthesized while it waits, but only played once the streams ahead
+    of it have finished.
+    """
+
+    def __init__(self, interrupt_callback=None, workers=STREAM_WORKERS, synthesize=_synthesize, play=None):
+        self.interrupt_callback = interrupt_callback
+        self.segmenter = SentenceSegmenter()
+        self._synthesize = synthesize
+        self._play = play or player.play
+        self._stream_id = next(_stream_ids)
+        self._count = 0
+        self._text = []
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts")
+        self._queue = queue.Queue()
+        self._cancelled = threading.Event()
+        with _voice:
+            _voice_queue.append(self)
+        self._thread = threading.Thread(target=self._play_loop, daemon=True)
+        self._thread.start()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def done(self):
+        """True once playback has finished or was stopped."""
+        return not self._thread.is_alive()
+
+    def say(self, text):
+        """Speak `text` as one piece and close the stream."""
+        if text:
+            self._submit(text.strip())
+        self.close()
+
+    def feed(self, chunk):
+        """Add generated text; finished sentences are queued for speech."""
+        for sentence in self.segmenter.feed(chunk):
+            self._submit(sentence)
+
+    def close(self):
+        """Speak the remaining text; playback finishes in the background."""
+        for sentence in self.segmenter.flush():
+            self._submit(sentence)
+        if self._text:
+            print(f"{config.NAME}: {' '.join(self._text)}")
+        self._queue.put(None)
+        self._pool.shutdown(wait=False)
+
+    def cancel(self):
+        """Stop playback and drop every sentence that has not been spoken."""
+        self._cancelled.set()
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
                 break
-        mixer.quit()
-    except Exception as e:
-        print(f"Playback Error: {e}")
-    finally:
-        _speaking = False
+            if item is not None:
+                item.cancel()
+        self._queue.put(None)
+        self._pool.shutdown(wait=False)
+        with _voice:
+            _voice.notify_all()
+
+    def wait(self, timeout=None):
+        """Block until everything queued so far has been played."""
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _submit(self, sentence):
+        if self.cancelled:
+            return
+        self._count += 1
+        self._text.append(sentence)
+        filename = os.path.join(MEDIA_DIR, f"stream_{self._stream_id}_{self._count}.mp3")
+        self._queue.put(self._pool.submit(self._synthesize, sentence, filename))
+
+    def _should_stop(self):
+        if self.cancelled:
+            return True
+        if self.interrupt_callback and self.interrupt_callback():
+            print("🛑 Speech interrupted by callback")
+            self._cancelled.set()
+            return True
+        return False
+
+    def _wait_for_turn(self):
+        """Block until the streams ahead of this one are done; False if stopped meanwhile."""
+        with _voice:
+            while _voice_queue[0] is not self:
+                if self._should_stop():
+                    return False
+                _voice.wait(0.1)
+        return not self.cancelled
+
+    def _play_loop(self):
+        os.makedirs(MEDIA_DIR, exist_ok=True)
+        has_turn = False
+        try:
+            while True:
+                future = self._queue.get()
+                if future is None or self.cancelled:
+                    break
+                try:
+                    audio = future.result()
+                except Exception as e:
+                    print(f"TTS Error ({config.TTS_ENGINE.lower()}): {e}")
+                    continue
+                if not has_turn:
+                    has_turn = self._wait_for_turn()
+                if not has_turn or self.cancelled:
+                    self._discard(audio)
+                    break
+                try:
+                    if not self._play(audio, self._should_stop):
+                        break
+                except Exception as e:
+                    print(f"Playback Error: {e}")
+                finally:
+                    self._discard(audio)
+        finally:
+            with _voice:
+                _voice_queue.remove(self)
+                _voice.notify_all()
+
+    @staticmethod
+    def _discard(audio):
+        # Cached audio lives outside MEDIA_DIR and is kept
+        if isinstance(audio, str) and os.path.dirname(audio) == MEDIA_DIR and os.path.exists(audio):
+            os.remove(audio)
 
 def _speak_gtts(text, filename):
     from gtts import gTTS
@@ -84,10 +338,10 @@ def _speak_gtts(text, filename):
 
 def _speak_openai(text, filename):
     from openai import OpenAI
-    client = OpenAI(api_key=config.OPENAI_API_KEY)
+    client = OpenAI(api_key=config.OPENAI_API_KEY, http_client=http_pool.client(OPENAI_API_URL))
     response = client.audio.speech.create(
-        model="tts-1",
-        voice="alloy",
+        model=OPENAI_TTS_MODEL,
+        voice=OPENAI_TTS_VOICE,
         input=text
     )
     response.stream_to_file(filename)
@@ -95,49 +349,46 @@ def _speak_openai(text, filename):
 def _speak_elevenlabs(text, filename):
     from elevenlabs import save
     from elevenlabs.client import ElevenLabs
-    client = ElevenLabs(api_key=config.ELEVENLABS_API_KEY)
+    client = ElevenLabs(api_key=config.ELEVENLABS_API_KEY, httpx_client=http_pool.client(ELEVENLABS_API_URL))
     audio = client.generate(
         text=text,
-        voice="Rachel",
-        model="eleven_multilingual_v2"
+        voice=ELEVENLABS_VOICE,
+        model=ELEVENLABS_MODEL
     )
     save(audio, filename)
 
-def _speak_piper(text, filename):
+def _speak_piper(text):
     """
-    Piper local TTS implementation using standalone binary.
+    Piper local TTS through a long-lived worker that keeps the voice loaded.
+
+    Returns:
+        PCMAudio, or None when Piper or the voice model is unavailable.
     """
     # 1. Get base directory (where the core script/binary is located)
     base_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
-    
-    # 2. Check for binary
+
+    # 2. Check for binary (not needed when the piper package is installed)
     piper_path = os.path.join(base_dir, 'bin', 'piper')
     if not os.path.exists(piper_path):
         # Fallback to current working directory if not found relative to argv[0]
         piper_path = os.path.join(os.getcwd(), 'bin', 'piper')
-        
     if not os.path.exists(piper_path):
-        print(f"Piper binary not found. Falling back to gTTS.")
-        _speak_gtts(text, filename.replace('.wav', '.mp3'))
-        return
+        piper_path = None
 
     # 3. Check for model
     # Prefer temp/models, then models/ in base_dir
-    model_path = os.path.join(os.getcwd(), 'temp', 'models', f"{config.PIPER_VOICE}.onnx")
+    voice = config.PIPER_VOICE[:-len('.onnx')] if config.PIPER_VOICE.endswith('.onnx') else config.PIPER_VOICE
+    model_path = os.path.join(os.getcwd(), 'temp', 'models', f"{voice}.onnx")
     if not os.path.exists(model_path):
-        model_path = os.path.join(base_dir, 'models', f"{config.PIPER_VOICE}.onnx")
+        model_path = os.path.join(base_dir, 'models', f"{voice}.onnx")
 
     if not os.path.exists(model_path):
-        print(f"Piper model not found at {model_path}. Falling back to gTTS.")
-        _speak_gtts(text, filename.replace('.wav', '.mp3'))
-        return
-
-    # 4. Call piper with LD_LIBRARY_PATH pointed to our bin folder
-    bin_dir = os.path.dirname(piper_path)
-    command = f'export LD_LIBRARY_PATH="{bin_dir}":$LD_LIBRARY_PATH && echo "{text}" | "{piper_path}" --model "{model_path}" --output_file "{filename}"'
-    
+        print(f"Piper model not found at {model_path}.")
+        return None
+
+    # 4. Synthesize on the shared worker; the model is loaded only once
     try:
-        os.system(command)
+        return get_piper_worker(model_path, piper_path).synthesize(text)
     except Exception as e:
         print(f"Error executing Piper: {e}")
-        _speak_gtts(text, filename.replace('.wav', '.mp3'))
+        return None
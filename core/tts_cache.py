@@ -0,0 +1,162 @@
+"""
+TTS Cache - Reuse synthesized speech for repeated phrases.
+
+Provides:
+- Content-addressed keys from engine, voice and text
+- Audio files on disk under the config directory, so hits survive restarts
+- LRU eviction once the cache grows past a size limit
+- Hit/miss counters
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+import wave
+from collections import OrderedDict
+
+from core.piper_worker import PCMAudio
+
+
+def make_speech_key(engine: str, voice: str, text: str) -> str:
+    """Hash of (engine, voice, text); whitespace at the ends is ignored."""
+    payload = "\0".join([engine, voice or "", text.strip()])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """
+    Disk cache of synthesized audio keyed by make_speech_key().
+
+    Engines that write files (gTTS, OpenAI, ElevenLabs) are stored as a copy
+    of that file and served by path; in-memory PCM (Piper) is stored as WAV
+    and served back as PCMAudio. File mtimes record last use, so LRU order
+    survives restarts.
+    """
+
+    def __init__(self, cache_dir, max_bytes: int = 100 * 1024 * 1024, enabled: bool = True):
+        self.cache_dir = str(cache_dir)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._entries = None  # key -> (filename, size), least recently used first
+        self._total = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        found = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    key, ext = os.path.splitext(entry.name)
+                    if entry.is_file() and ext in (".mp3", ".wav") and len(key) == 64:
+                        st = entry.stat()
+                        found.append((st.st_mtime, key, entry.name, st.st_size))
+        except FileNotFoundError:
+            pass
+        found.sort()
+        self._entries = OrderedDict((key, (name, size)) for _, key, name, size in found)
+        self._total = sum(size for _, _, _, size in found)
+
+    def get(self, key: str):
+        """Cached audio (file path or PCMAudio), or None."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._load()
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        path = os.path.join(self.cache_dir, entry[0])
+        try:
+            os.utime(path)
+            if entry[0].endswith(".wav"):
+                with wave.open(path, "rb") as wav_file:
+                    return PCMAudio(wav_file.readframes(wav_file.getnframes()), wav_file.getframerate())
+            return path
+        except (OSError, EOFError, wave.Error):
+            with self._lock:
+                if self._entries.pop(key, None):
+                    self._total -= entry[1]
+            return None
+
+    def contains(self, key: str) -> bool:
+        if not self.enabled:
+            return False
+        with self._lock:
+            self._load()
+            return key in self._entries
+
+    def put(self, key: str, audio):
+        """
+        Store audio from an engine.
+
+        Returns:
+            What to play: the cached copy, or the original audio if it
+            could not be stored.
+        """
+        if not self.enabled or audio is None:
+            return audio
+        is_pcm = isinstance(audio, PCMAudio)
+        name = key + (".wav" if is_pcm else os.path.splitext(audio)[1] or ".mp3")
+        path = os.path.join(self.cache_dir, name)
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if is_pcm:
+                with wave.open(tmp_path, "wb") as wav_file:
+                    wav_file.setnchannels(1)
+                    wav_file.setsampwidth(2)
+                    wav_file.setframerate(audio.sample_rate)
+                    wav_file.writeframes(audio.data)
+            else:
+                shutil.copyfile(audio, tmp_path)
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except OSError as e:
+            print(f"⚠️ TTS cache write failed: {e}")
+            return audio
+
+        with self._lock:
+            self._load()
+            old = self._entries.pop(key, None)
+            if old:
+                self._total -= old[1]
+            self._entries[key] = (name, size)
+            self._total += size
+            evicted = self._evict()
+            if old and old[0] != name:
+                evicted.append(old[0])
+        for old_name in evicted:
+            try:
+                os.remove(os.path.join(self.cache_dir, old_name))
+            except OSError:
+                pass
+        return audio if is_pcm else path
+
+    def _evict(self):
+        """Drop least recently used entries until under max_bytes (caller holds the lock)."""
+        evicted = []
+        while self._total > self.max_bytes and len(self._entries) > 1:
+            _, (name, size) = self._entries.popitem(last=False)
+            self._total -= size
+            evicted.append(name)
+        return evicted
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._load()
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -75,6 +75,10 @@ class WebSocketServer:
                 self.loop
             )
 
+    def _session_key(self, websocket):
+        """Scheduler session for a client connection."""
+        return f"ws:{id(websocket)}"
+
     def _build_message(self, event_type, payload, message_id=None):
         return {
             "id": message_id or str(uuid.uuid4()),
@@ -214,20 +218,21 @@ class WebSocketServer:
                                 context=self._safe_event_context(event_type, payload),
                             )
 
-                        threading.Thread(
-                            target=assistant.process_command,
-                            args=(command, message_id, True),
-                            daemon=True
-                        ).start()
+                        # Commands from one client run in order; clients run concurrently
+                        assistant.submit_command(command, message_id, True, session_key=self._session_key(websocket))
 
                     elif event_type == "assistant.interrupt":
                         print("⚡ Interrupt received, stopping current operation...")
-                        assistant.interrupt()
+                        target = payload.get("request_id")
+                        if target:
+                            assistant.interrupt(request_id=str(target))
+                        else:
+                            assistant.interrupt(session_key=self._session_key(websocket))
 
                     elif event_type == "assistant.voice_start":
                         threading.Thread(
                             target=assistant.capture_voice_command,
-                            args=(message_id,),
+                            args=(message_id, self._session_key(websocket)),
                             daemon=True
                         ).start()
 
@@ -416,10 +421,23 @@ class WebSocketServer:
                     elif event_type == "conversation.search":
                         from core.memory import memory
                         query = payload.get("query", "")
-                        results = memory.recall(query)
+                        mode = payload.get("mode", "keyword")
+                        # Both searches read SQLite (and semantic may embed), so keep them off the loop
+                        loop = asyncio.get_running_loop()
+                        if mode == "semantic":
+                            results = await loop.run_in_executor(None, memory.semantic_recall, query)
+                        elif mode == "keyword":
+                            results = await loop.run_in_executor(None, memory.recall, query)
+                        else:
+                            raise CoreErrorException(
+                                "INVALID_SEARCH_MODE",
+                                "mode must be 'keyword' or 'semantic'",
+                                severity="warning",
+                                context=self._safe_event_context(event_type, payload),
+                            )
                         await websocket.send(json.dumps(self._build_message(
                             "conversation.search_results",
-                            {"query": query, "results": results},
+                            {"query": query, "mode": mode, "results": results},
                             message_id
                         )))
 
@@ -503,6 +521,8 @@ class WebSocketServer:
         except websockets.exceptions.ConnectionClosed:
             pass
         finally:
+            # Nobody is left to receive this client's replies; stop generating them
+            assistant.interrupt(session_key=self._session_key(websocket))
             await self.unregister(websocket)
 
     async def _broadcast_stats(self):
@@ -547,10 +567,17 @@ class WebSocketServer:
                     })
 
                     # Add Intelligence Stats broadcast
+                    from core.brain import brain
+                    from core.brains.transport import http_pool
                     intelligence_stats = {
                         "tokens_sec": 42.5 if assistant.state == "thinking" else 0,
                         "latency": 12 if assistant.state == "thinking" else 0,
                         "npu_acceleration": 64 if nvml_initialized else 0,
+                        "response_cache": brain.response_cache.stats(),
+                        "requests": assistant.scheduler.stats(),
+                        "http": http_pool.stats(),
+                        "brain_health": brain.manager.health_monitor.stats(),
+                        "brain_hedging": brain.manager.hedger.stats(),
                     }
                     await self.broadcast({
                         "id": str(uuid.uuid4()),
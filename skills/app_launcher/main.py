@@ -1,10 +1,13 @@
 import os
-import glob
+import json
+import time
+import threading
 import subprocess
 import shlex
 import shutil
 import rapidfuzz
 from pathlib import Path
+from core.config import config
 from core.ipc_bridge import ipc_bridge
 
 # -----------------------------
@@ -32,6 +35,30 @@ INTENT_ALIASES = {
     "video": ["video", "movie", "media"]
 }
 
+# Expansion terms for generic intents
+INTENT_EXPANSION = {
+    "browser": ["firefox", "chrome", "chromium", "opera", "browser", "web", "navigator", "internet", "net"],
+    "terminal": ["terminal", "console", "shell", "emulator", "bash", "term", "cosmic-term"],
+    "calculator": ["calc", "math", "calculator", "spreadsheet", "excel"],
+    "editor": ["code", "editor", "text", "ide", "writing", "edit", "vscode"],
+    "files": ["files", "explorer", "manager", "nautilus", "thunar", "folder"],
+    "settings": ["settings", "config", "preferences", "control"],
+    "music": ["music", "audio", "player", "spotify", "rhythmbox"],
+    "video": ["video", "movie", "player", "vlc", "mpv", "totem"]
+}
+
+# Categories for generic intents (Primary + Fallback)
+INTENT_CATS = {
+    "browser": ["WebBrowser", "Network"],
+    "terminal": ["TerminalEmulator", "System"],
+    "calculator": ["Calculator", "Office", "Spreadsheet"],
+    "editor": ["TextEditor", "IDE", "Development"],
+    "files": ["FileManager"],
+    "settings": ["Settings", "DesktopSettings"],
+    "music": ["Music", "Audio"],
+    "video": ["Video", "AudioVideo"]
+}
+
 SEARCH_DIRS = [
     "/usr/share/applications",
     "/usr/local/share/applications",
@@ -61,18 +88,149 @@ def normalize_intent(query):
 # Desktop Index
 # -----------------------------
 class DesktopIndex:
-    def __init__(self):
-        self.entries = []
-        self._build_index()
-
-    def _build_index(self):
-        for sdir in SEARCH_DIRS:
-            if not os.path.exists(sdir):
-                continue
-            for path in glob.glob(os.path.join(sdir, "*.desktop")):
-                entry = self._parse_desktop_file(path)
-                if entry:
-                    self.entries.append(entry)
+    """
+    Parsed .desktop entries from SEARCH_DIRS, cached on disk.
+
+    The cache maps each file path to its mtime and parsed entry, so startup
+    only reads one JSON file. Rescans are a stat diff: only new or modified
+    files are parsed, removed ones are dropped. A rescan runs in the
+    background whenever the index is older than `refresh_interval`, so new
+    apps show up without a restart and lookups never wait on the disk.
+    """
+
+    CACHE_VERSION = 1
+
+    def __init__(self, search_dirs=None, cache_path=None, refresh_interval=30.0):
+        self.search_dirs = list(search_dirs if search_dirs is not None else SEARCH_DIRS)
+        self.cache_path = str(cache_path or config.config_dir / "desktop_index.json")
+        self.refresh_interval = refresh_interval
+        self._snapshot = (0, [])  # (version, entries), replaced in one assignment
+        self._files = {}          # path -> {"mtime": int, "entry": dict | None}
+        self._last_scan = 0.0
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+        self._ready = threading.Event()
+        self._search = None       # SearchIndex for the current version
+
+        if self._load_cache():
+            self._ready.set()
+        self.refresh_async()
+
+    # ----- Cache -----
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != self.CACHE_VERSION or data.get("search_dirs") != self.search_dirs:
+            return False
+        self._files = data.get("files", {})
+        self._publish()
+        return True
+
+    def _save_cache(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"version": self.CACHE_VERSION, "search_dirs": self.search_dirs, "files": self._files}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"⚠️ Could not save desktop index: {e}")
+
+    @property
+    def entries(self):
+        return self._snapshot[1]
+
+    @property
+    def version(self):
+        """Bumped whenever entries change."""
+        return self._snapshot[0]
+
+    def _publish(self):
+        """
+        Rebuild the ordered entry list from the per-file table.
+
+        The new list and its version are swapped in as one tuple, so a
+        lookup on another thread never pairs a version with the wrong list.
+        """
+        entries = [
+            record["entry"]
+            for _, record in sorted(self._files.items(), key=lambda item: self._sort_key(item[0]))
+            if record.get("entry")
+        ]
+        self._snapshot = (self._snapshot[0] + 1, entries)
+
+    def _sort_key(self, path):
+        directory = os.path.dirname(path)
+        rank = self.search_dirs.index(directory) if directory in self.search_dirs else len(self.search_dirs)
+        return rank, path
+
+    # ----- Scanning -----
+
+    def refresh(self):
+        """
+        Stat-diff SEARCH_DIRS against the index and parse only what changed.
+
+        Returns:
+            True if any entry was added, changed or removed.
+        """
+        with self._lock:
+            seen = {}
+            for sdir in self.search_dirs:
+                try:
+                    with os.scandir(sdir) as it:
+                        for item in it:
+                            if item.name.endswith(".desktop") and item.is_file():
+                                seen[item.path] = item.stat().st_mtime_ns
+                except OSError:
+                    continue
+
+            changed = False
+            for path in list(self._files):
+                if path not in seen:
+                    del self._files[path]
+                    changed = True
+            for path, mtime in seen.items():
+                record = self._files.get(path)
+                if record is None or record.get("mtime") != mtime:
+                    self._files[path] = {"mtime": mtime, "entry": self._parse_desktop_file(path)}
+                    changed = True
+
+            self._last_scan = time.monotonic()
+            if changed:
+                self._publish()
+                self._save_cache()
+        self._ready.set()
+        return changed
+
+    def refresh_async(self):
+        """Start a background rescan unless one is already running."""
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        self._refresh_thread = threading.Thread(target=self._refresh_safely, name="avva-desktop-index", daemon=True)
+        self._refresh_thread.start()
+
+    def _refresh_safely(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"⚠️ Desktop index refresh failed: {e}")
+            self._ready.set()
+
+    def ensure_fresh(self, timeout=10.0):
+        """
+        Make entries usable for a lookup.
+
+        Waits only on a cold start (no cache yet); otherwise serves the
+        current entries and schedules a rescan if they are stale.
+        """
+        if not self._ready.is_set():
+            self._ready.wait(timeout)
+        elif time.monotonic() - self._last_scan > self.refresh_interval:
+            self.refresh_async()
 
     def _parse_desktop_file(self, path):
         data = {
@@ -117,52 +275,112 @@ class DesktopIndex:
             return None
         return data
 
+    def _ensure_search_index(self):
+        """(Re)build the search index when the entry list has changed."""
+        version, entries = self._snapshot
+        search = self._search
+        if search is None or search.version != version:
+            search = self._search = SearchIndex(entries, version)
+        return search
+
     def resolve(self, query):
         """
         Uses a weighted search across Name, Filename, Keywords, and Categories.
         Expands generic intents (e.g., 'browser') into multiple search terms.
         """
+        self.ensure_fresh()
+        return self._ensure_search_index().resolve(query)
+
+
+class SearchIndex:
+    """
+    Inverted index over one snapshot of DesktopIndex entries.
+
+    Scoring (per entry):
+      name contains a search term   +50 (+50 more on exact name)
+      else filename contains one    +40
+      intent category match         +50 primary / +25 fallback
+      keywords contain a term       +20
+      fuzzy token_set_ratio(name)   * 0.5
+    and entries scoring over 40 are returned, best first.
+
+    Instead of scoring every entry, candidates are gathered from a trigram
+    index (substring terms) and a category index. Entries with none of those
+    can only pass on the fuzzy score alone (> 80), which one batched
+    rapidfuzz.process.extract call with a cutoff finds. Results are cached
+    per query for the lifetime of the snapshot.
+    """
+
+    NGRAM = 3
+    CACHE_SIZE = 128
+
+    def __init__(self, entries, version):
+        self.entries = entries
+        self.version = version
+        self.names = [entry["name"].lower() for entry in entries]
+        self.fnames = [os.path.basename(entry["path"]).lower() for entry in entries]
+        self.keywords = [" ".join(entry["keywords"]) for entry in entries]
+        self.categories = {}  # category -> set of entry indices
+        self.ngrams = {}      # trigram -> set of entry indices (any field)
+        self._cache = {}
+
+        for idx, entry in enumerate(entries):
+            for cat in entry["categories"]:
+                self.categories.setdefault(cat, set()).add(idx)
+            for text in (self.names[idx], self.fnames[idx], self.keywords[idx]):
+                for gram in self._grams(text):
+                    self.ngrams.setdefault(gram, set()).add(idx)
+
+    @classmethod
+    def _grams(cls, text):
+        return {text[i:i + cls.NGRAM] for i in range(len(text) - cls.NGRAM + 1)}
+
+    def _containing(self, term):
+        """Indices of entries where `term` may occur in name, filename or keywords."""
+        if len(term) < self.NGRAM:
+            return set(range(len(self.entries)))
+        grams = sorted(self._grams(term), key=lambda g: len(self.ngrams.get(g, ())))
+        found = set(self.ngrams.get(grams[0], ()))
+        for gram in grams[1:]:
+            if not found:
+                break
+            found &= self.ngrams.get(gram, set())
+        return found
+
+    def resolve(self, query):
         query_clean = query.lower().strip()
+        cached = self._cache.get(query_clean)
+        if cached is not None:
+            return list(cached)
+
         intent = normalize_intent(query_clean)
-        candidates = []
-
-        # Expansion terms for generic intents
-        INTENT_EXPANSION = {
-            "browser": ["firefox", "chrome", "chromium", "opera", "browser", "web", "navigator", "internet", "net"],
-            "terminal": ["terminal", "console", "shell", "emulator", "bash", "term", "cosmic-term"],
-            "calculator": ["calc", "math", "calculator", "spreadsheet", "excel"],
-            "editor": ["code", "editor", "text", "ide", "writing", "edit", "vscode"],
-            "files": ["files", "explorer", "manager", "nautilus", "thunar", "folder"],
-            "settings": ["settings", "config", "preferences", "control"],
-            "music": ["music", "audio", "player", "spotify", "rhythmbox"],
-            "video": ["video", "movie", "player", "vlc", "mpv", "totem"]
-        }
+        search_terms = [query_clean]
+        if intent in INTENT_EXPANSION:
+            search_terms.extend(INTENT_EXPANSION[intent])
 
-        # Categories for generic intents (Primary + Fallback)
-        INTENT_CATS = {
-            "browser": ["WebBrowser", "Network"],
-            "terminal": ["TerminalEmulator", "System"],
-            "calculator": ["Calculator", "Office", "Spreadsheet"],
-            "editor": ["TextEditor", "IDE", "Development"],
-            "files": ["FileManager"],
-            "settings": ["Settings", "DesktopSettings"],
-            "music": ["Music", "Audio"],
-            "video": ["Video", "AudioVideo"]
-        }
+        # Candidates that can earn a structural score
+        candidates = set()
+        for term in search_terms:
+            candidates |= self._containing(term)
+        for cat in INTENT_CATS.get(intent, ()):
+            candidates |= self.categories.get(cat, set())
+
+        # Entries with no structural score pass only if fuzzy * 0.5 > 40
+        fuzzy = {}
+        for _, ratio, idx in rapidfuzz.process.extract(
+            query_clean, self.names, scorer=rapidfuzz.fuzz.token_set_ratio,
+            processor=None, score_cutoff=80, limit=None
+        ):
+            fuzzy[idx] = ratio
+            candidates.add(idx)
 
-        for entry in self.entries:
-            name = entry["name"].lower()
-            fname = os.path.basename(entry["path"]).lower()
-            kws = " ".join(entry["keywords"])
-            cats = entry["categories"]
-            
+        results = []
+        for idx in sorted(candidates):
+            name, fname, kws = self.names[idx], self.fnames[idx], self.keywords[idx]
+            cats = self.entries[idx]["categories"]
             score = 0
-            
+
             # 1. Direct Search Matching
-            search_terms = [query_clean]
-            if intent in INTENT_EXPANSION:
-                search_terms.extend(INTENT_EXPANSION[intent])
-            
             for term in search_terms:
                 if term in name:
                     score += 50
@@ -171,13 +389,13 @@ class DesktopIndex:
                 if term in fname:
                     score += 40
                     break
-            
+
             # 2. Category Match
             if intent in INTENT_CATS:
-                for idx, cat in enumerate(INTENT_CATS[intent]):
+                for cat_idx, cat in enumerate(INTENT_CATS[intent]):
                     if cat in cats:
                         # Primary category (first in list) gets more boost
-                        score += 50 if idx == 0 else 25
+                        score += 50 if cat_idx == 0 else 25
                         break
 
             # 3. Keyword Match
@@ -187,15 +405,19 @@ class DesktopIndex:
                     break
 
             # 4. Fuzzy logic fallback
-            fuzzy_name = rapidfuzz.fuzz.token_set_ratio(query_clean, name)
-            
+            fuzzy_name = fuzzy[idx] if idx in fuzzy else rapidfuzz.fuzz.token_set_ratio(query_clean, name)
+
             final_score = score + (fuzzy_name * 0.5)
 
             if final_score > 40:
-                candidates.append((final_score, entry))
+                results.append((final_score, self.entries[idx]))
+
+        results.sort(key=lambda x: x[0], reverse=True)
 
-        candidates.sort(key=lambda x: x[0], reverse=True)
-        return candidates
+        if len(self._cache) >= self.CACHE_SIZE:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[query_clean] = results
+        return list(results)
 
 # -----------------------------
 # Launcher Logic
@@ -24,6 +24,9 @@ def recall(query: str = ""):
         return "Please specify what you'd like me to recall. For example: 'recall my questions about Python'"
 
     results = memory.recall(query, max_results=5)
+    if not results:
+        # No keyword hit; fall back to meaning-based search
+        results = memory.semantic_recall(query, max_results=5)
 
     if not results:
         return f"I don't have any conversations matching '{query}' in my memory."
@@ -33,10 +36,9 @@ def recall(query: str = ""):
     for i, result in enumerate(results, 1):
         response += f"{i}. {result['title']} ({result['date']})\n"
 
-        if result.get('messages'):
-            preview = result['messages'][0] if len(result['messages']) > 0 else ""
-            if preview:
-                response += f"   Last message: {preview[:100]}...\n"
+        preview = result.get('snippet') or (result['messages'][0] if result.get('messages') else "")
+        if preview:
+            response += f"   Match: {preview[:100]}...\n"
         response += "\n"
 
     return response
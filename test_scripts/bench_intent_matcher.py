@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for local intent matching.
+
+Builds synthetic skill sets of increasing size and compares the original
+linear scan against core.intent_matcher.IntentMatcher on a mix of commands
+that hit static phrases, hit regex intents, or miss entirely.
+
+Usage: python test_scripts/bench_intent_matcher.py [iterations]
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.intent_matcher import IntentMatcher
+from test_intent_matcher import compiled_match, linear_match
+
+
+WORDS = ("open", "play", "show", "music", "volume", "light", "timer", "note", "mail", "lamp",
+         "weather", "news", "calendar", "camera", "screen", "battery", "wifi", "bluetooth")
+
+
+def synthetic_skills(n_skills, rng):
+    """Each synthetic skill registers three phrases and one parametric intent."""
+    static_intents, regex_intents = {}, []
+    for i in range(n_skills):
+        for j in range(3):
+            static_intents[f"{rng.choice(WORDS)} {rng.choice(WORDS)} skill{i}x{j}"] = f"tool_{i}_{j}()"
+        pattern = rf"(?:{rng.choice(WORDS)}|{rng.choice(WORDS)}) skill{i} (\w+)"
+        regex_intents.append((re.compile(pattern, re.IGNORECASE), f'tool_{i}("$1")'))
+    return static_intents, regex_intents
+
+
+def timed(label, fn, commands, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for command in commands:
+            fn(command)
+    per_call_us = (time.perf_counter() - start) / (iterations * len(commands)) * 1_000_000
+    print(f"  {label:<20} {per_call_us:10.1f} µs/call")
+    return per_call_us
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rng = random.Random(0)
+    print(f"Intent matcher micro-benchmark ({iterations} iterations)\n")
+
+    for n_skills in (10, 100, 500, 2000):
+        static_intents, regex_intents = synthetic_skills(n_skills, rng)
+        commands = [
+            f"please {next(iter(static_intents))} now",                         # early static hit
+            f"could you {list(static_intents)[-1]}",                           # late static hit
+            f"{WORDS[0]} skill{n_skills - 1} tomorrow",                        # late regex (maybe)
+            "what is the meaning of life, the universe and everything",          # miss
+        ]
+
+        start = time.perf_counter()
+        matcher = IntentMatcher(static_intents, regex_intents)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        for command in commands:
+            assert compiled_match(command, static_intents, matcher) == linear_match(command, static_intents, regex_intents)
+
+        print(f"{n_skills} skills ({len(static_intents)} phrases, {len(regex_intents)} regexes), build {build_ms:.1f} ms:")
+        before = timed("linear scan", lambda c: linear_match(c, static_intents, regex_intents), commands, iterations)
+        after = timed("compiled", lambda c: compiled_match(c, static_intents, matcher), commands, iterations)
+        print(f"  speedup: {before / after:.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the SQLite persistence layer.
+
+Compares the legacy "connect per call" pattern against the pooled,
+WAL-tuned connections used by core.persistence.Persistence. Writes are
+timed twice: until the row is queued on the write-behind queue, and
+until it is committed (flush() after every call), which is the figure
+compared against the legacy commit.
+
+Usage: python test_scripts/bench_persistence.py [iterations]
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+import time
+import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.persistence import Persistence
+
+
+def legacy_log_interaction(db_path, sender, message):
+    """The pre-pool implementation: fresh connection and commit per call."""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    try:
+        cursor.execute('''
+            INSERT INTO history (timestamp, sender, message, tool_call)
+            VALUES (?, ?, ?, ?)
+        ''', (datetime.datetime.now(), sender, message, None))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def legacy_get_setting(db_path, key):
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    try:
+        cursor.execute('SELECT value FROM settings WHERE key = ?', (key,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+    finally:
+        conn.close()
+
+
+def timed(label, fn, iterations):
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    per_call_us = elapsed / iterations * 1_000_000
+    print(f"  {label:<32} {per_call_us:10.1f} µs/call")
+    return per_call_us
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = os.path.join(tmp, "legacy.db")
+        pooled_db = os.path.join(tmp, "pooled.db")
+
+        # Same schema for both; the legacy database stays in rollback-journal mode.
+        Persistence(db_path=legacy_db).close()
+        conn = sqlite3.connect(legacy_db)
+        conn.execute("PRAGMA journal_mode=DELETE")
+        conn.close()
+
+        store = Persistence(db_path=pooled_db)
+        store.set_setting("bench", "1")
+        legacy_conn = sqlite3.connect(legacy_db)
+        legacy_conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('bench', '1')")
+        legacy_conn.commit()
+        legacy_conn.close()
+
+        print(f"Persistence micro-benchmark ({iterations} iterations)\n")
+
+        print("log_interaction (write):")
+        before_w = timed("connect-per-call", lambda i: legacy_log_interaction(legacy_db, "user", f"msg {i}"), iterations)
+        enqueue_w = timed("write-behind (enqueue only)", lambda i: store.log_interaction("user", f"msg {i}"), iterations)
+        store.flush()
+
+        def durable_log_interaction(i):
+            store.log_interaction("user", f"msg {i}")
+            store.flush()
+        after_w = timed("pooled + WAL (committed)", durable_log_interaction, iterations)
+
+        print("\nget_setting (read):")
+        before_r = timed("connect-per-call", lambda i: legacy_get_setting(legacy_db, "bench"), iterations)
+        after_r = timed("pooled + WAL", lambda i: store.get_setting("bench"), iterations)
+
+        print(f"\nWrite speedup: {before_w / after_w:.1f}x committed, {before_w / enqueue_w:.1f}x to enqueue")
+        print(f"Read speedup:  {before_r / after_r:.1f}x")
+
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
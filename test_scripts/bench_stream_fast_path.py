@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for intent-matchable commands on the streaming path.
+
+Compares the previous order (stream from the Brain first) against
+Brain.process_stream(), which answers local intents before any network
+call. The Brain is a stand-in LM Studio server on localhost that waits
+`first_token_ms` before its first token, like a model's time to first
+token.
+
+Usage: python test_scripts/bench_stream_fast_path.py [iterations] [first_token_ms]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from test_stream_fast_path import start_server, streaming_facade
+
+COMMANDS = ["what time is it", "open firefox", "What time is it?", "open terminal"]
+
+
+def stream_first(facade, command, on_chunk):
+    """The pre-fast-path order: a streaming Brain got every command."""
+    brain = facade.manager.select_brain({})
+    full_text = ""
+    for frame in brain.execute_stream(command, {}, {}):
+        if frame.get("done") or "error" in frame:
+            break
+        full_text += frame["chunk"]
+        on_chunk(frame["chunk"])
+    return full_text, None
+
+
+def timed(label, run, facade, iterations):
+    """Mean time to first chunk and to completion, in milliseconds."""
+    first, total = 0.0, 0.0
+    for _ in range(iterations):
+        for command in COMMANDS:
+            arrival = []
+            start = time.perf_counter()
+            run(facade, command, lambda chunk: arrival.append(time.perf_counter()) if not arrival else None)
+            end = time.perf_counter()
+            first += (arrival[0] if arrival else end) - start
+            total += end - start
+    runs = iterations * len(COMMANDS)
+    first_ms, total_ms = first / runs * 1000, total / runs * 1000
+    print(f"  {label:<24} first chunk {first_ms:8.2f} ms   complete {total_ms:8.2f} ms")
+    return total_ms
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    first_token_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 300
+    print(f"Streaming fast-path benchmark ({iterations} x {len(COMMANDS)} intent commands, "
+          f"model first token after {first_token_ms:.0f} ms)\n")
+
+    server, url = start_server(first_token_delay=first_token_ms / 1000)
+    try:
+        with streaming_facade(url) as (facade, _):
+            before = timed("stream first", stream_first, facade, iterations)
+            requests_before = server.requests
+            after = timed("local intents first", lambda f, c, cb: f.process_stream(c, cb), facade, iterations)
+        print(f"\n  LLM requests: {requests_before} -> {server.requests - requests_before}")
+        print(f"  speedup: {before / after:.0f}x")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
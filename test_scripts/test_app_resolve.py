@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Golden tests for DesktopIndex.resolve in skills/app_launcher.
+
+The indexed search must rank exactly like the original full scan.
+"""
+
+import os
+import random
+import sys
+import tempfile
+
+import rapidfuzz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skills.app_launcher.main import DesktopIndex, INTENT_CATS, INTENT_EXPANSION, normalize_intent
+from test_desktop_index import write_desktop
+
+
+APPS = [
+    ("firefox.desktop", "Firefox", "Network;WebBrowser;", "internet;www;browser;"),
+    ("chromium.desktop", "Chromium Web Browser", "Network;WebBrowser;", "web;"),
+    ("org.gnome.Terminal.desktop", "Terminal", "GNOME;GTK;System;TerminalEmulator;", "shell;prompt;command;"),
+    ("com.system76.CosmicTerm.desktop", "COSMIC Terminal", "System;TerminalEmulator;", ""),
+    ("xterm.desktop", "XTerm", "System;TerminalEmulator;", "shell;"),
+    ("org.gnome.Calculator.desktop", "Calculator", "GNOME;Utility;Calculator;", "calculation;arithmetic;"),
+    ("libreoffice-calc.desktop", "LibreOffice Calc", "Office;Spreadsheet;", "excel;"),
+    ("code.desktop", "Visual Studio Code", "TextEditor;Development;IDE;", "vscode;"),
+    ("org.gnome.gedit.desktop", "Text Editor", "GNOME;Utility;TextEditor;", "text;edit;"),
+    ("vim.desktop", "Vim", "Utility;TextEditor;", "text;editor;"),
+    ("org.gnome.Nautilus.desktop", "Files", "GNOME;System;FileManager;", "folder;manager;explore;"),
+    ("thunar.desktop", "Thunar File Manager", "System;FileManager;", ""),
+    ("gnome-control-center.desktop", "Settings", "GNOME;Settings;", "preferences;"),
+    ("spotify.desktop", "Spotify", "Audio;Music;Player;AudioVideo;", "music;"),
+    ("rhythmbox.desktop", "Rhythmbox", "AudioVideo;Audio;", "music;player;"),
+    ("vlc.desktop", "VLC media player", "AudioVideo;Player;Video;", "movie;video;"),
+    ("mpv.desktop", "mpv Media Player", "AudioVideo;Video;Player;", ""),
+    ("org.gnome.Totem.desktop", "Videos", "GTK;GNOME;AudioVideo;Player;Video;", "movie;"),
+    ("steam.desktop", "Steam", "Game;", "valve;"),
+    ("gimp.desktop", "GNU Image Manipulation Program", "Graphics;", "gimp;"),
+]
+
+QUERIES = [
+    "terminal", "browser", "calculator", "vlc", "code", "nautilus", "firefox", "fire", "text editr",
+    "vi", "", "spotify", "settings", "mus", "music", "video", "files", "editor", "gimp", "steam",
+    "image editor", "web", "console", "media", "player", "unknown app", "calc", "chrome",
+]
+
+
+def legacy_resolve(entries, query):
+    """The original full-scan implementation, kept as the reference."""
+    query_clean = query.lower().strip()
+    intent = normalize_intent(query_clean)
+    candidates = []
+    for entry in entries:
+        name = entry["name"].lower()
+        fname = os.path.basename(entry["path"]).lower()
+        kws = " ".join(entry["keywords"])
+        cats = entry["categories"]
+        score = 0
+        search_terms = [query_clean]
+        if intent in INTENT_EXPANSION:
+            search_terms.extend(INTENT_EXPANSION[intent])
+        for term in search_terms:
+            if term in name:
+                score += 50
+                if term == name: score += 50
+                break
+            if term in fname:
+                score += 40
+                break
+        if intent in INTENT_CATS:
+            for idx, cat in enumerate(INTENT_CATS[intent]):
+                if cat in cats:
+                    score += 50 if idx == 0 else 25
+                    break
+        for term in search_terms:
+            if term in kws:
+                score += 20
+                break
+        fuzzy_name = rapidfuzz.fuzz.token_set_ratio(query_clean, name)
+        final_score = score + (fuzzy_name * 0.5)
+        if final_score > 40:
+            candidates.append((final_score, entry))
+    candidates.sort(key=lambda x: x[0], reverse=True)
+    return candidates
+
+
+def ranking(results):
+    return [(score, entry["path"]) for score, entry in results]
+
+
+def build_index(tmp, apps):
+    directory = os.path.join(tmp, "applications")
+    os.makedirs(directory)
+    for filename, name, categories, keywords in apps:
+        write_desktop(directory, filename, name, filename.split(".")[0], categories, keywords)
+    index = DesktopIndex(search_dirs=[directory], cache_path=os.path.join(tmp, "cache.json"))
+    index.ensure_fresh()
+    index._refresh_thread.join()
+    return index
+
+
+def test_golden_rankings():
+    """Indexed resolve matches the full scan on a realistic app set."""
+    print("\n=== Test: Golden resolve rankings ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        index = build_index(tmp, APPS)
+        assert len(index.entries) == len(APPS)
+        for query in QUERIES:
+            expected = ranking(legacy_resolve(index.entries, query))
+            assert ranking(index.resolve(query)) == expected, query
+            assert ranking(index.resolve(query)) == expected, query  # cached
+        assert ranking(index.resolve("terminal"))[0][1].endswith("org.gnome.Terminal.desktop")
+    print("✅ Golden resolve rankings test passed\n")
+
+
+def test_random_app_sets():
+    """Randomized equivalence on generated names, keywords and categories."""
+    print("=== Test: Randomized resolve equivalence ===")
+    rng = random.Random(42)
+    words = ["web", "term", "media", "play", "code", "calc", "note", "fox", "mail", "vi", "music", "files"]
+    cats = ["WebBrowser", "Network", "TerminalEmulator", "System", "Office", "AudioVideo", "Video", "Music"]
+    apps = []
+    for i in range(300):
+        name = " ".join(rng.choice(words) for _ in range(rng.randint(1, 3)))
+        apps.append((f"app{i}-{rng.choice(words)}.desktop", name.title(),
+                     ";".join(rng.sample(cats, rng.randint(0, 3))), ";".join(rng.sample(words, 2))))
+    with tempfile.TemporaryDirectory() as tmp:
+        index = build_index(tmp, apps)
+        for query in QUERIES + words:
+            assert ranking(index.resolve(query)) == ranking(legacy_resolve(index.entries, query)), query
+    print("✅ Randomized resolve equivalence test passed\n")
+
+
+if __name__ == "__main__":
+    test_golden_rankings()
+    test_random_app_sets()
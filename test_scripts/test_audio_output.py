@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent speech output stream (core.audio_output).
+
+A stand-in stream drives the audio callback in real time, so no sound
+device is needed.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.audio_output import AudioPlayer, load_samples
+from core.piper_worker import PCMAudio
+
+
+class FakeStream:
+    """Calls the callback every block like a sound device would."""
+
+    def __init__(self, callback, blocksize, sample_rate):
+        self.callback = callback
+        self.blocksize = blocksize
+        self.interval = blocksize / sample_rate
+        self.blocks = []  # (time, block)
+        self._running = False
+
+    def start(self):
+        self._running = True
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        while self._running:
+            out = np.zeros((self.blocksize, 1), dtype=np.int16)
+            self.callback(out, self.blocksize, None, None)
+            self.blocks.append((time.monotonic(), out[:, 0].copy()))
+            time.sleep(self.interval)
+
+    def stop(self):
+        self._running = False
+
+    def close(self):
+        pass
+
+
+def make_player():
+    streams = []
+
+    def factory(callback):
+        stream = FakeStream(callback, player.blocksize, player.sample_rate)
+        streams.append(stream)
+        return stream
+
+    player = AudioPlayer(stream_factory=factory)
+    return player, streams
+
+
+def tone(seconds, rate):
+    t = np.arange(int(seconds * rate)) / rate
+    return (8000 * np.sin(2 * np.pi * 440 * t)).astype(np.int16)
+
+
+def test_plays_clips_on_one_stream():
+    """Clips play to completion in full, reusing a single open stream."""
+    print("\n=== Test: Persistent output stream ===")
+    player, streams = make_player()
+    for _ in range(3):
+        clip = tone(0.1, player.sample_rate)
+        assert player.play(PCMAudio(clip.tobytes(), player.sample_rate)) is True
+    assert len(streams) == 1
+    played = np.concatenate([block for _, block in streams[0].blocks])
+    assert np.count_nonzero(played) >= 3 * np.count_nonzero(clip) - 3
+    player.close()
+    print("✅ Persistent output stream test passed\n")
+
+
+def test_stop_latency():
+    """stop() silences the device within 50 ms."""
+    print("=== Test: Interrupt latency ===")
+    player, streams = make_player()
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault(
+        "played", player.play(PCMAudio(tone(5.0, player.sample_rate).tobytes(), player.sample_rate))))
+    thread.start()
+    time.sleep(0.2)
+    stopped_at = time.monotonic()
+    player.stop()
+    thread.join(1.0)
+    assert result["played"] is False
+    time.sleep(0.1)
+    after = [(at, block) for at, block in streams[0].blocks if at > stopped_at]
+    silent_from = next(at for at, block in after if not block.any())
+    assert silent_from - stopped_at < 0.05, silent_from - stopped_at
+    assert not any(block.any() for at, block in after if at >= silent_from)
+    player.close()
+    print("✅ Interrupt latency test passed\n")
+
+
+def test_load_samples_resamples():
+    """Piper PCM and WAV files are converted to the stream's rate in mono."""
+    print("=== Test: Sample loading ===")
+    pcm = PCMAudio(tone(1.0, 22050).tobytes(), 22050)
+    assert abs(len(load_samples(pcm, 24000)) - 24000) <= 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "clip.wav")
+        stereo = np.repeat(tone(0.5, 48000), 2)
+        with wave.open(path, "wb") as wav_file:
+            wav_file.setnchannels(2)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(48000)
+            wav_file.writeframes(stereo.tobytes())
+        samples = load_samples(path, 24000)
+        assert samples.dtype == np.int16 and abs(len(samples) - 12000) <= 1
+    print("✅ Sample loading test passed\n")
+
+
+if __name__ == "__main__":
+    test_plays_clips_on_one_stream()
+    test_stop_latency()
+    test_load_samples_resamples()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Tests for the asyncio Brain path (execute_async / execute_stream_async).
+
+A stand-in OpenAI-compatible server on localhost streams the replies,
+so no model or network access is needed.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.brain_interface import BrainConfig
+from core.brains.lmstudio_brain import LMStudioBrain
+from core.brains.rules_brain import RulesBrain
+
+
+class FakeChatServer:
+    """
+    Minimal /v1/chat/completions server speaking server-sent events.
+
+    Each reply is "Echo: <user message>" (or the given words), sent one
+    word per event with `delay` seconds between them; non-streaming
+    requests get the whole reply as one JSON completion. Counts open
+    streams, the peak number of concurrent streams, and chunks written
+    per request.
+    """
+
+    def __init__(self, delay=0.01, words=None):
+        self.delay = delay
+        self.words = words
+        self.active = 0
+        self.peak = 0
+        self.sent = []  # chunks written, one entry per finished request
+        self.disconnected = 0
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/v1"
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        headers = {}
+        await reader.readline()
+        while True:
+            line = (await reader.readline()).decode().strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.lower()] = value.strip()
+        body = json.loads(await reader.readexactly(int(headers.get("content-length", 0))))
+        words = self.words or ["Echo:"] + body["messages"][-1]["content"].split()
+        if not body.get("stream"):
+            await self._reply_json(writer, body, " ".join(words))
+            return
+
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        sent = 0
+        try:
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nConnection: close\r\n\r\n")
+            for i, word in enumerate(words):
+                text = word if i == 0 else f" {word}"
+                frame = {"id": "chat", "object": "chat.completion.chunk", "created": 0, "model": body["model"],
+                         "choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}]}
+                writer.write(f"data: {json.dumps(frame)}\n\n".encode())
+                await writer.drain()
+                sent += 1
+                await asyncio.sleep(self.delay)
+            writer.write(b"data: [DONE]\n\n")
+            await writer.drain()
+        except (ConnectionError, OSError):
+            self.disconnected += 1
+        finally:
+            self.active -= 1
+            self.sent.append(sent)
+            writer.close()
+
+    async def _reply_json(self, writer, body, text):
+        payload = json.dumps({
+            "id": "chat", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }).encode()
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                     + f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload)
+        await writer.drain()
+        writer.close()
+
+
+def make_brain(endpoint):
+    return LMStudioBrain(BrainConfig(
+        id="lmstudio_test", name="LM Studio", provider="lmstudio",
+        config_data={"endpoint": endpoint, "model": "local-model"}
+    ))
+
+
+async def collect(brain, prompt):
+    chunks, done = [], None
+    async for frame in brain.execute_stream_async(prompt, {}, {}):
+        if frame.get("done"):
+            done = frame
+        else:
+            chunks.append(frame["chunk"])
+    return chunks, done
+
+
+def test_concurrent_streams_share_one_loop():
+    """A hundred streams run at once on one loop with no thread per stream."""
+    print("\n=== Test: Concurrent async streams ===")
+    streams = 100
+
+    async def run():
+        server = FakeChatServer(delay=0.02)
+        brain = make_brain(await server.start())
+        threads = []
+
+        async def sample_threads():
+            while True:
+                threads.append(threading.active_count())
+                await asyncio.sleep(0.01)
+
+        sampler = asyncio.create_task(sample_threads())
+        results = await asyncio.gather(*(collect(brain, f"request number {i}") for i in range(streams)))
+        sampler.cancel()
+        await server.close()
+        return server, results, max(threads)
+
+    server, results, peak_threads = asyncio.run(run())
+    for i, (chunks, done) in enumerate(results):
+        assert "error" not in done, done
+        assert done["full_content"] == f"Echo: request number {i}"
+        assert "".join(chunks) == done["full_content"]
+    assert server.peak >= streams // 2, server.peak
+    assert peak_threads < streams // 2, peak_threads
+    print(f"   {server.peak} concurrent streams, at most {peak_threads} threads")
+    print("✅ Concurrent async streams test passed\n")
+
+
+def test_execute_async_and_errors():
+    """execute_async parses replies; connection failures come back as errors."""
+    print("=== Test: execute_async ===")
+    reply = '{"intent": "open_app", "arguments": {"name": "firefox"}, "confidence": 0.9}'
+
+    async def run():
+        server = FakeChatServer(words=[reply])
+        endpoint = await server.start()
+        response = await make_brain(endpoint).execute_async("open firefox", {}, {})
+        await server.close()
+        unreachable = await make_brain(endpoint).execute_async("hello", {}, {})
+        stream_frames = [frame async for frame in make_brain(endpoint).execute_stream_async("hello", {}, {})]
+        return response, unreachable, stream_frames
+
+    response, unreachable, stream_frames = asyncio.run(run())
+    assert response.success and response.intent == "open_app"
+    assert response.arguments == {"name": "firefox"}
+    assert not unreachable.success and unreachable.error.startswith("LM Studio error")
+    assert len(stream_frames) == 1 and stream_frames[0]["done"] and "error" in stream_frames[0]
+    print("✅ execute_async test passed\n")
+
+
+def test_clients_are_kept_per_loop():
+    """Each loop keeps its own client across calls; asyncio.run() closes its client on exit."""
+    print("=== Test: Per-loop async clients ===")
+    server = FakeChatServer(words=["hi"])
+    server_loop = asyncio.new_event_loop()
+    threading.Thread(target=server_loop.run_forever, daemon=True).start()
+    endpoint = asyncio.run_coroutine_threadsafe(server.start(), server_loop).result()
+    brain = make_brain(endpoint)
+
+    async def reply():
+        chunks, _ = await collect(brain, "hello")
+        return "".join(chunks), brain._get_async_client()
+
+    try:
+        text, first = asyncio.run_coroutine_threadsafe(reply(), server_loop).result()
+        assert text == "hi"
+        text, short_lived = asyncio.run(reply())
+        assert text == "hi" and short_lived is not first
+        assert short_lived.is_closed()  # closed when asyncio.run shut its loop down
+        _, again = asyncio.run_coroutine_threadsafe(reply(), server_loop).result()
+        assert again is first and not first.is_closed()
+    finally:
+        asyncio.run_coroutine_threadsafe(server.close(), server_loop).result()
+        asyncio.run_coroutine_threadsafe(server_loop.shutdown_asyncgens(), server_loop).result()
+        server_loop.call_soon_threadsafe(server_loop.stop)
+    assert first.is_closed()
+    print("✅ Per-loop async clients test passed\n")
+
+
+def test_default_async_wraps_sync_brains():
+    """Brains without an async client fall back to running execute() in a thread."""
+    print("=== Test: Default async wrappers ===")
+
+    async def run():
+        brain = RulesBrain()
+        response = await brain.execute_async("hello", {}, {})
+        frames = [frame async for frame in brain.execute_stream_async("hello", {}, {})]
+        return response, frames
+
+    response, frames = asyncio.run(run())
+    assert response.success
+    assert frames[-1]["done"]
+    print("✅ Default async wrappers test passed\n")
+
+
+if __name__ == "__main__":
+    test_concurrent_streams_share_one_loop()
+    test_execute_async_and_errors()
+    test_clients_are_kept_per_loop()
+    test_default_async_wraps_sync_brains()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Tests for per-Brain circuit breakers in core.brain_breaker and BrainManager.
+"""
+
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.brain as brain_module
+from core.brain_breaker import CircuitBreaker, CLOSED, HALF_OPEN, OPEN
+from core.brain_interface import (BrainCapability, BrainConfig, BrainHealth, BrainStatus,
+                                  CancellationToken, PrivacyLevel)
+from core.brain_manager import BrainManager
+from core.brains.base import BaseBrain
+from core.persistence import Persistence
+from core.response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingBrain(BaseBrain):
+    """Brain that answers its id, or fails while `failing` is set."""
+
+    def __init__(self, brain_id, failing=False, **flags):
+        super().__init__(BrainConfig(id=brain_id, name=brain_id, provider="test", config_data={}, **flags))
+        self.failing = failing
+        self.calls = 0
+
+    def get_capabilities(self):
+        return []
+
+    def get_privacy_level(self):
+        return PrivacyLevel.LOCAL
+
+    def health_check(self):
+        return BrainHealth(status=BrainStatus.AVAILABLE, message="ready")
+
+    def execute(self, prompt, context, constraints):
+        self.calls += 1
+        if self.failing:
+            return self._build_error_response(f"{self.id} is down")
+        return self._build_success_response(content=self.id, natural_response=self.id)
+
+
+class StreamingBrain(CountingBrain):
+    """CountingBrain that streams its id one character at a time."""
+
+    def get_capabilities(self):
+        return [BrainCapability.STREAMING]
+
+    def execute_stream(self, prompt, context, constraints, cancel_token=None):
+        self.calls += 1
+        for char in self.id:
+            yield {"chunk": char, "done": False}
+        yield self._build_done_frame(self.id)
+
+
+def trip(breaker, clock):
+    """Open the breaker and wait out its cool-down, leaving it half-open."""
+    for _ in range(3):
+        breaker.record_failure("down")
+    clock.now += breaker.to_dict()["cooldown_s"]
+    assert breaker.state == HALF_OPEN
+
+
+def test_breaker_trips_and_recovers():
+    """Error rate trips the breaker; half-open trials close it or double the cool-down."""
+    print("\n=== Test: Breaker states ===")
+    clock = FakeClock()
+    breaker = CircuitBreaker(error_rate=0.5, cooldown=5.0, max_cooldown=12.0, clock=clock)
+    breaker.record_success(100)
+    breaker.record_failure("timeout")
+    assert breaker.state == CLOSED  # too few requests to judge
+    breaker.record_failure("timeout")
+    assert breaker.state == OPEN and not breaker.allow_request()
+    assert breaker.to_dict()["retry_in_s"] == 5.0
+
+    clock.now += 5.0
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # only one trial at a time
+    breaker.record_failure("timeout")
+    assert breaker.state == OPEN and breaker.to_dict()["cooldown_s"] == 10.0
+
+    clock.now += 10.0
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.to_dict()["cooldown_s"] == 12.0  # capped at max_cooldown
+
+    clock.now += 12.0
+    assert breaker.allow_request()
+    breaker.record_success(100)
+    data = breaker.to_dict()
+    assert data["state"] == CLOSED and data["cooldown_s"] == 5.0 and data["trips"] == 3
+    print("✅ Breaker states test passed\n")
+
+
+def test_breaker_trips_on_latency():
+    """Mostly slow requests trip the breaker even when they succeed."""
+    print("=== Test: Latency tripping ===")
+    clock = FakeClock()
+    breaker = CircuitBreaker(slow_ms=1000, slow_rate=0.5, cooldown=1.0, clock=clock)
+    for latency in (200, 4000, 5000):
+        breaker.record_success(latency)
+    assert breaker.state == OPEN and "took over 1000 ms" in breaker.to_dict()["reason"]
+
+    # A slow trial keeps it open
+    clock.now += 1.0
+    assert breaker.allow_request()
+    breaker.record_success(3000)
+    assert breaker.state == OPEN
+
+    # An abandoned trial frees its slot after one cool-down
+    clock.now += 2.0
+    assert breaker.allow_request() and not breaker.allow_request()
+    clock.now += 2.0
+    assert breaker.allow_request()
+    print("✅ Latency tripping test passed\n")
+
+
+def test_open_circuit_skips_failing_brain():
+    """After tripping, requests go straight to the fallback until a half-open trial succeeds."""
+    print("=== Test: Open circuit in selection ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"))
+        primary = CountingBrain("primary", failing=True, is_active=True)
+        backup = CountingBrain("backup", is_fallback=True)
+        manager = BrainManager()
+        for brain in (primary, backup):
+            manager.register_brain(brain)
+        clock = FakeClock()
+        manager.breakers["primary"] = CircuitBreaker(cooldown=30.0, clock=clock)
+
+        facade = object.__new__(brain_module.Brain)
+        facade.manager = manager
+        facade.response_cache = ResponseCache(store, enabled=False)
+        original_storage = brain_module.storage
+        brain_module.storage = store
+        try:
+            for _ in range(6):
+                assert facade._get_llm_response("hello") == "backup"
+            assert primary.calls == 3  # tripped on the third failure, then skipped
+
+            info = {brain["id"]: brain for brain in manager.get_brain_display_info()}
+            assert info["primary"]["circuit"]["state"] == OPEN
+            assert info["primary"]["circuit"]["reason"].endswith("primary is down")
+            assert info["backup"]["circuit"]["state"] == CLOSED
+
+            # Cool-down over and the provider is back: the trial request closes the circuit
+            clock.now += 30.0
+            primary.failing = False
+            assert facade._get_llm_response("hello") == "primary"
+            assert manager.breakers["primary"].state == CLOSED
+            assert manager.select_brain({}) is primary
+        finally:
+            brain_module.storage = original_storage
+            manager.health_monitor.stop()
+            store.close()
+    print("✅ Open circuit in selection test passed\n")
+
+
+def test_hedge_chain_does_not_claim_the_trial():
+    """Building the hedge chain only peeks at a half-open fallback; launching it claims the trial."""
+    print("=== Test: Hedge chain peeks ===")
+    primary = CountingBrain("primary", is_active=True)
+    backup = CountingBrain("backup", is_fallback=True)
+    manager = BrainManager()
+    for brain in (primary, backup):
+        manager.register_brain(brain)
+    clock = FakeClock()
+    breaker = manager.breakers["backup"] = CircuitBreaker(cooldown=5.0, clock=clock)
+    trip(breaker, clock)
+    try:
+        assert manager.get_hedge_chain(primary) == [primary, backup]
+        assert breaker.can_request()
+        assert manager._is_usable(backup)  # the hedger's admit() takes the trial
+        assert manager.get_hedge_chain(primary) == [primary]
+        assert not breaker.can_request() and not breaker.allow_request()
+    finally:
+        manager.health_monitor.stop()
+    print("✅ Hedge chain peeks test passed\n")
+
+
+def test_cancelled_stream_releases_the_trial():
+    """A stream cancelled before its first chunk hands the half-open trial back."""
+    print("=== Test: Cancelled trial stream ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"))
+        store.save_permission("ai.generate")
+        primary = StreamingBrain("primary", is_active=True)
+        manager = BrainManager()
+        manager.register_brain(primary)
+        clock = FakeClock()
+        breaker = manager.breakers["primary"] = CircuitBreaker(cooldown=5.0, clock=clock)
+        trip(breaker, clock)
+
+        facade = object.__new__(brain_module.Brain)
+        facade.manager = manager
+        facade.response_cache = ResponseCache(store, enabled=False)
+        originals = brain_module.storage, brain_module.skill_manager
+        brain_module.storage = store
+        brain_module.skill_manager = SimpleNamespace(get_intent_match=lambda command: None)
+        try:
+            token = CancellationToken()
+            token.cancel()
+            text, _ = facade.process_stream("hello", lambda chunk: None, cancel_token=token)
+            assert text == "" and primary.calls == 1
+            assert breaker.state == HALF_OPEN and breaker.allow_request()
+
+            # A completed trial stream closes the circuit
+            breaker.release()
+            text, _ = facade.process_stream("hello", lambda chunk: None)
+            assert text == "primary" and breaker.state == CLOSED
+        finally:
+            brain_module.storage, brain_module.skill_manager = originals
+            manager.health_monitor.stop()
+            store.close()
+    print("✅ Cancelled trial stream test passed\n")
+
+
+def test_cache_hit_releases_the_trial():
+    """Replies served from the response cache hand the half-open trial back."""
+    print("=== Test: Cached trial ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"))
+        store.save_permission("ai.generate")
+        primary = StreamingBrain("primary", is_active=True)
+        manager = BrainManager()
+        manager.register_brain(primary)
+        clock = FakeClock()
+        breaker = manager.breakers["primary"] = CircuitBreaker(cooldown=5.0, clock=clock)
+
+        facade = object.__new__(brain_module.Brain)
+        facade.manager = manager
+        facade.response_cache = ResponseCache(store, enabled=True)
+        originals = brain_module.storage, brain_module.skill_manager
+        brain_module.storage = store
+        brain_module.skill_manager = SimpleNamespace(get_intent_match=lambda command: None)
+        try:
+            # Streamed and executed replies are cached apart
+            assert facade.process_stream("hello", lambda chunk: None)[0] == "primary"
+            assert facade._get_llm_response("hello") == "primary"
+            assert primary.calls == 2
+
+            trip(breaker, clock)
+            assert facade._get_llm_response("hello") == "primary"
+            assert facade.process_stream("hello", lambda chunk: None)[0] == "primary"
+            assert primary.calls == 2
+            assert breaker.state == HALF_OPEN and breaker.allow_request()
+        finally:
+            brain_module.storage, brain_module.skill_manager = originals
+            manager.health_monitor.stop()
+            store.close()
+    print("✅ Cached trial test passed\n")
+
+
+if __name__ == "__main__":
+    test_breaker_trips_and_recovers()
+    test_breaker_trips_on_latency()
+    test_open_circuit_skips_failing_brain()
+    test_hedge_chain_does_not_claim_the_trial()
+    test_cancelled_stream_releases_the_trial()
+    test_cache_hit_releases_the_trial()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Tests for background Brain health probing in core.brain_health.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.brain_health import HealthMonitor, LatencyHistogram
+from core.brain_interface import BrainConfig, BrainHealth, BrainStatus, PrivacyLevel
+from core.brain_manager import BrainManager
+from core.brains.base import BaseBrain
+from core.persistence import Persistence
+
+
+class ProbeBrain(BaseBrain):
+    """Brain whose health_check() and ping() sleep for `delay` and report `status`."""
+
+    def __init__(self, brain_id, delay=0.0, status=BrainStatus.AVAILABLE, **flags):
+        super().__init__(BrainConfig(id=brain_id, name=brain_id, provider="test", config_data={}, **flags))
+        self.delay = delay
+        self.status = status
+        self.checks = 0
+        self.pings = 0
+        self.probe_threads = set()
+
+    def get_capabilities(self):
+        return []
+
+    def get_privacy_level(self):
+        return PrivacyLevel.LOCAL
+
+    def health_check(self):
+        self.checks += 1
+        self.probe_threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        return BrainHealth(status=self.status, message=f"{self.id} is {self.status.value}")
+
+    def ping(self):
+        self.pings += 1
+        self.probe_threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        return BrainHealth(status=self.status, message=f"{self.id} answers")
+
+    def execute(self, prompt, context, constraints):
+        return self._build_success_response(content=self.id)
+
+
+def make_manager(store, interval=0.2, *brains):
+    manager = BrainManager()
+    manager.health_monitor = HealthMonitor(manager, interval=interval, store=store)
+    for brain in brains:
+        manager.register_brain(brain)
+    return manager
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_select_brain_never_blocks_on_health():
+    """A slow health check runs in the background, not in select_brain."""
+    print("\n=== Test: Non-blocking selection ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"))
+        slow = ProbeBrain("slow", delay=1.0, is_active=True)
+        manager = make_manager(store, 10.0, slow)
+        try:
+            start = time.perf_counter()
+            for _ in range(20):
+                assert manager.select_brain({}) is slow
+            elapsed = time.perf_counter() - start
+            assert elapsed < 0.2, elapsed
+            assert wait_for(lambda: slow.pings == 1, 2.0)
+            assert threading.current_thread().name not in slow.probe_threads
+        finally:
+            manager.health_monitor.stop()
+    print("✅ Non-blocking selection test passed\n")
+
+
+def test_unhealthy_active_falls_back_and_is_persisted():
+    """Probe results drive fallback selection and land in the brains table."""
+    print("=== Test: Snapshot-driven fallback ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"))
+        primary = ProbeBrain("primary", status=BrainStatus.UNREACHABLE, is_active=True)
+        backup = ProbeBrain("backup", is_fallback=True)
+        for brain in (primary, backup):
+            store.save_brain_config(brain.id, brain.name, brain.provider, "local", {}, [])
+        manager = make_manager(store, 0.2, primary, backup)
+        try:
+            manager.health_monitor.start()
+            assert wait_for(lambda: manager.health_monitor.get_health("primary") is not None)
+            assert wait_for(lambda: manager.health_monitor.get_health("backup") is not None)
+            assert manager.select_brain({}) is backup
+
+            def persisted():
+                return {row["id"]: row["health_status"] for row in store.load_brain_configs()}
+            assert wait_for(lambda: persisted() == {"primary": "unreachable", "backup": "available"}), persisted()
+
+            # Recovery shows up on a later scheduled probe
+            primary.status = BrainStatus.AVAILABLE
+            assert wait_for(lambda: manager.select_brain({}) is primary, 3.0)
+            stats = manager.health_monitor.stats()
+            assert stats["primary"]["failures"] >= 1 and stats["primary"]["probes"] >= 2
+            assert stats["backup"]["latency"]["count"] >= 1
+            # The background result also feeds the cached health used for display
+            assert primary.get_cached_health().status == BrainStatus.AVAILABLE
+        finally:
+            manager.health_monitor.stop()
+    print("✅ Snapshot-driven fallback test passed\n")
+
+
+def test_scheduled_probes_only_ping():
+    """Only refresh(full=True) runs health_check(); registration and the schedule ping."""
+    print("=== Test: Scheduled probes ping ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"))
+        brain = ProbeBrain("brain", is_active=True)
+        manager = make_manager(store, 0.1, brain)
+        try:
+            manager.health_monitor.start()
+            assert wait_for(lambda: brain.pings >= 3)
+            assert brain.checks == 0
+
+            manager.health_monitor.refresh("brain", full=True)
+            assert wait_for(lambda: brain.checks == 1)
+            manager.health_monitor.refresh("brain")
+            pings = brain.pings
+            assert wait_for(lambda: brain.pings > pings)
+            assert brain.checks == 1
+        finally:
+            manager.health_monitor.stop()
+    print("✅ Scheduled probes ping test passed\n")
+
+
+def test_probe_schedule_is_jittered():
+    """Probe delays vary within +/- jitter around the interval."""
+    print("=== Test: Jittered schedule ===")
+    monitor = HealthMonitor(BrainManager(), interval=10.0, jitter=0.2)
+    delays = [monitor.next_delay() for _ in range(200)]
+    assert all(8.0 <= d <= 12.0 for d in delays)
+    assert max(delays) - min(delays) > 1.0
+    print("✅ Jittered schedule test passed\n")
+
+
+def test_latency_histogram():
+    """Percentiles report bucket upper bounds; overflow reports the max seen."""
+    print("=== Test: Latency histogram ===")
+    histogram = LatencyHistogram(bounds=(10, 100, 1000))
+    assert histogram.percentile(50) is None
+    for latency in [5] * 90 + [50] * 9 + [5000]:
+        histogram.record(latency)
+    assert histogram.percentile(50) == 10
+    assert histogram.percentile(95) == 100
+    assert histogram.percentile(100) == 5000
+    data = histogram.to_dict()
+    assert data["count"] == 100 and data["buckets"] == {"<=10": 90, "<=100": 9, "<=1000": 0, ">1000": 1}
+    print("✅ Latency histogram test passed\n")
+
+
+if __name__ == "__main__":
+    test_select_brain_never_blocks_on_health()
+    test_unhealthy_active_falls_back_and_is_persisted()
+    test_scheduled_probes_only_ping()
+    test_probe_schedule_is_jittered()
+    test_latency_histogram()
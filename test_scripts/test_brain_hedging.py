@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Tests for hedged Brain execution in core.brain_hedging.
+
+The end-to-end test races an LM Studio Brain on a stand-in server that
+answers slowly against a local Brain, and checks the server sees the
+losing request abandoned.
+"""
+
+import asyncio
+import json
+import os
+import select
+import socket
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.brain as brain_module
+from core.brain_hedging import HedgedExecutor
+from core.brain_interface import BrainConfig, BrainHealth, BrainStatus, PrivacyLevel
+from core.brain_manager import BrainManager
+from core.brains.base import BaseBrain
+from core.brains.lmstudio_brain import LMStudioBrain
+from core.config import config
+from core.persistence import Persistence
+from core.response_cache import ResponseCache
+
+
+class TimedBrain(BaseBrain):
+    """Brain that answers its own id after `delay` seconds, or fails."""
+
+    def __init__(self, brain_id, delay=0.0, fail=False, **flags):
+        super().__init__(BrainConfig(id=brain_id, name=brain_id, provider="test", config_data={}, **flags))
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = False
+
+    def get_capabilities(self):
+        return []
+
+    def get_privacy_level(self):
+        return PrivacyLevel.LOCAL
+
+    def health_check(self):
+        return BrainHealth(status=BrainStatus.AVAILABLE, message="ready")
+
+    def execute(self, prompt, context, constraints):
+        time.sleep(self.delay)
+        return self._result()
+
+    async def execute_async(self, prompt, context, constraints):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self._result()
+
+    def _result(self):
+        if self.fail:
+            return self._build_error_response(f"{self.id} failed")
+        return self._build_success_response(content=self.id, natural_response=self.id)
+
+
+def race(executor, *brains):
+    start = time.perf_counter()
+    winner, response = executor.execute(list(brains), lambda b: b.execute_async("hi", {}, {}))
+    return winner, response, time.perf_counter() - start
+
+
+def test_slow_primary_is_hedged():
+    """The backup starts after the hedge delay, wins, and the primary is cancelled."""
+    print("\n=== Test: Hedge a slow primary ===")
+    executor = HedgedExecutor(default_delay=0.1)
+    primary, backup = TimedBrain("primary", delay=2.0), TimedBrain("backup", delay=0.05)
+    winner, response, elapsed = race(executor, primary, backup)
+    assert winner is backup and response.content == "backup"
+    assert elapsed < 0.5, elapsed
+    time.sleep(0.05)
+    assert primary.cancelled
+    stats = executor.stats()
+    assert stats["requests"] == 1 and stats["hedged"] == 1
+    assert stats["wins"] == {"primary": {"backup": 1}}
+    print("✅ Hedge a slow primary test passed\n")
+
+
+def test_fast_primary_is_not_hedged():
+    """A primary answering within its hedge delay never starts the backup."""
+    print("=== Test: Fast primary ===")
+    executor = HedgedExecutor(default_delay=0.5)
+    primary, backup = TimedBrain("primary", delay=0.05), TimedBrain("backup")
+    winner, _, _ = race(executor, primary, backup)
+    assert winner is primary and backup.calls == 0
+    assert executor.stats()["hedged"] == 0
+    print("✅ Fast primary test passed\n")
+
+
+def test_failed_primary_starts_backup_at_once():
+    """A failure does not wait for the hedge delay; all failing reports no winner."""
+    print("=== Test: Failing primary ===")
+    executor = HedgedExecutor(default_delay=5.0)
+    winner, response, elapsed = race(executor, TimedBrain("primary", fail=True), TimedBrain("backup"))
+    assert winner.id == "backup" and elapsed < 1.0, elapsed
+
+    winner, response, _ = race(executor, TimedBrain("primary", fail=True), TimedBrain("backup", fail=True))
+    assert winner is None and response.error == "backup failed"
+    assert executor.stats()["wins"]["primary"] == {"backup": 1, "none": 1}
+    print("✅ Failing primary test passed\n")
+
+
+def test_refused_hedge_is_not_started():
+    """A Brain that admit() refuses is skipped and never runs."""
+    print("=== Test: Refused hedge ===")
+    executor = HedgedExecutor(default_delay=0.05)
+    primary, backup = TimedBrain("primary", delay=0.3), TimedBrain("backup")
+    asked = []
+
+    def admit(brain):
+        asked.append(brain.id)
+        return False
+
+    winner, _ = executor.execute([primary, backup], lambda b: b.execute_async("hi", {}, {}), admit=admit)
+    assert winner is primary and backup.calls == 0
+    assert asked == ["backup"] and executor.stats()["hedged"] == 0
+    print("✅ Refused hedge test passed\n")
+
+
+def test_hedge_delay_follows_observed_latency():
+    """The delay is the default until min_samples, then the latency percentile."""
+    print("=== Test: Hedge delay from latency ===")
+    executor = HedgedExecutor(percentile=95, default_delay=2.0, min_samples=20)
+    for _ in range(19):
+        executor.record_latency("primary", 40)
+    assert executor.hedge_delay("primary") == 2.0
+    executor.record_latency("primary", 40)
+    assert executor.hedge_delay("primary") == 0.05  # 40 ms falls in the <=50 ms bucket
+    assert executor.stats()["brains"]["primary"]["hedge_delay_ms"] == 50.0
+    print("✅ Hedge delay from latency test passed\n")
+
+
+class SlowCompletionHandler(BaseHTTPRequestHandler):
+    """Lists one model; answers chat completions after `server.delay` unless the client hangs up."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._reply({"object": "list", "data": [{"id": "local-model", "object": "model", "created": 0,
+                                                 "owned_by": "test"}]})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        deadline = time.monotonic() + self.server.delay
+        while time.monotonic() < deadline:
+            readable, _, _ = select.select([self.connection], [], [], 0.02)
+            if readable and not self.connection.recv(1, socket.MSG_PEEK):
+                self.server.disconnected.set()
+                self.close_connection = True
+                return
+        self._reply({
+            "id": "chat", "object": "chat.completion", "created": 0, "model": "local-model",
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": '{"natural_response": "slow"}'}}],
+        })
+
+    def _reply(self, data):
+        payload = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_brain_hedges_and_cancels_the_http_request():
+    """With BRAIN_HEDGING on, a slow LM Studio primary loses and its request is dropped."""
+    print("=== Test: Hedged Brain request ===")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowCompletionHandler)
+    server.delay, server.disconnected = 3.0, threading.Event()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"))
+        primary = LMStudioBrain(BrainConfig(id="lmstudio_test", name="LM Studio", provider="lmstudio",
+                                            config_data={"endpoint": f"{url}/v1", "model": "local-model"},
+                                            is_active=True))
+        backup = TimedBrain("backup", delay=0.05, is_fallback=True)
+        manager = BrainManager()
+        manager.hedger = HedgedExecutor(default_delay=0.2)
+        for brain in (primary, backup):
+            manager.register_brain(brain)
+
+        facade = object.__new__(brain_module.Brain)
+        facade.manager = manager
+        facade.response_cache = ResponseCache(store, enabled=False)
+        original_hedging, original_storage = config.BRAIN_HEDGING, brain_module.storage
+        config.BRAIN_HEDGING, brain_module.storage = True, store
+        try:
+            start = time.perf_counter()
+            assert facade._get_llm_response("hello") == "backup"
+            assert time.perf_counter() - start < 1.5
+            assert server.disconnected.wait(2.0)
+            assert manager.hedger.stats()["wins"] == {"lmstudio_test": {"backup": 1}}
+            assert "backup" in manager.hedger.stats()["brains"]
+        finally:
+            config.BRAIN_HEDGING, brain_module.storage = original_hedging, original_storage
+            manager.health_monitor.stop()
+            store.close()
+            server.shutdown()
+    print("✅ Hedged Brain request test passed\n")
+
+
+if __name__ == "__main__":
+    test_slow_primary_is_hedged()
+    test_fast_primary_is_not_hedged()
+    test_failed_primary_starts_backup_at_once()
+    test_refused_hedge_is_not_started()
+    test_hedge_delay_follows_observed_latency()
+    test_brain_hedges_and_cancels_the_http_request()
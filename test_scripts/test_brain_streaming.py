@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tests for native execute_stream() in the Ollama, LM Studio and Gemini Brains.
+
+Ollama and LM Studio stream from a stand-in server on localhost that
+waits between tokens, so the tests can tell incremental delivery from a
+buffered reply. Gemini is driven through a stand-in model object.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.brain_interface import BrainCapability, BrainConfig
+from core.brains.google_brain import GoogleBrain
+from core.brains.lmstudio_brain import LMStudioBrain
+from core.brains.ollama_brain import OllamaBrain
+
+WORDS = ["Hello", " there", ",", " friend", "."]
+TOKEN_DELAY = 0.15
+
+
+class StreamingHandler(BaseHTTPRequestHandler):
+    """Ollama /api/chat (NDJSON) and OpenAI /v1/chat/completions (SSE) streams."""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        self.send_response(200)
+        if self.path == "/api/chat":
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            for word in WORDS:
+                self._send({"model": body["model"], "message": {"role": "assistant", "content": word}, "done": False})
+            self._send({"model": body["model"], "message": {"role": "assistant", "content": ""}, "done": True,
+                        "done_reason": "stop", "prompt_eval_count": 30, "eval_count": len(WORDS)})
+        else:
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            for word in WORDS:
+                self._send_event({"choices": [{"index": 0, "delta": {"content": word}, "finish_reason": None}]})
+            if body.get("stream_options", {}).get("include_usage"):
+                self._send_event({"choices": [],
+                                  "usage": {"prompt_tokens": 30, "completion_tokens": 5, "total_tokens": 35}})
+            self.wfile.write(b"data: [DONE]\n\n")
+
+    def _send(self, data):
+        self.wfile.write(json.dumps(data).encode() + b"\n")
+        self.wfile.flush()
+        time.sleep(TOKEN_DELAY)
+
+    def _send_event(self, data):
+        frame = dict(id="chat", object="chat.completion.chunk", created=0, model="local-model", **data)
+        self.wfile.write(f"data: {json.dumps(frame)}\n\n".encode())
+        self.wfile.flush()
+        time.sleep(TOKEN_DELAY)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StreamingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def read_stream(frames):
+    """Collect chunks with their arrival times, plus the done frame."""
+    start = time.perf_counter()
+    chunks, done = [], None
+    for frame in frames:
+        assert "error" not in frame, frame
+        if frame.get("done"):
+            done = frame
+        else:
+            chunks.append((time.perf_counter() - start, frame["chunk"]))
+    return chunks, done
+
+
+def assert_incremental(chunks, done):
+    assert "".join(text for _, text in chunks) == done["full_content"] == "".join(WORDS)
+    # The first token arrives long before the last one was generated
+    assert chunks[0][0] < TOKEN_DELAY * 2, chunks
+    assert chunks[-1][0] - chunks[0][0] >= TOKEN_DELAY * (len(WORDS) - 2), chunks
+
+
+def test_ollama_streams_tokens_with_usage():
+    """Ollama chunks arrive as generated; the done frame carries eval counts."""
+    print("\n=== Test: Ollama streaming ===")
+    server, url = start_server()
+    try:
+        brain = OllamaBrain(BrainConfig(id="ollama_test", name="Ollama", provider="ollama",
+                                        config_data={"host": url, "model": "llama3"}))
+        assert brain.supports_capability(BrainCapability.STREAMING)
+        chunks, done = read_stream(brain.execute_stream("hi", {}, {}))
+        assert_incremental(chunks, done)
+        assert done["tokens_used"] == 30 + len(WORDS)
+    finally:
+        server.shutdown()
+    print("✅ Ollama streaming test passed\n")
+
+
+def test_lmstudio_streams_tokens_with_usage():
+    """LM Studio streams over SSE and requests the trailing usage chunk."""
+    print("=== Test: LM Studio streaming ===")
+    server, url = start_server()
+    try:
+        brain = LMStudioBrain(BrainConfig(id="lmstudio_test", name="LM Studio", provider="lmstudio",
+                                          config_data={"endpoint": f"{url}/v1", "model": "local-model"}))
+        chunks, done = read_stream(brain.execute_stream("hi", {}, {}))
+        assert_incremental(chunks, done)
+        assert done["tokens_used"] == 35
+    finally:
+        server.shutdown()
+    print("✅ LM Studio streaming test passed\n")
+
+
+def test_gemini_streams_tokens_with_usage():
+    """Gemini yields each streamed part and prices the reported usage."""
+    print("=== Test: Gemini streaming ===")
+
+    class StreamingModel:
+        def generate_content(self, contents, stream=False):
+            assert stream and contents[-1] == "hi"
+            for i, word in enumerate(WORDS):
+                usage = None
+                if i == len(WORDS) - 1:
+                    usage = SimpleNamespace(prompt_token_count=1000, candidates_token_count=2000,
+                                            total_token_count=3000)
+                yield SimpleNamespace(parts=[word], text=word, usage_metadata=usage)
+
+    brain = GoogleBrain(BrainConfig(id="google_test", name="Gemini", provider="google", config_data={}))
+    brain.client = StreamingModel()
+    assert brain.supports_capability(BrainCapability.STREAMING)
+    chunks, done = read_stream(brain.execute_stream("hi", {}, {}))
+    assert [text for _, text in chunks] == WORDS
+    assert done["tokens_used"] == 3000
+    assert abs(done["cost_usd"] - brain._calculate_cost(1000, 2000)) < 1e-12 and done["cost_usd"] > 0
+    print("✅ Gemini streaming test passed\n")
+
+
+if __name__ == "__main__":
+    test_ollama_streams_tokens_with_usage()
+    test_lmstudio_streams_tokens_with_usage()
+    test_gemini_streams_tokens_with_usage()
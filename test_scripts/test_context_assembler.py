@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for token-budgeted context assembly in core.context_assembler.
+"""
+
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.persistence import Persistence
+from core.brain_interface import BrainConfig
+from core.brains.ollama_brain import OllamaBrain
+from core.context_assembler import ContextAssembler, estimate_tokens, context_budget_for, context_window_for
+
+
+def test_packs_within_budget_without_requerying():
+    """Context respects the token budget and is served from the ring buffer."""
+    print("\n=== Test: Budgeted context assembly ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"))
+        session_id = store.create_session(title="Long chat")
+        for i in range(40):
+            store.add_message(session_id, "user" if i % 2 == 0 else "assistant", f"message {i} " + "word " * 30)
+
+        assembler = ContextAssembler(store)
+        context = assembler.build(session_id, budget_tokens=300, provider="openai", include_sessions=0)
+        assert estimate_tokens(context, "openai") <= 300
+        assert "message 39" in context and "message 0 " not in context
+
+        # Appends are incremental: no database reads after the first build
+        calls = []
+        original = store.get_session_messages
+        store.get_session_messages = lambda *a, **kw: calls.append(a) or original(*a, **kw)
+        assembler.on_message_added(session_id, "user", "the newest question")
+        context = assembler.build(session_id, budget_tokens=300, include_sessions=0)
+        assert context.endswith("👤 the newest question")
+        assert calls == []
+        store.close()
+    print("✅ Budgeted context assembly test passed\n")
+
+
+def test_relevant_older_messages_are_preferred():
+    """With a query, older on-topic messages win over older off-topic ones."""
+    print("=== Test: Relevance packing ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"))
+        session_id = store.create_session(title="Mixed")
+        store.add_message(session_id, "user", "remember my wifi password is hunter2")
+        for i in range(20):
+            store.add_message(session_id, "user", f"unrelated chatter number {i} about nothing much")
+
+        assembler = ContextAssembler(store)
+        context = assembler.build(session_id, budget_tokens=120, query="what is my wifi password", include_sessions=0)
+        assert "hunter2" in context
+        store.close()
+    print("✅ Relevance packing test passed\n")
+
+
+def test_budget_follows_brain_window():
+    """The budget comes from the brain's window minus response and prompt reserves."""
+    print("=== Test: Brain budget ===")
+
+    class FakeConfig:
+        config_data = {"context_window": 32000, "max_tokens": 2000}
+
+    class FakeBrain:
+        config = FakeConfig()
+
+    assert context_budget_for(FakeBrain()) == 32000 - 2000 - 1024
+    assert context_budget_for(None, context_window=8192) == 8192 - 1024 - 1024
+
+    # Without a configured window it follows the model, then the provider
+    def brain(provider, **config_data):
+        return SimpleNamespace(provider=provider, config=SimpleNamespace(config_data=config_data))
+
+    assert context_window_for(brain("openai", model="gpt-4o-mini")) == 128000
+    assert context_window_for(brain("claude", model="claude-3-5-sonnet-20241022")) == 200000
+    assert context_window_for(brain("ollama", model="llama3")) == 4096
+    assert context_window_for(brain("lmstudio", model="local-model"), 8192) == 8192
+    local = OllamaBrain(BrainConfig(id="ollama", name="Ollama", provider="ollama",
+                                    config_data={"context_window": 16384}))
+    assert context_budget_for(local, 8192) == 16384 - 256 - 1024  # OllamaBrain's default max_tokens
+    assert local._chat_kwargs("hi", {}, {})["options"]["num_ctx"] == 16384
+    print("✅ Brain budget test passed\n")
+
+
+if __name__ == "__main__":
+    test_packs_within_budget_without_requerying()
+    test_relevant_older_messages_are_preferred()
+    test_budget_follows_brain_window()
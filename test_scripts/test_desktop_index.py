@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent DesktopIndex in skills/app_launcher.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skills.app_launcher.main import DesktopIndex
+
+
+def write_desktop(directory, filename, name, exec_cmd, categories="", keywords=""):
+    path = os.path.join(directory, filename)
+    with open(path, "w") as f:
+        f.write("[Desktop Entry]\n")
+        f.write(f"Name={name}\nExec={exec_cmd}\nCategories={categories}\nKeywords={keywords}\n")
+    return path
+
+
+def names(index):
+    return [entry["name"] for entry in index.entries]
+
+
+def test_cache_and_incremental_refresh():
+    """Entries come from the cache at startup and rescans only see changes."""
+    print("\n=== Test: Desktop index cache ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        apps = os.path.join(tmp, "applications")
+        os.makedirs(apps)
+        cache_path = os.path.join(tmp, "desktop_index.json")
+        write_desktop(apps, "firefox.desktop", "Firefox", "firefox %u", "Network;WebBrowser;")
+        write_desktop(apps, "vlc.desktop", "VLC media player", "vlc", "AudioVideo;Video;")
+
+        index = DesktopIndex(search_dirs=[apps], cache_path=cache_path)
+        index.ensure_fresh()
+        index._refresh_thread.join()
+        assert names(index) == ["Firefox", "VLC media player"]
+
+        # A new process starts from the cache without scanning first
+        warm = DesktopIndex(search_dirs=[apps], cache_path=cache_path, refresh_interval=3600)
+        assert warm._ready.is_set()
+        assert names(warm) == ["Firefox", "VLC media player"]
+        warm._refresh_thread.join()
+
+        # New, edited and removed files are picked up by a stat diff
+        write_desktop(apps, "gedit.desktop", "Text Editor", "gedit", "TextEditor;")
+        path = write_desktop(apps, "vlc.desktop", "VLC", "vlc", "AudioVideo;Video;")
+        os.utime(path, ns=(1, 1))
+        os.remove(os.path.join(apps, "firefox.desktop"))
+        version = warm.version
+        assert warm.refresh() is True
+        assert names(warm) == ["Text Editor", "VLC"]
+        assert warm.version > version
+        assert warm.refresh() is False
+    print("✅ Desktop index cache test passed\n")
+
+
+def test_search_index_matches_its_version():
+    """A lookup racing a rescan never builds a search index from mismatched entries."""
+    print("\n=== Test: Desktop index snapshot ===")
+
+    class RecordingIndex(DesktopIndex):
+        def _publish(self):
+            super()._publish()
+            history[self.version] = names(self)
+
+    history = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        apps = os.path.join(tmp, "applications")
+        os.makedirs(apps)
+        write_desktop(apps, "firefox.desktop", "Firefox", "firefox %u", "Network;WebBrowser;")
+        index = RecordingIndex(search_dirs=[apps], cache_path=os.path.join(tmp, "index.json"), refresh_interval=3600)
+        index._refresh_thread.join()
+
+        def churn():
+            for i in range(200):
+                path = os.path.join(apps, "gedit.desktop")
+                if i % 2:
+                    os.remove(path)
+                else:
+                    write_desktop(apps, "gedit.desktop", "Text Editor", "gedit", "TextEditor;")
+                index.refresh()
+
+        seen = []
+        writer = threading.Thread(target=churn)
+        writer.start()
+        while writer.is_alive():
+            search = index._ensure_search_index()
+            seen.append((search.version, [entry["name"] for entry in search.entries]))
+        writer.join()
+
+        assert len(history) > 100
+        for version, entry_names in seen:
+            assert history[version] == entry_names, (version, entry_names)
+    print("✅ Desktop index snapshot test passed\n")
+
+
+if __name__ == "__main__":
+    test_cache_and_incremental_refresh()
+    test_search_index_matches_its_version()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for the FTS5 conversation search index in core.persistence.
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.persistence import Persistence
+
+
+def test_ranked_search_with_snippets():
+    """Search returns one BM25-ranked hit per session with a snippet."""
+    print("\n=== Test: Ranked FTS search ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"))
+        python_session = store.create_session(title="Python help")
+        store.add_message(python_session, "user", "How do I read a file in Python?")
+        store.add_message(python_session, "assistant", "Use open() in Python; Python makes it easy.")
+        weather_session = store.create_session(title="Weather")
+        store.add_message(weather_session, "user", "Is it going to rain tomorrow?")
+
+        results = store.search_conversations("python")
+        assert [r["session_id"] for r in results] == [python_session]
+        assert "[Python]" in results[0]["snippet"]
+
+        # Prefix matching on the last term, all terms required
+        assert store.search_conversations("rai")[0]["session_id"] == weather_session
+        assert store.search_conversations("rain python") == []
+
+        # Triggers keep the index in sync with deletes
+        store.delete_session(python_session)
+        assert store.search_conversations("python") == []
+        store.close()
+    print("✅ Ranked FTS search test passed\n")
+
+
+def test_busy_session_does_not_hide_others():
+    """Sessions with weaker hits are still found behind one session with many."""
+    print("=== Test: FTS search across busy sessions ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"))
+        busy_session = store.create_session(title="Deploy log")
+        for i in range(250):
+            store.add_message(busy_session, "assistant", f"deploy {i}")
+        quiet_session = store.create_session(title="Release notes")
+        store.add_message(quiet_session, "user", "after the long release review we will finally deploy the new build")
+
+        results = store.search_conversations("deploy")
+        assert [r["session_id"] for r in results] == [busy_session, quiet_session]
+        assert "[deploy]" in results[1]["snippet"]
+        assert store.search_conversations("deploy", limit=1)[0]["session_id"] == busy_session
+        store.close()
+    print("✅ FTS search across busy sessions test passed\n")
+
+
+def test_online_backfill_of_existing_database():
+    """Messages written before the index existed are backfilled incrementally."""
+    print("=== Test: Online FTS backfill ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "avva.db")
+        store = Persistence(db_path=db_path)
+        session_id = store.create_session(title="Legacy")
+        store.close()
+
+        # Simulate a database created before the FTS index was introduced
+        conn = sqlite3.connect(db_path)
+        conn.execute("DROP TABLE conversation_messages_fts")
+        for name in ("insert", "delete", "update"):
+            conn.execute(f"DROP TRIGGER conversation_messages_fts_{name}")
+        conn.executemany(
+            "INSERT INTO conversation_messages (session_id, role, content, timestamp) VALUES (?, 'user', ?, '2026-01-01 00:00:00')",
+            [(session_id, f"legacy note {i} about kubernetes") for i in range(25)]
+        )
+        conn.commit()
+        conn.close()
+
+        store = Persistence(db_path=db_path)
+        store._closing.set()  # stop the background thread; drive the steps by hand
+        store._fts_backfill_thread.join()
+        store._fts_ready = False
+        while not store.backfill_fts_step(batch_size=10):
+            pass
+
+        assert store.fts_ready()
+        results = store.search_conversations("kubernetes")
+        assert results and results[0]["session_id"] == session_id
+        assert results[0]["message_id"] is not None
+        store.close()
+    print("✅ Online FTS backfill test passed\n")
+
+
+if __name__ == "__main__":
+    test_ranked_search_with_snippets()
+    test_busy_session_does_not_hide_others()
+    test_online_backfill_of_existing_database()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared provider connection pool in core.brains.transport.
+
+Requests go to a keep-alive HTTP server on localhost.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.brain_interface import BrainConfig
+from core.brains.lmstudio_brain import LMStudioBrain
+from core.brains.transport import HTTPPool, host_key, http_pool
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """Answers every request with a chat completion, keeping the connection open."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._reply({"ok": True})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        self._reply({
+            "id": "chat", "object": "chat.completion", "created": 0, "model": body.get("model", ""),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": '{"natural_response": "pong"}'}}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        })
+
+    def _reply(self, data):
+        payload = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_host_keys():
+    """Pools are keyed by scheme, host and port."""
+    print("\n=== Test: Host keys ===")
+    assert host_key("https://api.openai.com/v1") == "https://api.openai.com:443"
+    assert host_key("http://localhost:11434") == "http://localhost:11434"
+    assert host_key("localhost:1234/v1") == "http://localhost:1234"
+    assert host_key("http://example.com/a") == host_key("http://example.com:80/b")
+    print("✅ Host keys test passed\n")
+
+
+def test_connections_are_reused():
+    """Sequential requests to one host, from any client, share one connection."""
+    print("=== Test: Connection reuse ===")
+    server, url = start_server()
+    try:
+        pool = HTTPPool(pool_size=4, keepalive=2)
+        client = pool.client(f"{url}/v1")
+        assert pool.client(f"{url}/other") is client
+
+        for _ in range(3):
+            assert client.get(f"{url}/v1/models").json() == {"ok": True}
+        # An SDK-built client (as Ollama does) sends through the same pool
+        with httpx.Client(**pool.client_options(url)) as sdk_client:
+            assert sdk_client.get(f"{url}/api/tags").status_code == 200
+
+        stats = pool.stats()["hosts"][host_key(url)]
+        assert stats["requests"] == 4, stats
+        assert stats["connections_opened"] == 1, stats
+        assert stats["connections_reused"] == 3, stats
+        pool.close()
+    finally:
+        server.shutdown()
+    print("✅ Connection reuse test passed\n")
+
+
+def test_async_clients_are_per_loop():
+    """Async clients reuse connections within a loop and are rebuilt for a new loop."""
+    print("=== Test: Async pools ===")
+    server, url = start_server()
+    try:
+        pool = HTTPPool()
+
+        async def run():
+            client = pool.async_client(url)
+            assert pool.async_client(url) is client
+            for _ in range(3):
+                await client.get(f"{url}/ping")
+            return client
+
+        first = asyncio.run(run())
+        second = asyncio.run(run())
+        assert first is not second
+
+        stats = pool.stats()["hosts"][host_key(url)]
+        assert stats["requests"] == 6, stats
+        assert stats["connections_opened"] == 2, stats
+    finally:
+        server.shutdown()
+    print("✅ Async pools test passed\n")
+
+
+def test_brains_share_the_global_pool():
+    """Two LM Studio brains on one endpoint use a single kept-alive connection."""
+    print("=== Test: Brains on the shared pool ===")
+    server, url = start_server()
+    try:
+        brains = [
+            LMStudioBrain(BrainConfig(id=f"lmstudio_{i}", name="LM Studio", provider="lmstudio",
+                                      config_data={"endpoint": f"{url}/v1", "model": "local-model"}))
+            for i in range(2)
+        ]
+        for brain in brains * 2:
+            response = brain.execute("ping", {}, {})
+            assert response.success and response.natural_response == "pong", response
+
+        stats = http_pool.stats()["hosts"][host_key(url)]
+        assert stats["requests"] == 4, stats
+        assert stats["connections_opened"] == 1, stats
+    finally:
+        server.shutdown()
+    print("✅ Brains on the shared pool test passed\n")
+
+
+if __name__ == "__main__":
+    test_host_keys()
+    test_connections_are_reused()
+    test_async_clients_are_per_loop()
+    test_brains_share_the_global_pool()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled intent matcher in core.intent_matcher.
+
+The compiled matcher must return exactly what the original linear scan in
+SkillManager.get_intent_match returned, for any set of intents.
+"""
+
+import os
+import random
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.intent_matcher import AhoCorasick, IntentMatcher, required_literal
+
+
+def linear_match(command, static_intents, regex_intents):
+    """The pre-compilation implementation, kept as the reference."""
+    cmd_clean = command.lower().strip()
+    if cmd_clean in static_intents:
+        return static_intents[cmd_clean]
+    for phrase, exec_str in static_intents.items():
+        if phrase in cmd_clean:
+            return exec_str
+    for regex, template in regex_intents:
+        match = regex.search(cmd_clean)
+        if match:
+            resolved_exec = template
+            for i, group in enumerate(match.groups(), 1):
+                resolved_exec = resolved_exec.replace(f"${i}", group)
+            return resolved_exec
+    return None
+
+
+def compiled_match(command, static_intents, matcher):
+    found = matcher.match(command.lower().strip(), static_intents)
+    if not found:
+        return None
+    kind, value = found
+    if kind == "static":
+        return value
+    resolved_exec, groups = value
+    for i, group in enumerate(groups, 1):
+        resolved_exec = resolved_exec.replace(f"${i}", group)
+    return resolved_exec
+
+
+def test_phrase_priority_follows_registration_order():
+    """The earliest registered phrase wins, not the longest or leftmost."""
+    print("\n=== Test: Phrase priority ===")
+    ac = AhoCorasick(["time", "what time", "he", "she", "hers"])
+    assert ac.find_first("tell me what time it is") == "time"
+    assert ac.find_first("ushers") == "he"
+    assert ac.find_first("nothing here") == "he"
+    assert ac.find_first("xyz") is None
+    assert AhoCorasick(["abc", ""]).find_first("zzz") == ""
+    print("✅ Phrase priority test passed\n")
+
+
+def test_regex_priority_and_groups():
+    """The prefiltered regex set picks the first registered pattern, with its own groups."""
+    print("=== Test: Regex priority ===")
+    regex_intents = [
+        (re.compile(r"(?:launch|open|start|run)\s+(.*)", re.IGNORECASE), 'launch_application("$1")'),
+        (re.compile(r"^([a-z0-9_-]+)$", re.IGNORECASE), 'launch_application("$1")'),
+        (re.compile(r"(\w+) (\1)", re.IGNORECASE), 'echo("$1")'),
+        (re.compile(r"la+ste(?:st)? news", re.IGNORECASE), 'news()'),
+        (re.compile(r"weather in (\w+)", re.IGNORECASE), 'weather("$1")'),
+    ]
+    matcher = IntentMatcher({}, regex_intents)
+    commands = ("please open firefox now", "steam", "say hi hi", "weather in paris, open maps", "??",
+                "laaaste news", "la\u017fte news")  # long s folds to "s" under IGNORECASE
+    for command in commands:
+        assert compiled_match(command, {}, matcher) == linear_match(command, {}, regex_intents), command
+    assert required_literal(re.compile(r"(?:launch|open)\s+(.*)")) is None
+    assert required_literal(re.compile(r"^weather in (\w+)")) == "weather "
+    print("✅ Regex priority test passed\n")
+
+
+def test_matches_linear_scan_on_random_skill_sets():
+    """Randomized equivalence against the original implementation."""
+    print("=== Test: Randomized equivalence ===")
+    rng = random.Random(1234)
+    alphabet = "abcde "
+    for _ in range(200):
+        static_intents = {}
+        for i in range(rng.randint(0, 12)):
+            phrase = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))).strip()
+            static_intents[phrase] = f"tool_{i}()"
+        regex_intents = []
+        for i in range(rng.randint(0, 6)):
+            word = "".join(rng.choice("abcde") for _ in range(rng.randint(1, 3)))
+            pattern = rng.choice([f"{word}\\s*(\\w*)", f"^{word}", f"({word})+(b?)$", f"(?:{word}|e)(.)"])
+            regex_intents.append((re.compile(pattern, re.IGNORECASE), f'regex_{i}("$1")'))
+        matcher = IntentMatcher(static_intents, regex_intents)
+        for _ in range(20):
+            command = "".join(rng.choice(alphabet + "xyz") for _ in range(rng.randint(0, 15)))
+            try:
+                expected = linear_match(command, static_intents, regex_intents)
+            except TypeError:
+                continue  # unmatched optional group; both implementations raise
+            assert compiled_match(command, static_intents, matcher) == expected, (command, static_intents, regex_intents)
+    print("✅ Randomized equivalence test passed\n")
+
+
+if __name__ == "__main__":
+    test_phrase_priority_follows_registration_order()
+    test_regex_priority_and_groups()
+    test_matches_linear_scan_on_random_skill_sets()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for the pooled SQLite connection layer in core.persistence.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.persistence import Persistence
+
+
+def test_pool_pragmas_and_reuse():
+    """Connections are WAL-tuned and reused across calls."""
+    print("\n=== Test: Pool pragmas and reuse ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"), max_connections=2)
+        with store.pool.connection() as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            sync = conn.execute("PRAGMA synchronous").fetchone()[0]
+        assert mode == "wal"
+        assert sync == 1  # NORMAL
+
+        for i in range(20):
+            store.set_setting(f"key{i}", str(i))
+        assert store.get_setting("key7") == "7"
+        assert len(store.pool._all) == 1
+        store.close()
+    print("✅ Pool pragmas and reuse test passed\n")
+
+
+def test_pool_concurrent_writers():
+    """Several threads can write through the bounded pool without errors."""
+    print("=== Test: Concurrent writers ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"), max_connections=3)
+        session_id = store.create_session(title="Concurrency")
+        errors = []
+
+        def writer(n):
+            try:
+                for i in range(25):
+                    store.add_message(session_id, "user", f"thread {n} message {i}")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert not errors, errors
+        assert len(store.get_session_messages(session_id, limit=1000)) == 150
+        assert len(store.pool._all) <= 3
+        store.close()
+    print("✅ Concurrent writers test passed\n")
+
+
+def test_failed_transaction_rolls_back():
+    """An exception inside pool.cursor() leaves no partial writes behind."""
+    print("=== Test: Rollback on error ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"))
+        try:
+            with store.pool.cursor() as cursor:
+                cursor.execute("INSERT INTO settings (key, value) VALUES ('partial', 'x')")
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+        assert store.get_setting("partial") is None
+        store.close()
+    print("✅ Rollback test passed\n")
+
+
+if __name__ == "__main__":
+    test_pool_pragmas_and_reuse()
+    test_pool_concurrent_writers()
+    test_failed_transaction_rolls_back()
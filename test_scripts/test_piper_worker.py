@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the long-lived Piper worker in core.piper_worker.
+
+A stand-in script speaks the same --json-input protocol as the piper
+binary, so no voice model is needed.
+"""
+
+import os
+import stat
+import sys
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.piper_worker import PiperProcess
+
+FAKE_PIPER = '''#!{python}
+import json, sys, time, wave
+with open({starts!r}, "a") as f:
+    f.write("start\\n")
+for line in sys.stdin:
+    request = json.loads(line)
+    text = request["text"]
+    if text == "crash":
+        sys.exit(3)
+    time.sleep(0.01)
+    with wave.open(request["output_file"], "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(16000)
+        out.writeframes(text.encode("utf-8").ljust(2 * len(text), b"\\0"))
+    print(request["output_file"], flush=True)
+'''
+
+
+def make_fake_piper(tmp):
+    starts = os.path.join(tmp, "starts.log")
+    path = os.path.join(tmp, "piper")
+    with open(path, "w") as f:
+        f.write(FAKE_PIPER.format(python=sys.executable, starts=starts))
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return path, starts
+
+
+def load_count(starts):
+    with open(starts) as f:
+        return len(f.readlines())
+
+
+def test_model_loaded_once_for_concurrent_requests():
+    """Concurrent requests share one process and each gets its own audio."""
+    print("\n=== Test: Persistent Piper worker ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        binary, starts = make_fake_piper(tmp)
+        worker = PiperProcess(binary, os.path.join(tmp, "voice.onnx"))
+        texts = [f'sentence "{i}" with\nnewline' for i in range(12)]
+        results = {}
+
+        def run(text):
+            results[text] = worker.synthesize(text)
+
+        threads = [threading.Thread(target=run, args=(text,)) for text in texts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for text in texts:
+            audio = results[text]
+            assert audio.sample_rate == 16000
+            assert audio.data.rstrip(b"\0") == text.encode("utf-8")
+        assert load_count(starts) == 1
+        assert os.listdir(worker.work_dir) == []
+        worker.close()
+    print("✅ Persistent Piper worker test passed\n")
+
+
+def test_restarts_after_crash():
+    """A dead process fails its request and is restarted on the next one."""
+    print("=== Test: Piper worker restart ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        binary, starts = make_fake_piper(tmp)
+        worker = PiperProcess(binary, os.path.join(tmp, "voice.onnx"))
+        try:
+            worker.synthesize("crash")
+            assert False, "expected failure"
+        except RuntimeError:
+            pass
+        assert worker.synthesize("hello").data.rstrip(b"\0") == b"hello"
+        assert load_count(starts) == 2
+        worker.close()
+    print("✅ Piper worker restart test passed\n")
+
+
+if __name__ == "__main__":
+    test_model_loaded_once_for_concurrent_requests()
+    test_restarts_after_crash()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Tests for the Assistant request scheduler (core.assistant.RequestScheduler).
+"""
+
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.assistant as assistant_module
+import core.memory as memory_module
+from core.assistant import Assistant, RequestScheduler
+from core.errors import CoreErrorException
+from core.tts import SpeechStream
+
+
+class RecordingHandler:
+    """Handler that logs start/end per request and can be held open."""
+
+    def __init__(self, duration=0.02):
+        self.duration = duration
+        self.events = []
+        self.lock = threading.Lock()
+        self.release = threading.Event()
+        self.release.set()
+        self.active = 0
+        self.peak = 0
+
+    def __call__(self, context):
+        with self.lock:
+            self.events.append(("start", context.command))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        self.release.wait()
+        deadline = time.monotonic() + self.duration
+        while time.monotonic() < deadline and not context.cancelled:
+            time.sleep(0.005)
+        with self.lock:
+            self.active -= 1
+            self.events.append(("cancelled" if context.cancelled else "end", context.command))
+
+
+def test_session_fifo_and_parallel_sessions():
+    """One session runs in order; two sessions overlap."""
+    print("\n=== Test: Per-session ordering ===")
+    handler = RecordingHandler()
+    scheduler = RequestScheduler(handler, max_workers=2)
+    contexts = [scheduler.submit(f"a{i}", session_key="a") for i in range(3)]
+    contexts += [scheduler.submit(f"b{i}", session_key="b") for i in range(3)]
+    for context in contexts:
+        assert context.wait(2.0)
+
+    for session in "ab":
+        own = [(kind, cmd) for kind, cmd in handler.events if cmd[0] == session]
+        assert own == [(kind, f"{session}{i}") for i in range(3) for kind in ("start", "end")], own
+    assert handler.peak == 2
+    assert all(context.status == "done" for context in contexts)
+    print("✅ Per-session ordering test passed\n")
+
+
+def test_cancel_by_request_id():
+    """Queued requests are dropped; running ones see the cancel flag."""
+    print("=== Test: Cancellation ===")
+    handler = RecordingHandler(duration=5.0)
+    scheduler = RequestScheduler(handler, max_workers=1)
+    running = scheduler.submit("first", request_id="r1")
+    queued = scheduler.submit("second", request_id="r2")
+    while ("start", "first") not in handler.events:
+        time.sleep(0.005)
+
+    assert scheduler.cancel("r2") is queued
+    assert queued.wait(0.1) and queued.status == "cancelled"
+    assert scheduler.cancel("r1") is running
+    assert running.wait(1.0) and running.status == "cancelled"
+    assert ("cancelled", "first") in handler.events
+    assert ("start", "second") not in handler.events
+    assert scheduler.cancel("unknown") is None
+    assert scheduler.stats()["queued"] == 0 and scheduler.stats()["running"] == 0
+    print("✅ Cancellation test passed\n")
+
+
+def test_backpressure():
+    """Submissions beyond max_queued are refused until the queue drains."""
+    print("=== Test: Backpressure ===")
+    handler = RecordingHandler()
+    handler.release.clear()
+    scheduler = RequestScheduler(handler, max_workers=1, max_queued=2)
+    scheduler.submit("busy", session_key="x")
+    while ("start", "busy") not in handler.events:
+        time.sleep(0.005)
+    scheduler.submit("q1", session_key="y")
+    scheduler.submit("q2", session_key="z")
+    try:
+        scheduler.submit("q3", session_key="w")
+        assert False, "expected ASSISTANT_BUSY"
+    except CoreErrorException as e:
+        assert e.code == "ASSISTANT_BUSY" and e.retry_allowed
+    handler.release.set()
+    last = None
+    deadline = time.monotonic() + 2.0
+    while last is None and time.monotonic() < deadline:
+        try:
+            last = scheduler.submit("q3", session_key="w")
+        except CoreErrorException:
+            time.sleep(0.01)
+    assert last is not None and last.wait(2.0)
+    print("✅ Backpressure test passed\n")
+
+
+class FakeSpeech:
+    """Stand-in for tts.SpeechStream that records how it was ended."""
+
+    def __init__(self):
+        self.fed, self.ended = [], None
+
+    @property
+    def done(self):
+        return self.ended is not None
+
+    def feed(self, chunk):
+        self.fed.append(chunk)
+
+    def close(self):
+        self.ended = "closed"
+
+    def cancel(self):
+        self.ended = "cancelled"
+
+
+def test_interrupted_stream_stops_its_speech():
+    """Speech started for a streamed reply is cancelled if the request is interrupted mid-stream."""
+    print("=== Test: Interrupted stream speech ===")
+    speeches = []
+
+    def process_stream(command, on_chunk, cancel_token=None):
+        on_chunk("Once upon a time. ")
+        if command == "interrupt me":
+            cancel_token.cancel()
+        on_chunk("The end.")
+        return "Once upon a time. The end.", None
+
+    def speak_stream():
+        speeches.append(FakeSpeech())
+        return speeches[-1]
+
+    originals = assistant_module.brain, assistant_module.speak_stream, memory_module.memory
+    assistant_module.brain = SimpleNamespace(process_stream=process_stream)
+    assistant_module.speak_stream = speak_stream
+    memory_module.memory = SimpleNamespace(add_user_message=lambda text: None,
+                                           add_assistant_message=lambda text: None)
+    try:
+        assistant = Assistant()
+        assistant.process_command("interrupt me", stream=True)
+        assistant.process_command("tell me a story", stream=True)
+    finally:
+        assistant_module.brain, assistant_module.speak_stream, memory_module.memory = originals
+    assert [s.ended for s in speeches] == ["cancelled", "closed"]
+    assert speeches[0].fed == ["Once upon a time. "]
+    print("✅ Interrupted stream speech test passed\n")
+
+
+class FakeVoice:
+    """Synthesis and playback stand-ins for SpeechStream, shared by every reply."""
+
+    def __init__(self):
+        self.files, self.played = [], []
+        self.lock = threading.Lock()
+
+    def synthesize(self, text, filename):
+        with self.lock:
+            self.files.append(filename)
+        return text
+
+    def play(self, text, should_stop):
+        time.sleep(0.02)
+        with self.lock:
+            self.played.append(text)
+        return True
+
+
+def test_overlapping_requests_both_speak():
+    """Two requests running at once both get their whole reply spoken, one after the other."""
+    print("=== Test: Overlapping speech ===")
+    voice = FakeVoice()
+    both_running = threading.Barrier(2, timeout=2.0)
+    story = ["Once upon a time there was a fox. ", "The fox ran into the woods. ", "And then it slept."]
+
+    def process_stream(command, on_chunk, cancel_token=None):
+        both_running.wait()
+        for chunk in story:
+            on_chunk(chunk)
+            time.sleep(0.02)
+        return "".join(story), None
+
+    def process(command):
+        both_running.wait()
+        return "It is sunny today. Expect light wind."
+
+    def new_speech():
+        return SpeechStream(synthesize=voice.synthesize, play=voice.play)
+
+    def speak(text):
+        speech = new_speech()
+        speech.say(text)
+        return speech
+
+    names = ("brain", "speak", "speak_stream")
+    originals = [getattr(assistant_module, name) for name in names] + [memory_module.memory]
+    assistant_module.brain = SimpleNamespace(process_stream=process_stream, process=process)
+    assistant_module.speak, assistant_module.speak_stream = speak, new_speech
+    memory_module.memory = SimpleNamespace(add_user_message=lambda text: None,
+                                           add_assistant_message=lambda text: None)
+    try:
+        assistant = Assistant()
+        first = assistant.submit_command("tell me a story", stream=True, session_key="a")
+        second = assistant.submit_command("weather", stream=False, session_key="b")
+        assert first.wait(3.0) and second.wait(3.0)
+        for _, speech in list(assistant._speeches):
+            assert speech.wait(3.0)
+    finally:
+        for name, value in zip(names, originals):
+            setattr(assistant_module, name, value)
+        memory_module.memory = originals[-1]
+
+    sentences = [chunk.strip() for chunk in story]
+    weather = "It is sunny today. Expect light wind."
+    assert sorted(voice.played) == sorted(sentences + [weather])
+    assert voice.played in (sentences + [weather], [weather] + sentences)
+    assert len(set(voice.files)) == len(voice.files)
+    print("✅ Overlapping speech test passed\n")
+
+
+if __name__ == "__main__":
+    test_session_fifo_and_parallel_sessions()
+    test_cancel_by_request_id()
+    test_backpressure()
+    test_interrupted_stream_stops_its_speech()
+    test_overlapping_requests_both_speak()
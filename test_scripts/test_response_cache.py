@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the Brain response cache in core.response_cache.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.persistence import Persistence
+from core.brain_interface import BrainConfig, BrainResponse
+from core.response_cache import ResponseCache
+
+
+class FakeBrain:
+    def __init__(self, brain_id="fake", **config_data):
+        self.id = brain_id
+        self.config = BrainConfig(id=brain_id, name=brain_id, provider="openai", config_data=config_data)
+
+
+def test_hits_across_normalized_prompts_and_restarts():
+    """Equivalent prompts share an entry; the SQLite tier survives a new cache."""
+    print("\n=== Test: Response cache hits ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"))
+        brain = FakeBrain(model="gpt-4o")
+        context = {"query": "What's the weather?", "user": "Ava"}
+        cache = ResponseCache(store, enabled=True)
+
+        assert cache.get(brain, "What's the weather?", context) is None
+        cache.put(brain, "What's the weather?", context, BrainResponse(success=True, content="Sunny"))
+        assert cache.get(brain, "  what's the   WEATHER ", dict(context, query="x")).content == "Sunny"
+
+        # Different brain model or context is a different entry
+        assert cache.get(FakeBrain(model="gpt-4o-mini"), "What's the weather?", context) is None
+        assert cache.get(brain, "What's the weather?", dict(context, user="Bob")) is None
+
+        restarted = ResponseCache(store, enabled=True)
+        assert restarted.get(brain, "what's the weather", context).content == "Sunny"
+        assert restarted.stats()["disk_hits"] == 1
+
+        stats = cache.stats()
+        assert stats["hits"] == 1 and stats["misses"] == 3
+        store.close()
+    print("✅ Response cache hits test passed\n")
+
+
+def test_ttl_lru_and_opt_out():
+    """Expired entries miss, the LRU is bounded, and brains can opt out."""
+    print("=== Test: TTL, LRU and opt-out ===")
+    brain = FakeBrain()
+    cache = ResponseCache(max_entries=2, enabled=True)
+    for prompt in ("a", "b", "c"):
+        cache.put(brain, prompt, {}, BrainResponse(success=True, content=prompt))
+    assert cache.get(brain, "a", {}) is None
+    assert cache.get(brain, "c", {}).content == "c"
+    assert cache.stats()["evictions"] == 1
+
+    expired = FakeBrain(cache_ttl=-1)
+    cache.put(expired, "d", {}, BrainResponse(success=True, content="d"))
+    assert cache.get(expired, "d", {}) is None
+
+    opted_out = FakeBrain("creative", cache_responses=False)
+    cache.put(opted_out, "poem", {}, BrainResponse(success=True, content="roses"))
+    assert cache.get(opted_out, "poem", {}) is None
+
+    cache.put(brain, "fail", {}, BrainResponse(success=False, content="", error="boom"))
+    assert cache.get(brain, "fail", {}) is None
+
+    disabled = ResponseCache()
+    disabled.put(brain, "x", {}, BrainResponse(success=True, content="x"))
+    assert disabled.get(brain, "x", {}) is None
+    print("✅ TTL, LRU and opt-out test passed\n")
+
+
+if __name__ == "__main__":
+    test_hits_across_normalized_prompts_and_restarts()
+    test_ttl_lru_and_opt_out()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Tests for the local semantic index in core.semantic_index.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.persistence import Persistence
+from core.semantic_index import HashingEmbedder, SemanticIndex, VectorStore
+
+
+def test_incremental_index_and_search():
+    """New messages are picked up incrementally and ranked by similarity."""
+    print("\n=== Test: Incremental semantic search ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"))
+        index = SemanticIndex(store)
+
+        cooking = store.create_session(title="Cooking")
+        store.add_message(cooking, "user", "What is a good recipe for banana bread?")
+        linux = store.create_session(title="Linux")
+        store.add_message(linux, "user", "How do I restart the network manager service?")
+        assert index.sync() == 2
+
+        store.add_message(cooking, "assistant", "Mash ripe bananas, add flour, sugar and bake.")
+        assert index.sync() == 1
+        assert index.sync() == 0
+
+        hits = index.search("baking bananas", k=3)
+        top = store.get_messages_by_ids([hits[0][0]])[hits[0][0]]
+        assert top["session_id"] == cooking
+
+        hits = index.search("restarting networking services", k=1)
+        assert store.get_messages_by_ids([hits[0][0]])[hits[0][0]]["session_id"] == linux
+
+        # Reopening keeps the persisted vectors and resumes after the last id
+        reopened = SemanticIndex(store)
+        assert reopened.store.count() == 3
+        assert reopened.sync() == 0
+        store.close()
+    print("✅ Incremental semantic search test passed\n")
+
+
+def test_search_leaves_backlog_to_background():
+    """A search indexes at most one batch inline; the rest is backfilled in the background."""
+    print("=== Test: Bounded inline sync ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"))
+        session = store.create_session(title="Backlog")
+        for i in range(7):
+            store.add_message(session, "user", f"message number {i} about gardening")
+        index = SemanticIndex(store, batch_size=2)
+
+        hits = index.search("gardening", k=10)
+        assert 2 <= len(hits) < 7
+        deadline = time.monotonic() + 5.0
+        while index.store.count() < 7 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert index.store.count() == 7
+        assert len(index.search("gardening", k=10)) == 7
+
+        # Created with backfill, existing history is indexed without any search
+        os.remove(index.store.vectors_path)
+        os.remove(index.store.ids_path)
+        backfilled = SemanticIndex(store, backfill=True)
+        deadline = time.monotonic() + 5.0
+        while backfilled.store.count() < 7 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert backfilled.store.count() == 7
+        store.close()
+    print("✅ Bounded inline sync test passed\n")
+
+
+def test_background_sync_is_debounced():
+    """A burst of new messages wakes the indexer once, not once per message."""
+    print("=== Test: Debounced background sync ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"))
+        session = store.create_session(title="Burst")
+        index = SemanticIndex(store, sync_delay=0.5)
+        syncs = []
+        sync = index.sync
+        index.sync = lambda *args, **kwargs: syncs.append(1) or sync(*args, **kwargs)
+        for i in range(20):
+            store.add_message(session, "user", f"burst message {i} about cooking")
+            index.schedule_sync()
+            time.sleep(0.01)
+        deadline = time.monotonic() + 5.0
+        while index.store.count() < 20 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert index.store.count() == 20
+        assert len(syncs) <= 2, len(syncs)
+        store.close()
+    print("✅ Debounced background sync test passed\n")
+
+
+def test_vector_store_top_k_matches_brute_force():
+    """Chunked top-k equals a full argsort over the same matrix."""
+    print("=== Test: Vector store top-k ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        rng = np.random.default_rng(7)
+        vectors = rng.standard_normal((5000, 32)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        vs = VectorStore(os.path.join(tmp, "vectors"), 32, "test")
+        vs.append(list(range(1, 5001)), vectors)
+
+        query = vectors[123]
+        expected = (np.argsort(-(vectors @ query))[:10] + 1).tolist()
+        got = [message_id for message_id, _ in vs.search(query, k=10, chunk_rows=700)]
+        assert got == expected
+    print("✅ Vector store top-k test passed\n")
+
+
+def test_embedder_is_stable_and_normalized():
+    """Embeddings do not depend on PYTHONHASHSEED and have unit length."""
+    print("=== Test: Hashing embedder ===")
+    embedder = HashingEmbedder()
+    a, b = embedder.embed(["Open Firefox please", "Open Firefox please"])
+    assert np.allclose(a, b)
+    assert abs(np.linalg.norm(a) - 1.0) < 1e-5
+    assert not np.any(embedder.embed([""])[0])
+    print("✅ Hashing embedder test passed\n")
+
+
+def bench_search(rows=1_000_000):
+    """Manual benchmark: top-k latency over a synthetic store."""
+    with tempfile.TemporaryDirectory() as tmp:
+        dim = HashingEmbedder().dim
+        vs = VectorStore(os.path.join(tmp, "vectors"), dim, "bench")
+        rng = np.random.default_rng(0)
+        for start in range(0, rows, 100_000):
+            block = rng.standard_normal((100_000, dim)).astype(np.float32)
+            vs.append(list(range(start + 1, start + 100_001)), block)
+        query = HashingEmbedder().embed(["what did we say about the weather"])[0]
+        vs.search(query, k=10)  # warm the page cache
+        start = time.perf_counter()
+        for _ in range(5):
+            vs.search(query, k=10)
+        print(f"top-10 over {rows} vectors: {(time.perf_counter() - start) / 5 * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    test_incremental_index_and_search()
+    test_search_leaves_backlog_to_background()
+    test_background_sync_is_debounced()
+    test_vector_store_top_k_matches_brute_force()
+    test_embedder_is_stable_and_normalized()
+    if "--bench" in sys.argv:
+        bench_search()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for lazy plugin loading and the manifest index in core.skill_manager.
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.skill_manager import SkillManager, LazyTool
+
+
+PLUGIN_SOURCE = '''
+import os
+
+with open(os.path.join(os.path.dirname(__file__), "imported.flag"), "a") as f:
+    f.write("x")
+
+MANIFEST = {
+    "greet": {"description": "Say hello."},
+    "missing": {"description": "Declared but not defined."}
+}
+
+def greet(name="world"):
+    return f"hello {name}"
+'''
+
+
+def make_plugin(skills_dir, name="greeter"):
+    folder = os.path.join(skills_dir, name)
+    os.makedirs(folder)
+    with open(os.path.join(folder, "manifest.json"), "w") as f:
+        json.dump({"name": "Greeter", "intents": {"say hello": "greet()", "regex:greet (\\w+)": "greet(\"$1\")"}}, f)
+    with open(os.path.join(folder, "main.py"), "w") as f:
+        f.write(PLUGIN_SOURCE)
+    return folder
+
+
+def test_intents_register_without_importing():
+    """Discovery reads manifests only; the module runs on first tool call."""
+    print("\n=== Test: Lazy plugin import ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        skills_dir = os.path.join(tmp, "skills")
+        folder = make_plugin(skills_dir)
+        manager = SkillManager(skills_dir=skills_dir, index_path=os.path.join(tmp, "index.json"))
+
+        assert not os.path.exists(os.path.join(folder, "imported.flag"))
+        assert isinstance(manager.registry["greet"], LazyTool)
+        assert "missing" not in manager.registry
+        assert manager.tool_metadata["greet"] == "Say hello."
+        assert manager.get_intent_match("greet ada") == 'greet("ada")'
+
+        assert manager.execute('greet("ada")') == "hello ada"
+        assert manager.execute("greet()") == "hello world"
+        assert not isinstance(manager.registry["greet"], LazyTool)
+        with open(os.path.join(folder, "imported.flag")) as f:
+            assert f.read() == "x"  # imported exactly once
+    print("✅ Lazy plugin import test passed\n")
+
+
+def test_index_is_reused_until_files_change():
+    """A second start hits the index; editing the plugin forces a rescan."""
+    print("=== Test: Manifest index cache ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        skills_dir = os.path.join(tmp, "skills")
+        folder = make_plugin(skills_dir)
+        index_path = os.path.join(tmp, "index.json")
+        key = os.path.abspath(folder)
+
+        assert SkillManager(skills_dir=skills_dir, index_path=index_path).load_timings[key]["source"] == "scan"
+        assert SkillManager(skills_dir=skills_dir, index_path=index_path).load_timings[key]["source"] == "cache"
+
+        with open(os.path.join(folder, "main.py"), "a") as f:
+            f.write("\ndef wave():\n    return 'wave'\n")
+        manager = SkillManager(skills_dir=skills_dir, index_path=index_path)
+        assert manager.load_timings[key]["source"] == "scan"
+        assert [t["plugin"] for t in manager.get_load_report()] == ["greeter"]
+    print("✅ Manifest index cache test passed\n")
+
+
+def test_scan_finds_guarded_tools_and_shares_index():
+    """Tools defined in if/try blocks are found; managers of other dirs keep each other's index entries."""
+    print("=== Test: Guarded tools and shared index ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        skills_dir = os.path.join(tmp, "skills")
+        folder = make_plugin(skills_dir)
+        with open(os.path.join(folder, "main.py"), "a") as f:
+            f.write(
+                "\ntry:\n    from json import dumps as dump_json\nexcept ImportError:\n"
+                "    def dump_json(value):\n        return str(value)\n"
+                "if True:\n    def wave():\n        return 'wave'\n"
+                "def helper():\n    def nested():\n        pass\n"
+            )
+        with open(os.path.join(folder, "main.py")) as f:
+            source = f.read()
+        with open(os.path.join(folder, "main.py"), "w") as f:
+            f.write(source.replace(
+                '"missing": {"description": "Declared but not defined."}',
+                '"missing": {"description": "Declared but not defined."},\n'
+                '    "wave": {"description": "Wave."},\n'
+                '    "dump_json": {"description": "Dump."},\n'
+                '    "nested": {"description": "Not module level."}'
+            ))
+        index_path = os.path.join(tmp, "index.json")
+        manager = SkillManager(skills_dir=skills_dir, index_path=index_path)
+        assert sorted(manager.tool_metadata) == ["dump_json", "greet", "wave"]
+        assert manager.execute("wave()") == "wave"
+
+        other_dir = os.path.join(tmp, "other_skills")
+        make_plugin(other_dir, "other")
+        SkillManager(skills_dir=other_dir, index_path=index_path)
+        with open(index_path) as f:
+            keys = set(json.load(f)["plugins"])
+        assert keys == {os.path.abspath(folder), os.path.abspath(os.path.join(other_dir, "other"))}
+        key = os.path.abspath(folder)
+        assert SkillManager(skills_dir=skills_dir, index_path=index_path).load_timings[key]["source"] == "cache"
+    print("✅ Guarded tools and shared index test passed\n")
+
+
+def test_swapped_intent_rebuilds_matcher():
+    """Replacing an intent rebuilds the matcher even though the intent count is unchanged."""
+    print("=== Test: Swapped intent ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        skills_dir = os.path.join(tmp, "skills")
+        make_plugin(skills_dir)
+        manager = SkillManager(skills_dir=skills_dir, index_path=os.path.join(tmp, "index.json"))
+        assert manager.get_intent_match("please say hello") == "greet()"
+
+        # A plugin reload drops the old phrase and registers a new one
+        del manager.static_intents["say hello"]
+        manager._register_intent("say hi", "greet()", "greeter")
+        assert manager.get_intent_match("please say hi") == "greet()"
+        assert manager.get_intent_match("please say hello") is None
+    print("✅ Swapped intent test passed\n")
+
+
+if __name__ == "__main__":
+    test_intents_register_without_importing()
+    test_index_is_reused_until_files_change()
+    test_scan_finds_guarded_tools_and_shares_index()
+    test_swapped_intent_rebuilds_matcher()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for sentence-level streaming speech in core.tts.
+
+Synthesis and playback are replaced by timed stand-ins, so no audio
+device or TTS engine is needed.
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.tts import SentenceSegmenter, SpeechStream
+
+
+def segment(chunks):
+    segmenter = SentenceSegmenter()
+    sentences = []
+    for chunk in chunks:
+        sentences.extend(segmenter.feed(chunk))
+    return sentences + segmenter.flush()
+
+
+def test_sentence_segmentation():
+    """Chunks split on sentence ends, not on abbreviations or decimals."""
+    print("\n=== Test: Sentence segmentation ===")
+    text = "Hello there! The file is 3.5 MB, e.g. quite small. Dr. Smith agrees.\nNext line here without a stop"
+    chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+    assert segment(chunks) == [
+        "Hello there!",
+        "The file is 3.5 MB, e.g. quite small.",
+        "Dr. Smith agrees.",
+        "Next line here without a stop",
+    ]
+    # Fragments are merged rather than spoken on their own
+    assert segment(["Ok. Sure. That works fine."]) == ["Ok. Sure. That works fine."]
+    print("✅ Sentence segmentation test passed\n")
+
+
+class FakeAudio:
+    """Synthesis takes longer for later sentences; playback records order."""
+
+    def __init__(self):
+        self.played = []
+        self.first_played = threading.Event()
+
+    def synthesize(self, text, filename):
+        time.sleep(0.05 if text.startswith("First") else 0.01)
+        return text
+
+    def play(self, text, should_stop):
+        for _ in range(5):
+            if should_stop():
+                return False
+            time.sleep(0.01)
+        self.played.append(text)
+        self.first_played.set()
+        return True
+
+
+def test_speaks_during_generation_in_order():
+    """The first sentence plays before the reply is complete; order is kept."""
+    print("=== Test: Streaming playback ===")
+    audio = FakeAudio()
+    stream = SpeechStream(synthesize=audio.synthesize, play=audio.play)
+    stream.feed("First sentence is here. Second sentence ")
+    assert audio.first_played.wait(2.0), "nothing spoken while generating"
+    stream.feed("follows. Third one ends")
+    stream.close()
+    assert stream.wait(2.0)
+    assert audio.played == ["First sentence is here.", "Second sentence follows.", "Third one ends"]
+    print("✅ Streaming playback test passed\n")
+
+
+def test_cancel_flushes_queue():
+    """Cancelling stops playback and drops everything not yet spoken."""
+    print("=== Test: Streaming interruption ===")
+    audio = FakeAudio()
+    stream = SpeechStream(synthesize=audio.synthesize, play=audio.play)
+    stream.feed("First sentence is here. " + "Another sentence here. " * 20)
+    assert audio.first_played.wait(2.0)
+    stream.cancel()
+    assert stream.wait(2.0)
+    assert len(audio.played) < 3
+    print("✅ Streaming interruption test passed\n")
+
+
+def test_streams_take_turns():
+    """Replies queue on one voice; cancelling one leaves the others alone."""
+    print("=== Test: Streams take turns ===")
+    audio = FakeAudio()
+    first = SpeechStream(synthesize=audio.synthesize, play=audio.play)
+    dropped = SpeechStream(synthesize=audio.synthesize, play=audio.play)
+    last = SpeechStream(synthesize=audio.synthesize, play=audio.play)
+    last.say("Last reply is short.")
+    dropped.say("Dropped reply never plays.")
+    first.feed("First sentence is here. ")
+    assert audio.first_played.wait(2.0)
+    dropped.cancel()
+    first.feed("Second sentence follows.")
+    first.close()
+    assert all(stream.wait(2.0) for stream in (first, dropped, last))
+    assert audio.played == ["First sentence is here.", "Second sentence follows.", "Last reply is short."]
+    print("✅ Streams take turns test passed\n")
+
+
+if __name__ == "__main__":
+    test_sentence_segmentation()
+    test_speaks_during_generation_in_order()
+    test_cancel_flushes_queue()
+    test_streams_take_turns()
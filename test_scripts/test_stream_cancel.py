@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Tests for cancelling in-flight Brain streams with a CancellationToken.
+
+A stand-in server on localhost streams a long reply one token at a time
+and records how many tokens it managed to write before the client hung
+up, so the tests can check generation stops within one chunk of cancel().
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.brain as brain_module
+from core.brain_interface import BrainConfig, CancellationToken
+from core.brains.lmstudio_brain import LMStudioBrain
+from core.brains.ollama_brain import OllamaBrain
+from core.persistence import Persistence
+from core.response_cache import ResponseCache
+
+TOKENS = 40
+TOKEN_DELAY = 0.05
+CANCEL_AFTER = 3
+STALL = 3.0  # seconds a stalling server waits before its next token
+
+
+class LongReplyHandler(BaseHTTPRequestHandler):
+    """Streams TOKENS words as Ollama NDJSON (/api/chat) or OpenAI SSE."""
+
+    def do_POST(self):
+        self.server.requests += 1
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        ndjson = self.path == "/api/chat"
+        self.send_header("Content-Type", "application/x-ndjson" if ndjson else "text/event-stream")
+        self.end_headers()
+        try:
+            for i in range(TOKENS):
+                if ndjson:
+                    part = {"model": "llama3", "message": {"role": "assistant", "content": f"w{i} "}, "done": False}
+                    self.wfile.write(json.dumps(part).encode() + b"\n")
+                else:
+                    frame = {"id": "chat", "object": "chat.completion.chunk", "created": 0, "model": "local-model",
+                             "choices": [{"index": 0, "delta": {"content": f"w{i} "}, "finish_reason": None}]}
+                    self.wfile.write(f"data: {json.dumps(frame)}\n\n".encode())
+                self.wfile.flush()
+                self.server.sent += 1
+                time.sleep(STALL if self.server.sent == self.server.stall_after else TOKEN_DELAY)
+        except (ConnectionError, OSError):
+            self.server.disconnected.set()
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(stall_after=None):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LongReplyHandler)
+    server.requests, server.sent, server.disconnected = 0, 0, threading.Event()
+    server.stall_after = stall_after
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def lmstudio_brain(url):
+    return LMStudioBrain(BrainConfig(id="lmstudio_test", name="LM Studio", provider="lmstudio",
+                                     config_data={"endpoint": f"{url}/v1", "model": "local-model"}))
+
+
+def ollama_brain(url):
+    return OllamaBrain(BrainConfig(id="ollama_test", name="Ollama", provider="ollama",
+                                   config_data={"host": url, "model": "llama3"}))
+
+
+def cancel_mid_stream(make_brain):
+    """Cancel from another thread after CANCEL_AFTER chunks; return (chunks, done, server)."""
+    server, url = start_server()
+    token = CancellationToken()
+    chunks, done = [], None
+    try:
+        for frame in make_brain(url).execute_stream("tell me a story", {}, {}, cancel_token=token):
+            assert "error" not in frame, frame
+            if frame.get("done"):
+                done = frame
+                continue
+            chunks.append(frame["chunk"])
+            if len(chunks) == CANCEL_AFTER:
+                interrupt = threading.Thread(target=token.cancel)
+                interrupt.start()
+                interrupt.join()
+        # The server notices the closed connection on its next write
+        assert server.disconnected.wait(TOKEN_DELAY * 10)
+    finally:
+        server.shutdown()
+    return chunks, done, server
+
+
+def assert_stopped_within_one_chunk(chunks, done, server):
+    assert len(chunks) == CANCEL_AFTER, chunks
+    assert done["full_content"] == "".join(chunks)
+    # At most the chunk in flight when cancel() ran, plus one write the
+    # kernel accepted before the reset came back
+    assert server.sent <= CANCEL_AFTER + 2, server.sent
+    assert server.sent < TOKENS
+
+
+def test_lmstudio_stream_stops_on_cancel():
+    """An OpenAI-compatible SSE stream is closed on the next chunk after cancel()."""
+    print("\n=== Test: LM Studio stream cancel ===")
+    assert_stopped_within_one_chunk(*cancel_mid_stream(lmstudio_brain))
+    print("✅ LM Studio stream cancel test passed\n")
+
+
+def test_ollama_stream_stops_on_cancel():
+    """An Ollama NDJSON stream is closed on the next chunk after cancel()."""
+    print("=== Test: Ollama stream cancel ===")
+    assert_stopped_within_one_chunk(*cancel_mid_stream(ollama_brain))
+    print("✅ Ollama stream cancel test passed\n")
+
+
+def test_cancel_interrupts_a_blocked_read():
+    """cancel() from another thread ends a read waiting on a stalled provider at once."""
+    print("=== Test: Cancel a stalled stream ===")
+    server, url = start_server(stall_after=CANCEL_AFTER)
+    token = CancellationToken()
+    chunks, frames = [], []
+    received = threading.Event()
+
+    def consume():
+        for frame in lmstudio_brain(url).execute_stream("tell me a story", {}, {}, cancel_token=token):
+            frames.append(frame)
+            if "chunk" in frame:
+                chunks.append(frame["chunk"])
+                if len(chunks) == CANCEL_AFTER:
+                    received.set()
+
+    reader = threading.Thread(target=consume)
+    try:
+        reader.start()
+        assert received.wait(2.0)
+        time.sleep(TOKEN_DELAY)  # the reader is now blocked on the stalled socket
+        start = time.perf_counter()
+        token.cancel()
+        reader.join(STALL)
+        elapsed = time.perf_counter() - start
+        assert not reader.is_alive() and elapsed < 0.5, elapsed
+        assert frames[-1] == {"done": True, "full_content": "".join(chunks)}, frames[-1]
+        assert server.sent == CANCEL_AFTER
+    finally:
+        server.shutdown()
+    print("✅ Cancel a stalled stream test passed\n")
+
+
+def test_process_stream_honours_cancel_token():
+    """Brain.process_stream emits nothing after cancel and skips the fallback."""
+    print("=== Test: process_stream cancel ===")
+    server, url = start_server()
+    token = CancellationToken()
+    emitted = []
+
+    def on_chunk(chunk):
+        emitted.append(chunk)
+        if len(emitted) == CANCEL_AFTER:
+            token.cancel()  # what Assistant.interrupt() does via RequestContext
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"))
+        store.save_permission("ai.generate")
+        original_storage = brain_module.storage
+        brain_module.storage = store
+        try:
+            facade = object.__new__(brain_module.Brain)
+            target = lmstudio_brain(url)
+            facade.manager = SimpleNamespace(select_brain=lambda context: target, record_result=lambda *args, **kwargs: None)
+            facade.response_cache = ResponseCache(store, enabled=False)
+
+            start = time.perf_counter()
+            text, data = facade.process_stream("tell me a story", on_chunk, cancel_token=token)
+            elapsed = time.perf_counter() - start
+
+            assert emitted == ["w0 ", "w1 ", "w2 "], emitted
+            assert text == "".join(emitted) and data is None
+            assert elapsed < TOKEN_DELAY * (CANCEL_AFTER + 4), elapsed
+            assert server.disconnected.wait(TOKEN_DELAY * 10)
+            assert server.requests == 1  # no non-streaming retry after cancel
+        finally:
+            brain_module.storage = original_storage
+            store.close()
+            server.shutdown()
+    print("✅ process_stream cancel test passed\n")
+
+
+def test_token_callbacks():
+    """Callbacks run once on cancel(), or immediately once already cancelled; removed ones never run."""
+    print("=== Test: Cancellation token ===")
+    token = CancellationToken()
+    calls = []
+    token.on_cancel(lambda: calls.append("early"))
+    remove = token.on_cancel(lambda: calls.append("removed"))
+    remove()
+    assert not token.cancelled
+    token.cancel()
+    token.cancel()
+    token.on_cancel(lambda: calls.append("late"))
+    assert token.cancelled and calls == ["early", "late"]
+    print("✅ Cancellation token test passed\n")
+
+
+if __name__ == "__main__":
+    test_lmstudio_stream_stops_on_cancel()
+    test_ollama_stream_stops_on_cancel()
+    test_cancel_interrupts_a_blocked_read()
+    test_process_stream_honours_cancel_token()
+    test_token_callbacks()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Tests for the local fast path in Brain.process_stream().
+
+Commands that match a local intent, or that the AI permission gate turns
+away, must be answered without contacting the streaming Brain. A stand-in
+LLM server on localhost counts the requests it receives.
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.brain as brain_module
+from core.brain_interface import BrainConfig
+from core.brains.lmstudio_brain import LMStudioBrain
+from core.persistence import Persistence
+from core.response_cache import ResponseCache
+
+WORDS = ["Once", " upon", " a", " time", "."]
+FIRST_TOKEN_DELAY = 0.2
+TIME_REPLY = "It's 10:30 AM."
+
+
+class SlowChatHandler(BaseHTTPRequestHandler):
+    """OpenAI-compatible SSE stream that waits FIRST_TOKEN_DELAY before replying."""
+
+    def do_POST(self):
+        self.server.requests += 1
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.server.first_token_delay)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for word in WORDS:
+            frame = {"id": "chat", "object": "chat.completion.chunk", "created": 0, "model": "local-model",
+                     "choices": [{"index": 0, "delta": {"content": word}, "finish_reason": None}]}
+            self.wfile.write(f"data: {json.dumps(frame)}\n\n".encode())
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(first_token_delay=FIRST_TOKEN_DELAY):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowChatHandler)
+    server.requests, server.first_token_delay = 0, first_token_delay
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class LocalSkills:
+    """Stand-in for skill_manager with one static and one parametric intent."""
+
+    def __init__(self):
+        self.executed = []
+
+    def get_intent_match(self, command):
+        command = command.lower().strip()
+        if "what time" in command:
+            return "get_time()"
+        if command.startswith("open "):
+            return f'open_app("{command[5:]}")'
+        return None
+
+    def execute(self, exec_str):
+        self.executed.append(exec_str)
+        if exec_str == "get_time()":
+            return TIME_REPLY
+        return {"text": f"Opening {exec_str[10:-2]}.", "exec_str": exec_str}
+
+
+@contextlib.contextmanager
+def streaming_facade(url, allow_ai=True, cache=False):
+    """
+    A Brain facade whose manager always picks an LM Studio Brain at `url`,
+    with history and permissions in a temporary database.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"))
+        if allow_ai:
+            store.save_permission("ai.generate")
+        skills = LocalSkills()
+        originals = brain_module.storage, brain_module.skill_manager
+        brain_module.storage, brain_module.skill_manager = store, skills
+        try:
+            facade = object.__new__(brain_module.Brain)
+            target = LMStudioBrain(BrainConfig(id="lmstudio_test", name="LM Studio", provider="lmstudio",
+                                               config_data={"endpoint": f"{url}/v1", "model": "local-model"}))
+            facade.manager = SimpleNamespace(select_brain=lambda context: target, record_result=lambda *args, **kwargs: None,
+                                             release_request=lambda brain_id: None)
+            facade.response_cache = ResponseCache(store, enabled=cache)
+            yield facade, skills
+        finally:
+            brain_module.storage, brain_module.skill_manager = originals
+            store.close()
+
+
+def test_local_intents_skip_the_brain():
+    """Static and parametric intents are answered without an LLM request."""
+    print("\n=== Test: Local intents skip the Brain ===")
+    server, url = start_server()
+    try:
+        with streaming_facade(url) as (facade, skills):
+            chunks = []
+            start = time.perf_counter()
+            text, data = facade.process_stream("What time is it?", chunks.append)
+            elapsed = time.perf_counter() - start
+            assert text == TIME_REPLY == "".join(chunks) and data is None
+            assert elapsed < FIRST_TOKEN_DELAY / 2, elapsed
+
+            text, data = facade.process_stream("open firefox", lambda chunk: None)
+            assert text == "Opening firefox." and data == {"exec_str": 'open_app("firefox")'}
+            assert skills.executed == ["get_time()", 'open_app("firefox")']
+        assert server.requests == 0
+    finally:
+        server.shutdown()
+    print("✅ Local intents skip the Brain test passed\n")
+
+
+def test_permission_gate_applies_to_streams():
+    """Without 'ai.generate' a streaming Brain is never contacted."""
+    print("=== Test: Permission gate on streams ===")
+    server, url = start_server()
+    try:
+        with streaming_facade(url, allow_ai=False) as (facade, _):
+            text, _ = facade.process_stream("tell me a story", lambda chunk: None)
+            assert "AI access is currently disabled" in text
+        assert server.requests == 0
+    finally:
+        server.shutdown()
+    print("✅ Permission gate on streams test passed\n")
+
+
+def test_unmatched_commands_stream_from_the_brain():
+    """Everything else still streams from the selected Brain, sync and async."""
+    print("=== Test: Unmatched commands stream ===")
+    server, url = start_server(first_token_delay=0)
+    try:
+        with streaming_facade(url) as (facade, skills):
+            chunks = []
+            text, _ = facade.process_stream("tell me a story", chunks.append)
+            assert chunks == WORDS and text == "".join(WORDS)
+
+            text, _ = asyncio.run(facade.process_stream_async("tell me a story", lambda chunk: None))
+            assert text == "".join(WORDS)
+            text, _ = asyncio.run(facade.process_stream_async("what time is it", lambda chunk: None))
+            assert text == TIME_REPLY
+            assert skills.executed == ["get_time()"]
+        assert server.requests == 2
+    finally:
+        server.shutdown()
+    print("✅ Unmatched commands stream test passed\n")
+
+
+def test_repeated_stream_is_served_from_cache():
+    """With the response cache on, a completed stream is replayed for a repeat, sync and async."""
+    print("=== Test: Cached stream ===")
+    server, url = start_server(first_token_delay=0)
+    try:
+        with streaming_facade(url, cache=True) as (facade, _):
+            text, _ = facade.process_stream("tell me a story", lambda chunk: None)
+            assert text == "".join(WORDS)
+
+            chunks = []
+            text, data = facade.process_stream("Tell me a story!", chunks.append, chunk_size=4)
+            assert text == "".join(WORDS) == "".join(chunks) and data is None
+            text, _ = asyncio.run(facade.process_stream_async("tell me a story", lambda chunk: None))
+            assert text == "".join(WORDS)
+            assert facade.response_cache.stats()["hits"] == 2
+        assert server.requests == 1
+    finally:
+        server.shutdown()
+    print("✅ Cached stream test passed\n")
+
+
+if __name__ == "__main__":
+    test_local_intents_skip_the_brain()
+    test_permission_gate_applies_to_streams()
+    test_unmatched_commands_stream_from_the_brain()
+    test_repeated_stream_is_served_from_cache()
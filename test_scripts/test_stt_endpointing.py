@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming capture, end-of-speech detection and STT engine
+selection in core.stt.
+
+Audio is synthesized, so no microphone is needed.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import config
+from core.stt import (
+    SAMPLE_RATE, FRAME_MS, EnergyEndpointer, GoogleSTTEngine, STTEngine, collect_utterance, get_stt_engine
+)
+
+FRAME = SAMPLE_RATE * FRAME_MS // 1000
+
+
+def synth(segments, seed=0):
+    """Build 30 ms int16 frames from (kind, milliseconds) segments."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    t = 0
+    for kind, ms in segments:
+        for _ in range(ms // FRAME_MS):
+            noise = rng.normal(0, 60, FRAME)
+            if kind == "speech":
+                n = np.arange(t, t + FRAME)
+                noise += 4000 * np.sin(2 * np.pi * 220 * n / SAMPLE_RATE)
+            frames.append(noise.astype(np.int16))
+            t += FRAME
+    return frames
+
+
+class CountingFrames:
+    """Frame source that records how many frames were consumed."""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.consumed = 0
+
+    def __iter__(self):
+        for frame in self.frames:
+            self.consumed += 1
+            yield frame
+
+
+def test_returns_at_end_of_speech_with_pre_roll():
+    """Capture ends ~700 ms after speech stops and keeps audio before onset."""
+    print("\n=== Test: End-of-speech hand-off ===")
+    source = CountingFrames(synth([("silence", 600), ("speech", 900), ("silence", 5000)]))
+    audio = collect_utterance(source, pre_roll_ms=300)
+
+    consumed_ms = source.consumed * FRAME_MS
+    assert 600 + 900 + 600 <= consumed_ms <= 600 + 900 + 900, consumed_ms
+    # pre-roll (300 ms incl. the onset frames) + speech + trailing silence
+    assert len(audio) >= (900 + 600) * SAMPLE_RATE // 1000
+    assert audio.dtype == np.int16
+    print("✅ End-of-speech hand-off test passed\n")
+
+
+def test_timeout_and_phrase_limit():
+    """No speech gives None after the timeout; endless speech is capped."""
+    print("=== Test: Timeout and phrase limit ===")
+    silent = CountingFrames(synth([("silence", 10000)]))
+    assert collect_utterance(silent, timeout=1.0) is None
+    assert silent.consumed * FRAME_MS <= 1000 + FRAME_MS
+
+    audio = collect_utterance(synth([("speech", 10000)]), phrase_limit=2.0)
+    assert len(audio) <= (2000 + 300) * SAMPLE_RATE // 1000
+    print("✅ Timeout and phrase limit test passed\n")
+
+
+def test_noise_floor_adapts():
+    """Steady background noise alone never triggers speech."""
+    print("=== Test: Adaptive noise floor ===")
+    endpointer = EnergyEndpointer()
+    events = [endpointer.process(frame) for frame in synth([("silence", 3000)], seed=3)]
+    assert "start" not in events
+    print("✅ Adaptive noise floor test passed\n")
+
+
+def test_engine_receives_frames_while_capturing():
+    """Streaming engines see each utterance frame (pre-roll first) before capture ends."""
+    print("=== Test: Streaming engine feed ===")
+
+    class WordCountingEngine(STTEngine):
+        def start(self, on_partial=None, sample_rate=SAMPLE_RATE):
+            super().start(on_partial, sample_rate)
+            self.frames = 0
+
+        def accept(self, frame):
+            self.frames += 1
+            if self.frames % 10 == 0:
+                self.on_partial(f"{self.frames} frames")
+
+        def finish(self, audio):
+            return f"{len(audio) // FRAME} frames"
+
+    partials = []
+    engine = WordCountingEngine()
+    engine.start(on_partial=partials.append)
+    audio = collect_utterance(synth([("silence", 600), ("speech", 900), ("silence", 2000)]), on_frame=engine.accept)
+    assert engine.finish(audio) == f"{engine.frames} frames"
+    assert partials and partials[0] == "10 frames"
+
+    # An engine without finish() is rejected when created, not mid-utterance
+    class HalfEngine(STTEngine):
+        def accept(self, frame):
+            pass
+
+    try:
+        HalfEngine()
+        assert False, "engine without finish() was created"
+    except TypeError:
+        pass
+    print("✅ Streaming engine feed test passed\n")
+
+
+def test_engine_selection_falls_back_to_google():
+    """Unknown engines and a missing Vosk model fall back to Google."""
+    print("=== Test: STT engine selection ===")
+    original = (config.STT_ENGINE, config.VOSK_MODEL)
+    try:
+        config.STT_ENGINE = "google"
+        assert isinstance(get_stt_engine(), GoogleSTTEngine)
+        config.STT_ENGINE, config.VOSK_MODEL = "vosk", "/nonexistent/model"
+        assert isinstance(get_stt_engine(), GoogleSTTEngine)
+        config.STT_ENGINE = "whisper-9000"
+        assert isinstance(get_stt_engine(), GoogleSTTEngine)
+    finally:
+        config.STT_ENGINE, config.VOSK_MODEL = original
+    print("✅ STT engine selection test passed\n")
+
+
+if __name__ == "__main__":
+    test_returns_at_end_of_speech_with_pre_roll()
+    test_timeout_and_phrase_limit()
+    test_noise_floor_adapts()
+    test_engine_receives_frames_while_capturing()
+    test_engine_selection_falls_back_to_google()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the synthesized-speech cache (core.tts_cache).
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.piper_worker import PCMAudio
+from core.tts_cache import TTSCache, make_speech_key
+import core.tts as tts
+
+
+def write_file(directory, name, size):
+    path = os.path.join(directory, name)
+    with open(path, "wb") as f:
+        f.write(b"\x01" * size)
+    return path
+
+
+def test_keys_and_round_trip():
+    """Files and PCM come back intact; engine and voice are part of the key."""
+    print("\n=== Test: Speech cache round trip ===")
+    assert make_speech_key("gtts", "en-uk", "Hello") == make_speech_key("gtts", "en-uk", " Hello ")
+    assert make_speech_key("gtts", "en-uk", "Hello") != make_speech_key("gtts", "en-us", "Hello")
+    assert make_speech_key("gtts", "en-uk", "Hello") != make_speech_key("piper", "en-uk", "Hello")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TTSCache(os.path.join(tmp, "cache"))
+        mp3_key = make_speech_key("gtts", "en-uk", "Hello")
+        assert cache.get(mp3_key) is None
+        path = cache.put(mp3_key, write_file(tmp, "response.mp3", 100))
+        assert path.startswith(cache.cache_dir) and path.endswith(".mp3")
+        assert cache.get(mp3_key) == path
+
+        pcm_key = make_speech_key("piper", "lessac", "Hello")
+        pcm = PCMAudio(b"\x10\x00\x20\x00" * 50, 22050)
+        assert cache.put(pcm_key, pcm) == pcm
+        assert cache.get(pcm_key) == pcm
+
+        reopened = TTSCache(os.path.join(tmp, "cache"))
+        assert reopened.get(mp3_key) == path
+        assert reopened.get(pcm_key) == pcm
+        assert reopened.stats()["entries"] == 2
+    print("✅ Speech cache round trip test passed\n")
+
+
+def test_lru_eviction():
+    """The least recently used entries go first once over the size limit."""
+    print("=== Test: Speech cache eviction ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TTSCache(os.path.join(tmp, "cache"), max_bytes=350)
+        keys = [make_speech_key("gtts", "en", f"phrase {i}") for i in range(4)]
+        for key in keys[:3]:
+            cache.put(key, write_file(tmp, "response.mp3", 100))
+        assert cache.get(keys[0])  # now most recently used
+        cache.put(keys[3], write_file(tmp, "response.mp3", 100))
+
+        assert cache.get(keys[1]) is None
+        assert all(cache.get(key) for key in (keys[0], keys[2], keys[3]))
+        assert cache.stats()["bytes"] == 300
+        assert len(os.listdir(cache.cache_dir)) == 3
+    print("✅ Speech cache eviction test passed\n")
+
+
+def test_synthesize_uses_cache():
+    """Repeated phrases skip the engine; prewarm fills whole phrases and sentences."""
+    print("=== Test: Cached synthesis ===")
+    rendered = []
+
+    def fake_render(engine, text, filename):
+        rendered.append(text)
+        with open(filename, "wb") as f:
+            f.write(text.encode())
+        return filename
+
+    original = (tts.speech_cache, tts._render, tts.config.TTS_ENGINE, tts.MEDIA_DIR)
+    with tempfile.TemporaryDirectory() as tmp:
+        tts.speech_cache, tts._render, tts.config.TTS_ENGINE = TTSCache(os.path.join(tmp, "cache")), fake_render, "gtts"
+        tts.MEDIA_DIR = os.path.join(tmp, "media")
+        try:
+            target = os.path.join(tmp, "response.mp3")
+            first = tts._synthesize("Step complete.", target)
+            assert tts._synthesize("Step complete.", target) == first
+            assert rendered == ["Step complete."]
+
+            tts.prewarm(["Hello there, friend! How can I help you today?"]).join()
+            assert rendered[1:] == [
+                "Hello there, friend! How can I help you today?", "Hello there, friend!", "How can I help you today?",
+            ]
+            tts.prewarm(["Hello there, friend! How can I help you today?"]).join()
+            assert len(rendered) == 4
+        finally:
+            tts.speech_cache, tts._render, tts.config.TTS_ENGINE, tts.MEDIA_DIR = original
+    print("✅ Cached synthesis test passed\n")
+
+
+if __name__ == "__main__":
+    test_keys_and_round_trip()
+    test_lru_eviction()
+    test_synthesize_uses_cache()
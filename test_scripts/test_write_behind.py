@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the write-behind queue in core.persistence.
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.persistence import Persistence
+
+
+def test_read_your_writes():
+    """Queued messages are visible to the next get_session_messages()."""
+    print("\n=== Test: Read-your-writes ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"))
+        session_id = store.create_session(title="Write-behind")
+        for i in range(50):
+            store.queue_message(session_id, "user" if i % 2 == 0 else "assistant", f"message {i}")
+
+        messages = store.get_session_messages(session_id, limit=100)
+        assert [m["content"] for m in messages] == [f"message {i}" for i in range(50)]
+        assert not store.writer.has_pending()
+        store.close()
+    print("✅ Read-your-writes test passed\n")
+
+
+def test_flush_on_close():
+    """Closing the store drains queued history rows to disk."""
+    print("=== Test: Flush on shutdown ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "avva.db")
+        store = Persistence(db_path=db_path)
+        for i in range(300):
+            store.log_interaction("user", f"hello {i}")
+        store.close()
+
+        conn = sqlite3.connect(db_path)
+        count = conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+        conn.close()
+        assert count == 300
+    print("✅ Flush on shutdown test passed\n")
+
+
+def test_backpressure_on_full_queue():
+    """A tiny queue still accepts every row; producers just wait for the writer."""
+    print("=== Test: Bounded queue backpressure ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"))
+        store.writer._queue.maxsize = 4
+        session_id = store.create_session()
+        for i in range(100):
+            store.queue_message(session_id, "user", f"m{i}")
+        assert len(store.get_session_messages(session_id, limit=200)) == 100
+        store.close()
+    print("✅ Backpressure test passed\n")
+
+
+def failing_writes(writer, should_fail):
+    """Make writer._write_batch raise should_fail(batch)'s error, if any."""
+    write = writer._write_batch
+
+    def flaky(batch):
+        error = should_fail(batch)
+        if error:
+            raise error
+        write(batch)
+    writer._write_batch = flaky
+
+
+def test_locked_database_keeps_rows_pending():
+    """A batch that keeps hitting a locked database is retried later, not dropped."""
+    print("=== Test: Retry on locked database ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Persistence(db_path=os.path.join(tmp, "avva.db"))
+        writer = store.writer
+        writer.RETRY_DELAYS, writer.RETRY_INTERVAL = (0.01,), 0.05
+        attempts = []
+
+        def locked(batch):
+            attempts.append(len(batch))
+            return sqlite3.OperationalError("database is locked") if len(attempts) <= 3 else None
+        failing_writes(writer, locked)
+
+        session_id = store.create_session()
+        for i in range(5):
+            store.queue_message(session_id, "user", f"m{i}")
+        deadline = time.monotonic() + 5.0
+        while writer.has_pending() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not writer.has_pending() and len(attempts) >= 4
+        assert [m["content"] for m in store.get_session_messages(session_id)] == [f"m{i}" for i in range(5)]
+        assert writer.failed == []
+        store.close()
+    print("✅ Retry on locked database test passed\n")
+
+
+def test_bad_row_does_not_sink_its_batch():
+    """A row that cannot be written is kept in `failed`; the rest of its batch is committed."""
+    print("=== Test: Bad row isolation ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "avva.db")
+        store = Persistence(db_path=db_path)
+        failing_writes(store.writer, lambda batch: sqlite3.IntegrityError("bad row")
+                       if any(params[2] == "bad" for _, _, params in batch) else None)
+        for message in ("one", "bad", "two"):
+            store.log_interaction("user", message)
+        store.close()
+
+        conn = sqlite3.connect(db_path)
+        rows = [row[0] for row in conn.execute("SELECT message FROM history ORDER BY id")]
+        conn.close()
+        assert rows == ["one", "two"]
+        assert [(kind, error) for kind, _, _, error in store.writer.failed] == [("history", "bad row")]
+        assert not store.writer.has_pending()
+    print("✅ Bad row isolation test passed\n")
+
+
+if __name__ == "__main__":
+    test_read_your_writes()
+    test_flush_on_close()
+    test_backpressure_on_full_queue()
+    test_locked_database_keeps_rows_pending()
+    test_bad_row_does_not_sink_its_batch()
@@ -20,6 +20,7 @@ export default defineNuxtPlugin(() => {
 
     const state = reactive({
         assistantState: 'idle',
+        liveTranscript: '',
         messages: [] as Message[],
         systemStats: { cpu: 0, ram: 0, vram: 0, vram_used: 0, vram_total: 0 },
         intelligenceStats: { tokens_sec: 0, latency: 0, npu_acceleration: 0 },
@@ -192,6 +193,9 @@ export default defineNuxtPlugin(() => {
                         })
                     }
                     break
+                case 'assistant.transcript':
+                    state.liveTranscript = payload.final ? '' : (payload.text || '')
+                    break
                 case 'assistant.command':
                     state.messages.push({
                         id: Date.now(),